@@ -0,0 +1,10 @@
+"""Headless benchmarks of the file handlers and the NumPy converters.
+
+Run :code:`python -m benchmarks --help` (from the repository root) for the
+available options. The benchmarks do not require Blender.
+
+Run :code:`python -m benchmarks.addon_startup` to measure the time required to
+enable the addon in Blender and
+:code:`python -m benchmarks.pipe_communication` to measure the throughput of
+images sent through the pipe of a subprocess.
+"""
@@ -0,0 +1,140 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+
+from benchmarks.suite import (
+    compare_with_baselines,
+    get_benchmark_cases,
+    get_result_lines,
+    read_baselines,
+    run_benchmark_cases,
+    write_baselines,
+)
+from benchmarks.synthetic_reconstruction import (
+    generate_synthetic_reconstruction,
+)
+
+_SCALES = {
+    "small": {"num_cameras": 50, "num_points": 10000, "depth_map_size": 64},
+    "medium": {
+        "num_cameras": 300,
+        "num_points": 200000,
+        "depth_map_size": 256,
+    },
+    "large": {
+        "num_cameras": 1000,
+        "num_points": 2000000,
+        "depth_map_size": 512,
+    },
+}
+
+
+def _parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the file handlers and converters on synthetic"
+        " reconstructions (without Blender).",
+    )
+    parser.add_argument("--scale", choices=_SCALES.keys(), default="small")
+    parser.add_argument("--num-cameras", type=int)
+    parser.add_argument("--num-points", type=int)
+    parser.add_argument("--track-length", type=int, default=4)
+    parser.add_argument("--num-intrinsics", type=int, default=1)
+    parser.add_argument(
+        "--depth-map-size",
+        type=int,
+        help="Width of the (square) depth maps",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        help="Run only the benchmarks containing one of these strings",
+    )
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare against this file")
+    parser.add_argument(
+        "--save-baseline", help="Write the results as baseline file"
+    )
+    parser.add_argument("--max-slowdown", type=float, default=1.25)
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Run the benchmarks and return the exit code."""
+    args = _parse_args(args)
+    if not args.verbose:
+        # The file handlers report their progress with log messages
+        logging.getLogger().setLevel(logging.WARNING)
+
+    scale = dict(_SCALES[args.scale])
+    for key in ["num_cameras", "num_points", "depth_map_size"]:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+    depth_map_size = scale["depth_map_size"]
+    reconstruction = generate_synthetic_reconstruction(
+        num_cameras=scale["num_cameras"],
+        num_points=scale["num_points"],
+        mean_track_length=args.track_length,
+        num_intrinsics=args.num_intrinsics,
+        depth_map_size=(depth_map_size, depth_map_size),
+        seed=args.seed,
+    )
+
+    cases = get_benchmark_cases()
+    if args.cases:
+        cases = [
+            case
+            for case in cases
+            if any(pattern in case.name for pattern in args.cases)
+        ]
+
+    with tempfile.TemporaryDirectory() as work_dp:
+        results = run_benchmark_cases(
+            cases, reconstruction, work_dp, args.repetitions
+        )
+
+    metadata = {
+        "scale": scale,
+        "track_length": args.track_length,
+        "num_intrinsics": args.num_intrinsics,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    baselines = None
+    if args.baseline is not None:
+        baselines = read_baselines(args.baseline)
+
+    for line in get_result_lines(results, baselines):
+        print(line)
+
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(
+                {"metadata": metadata, "results": results}, json_file, indent=4
+            )
+    if args.save_baseline is not None:
+        write_baselines(args.save_baseline, results, metadata)
+
+    if baselines is not None:
+        regressions = compare_with_baselines(
+            results, baselines, args.max_slowdown
+        )
+        for name, baseline_time, wall_time, ratio in regressions:
+            print(
+                f"Regression: {name} took {wall_time:.4f}s"
+                f" (baseline {baseline_time:.4f}s, {ratio:.2f}x)"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
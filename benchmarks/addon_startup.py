@@ -0,0 +1,260 @@
+"""Measure the cost of enabling the addon in Blender.
+
+Run :code:`python -m benchmarks.addon_startup --blender path/to/blender` (from
+the repository root). Each run starts a fresh Blender process with factory
+settings, so the results do not depend on the installed addons or on cached
+modules of previous runs.
+"""
+
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ADDON_NAME = "photogrammetry_importer"
+
+# Modules that must not be imported when enabling the addon, i.e. these are
+# imported on first use (e.g. when executing the corresponding operator)
+DEFERRED_MODULE_PREFIXES = [
+    "photogrammetry_importer.conversion",
+    "photogrammetry_importer.ext",
+    "photogrammetry_importer.file_handlers",
+    "photogrammetry_importer.importers.camera_animation_utility",
+    "photogrammetry_importer.importers.camera_utility",
+    "photogrammetry_importer.importers.point_utility",
+    "photogrammetry_importer.opengl.draw_manager",
+    "photogrammetry_importer.opengl.utility",
+    "photogrammetry_importer.process_communication",
+    "photogrammetry_importer.types.spatial_index",
+    "photogrammetry_importer.types.visibility_index",
+    "photogrammetry_importer.utility.outlier_utility",
+    "photogrammetry_importer.utility.thumbnail_utility",
+    "photogrammetry_importer.utility.voxel_utility",
+]
+DEFERRED_THIRD_PARTY_MODULES = ["PIL", "pyntcloud", "laspy", "pandas"]
+
+_RESULT_PREFIX = "ADDON_STARTUP_RESULT "
+_BLENDER_SCRIPT = """
+import json, sys, time
+import addon_utils
+start = time.perf_counter()
+module = addon_utils.enable({addon_name!r}, default_set=True)
+elapsed = time.perf_counter() - start
+print({result_prefix!r} + json.dumps({{
+    "enabled": module is not None,
+    "time": elapsed,
+    "modules": sorted(name for name in sys.modules
+        if name.split(".")[0] in {top_level_names!r}),
+}}))
+"""
+
+
+def _get_addon_dp():
+    return os.path.join(os.path.dirname(os.path.dirname(__file__)), ADDON_NAME)
+
+
+def _get_module_fp(module_name, addon_dp):
+    rel_path = os.path.join("", *module_name.split(".")[1:])
+    package_fp = os.path.join(addon_dp, rel_path, "__init__.py")
+    if os.path.isfile(package_fp):
+        return package_fp
+    module_fp = os.path.join(addon_dp, rel_path + ".py")
+    if os.path.isfile(module_fp):
+        return module_fp
+    return None
+
+
+def _get_statements_executed_on_import(statements):
+    # Only the bodies of functions are not executed when importing a module
+    for statement in statements:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        yield statement
+        for field in ["body", "orelse", "finalbody", "handlers"]:
+            yield from _get_statements_executed_on_import(
+                getattr(statement, field, [])
+            )
+
+
+def _get_imported_names(module_name, is_package, statement):
+    if isinstance(statement, ast.Import):
+        return [alias.name for alias in statement.names]
+    if statement.level == 0:
+        base_name = statement.module
+    else:
+        package_parts = module_name.split(".")
+        if not is_package:
+            package_parts = package_parts[:-1]
+        package_parts = package_parts[
+            : len(package_parts) - statement.level + 1
+        ]
+        base_name = ".".join(
+            package_parts + ([statement.module] if statement.module else [])
+        )
+    # "from package import module" imports a submodule
+    return [base_name] + [
+        base_name + "." + alias.name for alias in statement.names
+    ]
+
+
+def get_startup_modules(addon_dp=None):
+    """Return the addon modules imported when the addon is loaded.
+
+    The result is obtained by following the module level imports (without
+    executing any code), so it does not require Blender.
+    """
+    if addon_dp is None:
+        addon_dp = _get_addon_dp()
+    startup_modules = set()
+    module_names = [ADDON_NAME]
+    while module_names:
+        module_name = module_names.pop()
+        module_fp = _get_module_fp(module_name, addon_dp)
+        if module_name in startup_modules or module_fp is None:
+            continue
+        startup_modules.add(module_name)
+        # Importing a module imports the parent packages
+        parts = module_name.split(".")
+        module_names.extend(
+            ".".join(parts[:index]) for index in range(1, len(parts))
+        )
+        is_package = module_fp.endswith("__init__.py")
+        with open(module_fp, "r", encoding="utf-8") as module_file:
+            tree = ast.parse(module_file.read())
+        for statement in _get_statements_executed_on_import(tree.body):
+            if not isinstance(statement, (ast.Import, ast.ImportFrom)):
+                continue
+            for imported_name in _get_imported_names(
+                module_name, is_package, statement
+            ):
+                if imported_name.split(".")[0] == ADDON_NAME:
+                    module_names.append(imported_name)
+    return sorted(startup_modules)
+
+
+def get_deferred_startup_modules(module_names):
+    """Return the modules that should have been imported on first use."""
+    return [
+        module_name
+        for module_name in module_names
+        if any(
+            module_name == prefix or module_name.startswith(prefix + ".")
+            for prefix in DEFERRED_MODULE_PREFIXES
+        )
+        or module_name.split(".")[0] in DEFERRED_THIRD_PARTY_MODULES
+    ]
+
+
+def find_blender_executable():
+    """Return the Blender executable defined by the environment (if any)."""
+    blender_fp = os.environ.get("BLENDER_EXECUTABLE")
+    if blender_fp:
+        return blender_fp
+    return shutil.which("blender")
+
+
+def _create_scripts_dir(scripts_dp):
+    addons_dp = os.path.join(scripts_dp, "addons")
+    os.makedirs(addons_dp)
+    try:
+        os.symlink(_get_addon_dp(), os.path.join(addons_dp, ADDON_NAME))
+    except OSError:
+        shutil.copytree(_get_addon_dp(), os.path.join(addons_dp, ADDON_NAME))
+
+
+def _run_blender(blender_fp, scripts_dp):
+    script = _BLENDER_SCRIPT.format(
+        addon_name=ADDON_NAME,
+        result_prefix=_RESULT_PREFIX,
+        top_level_names=[ADDON_NAME] + DEFERRED_THIRD_PARTY_MODULES,
+    )
+    env = dict(os.environ, BLENDER_USER_SCRIPTS=scripts_dp)
+    completed_process = subprocess.run(
+        [
+            blender_fp,
+            "--background",
+            "--factory-startup",
+            "--python-exit-code",
+            "1",
+            "--python-expr",
+            script,
+        ],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in completed_process.stdout.splitlines():
+        if line.startswith(_RESULT_PREFIX):
+            return json.loads(line[len(_RESULT_PREFIX) :])
+    raise RuntimeError(
+        "Blender did not report the startup time:\n" + completed_process.stdout
+    )
+
+
+def measure_addon_startup(blender_fp, num_runs=5):
+    """Enable the addon in fresh Blender processes and return the timings.
+
+    The time is the median of all runs (the first run usually includes
+    compiling the byte code of the addon).
+    """
+    with tempfile.TemporaryDirectory() as scripts_dp:
+        _create_scripts_dir(scripts_dp)
+        runs = [_run_blender(blender_fp, scripts_dp) for _ in range(num_runs)]
+    modules = runs[-1]["modules"]
+    return {
+        "enabled": all(run["enabled"] for run in runs),
+        "time": statistics.median(run["time"] for run in runs),
+        "times": [run["time"] for run in runs],
+        "num_modules": len(modules),
+        "deferred_modules_loaded": get_deferred_startup_modules(modules),
+    }
+
+
+def _parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.addon_startup",
+        description="Measure the time required to enable the addon.",
+    )
+    parser.add_argument(
+        "--blender",
+        default=find_blender_executable(),
+        help="Blender executable (by default $BLENDER_EXECUTABLE or the"
+        " blender executable in $PATH)",
+    )
+    parser.add_argument("--num-runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the result to this file")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Measure the startup cost and return the exit code."""
+    args = _parse_args(args)
+    startup_modules = get_startup_modules()
+    print(f"Modules imported at startup (static): {len(startup_modules)}")
+    for module_name in get_deferred_startup_modules(startup_modules):
+        print(f"Imported at startup: {module_name}", file=sys.stderr)
+
+    if args.blender is None:
+        print("No Blender executable found.", file=sys.stderr)
+        return 2
+    result = measure_addon_startup(args.blender, args.num_runs)
+    print(
+        "Enabled addon in {:.3f}s (median of {} runs, {} modules)".format(
+            result["time"], args.num_runs, result["num_modules"]
+        )
+    )
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(result, json_file, indent=4)
+    return 1 if result["deferred_modules_loaded"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,616 @@
+import json
+import math
+import os
+import numpy as np
+
+from photogrammetry_importer.ext.read_write_model import (
+    write_model,
+    Camera as ColmapCamera,
+    Image as ColmapImage,
+    Point3D as ColmapPoint3D,
+)
+from photogrammetry_importer.utility.np_utility import invert_y_and_z_axis
+
+
+def _get_image_dp(odp):
+    image_dp = os.path.join(odp, "images")
+    os.makedirs(image_dp, exist_ok=True)
+    return image_dp
+
+
+def _group_observations_by_camera(reconstruction):
+    point_indices, camera_indices, feature_indices, pixel_coords = (
+        reconstruction.get_observations()
+    )
+    # Sort by camera and by feature index (i.e. the order of the features)
+    order = np.lexsort((feature_indices, camera_indices))
+    counts = np.bincount(
+        camera_indices, minlength=reconstruction.get_num_cameras()
+    )
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return order, offsets, point_indices, pixel_coords
+
+
+def _get_tracks(reconstruction):
+    point_indices, camera_indices, feature_indices, pixel_coords = (
+        reconstruction.get_observations()
+    )
+    offsets = reconstruction.track_offsets
+    for point_index in range(reconstruction.get_num_points()):
+        track = slice(offsets[point_index], offsets[point_index + 1])
+        yield (
+            camera_indices[track],
+            feature_indices[track],
+            pixel_coords[track],
+        )
+
+
+def _write_colmap_depth_map(depth_map, ofp):
+    # See photogrammetry_importer/ext/read_dense.py
+    height, width = depth_map.shape
+    with open(ofp, "wb") as depth_map_file:
+        depth_map_file.write(f"{width}&{height}&1&".encode())
+        depth_map.astype(np.float32).tofile(depth_map_file)
+
+
+def write_colmap_model(reconstruction, odp, ext=".bin"):
+    """Write the reconstruction as :code:`Colmap` model folder."""
+    os.makedirs(odp, exist_ok=True)
+    colmap_cameras = {}
+    for intrinsic_index, calibration_mat in enumerate(
+        reconstruction.calibration_mats
+    ):
+        colmap_cameras[intrinsic_index + 1] = ColmapCamera(
+            id=intrinsic_index + 1,
+            model="PINHOLE",
+            width=reconstruction.width,
+            height=reconstruction.height,
+            params=np.array(
+                [
+                    calibration_mat[0, 0],
+                    calibration_mat[1, 1],
+                    calibration_mat[0, 2],
+                    calibration_mat[1, 2],
+                ]
+            ),
+        )
+
+    quaternions = reconstruction.get_quaternions()
+    translation_vecs = reconstruction.get_translation_vecs()
+    order, offsets, point_indices, pixel_coords = (
+        _group_observations_by_camera(reconstruction)
+    )
+    colmap_images = {}
+    for camera_index in range(reconstruction.get_num_cameras()):
+        observations = order[offsets[camera_index] : offsets[camera_index + 1]]
+        colmap_images[camera_index + 1] = ColmapImage(
+            id=camera_index + 1,
+            qvec=quaternions[camera_index],
+            tvec=translation_vecs[camera_index],
+            camera_id=reconstruction.intrinsic_indices[camera_index] + 1,
+            name=reconstruction.image_names[camera_index],
+            xys=pixel_coords[observations],
+            point3D_ids=point_indices[observations],
+        )
+
+    colmap_points = {}
+    for point_index, (camera_indices, feature_indices, _) in enumerate(
+        _get_tracks(reconstruction)
+    ):
+        colmap_points[point_index] = ColmapPoint3D(
+            id=point_index,
+            xyz=reconstruction.point_coords[point_index],
+            rgb=reconstruction.point_colors[point_index],
+            error=reconstruction.point_errors[point_index],
+            image_ids=camera_indices + 1,
+            point2D_idxs=feature_indices,
+        )
+    write_model(colmap_cameras, colmap_images, colmap_points, odp, ext=ext)
+    return odp
+
+
+def write_colmap_workspace(reconstruction, odp, ext=".bin"):
+    """Write the reconstruction (and depth maps) as :code:`Colmap` workspace.
+
+    The workspace contains depth maps, if the :code:`depth_map_size` of the
+    reconstruction is set.
+    """
+    write_colmap_model(reconstruction, os.path.join(odp, "sparse"), ext)
+    _get_image_dp(odp)
+    if reconstruction.depth_map_size is not None:
+        depth_map_dp = os.path.join(odp, "stereo", "depth_maps")
+        os.makedirs(depth_map_dp, exist_ok=True)
+        for camera_index, image_name in enumerate(reconstruction.image_names):
+            _write_colmap_depth_map(
+                reconstruction.compute_depth_map(camera_index),
+                os.path.join(depth_map_dp, image_name + ".geometric.bin"),
+            )
+    return odp
+
+
+def write_nvm_file(reconstruction, odp):
+    """Write the reconstruction as :code:`VisualSfM` (:code:`.nvm`) file."""
+    os.makedirs(odp, exist_ok=True)
+    ofp = os.path.join(odp, "reconstruction.nvm")
+    if len(reconstruction.calibration_mats) == 1:
+        calibration_mat = reconstruction.calibration_mats[0]
+        first_line = "NVM_V3 FixedK {} {} {} {} 0".format(
+            calibration_mat[0, 0],
+            calibration_mat[0, 2],
+            calibration_mat[1, 1],
+            calibration_mat[1, 2],
+        )
+    else:
+        first_line = "NVM_V3"
+    focal_lengths = reconstruction.get_calibration_mats()[:, 0, 0]
+    quaternions = reconstruction.get_quaternions()
+    with open(ofp, "w") as nvm_file:
+        nvm_file.write(first_line + "\n\n")
+        nvm_file.write(f"{reconstruction.get_num_cameras()}\n")
+        for image_name, focal_length, quaternion, center in zip(
+            reconstruction.image_names,
+            focal_lengths,
+            quaternions,
+            reconstruction.centers,
+        ):
+            values = " ".join(map(str, [focal_length, *quaternion, *center]))
+            nvm_file.write(f"{image_name}\t{values} 0 0\n")
+        nvm_file.write("\n")
+        nvm_file.write(f"{reconstruction.get_num_points()}\n")
+        for point_index, (
+            camera_indices,
+            feature_indices,
+            pixel_coords,
+        ) in enumerate(_get_tracks(reconstruction)):
+            measurements = " ".join(
+                f"{camera_index} {feature_index} {x} {y}"
+                for camera_index, feature_index, (x, y) in zip(
+                    camera_indices, feature_indices, pixel_coords
+                )
+            )
+            nvm_file.write(
+                " ".join(map(str, reconstruction.point_coords[point_index]))
+                + " "
+                + " ".join(map(str, reconstruction.point_colors[point_index]))
+                + f" {len(camera_indices)} {measurements}\n"
+            )
+        nvm_file.write("\n0\n")
+    return ofp
+
+
+def write_meshroom_sfm_file(reconstruction, odp):
+    """Write the reconstruction as :code:`Meshroom` (:code:`.sfm`) file."""
+    image_dp = _get_image_dp(odp)
+    ofp = os.path.join(odp, "cameras.sfm")
+    width = reconstruction.width
+    height = reconstruction.height
+    sensor_width = 36.0
+    sensor_height = sensor_width * height / width
+    intrinsics = [
+        {
+            "intrinsicId": str(intrinsic_index),
+            "width": str(width),
+            "height": str(height),
+            "sensorWidth": str(sensor_width),
+            "sensorHeight": str(sensor_height),
+            "focalLength": str(calibration_mat[0, 0] / width * sensor_width),
+            "pixelRatio": "1",
+            # Relative to the image center
+            "principalPoint": [
+                str(calibration_mat[0, 2] - width / 2),
+                str(calibration_mat[1, 2] - height / 2),
+            ],
+            "distortionParams": [],
+        }
+        for intrinsic_index, calibration_mat in enumerate(
+            reconstruction.calibration_mats
+        )
+    ]
+    views = []
+    poses = []
+    for camera_index, image_name in enumerate(reconstruction.image_names):
+        views.append(
+            {
+                "viewId": str(camera_index),
+                "poseId": str(camera_index),
+                "intrinsicId": str(
+                    reconstruction.intrinsic_indices[camera_index]
+                ),
+                "path": os.path.join(image_dp, image_name),
+                "width": str(width),
+                "height": str(height),
+            }
+        )
+        rotation_mat = reconstruction.rotation_mats[camera_index]
+        poses.append(
+            {
+                "poseId": str(camera_index),
+                "pose": {
+                    "transform": {
+                        # Meshroom stores the camera to world rotation
+                        "rotation": list(map(str, rotation_mat.T.flatten())),
+                        "center": list(
+                            map(str, reconstruction.centers[camera_index])
+                        ),
+                    }
+                },
+            }
+        )
+    structure = []
+    for point_index, (
+        camera_indices,
+        feature_indices,
+        pixel_coords,
+    ) in enumerate(_get_tracks(reconstruction)):
+        structure.append(
+            {
+                "landmarkId": str(point_index),
+                "color": list(
+                    map(str, reconstruction.point_colors[point_index])
+                ),
+                "X": list(map(str, reconstruction.point_coords[point_index])),
+                "observations": [
+                    {
+                        "observationId": str(camera_index),
+                        "featureId": str(feature_index),
+                        "x": list(map(str, pixel_coord)),
+                    }
+                    for camera_index, feature_index, pixel_coord in zip(
+                        camera_indices, feature_indices, pixel_coords
+                    )
+                ],
+            }
+        )
+    json_data = {
+        "version": ["1", "2", "5"],
+        "views": views,
+        "intrinsics": intrinsics,
+        "poses": poses,
+        "structure": structure,
+    }
+    with open(ofp, "w") as json_file:
+        json.dump(json_data, json_file)
+    return ofp
+
+
+def _compute_rodrigues_vecs(reconstruction):
+    quaternions = reconstruction.get_quaternions()
+    vector_parts = quaternions[:, 1:]
+    norms = np.linalg.norm(vector_parts, axis=1, keepdims=True)
+    angles = 2.0 * np.arctan2(norms, quaternions[:, 0:1])
+    factors = np.divide(
+        angles, norms, out=np.zeros_like(norms), where=norms > 1e-12
+    )
+    return factors * vector_parts
+
+
+def write_opensfm_file(reconstruction, odp):
+    """Write the reconstruction as :code:`OpenSfM` (:code:`.json`) file."""
+    _get_image_dp(odp)
+    ofp = os.path.join(odp, "reconstruction.json")
+    width = reconstruction.width
+    height = reconstruction.height
+    cameras = {
+        f"camera_{intrinsic_index}": {
+            "projection_type": "perspective",
+            "width": width,
+            "height": height,
+            "focal": calibration_mat[0, 0] / max(width, height),
+            "k1": 0.0,
+            "k2": 0.0,
+        }
+        for intrinsic_index, calibration_mat in enumerate(
+            reconstruction.calibration_mats
+        )
+    }
+    rodrigues_vecs = _compute_rodrigues_vecs(reconstruction)
+    translation_vecs = reconstruction.get_translation_vecs()
+    shots = {
+        image_name: {
+            "camera": "camera_"
+            + str(reconstruction.intrinsic_indices[camera_index]),
+            "rotation": rodrigues_vecs[camera_index].tolist(),
+            "translation": translation_vecs[camera_index].tolist(),
+        }
+        for camera_index, image_name in enumerate(reconstruction.image_names)
+    }
+    points = {
+        str(point_index): {
+            "coordinates": coord,
+            "color": color,
+        }
+        for point_index, (coord, color) in enumerate(
+            zip(
+                reconstruction.point_coords.tolist(),
+                reconstruction.point_colors.tolist(),
+            )
+        )
+    }
+    with open(ofp, "w") as json_file:
+        json.dump(
+            [{"cameras": cameras, "shots": shots, "points": points}],
+            json_file,
+        )
+    return ofp
+
+
+def write_openmvg_file(reconstruction, odp):
+    """Write the reconstruction as :code:`OpenMVG` (:code:`.json`) file."""
+    image_dp = _get_image_dp(odp)
+    ofp = os.path.join(odp, "sfm_data.json")
+    intrinsics = [
+        {
+            "key": intrinsic_index,
+            "value": {
+                "polymorphic_id": 2147483649,
+                "polymorphic_name": "pinhole_radial_k3",
+                "ptr_wrapper": {
+                    "id": 2147483649 + intrinsic_index,
+                    "data": {
+                        "width": reconstruction.width,
+                        "height": reconstruction.height,
+                        "focal_length": calibration_mat[0][0],
+                        "principal_point": [
+                            calibration_mat[0][2],
+                            calibration_mat[1][2],
+                        ],
+                        "disto_k3": [0.0, 0.0, 0.0],
+                    },
+                },
+            },
+        }
+        for intrinsic_index, calibration_mat in enumerate(
+            reconstruction.calibration_mats.tolist()
+        )
+    ]
+    views = []
+    extrinsics = []
+    for camera_index, image_name in enumerate(reconstruction.image_names):
+        views.append(
+            {
+                "key": camera_index,
+                "value": {
+                    "ptr_wrapper": {
+                        "id": camera_index,
+                        "data": {
+                            "local_path": "",
+                            "filename": image_name,
+                            "width": reconstruction.width,
+                            "height": reconstruction.height,
+                            "id_view": camera_index,
+                            "id_intrinsic": int(
+                                reconstruction.intrinsic_indices[camera_index]
+                            ),
+                            "id_pose": camera_index,
+                        },
+                    }
+                },
+            }
+        )
+        extrinsics.append(
+            {
+                "key": camera_index,
+                "value": {
+                    "rotation": reconstruction.rotation_mats[
+                        camera_index
+                    ].tolist(),
+                    "center": reconstruction.centers[camera_index].tolist(),
+                },
+            }
+        )
+    structure = []
+    for point_index, (
+        camera_indices,
+        feature_indices,
+        pixel_coords,
+    ) in enumerate(_get_tracks(reconstruction)):
+        structure.append(
+            {
+                "key": point_index,
+                "value": {
+                    "X": reconstruction.point_coords[point_index].tolist(),
+                    "observations": [
+                        {
+                            "key": camera_index,
+                            "value": {"id_feat": feature_index, "x": coord},
+                        }
+                        for camera_index, feature_index, coord in zip(
+                            camera_indices.tolist(),
+                            feature_indices.tolist(),
+                            pixel_coords.tolist(),
+                        )
+                    ],
+                },
+            }
+        )
+    json_data = {
+        "sfm_data_version": "0.3",
+        "root_path": image_dp,
+        "views": views,
+        "intrinsics": intrinsics,
+        "extrinsics": extrinsics,
+        "structure": structure,
+    }
+    with open(ofp, "w") as json_file:
+        json.dump(json_data, json_file)
+    return ofp
+
+
+def _get_cam_to_world_mats(reconstruction):
+    cam_to_world_mats = np.zeros((reconstruction.get_num_cameras(), 4, 4))
+    cam_to_world_mats[:, 0:3, 0:3] = reconstruction.rotation_mats.transpose(
+        0, 2, 1
+    )
+    cam_to_world_mats[:, 0:3, 3] = reconstruction.centers
+    cam_to_world_mats[:, 3, 3] = 1.0
+    return cam_to_world_mats
+
+
+def write_open3d_json_file(reconstruction, odp):
+    """Write the cameras as :code:`Open3D` trajectory (:code:`.json`)."""
+    _get_image_dp(odp)
+    ofp = os.path.join(odp, "trajectory.json")
+    world_to_cam_mats = np.linalg.inv(_get_cam_to_world_mats(reconstruction))
+    calibration_mats = reconstruction.get_calibration_mats()
+    parameters = [
+        {
+            "class_name": "PinholeCameraParameters",
+            # Open3D stores the matrices in column major order
+            "extrinsic": world_to_cam_mat.T.flatten().tolist(),
+            "intrinsic": {
+                "width": reconstruction.width,
+                "height": reconstruction.height,
+                "intrinsic_matrix": calibration_mat.T.flatten().tolist(),
+            },
+            "version_major": 1,
+            "version_minor": 0,
+        }
+        for world_to_cam_mat, calibration_mat in zip(
+            world_to_cam_mats, calibration_mats
+        )
+    ]
+    json_data = {
+        "class_name": "PinholeCameraTrajectory",
+        "parameters": parameters,
+        "version_major": 1,
+        "version_minor": 0,
+    }
+    with open(ofp, "w") as json_file:
+        json.dump(json_data, json_file)
+    return ofp
+
+
+def write_open3d_log_file(reconstruction, odp):
+    """Write the cameras as :code:`Open3D` trajectory (:code:`.log`)."""
+    _get_image_dp(odp)
+    ofp = os.path.join(odp, "trajectory.log")
+    with open(ofp, "w") as log_file:
+        for camera_index, cam_to_world_mat in enumerate(
+            _get_cam_to_world_mats(reconstruction)
+        ):
+            log_file.write(
+                f"{camera_index} {camera_index} {camera_index + 1}\n"
+            )
+            for row in cam_to_world_mat:
+                log_file.write(" ".join(map(str, row)) + "\n")
+    return ofp
+
+
+def write_instant_ngp_file(reconstruction, odp):
+    """Write the cameras as :code:`Instant-NGP` (:code:`.json`) file.
+
+    :code:`Instant-NGP` shares the intrinsics between all frames, i.e. only
+    the first intrinsic of the reconstruction is written.
+    """
+    _get_image_dp(odp)
+    ofp = os.path.join(odp, "transforms.json")
+    calibration_mat = reconstruction.calibration_mats[0]
+    width = reconstruction.width
+    height = reconstruction.height
+    fl_x = float(calibration_mat[0, 0])
+    fl_y = float(calibration_mat[1, 1])
+    cam_to_world_mats = _get_cam_to_world_mats(reconstruction)
+    # Computer graphics convention (see parse_instant_ngp_json_file())
+    cam_to_world_mats[:, 0:3, 0:3] = invert_y_and_z_axis(
+        reconstruction.rotation_mats, axis=1
+    ).transpose(0, 2, 1)
+    json_data = {
+        "camera_angle_x": math.atan(width / (fl_x * 2)) * 2,
+        "camera_angle_y": math.atan(height / (fl_y * 2)) * 2,
+        "fl_x": fl_x,
+        "fl_y": fl_y,
+        "cx": float(calibration_mat[0, 2]),
+        "cy": float(calibration_mat[1, 2]),
+        "w": width,
+        "h": height,
+        "frames": [
+            {
+                "file_path": image_name,
+                "transform_matrix": cam_to_world_mat.tolist(),
+            }
+            for image_name, cam_to_world_mat in zip(
+                reconstruction.image_names, cam_to_world_mats
+            )
+        ],
+    }
+    with open(ofp, "w") as json_file:
+        json.dump(json_data, json_file)
+    return ofp
+
+
+def write_ply_file(reconstruction, odp):
+    """Write the points as binary :code:`.ply` file."""
+    os.makedirs(odp, exist_ok=True)
+    ofp = os.path.join(odp, "points.ply")
+    vertices = np.empty(
+        reconstruction.get_num_points(),
+        dtype=[
+            ("x", "<f4"),
+            ("y", "<f4"),
+            ("z", "<f4"),
+            ("red", "u1"),
+            ("green", "u1"),
+            ("blue", "u1"),
+        ],
+    )
+    for axis, name in enumerate(["x", "y", "z"]):
+        vertices[name] = reconstruction.point_coords[:, axis]
+    for channel, name in enumerate(["red", "green", "blue"]):
+        vertices[name] = reconstruction.point_colors[:, channel]
+    header = "\n".join(
+        [
+            "ply",
+            "format binary_little_endian 1.0",
+            f"element vertex {len(vertices)}",
+            "property float x",
+            "property float y",
+            "property float z",
+            "property uchar red",
+            "property uchar green",
+            "property uchar blue",
+            "end_header",
+        ]
+    )
+    with open(ofp, "wb") as ply_file:
+        ply_file.write((header + "\n").encode())
+        vertices.tofile(ply_file)
+    return ofp
+
+
+def write_asc_file(reconstruction, odp):
+    """Write the points as :code:`.asc` file (with header)."""
+    os.makedirs(odp, exist_ok=True)
+    ofp = os.path.join(odp, "points.asc")
+    data = np.hstack(
+        [reconstruction.point_coords, reconstruction.point_colors]
+    )
+    np.savetxt(
+        ofp,
+        data,
+        fmt=["%.6f", "%.6f", "%.6f", "%d", "%d", "%d"],
+        header="//X Y Z R G B",
+        comments="",
+    )
+    return ofp
+
+
+def write_las_file(reconstruction, odp):
+    """Write the points as :code:`.las` file (requires :code:`laspy`)."""
+    import laspy
+
+    os.makedirs(odp, exist_ok=True)
+    ofp = os.path.join(odp, "points.las")
+    header = laspy.LasHeader(point_format=2, version="1.2")
+    header.scales = np.array([0.0001, 0.0001, 0.0001])
+    header.offsets = np.min(reconstruction.point_coords, axis=0)
+    las_data = laspy.LasData(header)
+    las_data.x = reconstruction.point_coords[:, 0]
+    las_data.y = reconstruction.point_coords[:, 1]
+    las_data.z = reconstruction.point_coords[:, 2]
+    # LAS stores 16 bit colors
+    colors = reconstruction.point_colors.astype(np.uint16) * 256
+    las_data.red = colors[:, 0]
+    las_data.green = colors[:, 1]
+    las_data.blue = colors[:, 2]
+    las_data.write(ofp)
+    return ofp
@@ -0,0 +1,187 @@
+"""Measure the throughput of images sent through the pipe of a subprocess.
+
+Run :code:`python -m benchmarks.pipe_communication` (from the repository
+root). A child process writes float images to its stdout, which are read by
+this process with
+
+- :code:`raw`: plain reads into a preallocated buffer (i.e. the bandwidth of
+  the pipe),
+- :code:`framed`: the frames of :code:`pipe_communication` and
+- :code:`line_scanning`: marker lines around :code:`np.save()` output
+  (the previous protocol of :code:`pipe_communication`).
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from photogrammetry_importer.process_communication.pipe_communication import (
+    read_np_array_frame,
+    write_np_array_frame,
+)
+
+TRANSPORTS = ["raw", "framed", "line_scanning"]
+_START_MARKER = b"_serialized_numpy_array_start_\n"
+_END_MARKER = b"_serialized_numpy_array_end_\n"
+
+
+def _create_image(width, height, num_channels):
+    return np.random.default_rng(0).random(
+        (height, width, num_channels), dtype=np.float32
+    )
+
+
+def _write_images(transport, image, num_images, output_stream):
+    for _ in range(num_images):
+        if transport == "raw":
+            output_stream.write(memoryview(image).cast("B"))
+        elif transport == "framed":
+            write_np_array_frame(output_stream, image)
+        else:
+            memory_file = io.BytesIO()
+            np.save(memory_file, image)
+            output_stream.write(_START_MARKER)
+            output_stream.write(memory_file.getvalue() + b"\n")
+            output_stream.write(_END_MARKER)
+    output_stream.flush()
+
+
+def _read_image(transport, input_stream, out):
+    if transport == "raw":
+        byte_view = memoryview(out).cast("B")
+        num_bytes_read = 0
+        while num_bytes_read < len(byte_view):
+            num_bytes = input_stream.readinto(byte_view[num_bytes_read:])
+            if not num_bytes:
+                raise EOFError("Stream closed")
+            num_bytes_read += num_bytes
+        return out
+    if transport == "framed":
+        return read_np_array_frame(input_stream, out)[0]
+    lines = []
+    while True:
+        line = input_stream.readline()
+        if not line:
+            raise EOFError("Stream closed")
+        if line == _END_MARKER:
+            break
+        lines.append(line)
+    assert lines[0] == _START_MARKER
+    # Binary data may contain line breaks, i.e. the lines must be joined
+    return np.load(io.BytesIO(b"".join(lines[1:])))
+
+
+def measure_pipe_throughput(
+    transport, width=1920, height=1080, num_channels=4, num_images=20
+):
+    """Send images from a child process and return the achieved throughput.
+
+    The first image is not measured, since it includes starting the child.
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {transport}")
+    image_shape = (height, width, num_channels)
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.pipe_communication",
+        "--write",
+        transport,
+        "--width",
+        str(width),
+        "--height",
+        str(height),
+        "--num-channels",
+        str(num_channels),
+        "--num-images",
+        str(num_images + 1),
+    ]
+    repository_dp = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, cwd=repository_dp
+    )
+    try:
+        out = np.empty(image_shape, dtype=np.float32)
+        _read_image(transport, process.stdout, out)
+        start = time.perf_counter()
+        for _ in range(num_images):
+            image = _read_image(transport, process.stdout, out)
+        elapsed = time.perf_counter() - start
+    finally:
+        process.stdout.close()
+        process.wait()
+    assert image.shape == image_shape
+    num_bytes = num_images * out.nbytes
+    return {
+        "transport": transport,
+        "image_shape": list(image_shape),
+        "num_images": num_images,
+        "time": elapsed,
+        "megabytes_per_second": num_bytes / elapsed / 1e6,
+        "images_per_second": num_images / elapsed,
+    }
+
+
+def _parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.pipe_communication",
+        description="Measure the throughput of images sent through pipes.",
+    )
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--num-channels", type=int, default=4)
+    parser.add_argument("--num-images", type=int, default=20)
+    parser.add_argument(
+        "--transports", nargs="+", choices=TRANSPORTS, default=TRANSPORTS
+    )
+    parser.add_argument("--output", help="Write the results to this file")
+    # Used by the child process
+    parser.add_argument("--write", choices=TRANSPORTS, help=argparse.SUPPRESS)
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Run the benchmark and return the exit code."""
+    args = _parse_args(args)
+    if args.write is not None:
+        image = _create_image(args.width, args.height, args.num_channels)
+        try:
+            _write_images(
+                args.write, image, args.num_images, sys.stdout.buffer
+            )
+        except BrokenPipeError:
+            return 1
+        return 0
+
+    results = [
+        measure_pipe_throughput(
+            transport,
+            args.width,
+            args.height,
+            args.num_channels,
+            args.num_images,
+        )
+        for transport in args.transports
+    ]
+    for result in results:
+        print(
+            "{:<14} {:>9.1f} MB/s {:>8.1f} images/s".format(
+                result["transport"],
+                result["megabytes_per_second"],
+                result["images_per_second"],
+            )
+        )
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(results, json_file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
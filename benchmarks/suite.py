@@ -0,0 +1,461 @@
+import gc
+import importlib
+import json
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from photogrammetry_importer.file_handlers.colmap_file_handler import (
+    ColmapFileHandler,
+)
+from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
+    InstantNGPFileHandler,
+)
+from photogrammetry_importer.file_handlers.meshroom_file_handler import (
+    MeshroomFileHandler,
+)
+from photogrammetry_importer.file_handlers.open3D_file_handler import (
+    Open3DFileHandler,
+)
+from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
+    OpenMVGJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.opensfm_json_file_handler import (
+    OpenSfMJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.point_data_file_handler import (
+    PointDataFileHandler,
+)
+from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
+    VisualSfMFileHandler,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.visibility_index import VisibilityIndex
+from photogrammetry_importer.utility.outlier_utility import (
+    compute_statistical_inlier_mask,
+)
+from photogrammetry_importer.utility.quaternion_utility import (
+    quaternions_to_rotation_matrices,
+    rotation_matrices_to_quaternions,
+)
+from photogrammetry_importer.utility.voxel_utility import (
+    downsample_with_voxel_grid,
+)
+
+from benchmarks import format_writers
+
+_IMAGE_FP_TYPE = Camera.IMAGE_FP_TYPE_NAME
+
+
+class BenchmarkCase:
+    """This class represents a single benchmark.
+
+    File handler benchmarks write the synthetic reconstruction once (with
+    :code:`write_input`) and measure :code:`run`, which receives the written
+    path. Converter benchmarks have no :code:`write_input` and :code:`run`
+    receives the reconstruction itself.
+    """
+
+    def __init__(
+        self,
+        name,
+        run,
+        get_num_items,
+        item_type,
+        write_input=None,
+        required_modules=None,
+    ):
+        self.name = name
+        self.run = run
+        self.get_num_items = get_num_items
+        self.item_type = item_type
+        self.write_input = write_input
+        self.required_modules = required_modules or []
+
+    def get_missing_modules(self):
+        """Return the required modules that are not installed."""
+        return [
+            module_name
+            for module_name in self.required_modules
+            if importlib.util.find_spec(module_name) is None
+        ]
+
+
+def _get_num_points(reconstruction):
+    return reconstruction.get_num_points()
+
+
+def _get_num_cameras(reconstruction):
+    return reconstruction.get_num_cameras()
+
+
+def _get_num_depth_values(reconstruction):
+    map_width, map_height = reconstruction.depth_map_size
+    return reconstruction.get_num_cameras() * map_width * map_height
+
+
+def _parse_colmap(idp):
+    return ColmapFileHandler.parse_colmap_folder(
+        idp,
+        use_workspace_images=False,
+        image_dp=os.path.join(idp, "images"),
+        image_fp_type=_IMAGE_FP_TYPE,
+        suppress_distortion_warnings=True,
+    )
+
+
+def _parse_colmap_depth_maps(idp):
+    cameras, _, _ = _parse_colmap(idp)
+    return [
+        camera.convert_depth_map_to_world_coords(depth_map_display_sparsity=1)
+        for camera in cameras
+    ]
+
+
+def _get_image_dp(ifp):
+    return os.path.join(os.path.dirname(ifp), "images")
+
+
+def get_file_handler_cases():
+    """Return the benchmarks of the file handlers."""
+    return [
+        BenchmarkCase(
+            "parse_colmap_bin",
+            _parse_colmap,
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_colmap_workspace,
+        ),
+        BenchmarkCase(
+            "parse_colmap_txt",
+            _parse_colmap,
+            _get_num_points,
+            "points",
+            write_input=lambda reconstruction, odp: (
+                format_writers.write_colmap_workspace(
+                    reconstruction, odp, ext=".txt"
+                )
+            ),
+        ),
+        BenchmarkCase(
+            "read_colmap_depth_maps",
+            _parse_colmap_depth_maps,
+            _get_num_depth_values,
+            "depth values",
+            write_input=format_writers.write_colmap_workspace,
+        ),
+        BenchmarkCase(
+            "parse_nvm",
+            lambda ifp: VisualSfMFileHandler.parse_visualsfm_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, True
+            ),
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_nvm_file,
+        ),
+        BenchmarkCase(
+            "parse_meshroom_sfm",
+            lambda ifp: MeshroomFileHandler.parse_meshroom_sfm_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, True
+            ),
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_meshroom_sfm_file,
+        ),
+        BenchmarkCase(
+            "parse_opensfm",
+            lambda ifp: OpenSfMJSONFileHandler.parse_opensfm_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, 0, True
+            ),
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_opensfm_file,
+        ),
+        BenchmarkCase(
+            "parse_openmvg",
+            lambda ifp: OpenMVGJSONFileHandler.parse_openmvg_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, True
+            ),
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_openmvg_file,
+        ),
+        BenchmarkCase(
+            "parse_open3d_json",
+            lambda ifp: Open3DFileHandler.parse_open3d_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, None
+            ),
+            _get_num_cameras,
+            "cameras",
+            write_input=format_writers.write_open3d_json_file,
+        ),
+        BenchmarkCase(
+            "parse_open3d_log",
+            lambda ifp: Open3DFileHandler.parse_open3d_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, None
+            ),
+            _get_num_cameras,
+            "cameras",
+            write_input=format_writers.write_open3d_log_file,
+        ),
+        BenchmarkCase(
+            "parse_instant_ngp",
+            lambda ifp: InstantNGPFileHandler.parse_instant_ngp_json_file(
+                ifp, _get_image_dp(ifp), _IMAGE_FP_TYPE, True
+            ),
+            _get_num_cameras,
+            "cameras",
+            write_input=format_writers.write_instant_ngp_file,
+        ),
+        BenchmarkCase(
+            "parse_ply",
+            PointDataFileHandler.parse_point_data_file,
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_ply_file,
+            required_modules=["pyntcloud"],
+        ),
+        BenchmarkCase(
+            "parse_asc",
+            PointDataFileHandler.parse_point_data_file,
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_asc_file,
+            required_modules=["pyntcloud"],
+        ),
+        BenchmarkCase(
+            "parse_las",
+            PointDataFileHandler.parse_point_data_file,
+            _get_num_points,
+            "points",
+            write_input=format_writers.write_las_file,
+            required_modules=["pyntcloud", "laspy"],
+        ),
+    ]
+
+
+def get_converter_cases():
+    """Return the benchmarks of the (pure NumPy) converters."""
+    return [
+        BenchmarkCase(
+            "quaternions_to_rotation_matrices",
+            lambda reconstruction: quaternions_to_rotation_matrices(
+                reconstruction.get_quaternions()
+            ),
+            _get_num_cameras,
+            "cameras",
+        ),
+        BenchmarkCase(
+            "rotation_matrices_to_quaternions",
+            lambda reconstruction: rotation_matrices_to_quaternions(
+                reconstruction.rotation_mats
+            ),
+            _get_num_cameras,
+            "cameras",
+        ),
+        BenchmarkCase(
+            "camera_batch_to_cameras",
+            lambda reconstruction: reconstruction.to_cameras(
+                "", _IMAGE_FP_TYPE
+            ),
+            _get_num_cameras,
+            "cameras",
+        ),
+        BenchmarkCase(
+            "compute_matrix_worlds",
+            lambda reconstruction: reconstruction.to_camera_batch(
+                "", _IMAGE_FP_TYPE
+            ).compute_matrix_worlds(),
+            _get_num_cameras,
+            "cameras",
+        ),
+        BenchmarkCase(
+            "visibility_index_from_observations",
+            lambda reconstruction: VisibilityIndex.from_observations(
+                reconstruction.track_camera_indices,
+                np.repeat(
+                    np.arange(reconstruction.get_num_points()),
+                    reconstruction.get_track_lengths(),
+                ),
+                num_cameras=reconstruction.get_num_cameras(),
+            ),
+            _get_num_points,
+            "points",
+        ),
+        BenchmarkCase(
+            "voxel_downsampling",
+            lambda reconstruction: downsample_with_voxel_grid(
+                reconstruction.point_coords,
+                reconstruction.point_colors,
+                voxel_size=0.1,
+            ),
+            _get_num_points,
+            "points",
+        ),
+        BenchmarkCase(
+            "statistical_outlier_removal",
+            lambda reconstruction: compute_statistical_inlier_mask(
+                reconstruction.point_coords
+            ),
+            _get_num_points,
+            "points",
+        ),
+    ]
+
+
+def get_benchmark_cases():
+    """Return all benchmark cases."""
+    return get_file_handler_cases() + get_converter_cases()
+
+
+def _get_size_in_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for dp, _, fns in os.walk(path):
+        for fn in fns:
+            size += os.path.getsize(os.path.join(dp, fn))
+    return size
+
+
+def run_benchmark_case(case, reconstruction, work_dp, repetitions=3):
+    """Run a benchmark case and return the result as dictionary.
+
+    The wall time is the minimum over the repetitions. The peak memory is
+    measured (with :code:`tracemalloc`) in an additional run, since tracing
+    the allocations slows down the execution.
+    """
+    result = {"name": case.name, "item_type": case.item_type}
+    missing_modules = case.get_missing_modules()
+    if missing_modules:
+        result["skipped"] = "Missing modules: " + ", ".join(missing_modules)
+        return result
+    if case.write_input is not None:
+        case_input = case.write_input(
+            reconstruction, os.path.join(work_dp, case.name)
+        )
+        num_bytes = _get_size_in_bytes(case_input)
+    else:
+        case_input = reconstruction
+        num_bytes = None
+
+    wall_times = []
+    for _ in range(repetitions):
+        gc.collect()
+        start_time = time.perf_counter()
+        case.run(case_input)
+        wall_times.append(time.perf_counter() - start_time)
+    wall_time = min(wall_times)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(case_input)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    num_items = case.get_num_items(reconstruction)
+    result["wall_time"] = wall_time
+    result["num_items"] = num_items
+    result["items_per_second"] = num_items / max(wall_time, 1e-12)
+    if num_bytes is not None:
+        result["num_bytes"] = num_bytes
+        result["megabytes_per_second"] = (
+            num_bytes / 2**20 / max(wall_time, 1e-12)
+        )
+    result["peak_memory"] = peak_memory
+    return result
+
+
+def run_benchmark_cases(cases, reconstruction, work_dp, repetitions=3):
+    """Run the benchmark cases and return a list of result dictionaries."""
+    return [
+        run_benchmark_case(case, reconstruction, work_dp, repetitions)
+        for case in cases
+    ]
+
+
+def read_baselines(ifp):
+    """Read the baseline results (a dictionary with the case names as keys)."""
+    with open(ifp, "r") as json_file:
+        return json.load(json_file)
+
+
+def write_baselines(ofp, results, metadata=None):
+    """Write the results as baselines."""
+    baselines = {
+        "metadata": metadata or {},
+        "results": {
+            result["name"]: result
+            for result in results
+            if "skipped" not in result
+        },
+    }
+    with open(ofp, "w") as json_file:
+        json.dump(baselines, json_file, indent=4)
+
+
+def compare_with_baselines(results, baselines, max_slowdown=1.25):
+    """Compare the results with the baselines.
+
+    Return a list of :code:`(name, baseline_time, wall_time, ratio)` tuples
+    of the cases, which are slower than the baseline by more than the factor
+    :code:`max_slowdown`.
+    """
+    baseline_results = baselines["results"]
+    regressions = []
+    for result in results:
+        baseline = baseline_results.get(result["name"])
+        if baseline is None or "skipped" in result:
+            continue
+        ratio = result["wall_time"] / max(baseline["wall_time"], 1e-12)
+        if ratio > max_slowdown:
+            regressions.append(
+                (
+                    result["name"],
+                    baseline["wall_time"],
+                    result["wall_time"],
+                    ratio,
+                )
+            )
+    return regressions
+
+
+def get_result_lines(results, baselines=None):
+    """Return a human readable table of the results."""
+    baseline_results = {} if baselines is None else baselines["results"]
+    lines = [
+        "{:<36} {:>10} {:>14} {:>10} {:>12} {:>10}".format(
+            "Benchmark", "Time [s]", "Items/s", "MB/s", "Peak [MB]", "Baseline"
+        )
+    ]
+    for result in results:
+        if "skipped" in result:
+            lines.append(f"{result['name']:<36} skipped ({result['skipped']})")
+            continue
+        megabytes_per_second = result.get("megabytes_per_second")
+        baseline = baseline_results.get(result["name"])
+        lines.append(
+            "{:<36} {:>10.4f} {:>14.0f} {:>10} {:>12.1f} {:>10}".format(
+                result["name"],
+                result["wall_time"],
+                result["items_per_second"],
+                (
+                    "-"
+                    if megabytes_per_second is None
+                    else f"{megabytes_per_second:.1f}"
+                ),
+                result["peak_memory"] / 2**20,
+                (
+                    "-"
+                    if baseline is None
+                    else "{:.2f}x".format(
+                        result["wall_time"] / max(baseline["wall_time"], 1e-12)
+                    )
+                ),
+            )
+        )
+    return lines
@@ -0,0 +1,254 @@
+import numpy as np
+
+from photogrammetry_importer.types.camera_batch import CameraBatch
+from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.utility.quaternion_utility import (
+    rotation_matrices_to_quaternions,
+)
+
+
+class SyntheticReconstruction:
+    """This class represents a synthetic reconstruction as arrays.
+
+    The cameras are placed on a ring around the scene and look at the origin.
+    Each point is observed by a track of consecutive cameras. All attributes
+    are stored as numpy arrays, so that reconstructions with millions of
+    points can be generated in a few seconds.
+    """
+
+    def __init__(
+        self,
+        rotation_mats,
+        centers,
+        calibration_mats,
+        intrinsic_indices,
+        width,
+        height,
+        point_coords,
+        point_colors,
+        point_errors,
+        track_offsets,
+        track_camera_indices,
+        depth_map_size=None,
+    ):
+        self.rotation_mats = rotation_mats
+        self.centers = centers
+        self.calibration_mats = calibration_mats
+        self.intrinsic_indices = intrinsic_indices
+        self.width = width
+        self.height = height
+        self.point_coords = point_coords
+        self.point_colors = point_colors
+        self.point_errors = point_errors
+        # The cameras observing point i are
+        # track_camera_indices[track_offsets[i]:track_offsets[i + 1]]
+        self.track_offsets = track_offsets
+        self.track_camera_indices = track_camera_indices
+        self.depth_map_size = depth_map_size
+        self.image_names = [
+            f"image_{index:06d}.jpg" for index in range(len(rotation_mats))
+        ]
+        self._observations = None
+
+    def get_num_cameras(self):
+        """Return the number of cameras."""
+        return len(self.rotation_mats)
+
+    def get_num_points(self):
+        """Return the number of points."""
+        return len(self.point_coords)
+
+    def get_num_observations(self):
+        """Return the number of observations of all points."""
+        return len(self.track_camera_indices)
+
+    def get_track_lengths(self):
+        """Return the (N,) track lengths of the points."""
+        return np.diff(self.track_offsets)
+
+    def get_translation_vecs(self):
+        """Return the (N, 3) translation vectors (t = -R C)."""
+        return -np.einsum("nij,nj->ni", self.rotation_mats, self.centers)
+
+    def get_quaternions(self):
+        """Return the (N, 4) rotations as quaternions in (w, x, y, z)."""
+        return rotation_matrices_to_quaternions(self.rotation_mats)
+
+    def get_calibration_mats(self):
+        """Return the (N, 3, 3) calibration matrices of all cameras."""
+        return self.calibration_mats[self.intrinsic_indices]
+
+    def get_observations(self):
+        """Return the observations of all points.
+
+        The result contains the point indices, the camera indices, the
+        feature indices (i.e. the index of the observation in the list of
+        observations of the corresponding camera) and the (N, 2) pixel
+        coordinates of the observations.
+        """
+        if self._observations is None:
+            point_indices = np.repeat(
+                np.arange(self.get_num_points()), self.get_track_lengths()
+            )
+            camera_indices = self.track_camera_indices
+            # Rank of each observation within the observations of its camera
+            order = np.argsort(camera_indices, kind="stable")
+            counts = np.bincount(
+                camera_indices, minlength=self.get_num_cameras()
+            )
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            feature_indices = np.empty_like(order)
+            feature_indices[order] = np.arange(len(order)) - np.repeat(
+                starts, counts
+            )
+            cam_coords = np.einsum(
+                "nij,nj->ni",
+                self.rotation_mats[camera_indices],
+                self.point_coords[point_indices]
+                - self.centers[camera_indices],
+            )
+            pixel_coords = np.einsum(
+                "nij,nj->ni",
+                self.get_calibration_mats()[camera_indices],
+                cam_coords,
+            )
+            pixel_coords = pixel_coords[:, 0:2] / pixel_coords[:, 2:3]
+            self._observations = (
+                point_indices,
+                camera_indices,
+                feature_indices,
+                pixel_coords,
+            )
+        return self._observations
+
+    def compute_depth_map(self, camera_index):
+        """Return a synthetic (float32) depth map of a camera.
+
+        The depth map represents a slanted plane behind the scene center.
+        """
+        map_width, map_height = self.depth_map_size
+        distance = np.linalg.norm(self.centers[camera_index])
+        x_values = np.linspace(-1.0, 1.0, map_width, dtype=np.float32)
+        y_values = np.linspace(-1.0, 1.0, map_height, dtype=np.float32)
+        return (
+            distance + 0.25 * x_values[np.newaxis, :] + y_values[:, np.newaxis]
+        ).astype(np.float32)
+
+    def to_camera_batch(self, image_dp, image_fp_type):
+        """Return the cameras as :code:`CameraBatch`."""
+        return CameraBatch(
+            self.rotation_mats,
+            self.centers,
+            self.calibration_mats,
+            widths=np.full(len(self.calibration_mats), self.width),
+            heights=np.full(len(self.calibration_mats), self.height),
+            intrinsic_indices=self.intrinsic_indices,
+            relative_fps=self.image_names,
+            image_dp=image_dp,
+            image_fp_type=image_fp_type,
+        )
+
+    def to_cameras(self, image_dp, image_fp_type):
+        """Return the cameras as list of :code:`Camera` objects."""
+        return self.to_camera_batch(image_dp, image_fp_type).to_cameras()
+
+    def to_points(self):
+        """Return the points as list of :code:`Point` objects."""
+        return [
+            Point(coord=coord, color=color, id=index, scalars=None)
+            for index, (coord, color) in enumerate(
+                zip(self.point_coords, self.point_colors)
+            )
+        ]
+
+
+def _compute_look_at_rotation_mats(centers, target=None):
+    # Computer vision convention: x right, y down, z forward
+    if target is None:
+        target = np.zeros(3)
+    z_axes = target - centers
+    z_axes /= np.linalg.norm(z_axes, axis=1, keepdims=True)
+    up = np.array([0.0, 0.0, 1.0])
+    x_axes = np.cross(z_axes, up)
+    x_axes /= np.linalg.norm(x_axes, axis=1, keepdims=True)
+    y_axes = np.cross(z_axes, x_axes)
+    # The rows of the (world to camera) rotation are the camera axes
+    return np.stack([x_axes, y_axes, z_axes], axis=1)
+
+
+def generate_synthetic_reconstruction(
+    num_cameras=100,
+    num_points=10000,
+    mean_track_length=4,
+    num_intrinsics=1,
+    width=1920,
+    height=1080,
+    depth_map_size=None,
+    seed=0,
+):
+    """Generate a synthetic reconstruction with the given scale.
+
+    The track lengths follow a (shifted) Poisson distribution with the given
+    mean, but are at least 2 and at most :code:`num_cameras`. If
+    :code:`depth_map_size` (a tuple of width and height) is provided, the
+    writers of the dense workspaces add a depth map for each camera.
+    """
+    assert num_cameras >= 2
+    rng = np.random.default_rng(seed)
+
+    angles = np.linspace(0.0, 2.0 * np.pi, num_cameras, endpoint=False)
+    radius = 10.0
+    centers = np.stack(
+        [
+            radius * np.cos(angles),
+            radius * np.sin(angles),
+            rng.uniform(-0.5, 0.5, num_cameras),
+        ],
+        axis=1,
+    )
+    rotation_mats = _compute_look_at_rotation_mats(centers)
+
+    focal_lengths = np.linspace(1.0, 1.2, num_intrinsics) * max(width, height)
+    calibration_mats = np.zeros((num_intrinsics, 3, 3), dtype=float)
+    calibration_mats[:, 0, 0] = focal_lengths
+    calibration_mats[:, 1, 1] = focal_lengths
+    calibration_mats[:, 0, 2] = width / 2.0
+    calibration_mats[:, 1, 2] = height / 2.0
+    calibration_mats[:, 2, 2] = 1.0
+    intrinsic_indices = np.arange(num_cameras) % num_intrinsics
+
+    # Keep the points within the field of view of all cameras
+    point_coords = np.clip(
+        rng.normal(scale=0.75, size=(num_points, 3)), -1.5, 1.5
+    )
+    point_colors = rng.integers(0, 256, size=(num_points, 3), dtype=np.uint8)
+    point_errors = rng.exponential(0.5, size=num_points)
+
+    # Each track consists of consecutive cameras (on the ring)
+    track_lengths = 2 + rng.poisson(
+        max(mean_track_length - 2, 0), size=num_points
+    )
+    track_lengths = np.minimum(track_lengths, num_cameras)
+    track_offsets = np.concatenate([[0], np.cumsum(track_lengths)])
+    track_starts = rng.integers(0, num_cameras, size=num_points)
+    positions_in_track = np.arange(track_offsets[-1]) - np.repeat(
+        track_offsets[:-1], track_lengths
+    )
+    track_camera_indices = (
+        np.repeat(track_starts, track_lengths) + positions_in_track
+    ) % num_cameras
+
+    return SyntheticReconstruction(
+        rotation_mats=rotation_mats,
+        centers=centers,
+        calibration_mats=calibration_mats,
+        intrinsic_indices=intrinsic_indices,
+        width=width,
+        height=height,
+        point_coords=point_coords,
+        point_colors=point_colors,
+        point_errors=point_errors,
+        track_offsets=track_offsets,
+        track_camera_indices=track_camera_indices,
+        depth_map_size=depth_map_size,
+    )
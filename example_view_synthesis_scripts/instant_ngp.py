@@ -47,6 +47,13 @@ def create_args_parser():
     )
 
     # For communication with parent process
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the snapshot loaded and answer render requests of the"
+        " parent process (see"
+        " photogrammetry_importer.process_communication.view_synthesis_worker)",
+    )
     parser.add_argument(
         "--temp_json_ifp", default="", help="Path to the temporary json file."
     )
@@ -145,7 +152,10 @@ def post_process_image(img):
 def create_single_screenshot(testbed, args):
     with open(args.temp_json_ifp) as f:
         ref_transforms = json.load(f)
+    return create_screenshot(testbed, ref_transforms, args.samples_per_pixel)
 
+
+def create_screenshot(testbed, ref_transforms, samples_per_pixel):
     print("ref_transforms")
     print(ref_transforms)
 
@@ -166,7 +176,7 @@ def create_single_screenshot(testbed, args):
     image = testbed.render(
         int(ref_transforms["w"]),
         int(ref_transforms["h"]),
-        args.samples_per_pixel,
+        samples_per_pixel,
         True,
     )
     image = post_process_image(image)
@@ -177,6 +187,15 @@ if __name__ == "__main__":
     parser = create_args_parser()
     args = parser.parse_args()
 
+    if args.serve:
+        # Requires the addon in the PYTHONPATH (provided by the parent
+        # process). Create the channel before any output is written.
+        from photogrammetry_importer.process_communication.view_synthesis_worker import (
+            WorkerChannel,
+        )
+
+        channel = WorkerChannel.from_stdio()
+
     for system_dp in args.additional_system_dps:
         assert os.path.isdir(system_dp)
         sys.path.append(system_dp)
@@ -190,5 +209,15 @@ if __name__ == "__main__":
 
     testbed.load_snapshot(args.load_snapshot)
     configure_testbed(testbed, args)
-    img_np_array = create_single_screenshot(testbed, args)
-    write_np_array_to_file(img_np_array, args.temp_array_ofp, use_pickle=False)
+    if args.serve:
+        channel.serve(
+            lambda ref_transforms, samples_per_pixel: create_screenshot(
+                testbed, ref_transforms, samples_per_pixel
+            ),
+            worker_info={"snapshot": args.load_snapshot},
+        )
+    else:
+        img_np_array = create_single_screenshot(testbed, args)
+        write_np_array_to_file(
+            img_np_array, args.temp_array_ofp, use_pickle=False
+        )
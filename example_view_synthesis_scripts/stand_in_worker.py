@@ -0,0 +1,79 @@
+"""Stand-in view synthesis worker (e.g. to test the worker protocol).
+
+Renders a gradient image instead of running a neural radiance field, but
+behaves like :code:`instant_ngp.py --serve` otherwise. The parent process
+must provide the addon in the :code:`PYTHONPATH`.
+"""
+
+import argparse
+import time
+import numpy as np
+
+from photogrammetry_importer.process_communication.view_synthesis_worker import (
+    WorkerChannel,
+)
+
+
+def create_args_parser():
+    parser = argparse.ArgumentParser(
+        description="Stand-in view synthesis worker"
+    )
+    parser.add_argument("--load_snapshot", "--snapshot", default="")
+    parser.add_argument(
+        "--startup_delay",
+        type=float,
+        default=0.0,
+        help="Simulates the time required to load the snapshot.",
+    )
+    parser.add_argument(
+        "--crash_after",
+        type=int,
+        default=None,
+        help="Terminate (without answering) when receiving this request.",
+    )
+    parser.add_argument(
+        "--hang_after",
+        type=int,
+        default=None,
+        help="Stop responding when receiving this request.",
+    )
+    # Accepted for compatibility with the instant_ngp.py arguments
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--samples_per_pixel", type=int, default=1)
+    parser.add_argument("--additional_system_dps", nargs="+", default="")
+    parser.add_argument("--additional_output_dp", default="")
+    return parser
+
+
+def render_gradient(camera_json_data, samples_per_pixel):
+    width = int(camera_json_data["w"])
+    height = int(camera_json_data["h"])
+    cam_matrix = np.array(camera_json_data["frames"][0]["transform_matrix"])
+    image = np.ones((height, width, 4), dtype=np.float32)
+    image[..., 0] = np.linspace(0, 1, width, dtype=np.float32)[np.newaxis]
+    image[..., 1] = np.linspace(0, 1, height, dtype=np.float32)[:, np.newaxis]
+    image[..., 2] = np.tanh(np.abs(cam_matrix[0:3, 3]).sum())
+    return image
+
+
+if __name__ == "__main__":
+    args = create_args_parser().parse_args()
+    channel = WorkerChannel.from_stdio()
+    print(f"Loading snapshot {args.load_snapshot}")
+    time.sleep(args.startup_delay)
+
+    num_requests = 0
+
+    def render_function(camera_json_data, samples_per_pixel):
+        global num_requests
+        num_requests += 1
+        if num_requests == args.crash_after:
+            raise SystemExit(1)
+        if num_requests == args.hang_after:
+            time.sleep(3600)
+        print(f"Render request {num_requests}")
+        return render_gradient(camera_json_data, samples_per_pixel)
+
+    channel.serve(
+        render_function, worker_info={"snapshot": args.load_snapshot}
+    )
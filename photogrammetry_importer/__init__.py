@@ -4,6 +4,8 @@ A Blender addon to import different photogrammetry formats.
 Subpackage Summary
 ------------------
 
+conversion
+    Blender-independent batch conversion of reconstructions.
 ext
     External dependencies.
 file_handlers
@@ -39,48 +41,66 @@ bl_info = {
     "category": "Import-Export",
 }
 
-import bpy
+try:
+    import bpy
+except ImportError:
+    # The Blender-independent modules (e.g. the file handlers) can also be
+    # used outside of Blender, for example to run the unit tests.
+    bpy = None
 
-# load and reload submodules
-############################
+if bpy is not None:
+    # load and reload submodules
+    ############################
 
-import importlib
-from .utility import developer_utility
+    import importlib
+    from .utility import developer_utility
 
-importlib.reload(developer_utility)
-modules = developer_utility.setup_addon_modules(
-    __path__, __name__, "bpy" in locals()
-)
-
-# The root dir is Blenders addon folder.
-# Therefore, we need the "photogrammetry_importer" specifier for this addon
-from photogrammetry_importer.blender_utility.logging_utility import log_report
+    importlib.reload(developer_utility)
+    modules = developer_utility.setup_addon_modules(
+        __path__, __name__, "bpy" in locals()
+    )
 
-from photogrammetry_importer.preferences.addon_preferences import (
-    AddonPreferences,
-)
+    # The root dir is Blenders addon folder. Therefore, we need the
+    # "photogrammetry_importer" specifier for this addon
+    from photogrammetry_importer.blender_utility.logging_utility import (
+        log_report,
+    )
 
-from photogrammetry_importer.registration.registration import Registration
+    from photogrammetry_importer.preferences.addon_preferences import (
+        AddonPreferences,
+    )
 
-from photogrammetry_importer.panels.view_3d_opengl_panel import OpenGLPanel
-from photogrammetry_importer.panels.view_3d_view_synthesis_panel import (
-    ViewSynthesisPanel,
-)
-from photogrammetry_importer.opengl.utility import redraw_points
-from photogrammetry_importer.preferences.dependency import (
-    add_command_line_sys_path_if_necessary,
-)
+    from photogrammetry_importer.registration.registration import Registration
 
-if bpy.app.version < bl_info["blender"]:
-    log_report(
-        "WARNING",
-        f"Detected Blender version {bpy.app.version} is older than required"
-        f" the required Blender version {bl_info['blender']}. This might lead"
-        " to potential bugs!",
+    from photogrammetry_importer.panels.view_3d_opengl_panel import OpenGLPanel
+    from photogrammetry_importer.panels.view_3d_view_synthesis_panel import (
+        ViewSynthesisPanel,
     )
+    from photogrammetry_importer.panels.view_3d_profiling_panel import (
+        ImportProfilePanel,
+    )
+    from photogrammetry_importer.opengl.handler_utility import redraw_points
+    from photogrammetry_importer.blender_utility.image_utility import (
+        collect_deferred_images,
+        load_visible_deferred_images,
+    )
+    from photogrammetry_importer.preferences.dependency import (
+        add_command_line_sys_path_if_necessary,
+    )
+
+    if bpy.app.version < bl_info["blender"]:
+        log_report(
+            "WARNING",
+            f"Detected Blender version {bpy.app.version} is older than"
+            f" required the required Blender version {bl_info['blender']}."
+            " This might lead to potential bugs!",
+        )
 
-bpy.app.handlers.load_post.append(redraw_points)
-bpy.app.handlers.load_post.append(add_command_line_sys_path_if_necessary)
+    bpy.app.handlers.load_post.append(redraw_points)
+    bpy.app.handlers.load_post.append(add_command_line_sys_path_if_necessary)
+    bpy.app.handlers.load_post.append(collect_deferred_images)
+    bpy.app.handlers.depsgraph_update_post.append(load_visible_deferred_images)
+    bpy.app.handlers.frame_change_post.append(load_visible_deferred_images)
 
 
 def register():
@@ -93,10 +113,15 @@ def register():
 
     bpy.utils.register_class(OpenGLPanel)
     bpy.utils.register_class(ViewSynthesisPanel)
+    bpy.utils.register_class(ImportProfilePanel)
 
+    # The remaining modules are imported on first use
+    num_modules = len(developer_utility.get_loaded_addon_modules(__name__))
     log_report(
         "INFO",
-        "Registered {} with {} modules".format(bl_info["name"], len(modules)),
+        "Registered {} with {} loaded modules".format(
+            bl_info["name"], num_modules
+        ),
     )
 
 
@@ -109,6 +134,7 @@ def unregister():
 
     bpy.utils.unregister_class(OpenGLPanel)
     bpy.utils.unregister_class(ViewSynthesisPanel)
+    bpy.utils.unregister_class(ImportProfilePanel)
 
     log_report("INFO", "Unregistered {}".format(bl_info["name"]))
 
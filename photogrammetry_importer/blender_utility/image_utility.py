@@ -1,5 +1,6 @@
 import os
 import bpy
+from bpy.app.handlers import persistent
 
 
 def save_image_to_disk(image_name, file_path, save_alpha=True):
@@ -41,3 +42,85 @@ def save_image_to_disk(image_name, file_path, save_alpha=True):
     settings.file_format = previous_file_format
     for key in previous_settings_dict:
         setattr(output_settings, key, previous_settings_dict[key])
+
+
+# Names of objects with an image that has not been loaded yet
+_deferred_image_object_names = set()
+
+
+def get_image_texture_node(material):
+    """Return the (first) image texture node of a material."""
+    if material is None or material.node_tree is None:
+        return None
+    for node in material.node_tree.nodes:
+        if node.type == "TEX_IMAGE":
+            return node
+    return None
+
+
+def defer_image_loading(obj, image_fp):
+    """Load the image of a camera or image plane once it becomes visible.
+
+    The image is assigned to the background image of a camera object (once
+    the camera becomes the active scene camera) or to the image texture
+    node of an image plane (once the image plane becomes visible).
+    """
+    obj["deferred_image_fp"] = image_fp
+    _deferred_image_object_names.add(obj.name)
+
+
+def load_deferred_image(obj):
+    """Load the deferred image of an object and return it."""
+    image_fp = obj.get("deferred_image_fp")
+    _deferred_image_object_names.discard(obj.name)
+    if image_fp is None:
+        return None
+    del obj["deferred_image_fp"]
+    if not os.path.isfile(image_fp):
+        return None
+    blender_image = bpy.data.images.load(image_fp, check_existing=True)
+    if obj.type == "CAMERA":
+        if len(obj.data.background_images) == 0:
+            background_image = obj.data.background_images.new()
+            background_image.frame_method = "CROP"
+        else:
+            background_image = obj.data.background_images[0]
+        background_image.image = blender_image
+    elif obj.type == "MESH":
+        # Image planes use materials linked to the object (not to the mesh)
+        texture_node = get_image_texture_node(obj.active_material)
+        if texture_node is not None:
+            texture_node.image = blender_image
+    return blender_image
+
+
+def _is_deferred_image_visible(obj, scene):
+    if obj.type == "CAMERA":
+        return scene.camera == obj
+    try:
+        return obj.visible_get()
+    except RuntimeError:
+        # The object is not part of the current view layer
+        return False
+
+
+@persistent
+def load_visible_deferred_images(scene, depsgraph=None):
+    """Load the deferred images of active cameras and visible image planes."""
+    if len(_deferred_image_object_names) == 0:
+        return
+    for obj_name in list(_deferred_image_object_names):
+        obj = bpy.data.objects.get(obj_name)
+        if obj is None or "deferred_image_fp" not in obj:
+            _deferred_image_object_names.discard(obj_name)
+        elif _is_deferred_image_visible(obj, scene):
+            load_deferred_image(obj)
+
+
+@persistent
+def collect_deferred_images(dummy):
+    """Collect the objects with deferred images of a loaded Blender file."""
+    _deferred_image_object_names.clear()
+    for obj in bpy.data.objects:
+        if "deferred_image_fp" in obj:
+            _deferred_image_object_names.add(obj.name)
@@ -0,0 +1,83 @@
+import bpy
+
+
+class SceneBuilder:
+    """Class to add many objects and collections to the scene at once.
+
+    Linking objects (or collections) to collections that are part of the
+    view layer triggers depsgraph and user interface updates. Thus, this
+    class creates the data blocks with :code:`bpy.data` (never with
+    :code:`bpy.ops`) and accumulates the corresponding links. Calling
+    :code:`commit()` links the objects to their (unlinked) collections first
+    and then links the collections (from the leaves to the root), so that
+    the view layer is only touched by the final links. The view layer is
+    updated once at the end.
+    """
+
+    def __init__(self, view_layer=None):
+        self._view_layer = view_layer
+        self._object_links = []
+        self._collection_links = []
+        self._selected_objs = []
+        self._hidden_objs = []
+        self._active_obj = None
+
+    def add_collection(self, collection_name, parent_collection=None):
+        """Create a collection, which is linked during :code:`commit()`."""
+        if parent_collection is None:
+            parent_collection = bpy.context.collection
+        new_collection = bpy.data.collections.new(collection_name)
+        self._collection_links.append((parent_collection, new_collection))
+        return new_collection
+
+    def add_obj(self, data, obj_name, collection=None, select=True):
+        """Create an object, which is linked during :code:`commit()`."""
+        if collection is None:
+            collection = bpy.context.collection
+        new_obj = bpy.data.objects.new(obj_name, data)
+        self.link_obj(new_obj, collection)
+        if select:
+            self._selected_objs.append(new_obj)
+            self._active_obj = new_obj
+        return new_obj
+
+    def add_empty(self, empty_name, collection=None):
+        """Create an empty, which is linked during :code:`commit()`."""
+        return self.add_obj(None, empty_name, collection, select=False)
+
+    def link_obj(self, obj, collection):
+        """Link an (additional) collection to the object."""
+        self._object_links.append((collection, obj))
+
+    def hide_obj(self, obj):
+        """Hide the object in the view layer after linking it."""
+        self._hidden_objs.append(obj)
+
+    def commit(self):
+        """Link all objects and collections and update the view layer."""
+        for collection, obj in self._object_links:
+            collection.objects.link(obj)
+        # The collections are created top down, i.e. reversing the order
+        # links the root collections last
+        for parent_collection, collection in reversed(self._collection_links):
+            parent_collection.children.link(collection)
+
+        view_layer = self._view_layer
+        if view_layer is None:
+            view_layer = bpy.context.view_layer
+        for obj in self._selected_objs:
+            obj.select_set(state=True)
+        for obj in self._hidden_objs:
+            obj.hide_set(True)
+        if self._active_obj is not None and (
+            view_layer.objects.active is None
+            or view_layer.objects.active.mode == "OBJECT"
+        ):
+            view_layer.objects.active = self._active_obj
+        view_layer.update()
+
+        self._object_links = []
+        self._collection_links = []
+        self._selected_objs = []
+        self._hidden_objs = []
+        self._active_obj = None
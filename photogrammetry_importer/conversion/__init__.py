@@ -0,0 +1 @@
+""" Contains the Blender-independent conversion of reconstruction formats. """
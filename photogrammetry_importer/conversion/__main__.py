@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import argparse
+import logging
+
+from photogrammetry_importer.conversion.batch_conversion import (
+    INPUT_FORMATS,
+    OUTPUT_FORMATS,
+    ConversionOptions,
+    convert_reconstructions,
+    create_conversion_tasks,
+)
+from photogrammetry_importer.types.camera import Camera
+
+
+def _parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="python -m photogrammetry_importer.conversion",
+        description="Convert reconstructions between the supported formats"
+        " without Blender.",
+    )
+    parser.add_argument(
+        "input_paths",
+        nargs="*",
+        help="Reconstruction files or folders (Colmap / MVE)",
+    )
+    parser.add_argument(
+        "--input-list",
+        help="Text file with one reconstruction path per line",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        help="Format of all inputs (detected per input by default)",
+    )
+    parser.add_argument(
+        "--output-format", choices=OUTPUT_FORMATS, required=True
+    )
+    parser.add_argument("--output-dp", required=True)
+    parser.add_argument(
+        "--image-dp",
+        help="Image directory (by default the images subdirectory or the"
+        " directory of each input)",
+    )
+    parser.add_argument(
+        "--image-fp-type",
+        choices=[
+            Camera.IMAGE_FP_TYPE_NAME,
+            Camera.IMAGE_FP_TYPE_RELATIVE,
+            Camera.IMAGE_FP_TYPE_ABSOLUTE,
+        ],
+        default=Camera.IMAGE_FP_TYPE_NAME,
+    )
+    parser.add_argument(
+        "--ignore-workspace-images",
+        action="store_true",
+        help="Do not use the images of Colmap / Meshroom workspaces",
+    )
+    parser.add_argument("--default-width", type=int, default=-1)
+    parser.add_argument("--default-height", type=int, default=-1)
+    parser.add_argument(
+        "--default-focal-length", type=float, default=float("nan")
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        help="Number of worker processes (all CPUs by default, 0 converts"
+        " the inputs in this process)",
+    )
+    parser.add_argument(
+        "--max-tasks-per-worker",
+        type=int,
+        default=1,
+        help="Replace each worker process after this many conversions",
+    )
+    parser.add_argument(
+        "--summary", help="Write a summary of all conversions (.json)"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(args)
+
+
+def _read_input_list(input_list_ifp):
+    with open(input_list_ifp, "r") as input_list_file:
+        lines = [line.strip() for line in input_list_file]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def main(args=None):
+    """Convert the reconstructions and return the exit code."""
+    args = _parse_args(args)
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    logging.getLogger().setLevel(log_level)
+
+    input_paths = list(args.input_paths)
+    if args.input_list is not None:
+        input_paths += _read_input_list(args.input_list)
+    if not input_paths:
+        print("No input reconstructions provided.", file=sys.stderr)
+        return 2
+
+    options = ConversionOptions(
+        image_dp=args.image_dp,
+        image_fp_type=args.image_fp_type,
+        use_workspace_images=not args.ignore_workspace_images,
+        default_width=args.default_width,
+        default_height=args.default_height,
+        default_focal_length=args.default_focal_length,
+        suppress_distortion_warnings=not args.verbose,
+    )
+    os.makedirs(args.output_dp, exist_ok=True)
+    tasks = create_conversion_tasks(
+        input_paths,
+        args.output_dp,
+        args.output_format,
+        input_format=args.input_format,
+        options=options,
+    )
+
+    summaries = []
+    for summary in convert_reconstructions(
+        tasks,
+        num_workers=args.num_workers,
+        max_tasks_per_worker=args.max_tasks_per_worker,
+        log_level=log_level,
+    ):
+        summaries.append(summary)
+        if summary["error"] is None:
+            print(
+                "Converted {} -> {} ({} cameras, {} points, {:.2f}s)".format(
+                    summary["input_path"],
+                    summary["output_path"],
+                    summary["num_cameras"],
+                    summary["num_points"],
+                    summary["wall_time"],
+                )
+            )
+        else:
+            print(
+                f"Failed {summary['input_path']}: {summary['error']}",
+                file=sys.stderr,
+            )
+
+    num_failed = sum(summary["error"] is not None for summary in summaries)
+    print(f"Converted {len(summaries) - num_failed} of {len(summaries)}")
+    if args.summary is not None:
+        with open(args.summary, "w") as json_file:
+            json.dump(summaries, json_file, indent=4)
+    return 1 if num_failed > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
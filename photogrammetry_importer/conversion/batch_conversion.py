@@ -0,0 +1,461 @@
+import os
+import sys
+import json
+import math
+import time
+import logging
+import multiprocessing
+
+from photogrammetry_importer.file_handlers.colmap_file_handler import (
+    ColmapFileHandler,
+)
+from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
+    InstantNGPFileHandler,
+)
+from photogrammetry_importer.file_handlers.meshroom_file_handler import (
+    MeshroomFileHandler,
+)
+from photogrammetry_importer.file_handlers.mve_file_handler import (
+    MVEFileHandler,
+)
+from photogrammetry_importer.file_handlers.open3D_file_handler import (
+    Open3DFileHandler,
+)
+from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
+    OpenMVGJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.opensfm_json_file_handler import (
+    OpenSfMJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.point_data_file_handler import (
+    PointDataFileHandler,
+)
+from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
+    VisualSfMFileHandler,
+)
+from photogrammetry_importer.operators.utility import (
+    set_image_size_for_cameras,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.blender_utility.logging_utility import log_report
+
+INPUT_FORMAT_COLMAP = "colmap"
+INPUT_FORMAT_MESHROOM = "meshroom"
+INPUT_FORMAT_MVE = "mve"
+INPUT_FORMAT_NVM = "nvm"
+INPUT_FORMAT_OPEN3D = "open3d"
+INPUT_FORMAT_OPENMVG = "openmvg"
+INPUT_FORMAT_OPENSFM = "opensfm"
+INPUT_FORMAT_INSTANT_NGP = "instant_ngp"
+INPUT_FORMAT_POINT_DATA = "point_data"
+INPUT_FORMATS = [
+    INPUT_FORMAT_COLMAP,
+    INPUT_FORMAT_MESHROOM,
+    INPUT_FORMAT_MVE,
+    INPUT_FORMAT_NVM,
+    INPUT_FORMAT_OPEN3D,
+    INPUT_FORMAT_OPENMVG,
+    INPUT_FORMAT_OPENSFM,
+    INPUT_FORMAT_INSTANT_NGP,
+    INPUT_FORMAT_POINT_DATA,
+]
+
+OUTPUT_FORMAT_COLMAP = "colmap"
+OUTPUT_FORMAT_NVM = "nvm"
+OUTPUT_FORMAT_INSTANT_NGP = "instant_ngp"
+OUTPUT_FORMATS = [
+    OUTPUT_FORMAT_COLMAP,
+    OUTPUT_FORMAT_NVM,
+    OUTPUT_FORMAT_INSTANT_NGP,
+]
+
+_POINT_DATA_EXTS = [".ply", ".pcd", ".las", ".laz", ".asc", ".pts", ".csv"]
+
+
+def _detect_json_format(ifp):
+    # Check the default file names first to avoid parsing large files twice
+    fn = os.path.basename(ifp).lower()
+    if fn == "sfm_data.json":
+        return INPUT_FORMAT_OPENMVG
+    if fn.startswith("reconstruction"):
+        return INPUT_FORMAT_OPENSFM
+    if fn.startswith("transforms"):
+        return INPUT_FORMAT_INSTANT_NGP
+
+    with open(ifp, "r") as json_file:
+        json_data = json.load(json_file)
+    if isinstance(json_data, list):
+        return INPUT_FORMAT_OPENSFM
+    if "frames" in json_data:
+        return INPUT_FORMAT_INSTANT_NGP
+    if "parameters" in json_data:
+        return INPUT_FORMAT_OPEN3D
+    if "extrinsics" in json_data:
+        return INPUT_FORMAT_OPENMVG
+    if "poses" in json_data:
+        return INPUT_FORMAT_MESHROOM
+    return None
+
+
+def detect_input_format(input_path):
+    """Return the format of a reconstruction file or folder (or None)."""
+    if os.path.isdir(input_path):
+        if os.path.isfile(os.path.join(input_path, "synth_0.out")):
+            return INPUT_FORMAT_MVE
+        for colmap_element in ["cameras.bin", "cameras.txt", "sparse"]:
+            if os.path.exists(os.path.join(input_path, colmap_element)):
+                return INPUT_FORMAT_COLMAP
+        return None
+
+    ext = os.path.splitext(input_path)[1].lower()
+    if ext == ".nvm":
+        return INPUT_FORMAT_NVM
+    if ext in [".sfm", ".mg"]:
+        return INPUT_FORMAT_MESHROOM
+    if ext == ".log":
+        return INPUT_FORMAT_OPEN3D
+    if ext in _POINT_DATA_EXTS:
+        return INPUT_FORMAT_POINT_DATA
+    if ext == ".json":
+        return _detect_json_format(input_path)
+    return None
+
+
+class ConversionOptions:
+    """This class holds the options used to read the reconstructions.
+
+    The options correspond to the import options of the :code:`Blender`
+    operators.
+    """
+
+    def __init__(
+        self,
+        image_dp=None,
+        image_fp_type=Camera.IMAGE_FP_TYPE_NAME,
+        use_workspace_images=True,
+        default_width=-1,
+        default_height=-1,
+        default_focal_length=float("nan"),
+        suppress_distortion_warnings=True,
+    ):
+        self.image_dp = image_dp
+        self.image_fp_type = image_fp_type
+        self.use_workspace_images = use_workspace_images
+        self.default_width = default_width
+        self.default_height = default_height
+        self.default_focal_length = default_focal_length
+        self.suppress_distortion_warnings = suppress_distortion_warnings
+
+
+class ConversionTask:
+    """This class represents the conversion of a single reconstruction."""
+
+    def __init__(
+        self,
+        input_path,
+        output_path,
+        output_format,
+        input_format=None,
+        options=None,
+    ):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.output_format = output_format
+        self.input_format = input_format
+        if options is None:
+            options = ConversionOptions()
+        self.options = options
+
+
+def _get_default_image_dp(input_path):
+    # Like ImportOperator.get_default_image_path(), but folders (e.g. Colmap
+    # workspaces) are considered as base directory
+    if os.path.isdir(input_path):
+        base_dp = input_path
+    else:
+        base_dp = os.path.dirname(input_path)
+    image_sub_dp = os.path.join(base_dp, "images")
+    if os.path.isdir(image_sub_dp):
+        return image_sub_dp
+    return base_dp
+
+
+def read_reconstruction(input_path, input_format=None, options=None):
+    """Parse a reconstruction with the corresponding file handler.
+
+    Returns the cameras and the points of the reconstruction.
+    """
+    if options is None:
+        options = ConversionOptions()
+    if input_format is None:
+        input_format = detect_input_format(input_path)
+        if input_format is None:
+            raise ValueError(f"Unknown reconstruction format: {input_path}")
+    image_dp = options.image_dp
+    if image_dp is None:
+        image_dp = _get_default_image_dp(input_path)
+    image_fp_type = options.image_fp_type
+    suppress = options.suppress_distortion_warnings
+
+    cameras = []
+    points = []
+    if input_format == INPUT_FORMAT_COLMAP:
+        cameras, points, _ = ColmapFileHandler.parse_colmap_folder(
+            os.path.normpath(input_path),
+            options.use_workspace_images,
+            image_dp,
+            image_fp_type,
+            suppress,
+        )
+    elif input_format == INPUT_FORMAT_MESHROOM:
+        cameras, points, _, _ = MeshroomFileHandler.parse_meshroom_file(
+            input_path,
+            options.use_workspace_images,
+            image_dp,
+            image_fp_type,
+            suppress,
+            "AUTOMATIC",
+            -1,
+            "AUTOMATIC",
+            -1,
+            -1,
+        )
+    elif input_format == INPUT_FORMAT_MVE:
+        cameras, points = MVEFileHandler.parse_mve_workspace(
+            os.path.normpath(input_path),
+            options.default_width,
+            options.default_height,
+            False,
+            suppress,
+        )
+    elif input_format == INPUT_FORMAT_NVM:
+        cameras, points = VisualSfMFileHandler.parse_visualsfm_file(
+            input_path, image_dp, image_fp_type, suppress
+        )
+    elif input_format == INPUT_FORMAT_OPEN3D:
+        cameras = Open3DFileHandler.parse_open3d_file(
+            input_path, image_dp, image_fp_type, None
+        )
+    elif input_format == INPUT_FORMAT_OPENMVG:
+        cameras, points = OpenMVGJSONFileHandler.parse_openmvg_file(
+            input_path, image_dp, image_fp_type, suppress
+        )
+    elif input_format == INPUT_FORMAT_OPENSFM:
+        cameras, points = OpenSfMJSONFileHandler.parse_opensfm_file(
+            input_path, image_dp, image_fp_type, 0, suppress
+        )
+    elif input_format == INPUT_FORMAT_INSTANT_NGP:
+        cameras = InstantNGPFileHandler.parse_instant_ngp_json_file(
+            input_path, image_dp, image_fp_type, suppress
+        )
+    elif input_format == INPUT_FORMAT_POINT_DATA:
+        points = PointDataFileHandler.parse_point_data_file(input_path)
+    else:
+        raise ValueError(f"Unknown input format: {input_format}")
+
+    _complete_cameras(cameras, options)
+    return cameras, points
+
+
+def _complete_cameras(cameras, options):
+    # Some formats (e.g. NVM or Open3D .log files) do not contain the image
+    # size and/or the intrinsic parameters
+    if any(
+        camera.width is None or camera.height is None for camera in cameras
+    ):
+        success = set_image_size_for_cameras(
+            cameras, options.default_width, options.default_height
+        )
+        if not success:
+            raise ValueError(
+                "Could not determine the image sizes. Provide the images or"
+                " a default width and height."
+            )
+    if not all(camera.has_intrinsics() for camera in cameras):
+        if math.isnan(options.default_focal_length):
+            raise ValueError(
+                "The reconstruction contains no intrinsic parameters."
+                " Provide a default focal length."
+            )
+        for camera in cameras:
+            calibration_mat = Camera.compute_calibration_mat(
+                focal_length=options.default_focal_length,
+                cx=camera.width / 2.0,
+                cy=camera.height / 2.0,
+            )
+            camera.set_calibration_mat(calibration_mat)
+    # Like the export operators, use the camera index as identifier
+    for index, camera in enumerate(cameras):
+        camera.id = index
+
+
+def write_reconstruction(output_path, output_format, cameras, points):
+    """Write the cameras and points with the corresponding file handler."""
+    output_dp = os.path.dirname(output_path)
+    if output_dp:
+        os.makedirs(output_dp, exist_ok=True)
+    if output_format == OUTPUT_FORMAT_COLMAP:
+        ColmapFileHandler.write_colmap_model(output_path, cameras, points)
+    elif output_format in [OUTPUT_FORMAT_NVM, OUTPUT_FORMAT_INSTANT_NGP]:
+        if len(cameras) == 0:
+            raise ValueError(
+                f"The output format {output_format} requires cameras."
+            )
+        if output_format == OUTPUT_FORMAT_NVM:
+            VisualSfMFileHandler.write_visualsfm_file(
+                output_path, cameras, points
+            )
+        else:
+            InstantNGPFileHandler.write_instant_ngp_file(
+                output_path, cameras, keep_image_names=True
+            )
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+
+def _get_max_rss():
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        return max_rss
+    return max_rss * 1024
+
+
+def run_conversion_task(task):
+    """Convert a single reconstruction and return a summary dictionary.
+
+    Errors are reported in the summary (instead of being raised), so that
+    a failing reconstruction does not abort a batch conversion.
+    """
+    summary = {
+        "input_path": task.input_path,
+        "output_path": task.output_path,
+        "input_format": task.input_format,
+        "output_format": task.output_format,
+        "num_cameras": None,
+        "num_points": None,
+        "wall_time": None,
+        "max_rss": None,
+        "error": None,
+    }
+    start_time = time.perf_counter()
+    try:
+        input_format = task.input_format
+        if input_format is None:
+            input_format = detect_input_format(task.input_path)
+            summary["input_format"] = input_format
+        cameras, points = read_reconstruction(
+            task.input_path, input_format, task.options
+        )
+        summary["num_cameras"] = len(cameras)
+        summary["num_points"] = len(points)
+        write_reconstruction(
+            task.output_path, task.output_format, cameras, points
+        )
+    except Exception as exception:
+        # The file handlers use assertions to reject invalid files
+        summary["error"] = f"{type(exception).__name__}: {exception}"
+        log_report("ERROR", f"{task.input_path}: {summary['error']}")
+    summary["wall_time"] = time.perf_counter() - start_time
+    summary["max_rss"] = _get_max_rss()
+    return summary
+
+
+def get_output_path(output_dp, name, output_format):
+    """Return the output path of a reconstruction with the given name."""
+    if output_format == OUTPUT_FORMAT_COLMAP:
+        return os.path.join(output_dp, name)
+    elif output_format == OUTPUT_FORMAT_NVM:
+        return os.path.join(output_dp, name + ".nvm")
+    elif output_format == OUTPUT_FORMAT_INSTANT_NGP:
+        return os.path.join(output_dp, name + ".json")
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def _get_name(input_path):
+    input_path = os.path.normpath(input_path)
+    if os.path.isdir(input_path):
+        return os.path.basename(input_path)
+    return os.path.splitext(os.path.basename(input_path))[0]
+
+
+def _get_unique_names(input_paths):
+    names = [_get_name(input_path) for input_path in input_paths]
+    if len(set(names)) == len(names):
+        return names
+    # Reconstructions often share the same file name (e.g. sfm_data.json),
+    # thus include the (relative) parent directories
+    parent_dps = [
+        os.path.dirname(os.path.abspath(input_path))
+        for input_path in input_paths
+    ]
+    common_dp = os.path.commonpath(parent_dps)
+    for index, parent_dp in enumerate(parent_dps):
+        relative_dp = os.path.relpath(parent_dp, common_dp)
+        if relative_dp != os.curdir:
+            prefix = relative_dp.replace(os.sep, "_")
+            names[index] = f"{prefix}_{names[index]}"
+    if len(set(names)) == len(names):
+        return names
+    return [f"{name}_{index}" for index, name in enumerate(names)]
+
+
+def create_conversion_tasks(
+    input_paths, output_dp, output_format, input_format=None, options=None
+):
+    """Create the conversion tasks of several reconstructions.
+
+    The output names are derived from the input names and made unique.
+    """
+    names = _get_unique_names(input_paths)
+    return [
+        ConversionTask(
+            input_path,
+            get_output_path(output_dp, name, output_format),
+            output_format,
+            input_format=input_format,
+            options=options,
+        )
+        for input_path, name in zip(input_paths, names)
+    ]
+
+
+def _initialize_worker(log_level):
+    # The file handlers report their progress with log messages
+    logging.getLogger().setLevel(log_level)
+
+
+def convert_reconstructions(
+    tasks, num_workers=None, max_tasks_per_worker=1, log_level=logging.WARNING
+):
+    """Run the conversion tasks and yield the summaries as they finish.
+
+    The tasks are processed by a pool of :code:`num_workers` processes (all
+    CPUs by default). At most :code:`num_workers` reconstructions are in
+    memory at the same time. Each worker is replaced after
+    :code:`max_tasks_per_worker` tasks, which returns the memory of large
+    reconstructions to the operating system. If :code:`num_workers` is 0,
+    the tasks are processed sequentially in the current process.
+    """
+    if num_workers == 0:
+        for task in tasks:
+            yield run_conversion_task(task)
+        return
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, len(tasks)))
+    with multiprocessing.Pool(
+        num_workers,
+        initializer=_initialize_worker,
+        initargs=(log_level,),
+        maxtasksperchild=max_tasks_per_worker,
+    ) as pool:
+        for summary in pool.imap_unordered(
+            run_conversion_task, tasks, chunksize=1
+        ):
+            yield summary
@@ -12,11 +12,19 @@ from photogrammetry_importer.ext.read_write_model import (
 )
 
 from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_batch import CameraBatch
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.visibility_index import VisibilityIndex
+from photogrammetry_importer.utility.quaternion_utility import (
+    quaternions_to_rotation_matrices,
+)
 from photogrammetry_importer.file_handlers.utility import (
     check_radial_distortion,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 # From photogrammetry_importer\ext\read_write_model.py
 # CAMERA_MODELS = {
@@ -111,52 +119,63 @@ class ColmapFileHandler:
         #   BaseImage = collections.namedtuple(
         #       "Image", ["id", "qvec", "tvec", "camera_id", "name", "xys", "point3D_ids"])
 
-        cameras = []
-        for col_image in id_to_col_images.values():
-            current_camera = Camera()
-            current_camera.id = col_image.id
-            current_camera.set_rotation_with_quaternion(col_image.qvec)
-            current_camera.set_camera_translation_vector_after_rotation(
-                col_image.tvec
-            )
-
-            current_camera.image_fp_type = image_fp_type
-            current_camera.image_dp = image_dp
-            current_camera._relative_fp = col_image.name
-
-            # log_report('INFO', 'image_dp: ' + str(image_dp))
-            # log_report('INFO', 'col_image.name: ' + str(col_image.name))
-
-            camera_model = id_to_col_cameras[col_image.camera_id]
-
-            # log_report('INFO', 'image_id: ' + str(col_image.id))
-            # log_report('INFO', 'camera_id: ' + str(col_image.camera_id))
-            # log_report('INFO', 'camera_model: ' + str(camera_model))
-
-            current_camera.width = camera_model.width
-            current_camera.height = camera_model.height
-
-            (
-                fx,
-                fy,
-                cx,
-                cy,
-                skew,
-                r,
-            ) = ColmapFileHandler._parse_camera_param_list(
-                camera_model,
+        col_images = list(id_to_col_images.values())
+
+        # Table of shared intrinsics (one entry per Colmap camera). The
+        # cameras use a radial distortion of 0, since the values of Colmap are
+        # only used to warn about distorted images.
+        camera_id_to_intrinsic_index = {}
+        calibration_mats = []
+        widths = []
+        heights = []
+        radial_distortions = []
+        for camera_id, camera_model in id_to_col_cameras.items():
+            fx, fy, cx, cy, skew, r = (
+                ColmapFileHandler._parse_camera_param_list(camera_model)
             )
-            if not suppress_distortion_warnings:
-                check_radial_distortion(r, current_camera._relative_fp, op)
+            camera_id_to_intrinsic_index[camera_id] = len(calibration_mats)
+            calibration_mats.append([[fx, skew, cx], [0, fy, cy], [0, 0, 1]])
+            widths.append(camera_model.width)
+            heights.append(camera_model.height)
+            radial_distortions.append(r)
+
+        intrinsic_indices = [
+            camera_id_to_intrinsic_index[col_image.camera_id]
+            for col_image in col_images
+        ]
+        if not suppress_distortion_warnings:
+            for col_image, intrinsic_index in zip(
+                col_images, intrinsic_indices
+            ):
+                check_radial_distortion(
+                    radial_distortions[intrinsic_index], col_image.name, op
+                )
 
-            camera_calibration_matrix = np.array(
-                [[fx, skew, cx], [0, fy, cy], [0, 0, 1]]
-            )
-            current_camera.set_calibration(
-                camera_calibration_matrix, radial_distortion=0
-            )
+        qvecs = np.array(
+            [col_image.qvec for col_image in col_images], dtype=float
+        ).reshape(-1, 4)
+        tvecs = np.array(
+            [col_image.tvec for col_image in col_images], dtype=float
+        ).reshape(-1, 3)
+        camera_batch = CameraBatch.from_world_to_cam(
+            quaternions_to_rotation_matrices(qvecs),
+            tvecs,
+            calibration_mats=np.array(calibration_mats, dtype=float),
+            widths=np.array(widths, dtype=object),
+            heights=np.array(heights, dtype=object),
+            intrinsic_indices=intrinsic_indices,
+            relative_fps=[col_image.name for col_image in col_images],
+            image_dp=image_dp,
+            image_fp_type=image_fp_type,
+            ids=np.array(
+                [col_image.id for col_image in col_images], dtype=object
+            ),
+            quaternions=qvecs,
+        )
+        cameras = camera_batch.to_cameras()
 
-            if depth_map_idp is not None:
+        if depth_map_idp is not None:
+            for current_camera, col_image in zip(cameras, col_images):
                 geometric_ifp = os.path.join(
                     depth_map_idp, col_image.name + ".geometric.bin"
                 )
@@ -175,28 +194,91 @@ class ColmapFileHandler:
                     Camera.DEPTH_MAP_WRT_CANONICAL_VECTORS,
                     shift_depth_map_to_pixel_center=False,
                 )
-            cameras.append(current_camera)
         return cameras
 
     @staticmethod
-    def _convert_points(id_to_col_points3D):
+    def _convert_points(
+        id_to_col_points3D,
+        min_track_length=0,
+        max_reprojection_error=None,
+        op=None,
+    ):
         # From photogrammetry_importer\ext\read_write_model.py
         #   Point3D = collections.namedtuple(
         #       "Point3D", ["id", "xyz", "rgb", "error", "image_ids", "point2D_idxs"])
 
-        col_points3D = id_to_col_points3D.values()
+        col_points3D = list(id_to_col_points3D.values())
+        num_points = len(col_points3D)
+
+        # Gather the point attributes in columnar arrays, so that the filter
+        # requires only a single (vectorized) masked pass.
+        errors = np.fromiter(
+            (col_point3D.error for col_point3D in col_points3D),
+            dtype=float,
+            count=num_points,
+        )
+        track_lengths = np.fromiter(
+            (len(col_point3D.image_ids) for col_point3D in col_points3D),
+            dtype=np.int64,
+            count=num_points,
+        )
+        mask = track_lengths >= min_track_length
+        if max_reprojection_error is not None:
+            mask &= errors <= max_reprojection_error
+        valid_indices = np.flatnonzero(mask)
+        if len(valid_indices) < num_points:
+            log_report(
+                "INFO",
+                f"Removed {num_points - len(valid_indices)} of {num_points} "
+                "points with a short track or a large reprojection error",
+                op,
+            )
+
+        errors = errors.tolist()
+        track_lengths = track_lengths.tolist()
         points3D = []
-        for col_point3D in col_points3D:
+        for idx in valid_indices.tolist():
+            col_point3D = col_points3D[idx]
             current_point = Point(
                 coord=col_point3D.xyz,
                 color=col_point3D.rgb,
                 id=col_point3D.id,
-                scalars=None,
+                scalars={
+                    "track_length": track_lengths[idx],
+                    "reprojection_error": errors[idx],
+                },
             )
             points3D.append(current_point)
 
         return points3D
 
+    @staticmethod
+    def _compute_visibility_index(id_to_col_images):
+        # The camera indices correspond to the order of the cameras returned
+        # by _convert_cameras()
+        point3D_ids_per_image = [
+            np.asarray(col_image.point3D_ids, dtype=np.int64)
+            for col_image in id_to_col_images.values()
+        ]
+        num_observations = np.array(
+            [len(point3D_ids) for point3D_ids in point3D_ids_per_image],
+            dtype=np.int64,
+        )
+        camera_indices = np.repeat(
+            np.arange(len(point3D_ids_per_image)), num_observations
+        )
+        if len(camera_indices) == 0:
+            point3D_ids = np.zeros(0, dtype=np.int64)
+        else:
+            point3D_ids = np.concatenate(point3D_ids_per_image)
+        # Features without corresponding 3D point have the id -1
+        valid = point3D_ids >= 0
+        return VisibilityIndex.from_observations(
+            camera_indices[valid],
+            point3D_ids[valid],
+            num_cameras=len(point3D_ids_per_image),
+        )
+
     @staticmethod
     def _get_model_folder_ext(idp):
         ifp_s = os.listdir(idp)
@@ -235,8 +317,15 @@ class ColmapFileHandler:
         depth_map_idp=None,
         suppress_distortion_warnings=False,
         op=None,
+        min_track_length=0,
+        max_reprojection_error=None,
+        return_visibility_index=False,
     ):
-        """Parse a :code:`Colmap` model."""
+        """Parse a :code:`Colmap` model.
+
+        If :code:`return_visibility_index` is set, a :code:`VisibilityIndex`
+        is returned as additional (last) element.
+        """
         log_report("INFO", "Parse Colmap model folder: " + model_idp, op)
 
         assert ColmapFileHandler._is_valid_model_folder(model_idp)
@@ -258,8 +347,15 @@ class ColmapFileHandler:
             op,
         )
 
-        points3D = ColmapFileHandler._convert_points(id_to_col_points3D)
+        points3D = ColmapFileHandler._convert_points(
+            id_to_col_points3D, min_track_length, max_reprojection_error, op
+        )
 
+        if return_visibility_index:
+            visibility_index = ColmapFileHandler._compute_visibility_index(
+                id_to_col_images
+            )
+            return cameras, points3D, visibility_index
         return cameras, points3D
 
     @staticmethod
@@ -282,6 +378,7 @@ class ColmapFileHandler:
         return model_idp, image_idp, depth_map_idp, mesh_ifp
 
     @staticmethod
+    @profile_function("Parse Colmap Folder")
     def parse_colmap_folder(
         idp,
         use_workspace_images,
@@ -289,8 +386,15 @@ class ColmapFileHandler:
         image_fp_type,
         suppress_distortion_warnings=False,
         op=None,
+        min_track_length=0,
+        max_reprojection_error=None,
+        return_visibility_index=False,
     ):
-        """Parse a :code:`Colmap` model or a :code:`Colmap` workspace."""
+        """Parse a :code:`Colmap` model or a :code:`Colmap` workspace.
+
+        If :code:`return_visibility_index` is set, a :code:`VisibilityIndex`
+        is returned as additional (last) element.
+        """
         log_report("INFO", "idp: " + str(idp), op)
 
         if ColmapFileHandler._is_valid_model_folder(idp):
@@ -312,15 +416,22 @@ class ColmapFileHandler:
             assert False, "Invalid colmap model / workspace"
 
         log_report("INFO", "image_dp: " + image_dp, op)
-        cameras, points = ColmapFileHandler.parse_colmap_model_folder(
+        result = ColmapFileHandler.parse_colmap_model_folder(
             model_idp,
             image_dp,
             image_fp_type,
             depth_map_idp,
             suppress_distortion_warnings=suppress_distortion_warnings,
+            min_track_length=min_track_length,
+            max_reprojection_error=max_reprojection_error,
+            return_visibility_index=return_visibility_index,
             op=op,
         )
 
+        if return_visibility_index:
+            cameras, points, visibility_index = result
+            return cameras, points, mesh_ifp, visibility_index
+        cameras, points = result
         return cameras, points, mesh_ifp
 
     @staticmethod
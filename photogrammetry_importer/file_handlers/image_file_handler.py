@@ -1,18 +1,151 @@
 import os
+import json
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 
 
+def _get_default_image_size_cache_fp():
+    cache_dp = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(
+        cache_dp, "photogrammetry_importer", "image_size_cache.json"
+    )
+
+
+def _read_png_size(image_file):
+    # Signature (8 bytes), IHDR length (4 bytes) and type (4 bytes)
+    header = image_file.read(24)
+    if len(header) < 24 or header[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", header[16:24])
+    return width, height
+
+
+def _read_jpeg_size(image_file):
+    # Start of frame markers containing the image size (i.e. all SOFn
+    # markers except DHT (C4), JPG (C8) and DAC (CC))
+    sof_markers = {
+        0xC0,
+        0xC1,
+        0xC2,
+        0xC3,
+        0xC5,
+        0xC6,
+        0xC7,
+        0xC9,
+        0xCA,
+        0xCB,
+        0xCD,
+        0xCE,
+        0xCF,
+    }
+    image_file.seek(2)
+    while True:
+        byte = image_file.read(1)
+        if len(byte) == 0:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = image_file.read(1)
+        # Skip fill bytes
+        while marker == b"\xff":
+            marker = image_file.read(1)
+        if len(marker) == 0:
+            return None
+        marker = marker[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            # Markers without payload
+            continue
+        length_bytes = image_file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if marker in sof_markers:
+            payload = image_file.read(5)
+            if len(payload) < 5:
+                return None
+            height, width = struct.unpack(">HH", payload[1:5])
+            return width, height
+        image_file.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_tiff_size(image_file):
+    header = image_file.read(8)
+    if header[:2] == b"II":
+        byte_order = "<"
+    elif header[:2] == b"MM":
+        byte_order = ">"
+    else:
+        return None
+    magic, ifd_offset = struct.unpack(byte_order + "HI", header[2:8])
+    if magic != 42:
+        # e.g. BigTIFF
+        return None
+    image_file.seek(ifd_offset)
+    (num_entries,) = struct.unpack(byte_order + "H", image_file.read(2))
+    entries = image_file.read(12 * num_entries)
+    width = height = None
+    for entry_index in range(num_entries):
+        entry = entries[12 * entry_index : 12 * (entry_index + 1)]
+        if len(entry) < 12:
+            break
+        tag, field_type = struct.unpack(byte_order + "HH", entry[:4])
+        if field_type == 3:  # SHORT
+            (value,) = struct.unpack(byte_order + "H", entry[8:10])
+        elif field_type == 4:  # LONG
+            (value,) = struct.unpack(byte_order + "I", entry[8:12])
+        else:
+            continue
+        if tag == 256:
+            width = value
+        elif tag == 257:
+            height = value
+    if width is None or height is None:
+        return None
+    return width, height
+
+
+def _read_exr_size(image_file):
+    # Magic number (4 bytes) and version (4 bytes), followed by attributes
+    # of the form: name (null terminated), type (null terminated), size
+    # (int32) and value
+    header = image_file.read(65536)
+    offset = 8
+    while offset < len(header):
+        name_end = header.find(b"\x00", offset)
+        if name_end == -1 or name_end == offset:
+            return None
+        name = header[offset:name_end]
+        type_end = header.find(b"\x00", name_end + 1)
+        if type_end == -1:
+            return None
+        attribute_type = header[name_end + 1 : type_end]
+        (size,) = struct.unpack("<i", header[type_end + 1 : type_end + 5])
+        value_start = type_end + 5
+        if name == b"dataWindow" and attribute_type == b"box2i":
+            x_min, y_min, x_max, y_max = struct.unpack(
+                "<iiii", header[value_start : value_start + 16]
+            )
+            return x_max - x_min + 1, y_max - y_min + 1
+        offset = value_start + size
+    return None
+
+
 class ImageFileHandler:
     """Class to read and write images using :code:`Pillow`."""
 
     PILImage = None
 
-    @classmethod
-    def read_image_size(
-        cls, image_ifp, default_width, default_height, op=None
-    ):
-        """Read image size from disk."""
+    # Persistent (path, file size, modification time) -> image size cache
+    image_size_cache_fp = _get_default_image_size_cache_fp()
+    _image_size_cache = None
+    _image_size_cache_lock = threading.Lock()
 
+    @classmethod
+    def _import_pillow(cls):
         if cls.PILImage is None:
             try:
                 from PIL import Image as _PILImage
@@ -20,11 +153,158 @@ class ImageFileHandler:
                 cls.PILImage = _PILImage
             except ImportError:
                 pass
+        return cls.PILImage
+
+    @staticmethod
+    def read_image_size_from_header(image_ifp):
+        """Read the image size from the header of a JPEG/PNG/TIFF/EXR file.
+
+        Return :code:`None` if the format is not supported or the header is
+        invalid.
+        """
+        with open(image_ifp, "rb") as image_file:
+            signature = image_file.read(4)
+            image_file.seek(0)
+            try:
+                if signature == b"\x89PNG":
+                    return _read_png_size(image_file)
+                if signature[:2] == b"\xff\xd8":
+                    return _read_jpeg_size(image_file)
+                if signature in (b"II*\x00", b"MM\x00*"):
+                    return _read_tiff_size(image_file)
+                if signature == b"\x76\x2f\x31\x01":
+                    return _read_exr_size(image_file)
+            except struct.error:
+                pass
+        return None
+
+    @classmethod
+    def _get_image_size_cache(cls):
+        if cls._image_size_cache is None:
+            cache = {}
+            if os.path.isfile(cls.image_size_cache_fp):
+                try:
+                    with open(cls.image_size_cache_fp, "r") as cache_file:
+                        cache = json.load(cache_file)
+                except (OSError, ValueError):
+                    cache = {}
+            cls._image_size_cache = cache
+        return cls._image_size_cache
+
+    @classmethod
+    def _save_image_size_cache(cls):
+        cache_dp = os.path.dirname(cls.image_size_cache_fp)
+        try:
+            os.makedirs(cache_dp, exist_ok=True)
+            tmp_fp = cls.image_size_cache_fp + ".tmp"
+            with open(tmp_fp, "w") as cache_file:
+                json.dump(cls._image_size_cache, cache_file)
+            os.replace(tmp_fp, cls.image_size_cache_fp)
+        except OSError:
+            # The cache is only an optimization
+            pass
+
+    @classmethod
+    def clear_image_size_cache(cls):
+        """Remove all entries of the persistent image size cache."""
+        with cls._image_size_cache_lock:
+            cls._image_size_cache = {}
+            if os.path.isfile(cls.image_size_cache_fp):
+                os.remove(cls.image_size_cache_fp)
+
+    @classmethod
+    def _probe_image_size(cls, image_ifp, cache):
+        """Return ((width, height) or None, cache entry or None)."""
+        try:
+            stat_result = os.stat(image_ifp)
+        except OSError:
+            return None, None
+        file_size = stat_result.st_size
+        mtime_ns = stat_result.st_mtime_ns
+
+        cache_entry = cache.get(os.path.abspath(image_ifp))
+        if (
+            cache_entry is not None
+            and cache_entry[0] == file_size
+            and cache_entry[1] == mtime_ns
+        ):
+            return (cache_entry[2], cache_entry[3]), None
 
-        if cls.PILImage is not None and os.path.isfile(image_ifp):
-            # This does NOT load the data into memory -> should be fast!
-            image = cls.PILImage.open(image_ifp)
-            width, height = image.size
+        try:
+            image_size = cls.read_image_size_from_header(image_ifp)
+        except OSError:
+            image_size = None
+        if image_size is None and cls._import_pillow() is not None:
+            try:
+                # This does NOT load the data into memory -> should be fast!
+                with cls.PILImage.open(image_ifp) as image:
+                    image_size = image.size
+            except (OSError, ValueError):
+                image_size = None
+        if image_size is None:
+            return None, None
+        width, height = image_size
+        return (width, height), [file_size, mtime_ns, width, height]
+
+    @classmethod
+    def read_image_sizes(cls, image_ifps, num_threads=None, use_cache=True):
+        """Read the sizes of many images concurrently.
+
+        Return a list containing :code:`(width, height)` for each image (or
+        :code:`None`, if the size could not be determined). Only the image
+        headers are read. Probed sizes are stored in a persistent cache
+        keyed by path, file size and modification time.
+        """
+        image_ifps = list(image_ifps)
+        if len(image_ifps) == 0:
+            return []
+        if use_cache:
+            cache = cls._get_image_size_cache()
+        else:
+            cache = {}
+        if num_threads is None:
+            num_threads = min(32, (os.cpu_count() or 1) + 4)
+        num_threads = max(1, min(num_threads, len(image_ifps)))
+
+        def probe(image_ifp):
+            return cls._probe_image_size(image_ifp, cache)
+
+        if num_threads == 1:
+            results = [probe(image_ifp) for image_ifp in image_ifps]
+        else:
+            # The probing is I/O bound (e.g. network drives)
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                results = list(executor.map(probe, image_ifps))
+
+        if use_cache:
+            new_entries = {
+                os.path.abspath(image_ifp): cache_entry
+                for image_ifp, (_, cache_entry) in zip(image_ifps, results)
+                if cache_entry is not None
+            }
+            if len(new_entries) > 0:
+                with cls._image_size_cache_lock:
+                    cls._get_image_size_cache().update(new_entries)
+                    cls._save_image_size_cache()
+        return [image_size for image_size, _ in results]
+
+    @classmethod
+    def read_image_size(
+        cls, image_ifp, default_width, default_height, op=None
+    ):
+        """Read image size from disk."""
+        image_size = cls.read_image_sizes([image_ifp], num_threads=1)[0]
+        return cls.get_image_size_or_default(
+            image_ifp, image_size, default_width, default_height, op
+        )
+
+    @classmethod
+    def get_image_size_or_default(
+        cls, image_ifp, image_size, default_width, default_height, op=None
+    ):
+        """Return the image size or the default values (if valid)."""
+        if image_size is not None:
+            width, height = image_size
             success = True
         elif default_width > 0 and default_height > 0:
             width = default_width
@@ -40,13 +320,19 @@ class ImageFileHandler:
             )
             success = True
         else:
-            if cls.PILImage is None:
+            if os.path.isfile(image_ifp):
                 log_report(
                     "ERROR",
-                    "PIL/PILLOW is not installed. Can not read image from disc"
-                    + " to get image size.",
+                    "Could not read the image size of: " + image_ifp,
                     op,
                 )
+                if cls._import_pillow() is None:
+                    log_report(
+                        "ERROR",
+                        "PIL/PILLOW is not installed. Only the size of "
+                        + "JPEG, PNG, TIFF and EXR images can be read.",
+                        op,
+                    )
             else:
                 log_report(
                     "ERROR",
@@ -62,20 +348,12 @@ class ImageFileHandler:
                 + ")",
                 op,
             )
-            if cls.PILImage is None:
-                log_report(
-                    "ERROR",
-                    "Adjust the default width/height values to import the"
-                    + " NVM / LOG / MVE file.",
-                    op,
-                )
-            else:
-                log_report(
-                    "ERROR",
-                    "Adjust the image path or the default width/height values"
-                    + " to import the NVM / LOG file.",
-                    op,
-                )
+            log_report(
+                "ERROR",
+                "Adjust the image path or the default width/height values"
+                + " to import the NVM / LOG / MVE file.",
+                op,
+            )
             width = None
             height = None
             success = False
@@ -3,13 +3,14 @@ import os
 import math
 import numpy as np
 
-from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_batch import CameraBatch
 from photogrammetry_importer.file_handlers.utility import (
     check_radial_distortion,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
-from photogrammetry_importer.importers.camera_utility import (
-    invert_y_and_z_axis,
+from photogrammetry_importer.utility.np_utility import invert_y_and_z_axis
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
 )
 
 
@@ -17,6 +18,7 @@ class InstantNGPFileHandler:
     """Class to read and write :code:`Instant-NGP` json files."""
 
     @classmethod
+    @profile_function("Parse Instant-NGP File")
     def parse_instant_ngp_json_file(
         cls,
         json_ifp,
@@ -29,16 +31,37 @@ class InstantNGPFileHandler:
         log_report("INFO", f"Parse Instant-NGP json file: {json_ifp}", op)
         log_report("INFO", f"image_dp: {image_dp}", op)
 
-        cams = []
-
         input_file = open(json_ifp, "r")
         json_data = json.load(input_file)
         frames = json_data["frames"]
-        for frame in frames:
-            camera = Camera()
-            camera.image_fp_type = image_fp_type
-            camera.image_dp = image_dp
 
+        # All frames share the same intrinsic parameters
+        width = int(json_data["w"])
+        height = int(json_data["h"])
+        camera_angle_x = json_data["camera_angle_x"]
+        camera_angle_y = json_data["camera_angle_y"]
+        fl_x = json_data["fl_x"]
+        fl_y = json_data["fl_y"]
+        assert camera_angle_x == math.atan(width / (fl_x * 2)) * 2
+        assert camera_angle_y == math.atan(height / (fl_y * 2)) * 2
+        cx = json_data["cx"]
+        cy = json_data["cy"]
+        camera_calibration_mat = np.array(
+            [[fl_x, 0, cx], [0, fl_y, cy], [0, 0, 1]]
+        )
+
+        radial_distortion = None
+        radial_parameters = ["k1", "k2", "k3", "k4", "p1", "p2"]
+        for radial_parameter in radial_parameters:
+            if radial_parameter in json_data:
+                radial_value = json_data[radial_parameter]
+                if radial_distortion is None:
+                    radial_distortion = [radial_value]
+                else:
+                    radial_distortion.append(radial_value)
+
+        image_fns = []
+        for frame in frames:
             relative_image_ifp = frame["file_path"]
             len_relative_image_ifp = len(relative_image_ifp.split(os.path.sep))
             if len_relative_image_ifp > 1:
@@ -46,82 +69,54 @@ class InstantNGPFileHandler:
                 msg += " going to extract only the file name"
                 log_report("WARNING", msg, op)
             image_fn = os.path.basename(relative_image_ifp)
-            camera._relative_fp = image_fn
-            camera._absolute_fp = os.path.join(image_dp, image_fn)
-
-            camera.width = int(json_data["w"])
-            camera.height = int(json_data["h"])
-
-            camera_angle_x = json_data["camera_angle_x"]
-            camera_angle_y = json_data["camera_angle_y"]
-            fl_x = json_data["fl_x"]
-            fl_y = json_data["fl_y"]
-            assert camera_angle_x == math.atan(camera.width / (fl_x * 2)) * 2
-            assert camera_angle_y == math.atan(camera.height / (fl_y * 2)) * 2
-
             if not suppress_distortion_warnings:
-                radial_distortion = None
-                radial_parameters = ["k1", "k2", "k3", "k4", "p1", "p2"]
-                for radial_parameter in radial_parameters:
-                    if radial_parameter in json_data:
-                        radial_value = json_data[radial_parameter]
-                        if radial_distortion is None:
-                            radial_distortion = [radial_value]
-                        else:
-                            radial_distortion.append(radial_value)
-                    check_radial_distortion(
-                        radial_distortion, camera._relative_fp, op
-                    )
-
-            cx = json_data["cx"]
-            cy = json_data["cy"]
-
-            camera_calibration_mat = np.array(
-                [[fl_x, 0, cx], [0, fl_y, cy], [0, 0, 1]]
-            )
-            camera.set_calibration_mat(camera_calibration_mat)
-
-            camera_to_world_mat_list = frame["transform_matrix"]
-            camera_to_world_mat = np.asarray(camera_to_world_mat_list)
-
-            # camera_to_world_mat = [R^T    c]
-            #                       [0      1]
-            rotation_mat = camera_to_world_mat[0:3, 0:3].transpose()
-            camera_center_vec = camera_to_world_mat[0:3, 3]
-
-            # Instant-NGP uses a camera coordinate system common in computer
-            #  graphics (such as used by blender). However, the addon expects
-            #  camera coordinate systems in common computer vision notation.
-            #
-            # In Instant-NGP the y axis in the image is pointing downwards (not
-            #  upwards) and the camera is looking along the positive z axis
-            #  (points in front of the camera show a positive z value).
-            #
-            # The conversion of camera coordinate systems in computer graphic
-            #  notation to computer vision notiation is defined by a rotation
-            #  of x axis around 180 degrees, i.e. an inversion of the y and z
-            #  axis of the CAMERA MATRICES.
-            #
-            # Thus, in the case of a world to camera matrix
-            #  world_to_camera_mat = [R      -Rc]
-            #                        [0      1  ]
-            #  the y and z axis of the TRANSLATION VECTOR t=-Rc must also be
-            #  inverted.
-            rotation_mat = invert_y_and_z_axis(rotation_mat)
-
-            # Set camera rotation and center according to
-            #  camera.set_4x4_cam_to_world_mat(cam_to_world_mat)
-            camera.set_rotation_with_rotation_mat(
-                rotation_mat,
-                check_rotation=True,
-            )
-            camera.set_camera_center_after_rotation(
-                camera_center_vec, check_rotation=True
-            )
-
-            cams.append(camera)
-
-        return cams
+                check_radial_distortion(radial_distortion, image_fn, op)
+            image_fns.append(image_fn)
+
+        camera_to_world_mats = np.array(
+            [frame["transform_matrix"] for frame in frames], dtype=float
+        ).reshape(-1, 4, 4)
+
+        # camera_to_world_mat = [R^T    c]
+        #                       [0      1]
+        rotation_mats = camera_to_world_mats[:, 0:3, 0:3].transpose(0, 2, 1)
+        camera_center_vecs = camera_to_world_mats[:, 0:3, 3]
+
+        # Instant-NGP uses a camera coordinate system common in computer
+        #  graphics (such as used by blender). However, the addon expects
+        #  camera coordinate systems in common computer vision notation.
+        #
+        # In Instant-NGP the y axis in the image is pointing downwards (not
+        #  upwards) and the camera is looking along the positive z axis
+        #  (points in front of the camera show a positive z value).
+        #
+        # The conversion of camera coordinate systems in computer graphic
+        #  notation to computer vision notiation is defined by a rotation
+        #  of x axis around 180 degrees, i.e. an inversion of the y and z
+        #  axis of the CAMERA MATRICES.
+        #
+        # Thus, in the case of a world to camera matrix
+        #  world_to_camera_mat = [R      -Rc]
+        #                        [0      1  ]
+        #  the y and z axis of the TRANSLATION VECTOR t=-Rc must also be
+        #  inverted.
+        rotation_mats = invert_y_and_z_axis(rotation_mats, axis=1)
+        assert np.allclose(np.abs(np.linalg.det(rotation_mats)), 1)
+
+        camera_batch = CameraBatch(
+            rotation_mats,
+            camera_center_vecs,
+            calibration_mats=camera_calibration_mat,
+            widths=[width],
+            heights=[height],
+            relative_fps=image_fns,
+            absolute_fps=[
+                os.path.join(image_dp, image_fn) for image_fn in image_fns
+            ],
+            image_dp=image_dp,
+            image_fp_type=image_fp_type,
+        )
+        return camera_batch.to_cameras()
 
     @staticmethod
     def _ensure_consistent_values(cameras):
@@ -130,12 +125,16 @@ class InstantNGPFileHandler:
             assert cam_1.height == cam_2.height
 
     @classmethod
-    def write_instant_ngp_file(
-        cls, ofp, cameras, ref_centroid_shift=None, op=None
+    def get_instant_ngp_json_data(
+        cls, cameras, ref_centroid_shift=None, keep_image_names=False
     ):
-        """Write cameras and points as :code:`Instant-NGP` json file."""
-        log_report("INFO", f"Write Instant-NGP json file: {ofp}", op)
+        """Return the :code:`Instant-NGP` json data of the cameras.
 
+        By default, the image names are derived from the names of the
+        :code:`Blender` cameras (i.e. :code:`<image_stem>_cam`). If
+        :code:`keep_image_names` is set, the relative image paths of the
+        cameras are used instead.
+        """
         cls._ensure_consistent_values(cameras)
         reference_camera = cameras[0]
         cx, cy = reference_camera.get_principal_point()
@@ -163,9 +162,12 @@ class InstantNGPFileHandler:
 
         json_frames = []
         for camera in cameras:
-            blender_name = camera.get_relative_fp()
-            blender_stem = blender_name.split("_")[0]
-            instant_fn = os.path.join("images", f"{blender_stem}.jpg")
+            if keep_image_names:
+                instant_fn = os.path.join("images", camera.get_relative_fp())
+            else:
+                blender_name = camera.get_relative_fp()
+                blender_stem = blender_name.split("_")[0]
+                instant_fn = os.path.join("images", f"{blender_stem}.jpg")
 
             rotation_mat = camera.get_rotation_as_rotation_mat()
             camera_center_vec = camera.get_camera_center()
@@ -190,6 +192,24 @@ class InstantNGPFileHandler:
 
             json_frames.append(json_frame)
         json_data["frames"] = json_frames
+        return json_data
 
+    @classmethod
+    def write_instant_ngp_file(
+        cls,
+        ofp,
+        cameras,
+        ref_centroid_shift=None,
+        op=None,
+        keep_image_names=False,
+    ):
+        """Write cameras and points as :code:`Instant-NGP` json file.
+
+        See :code:`get_instant_ngp_json_data()` for the image names.
+        """
+        log_report("INFO", f"Write Instant-NGP json file: {ofp}", op)
+        json_data = cls.get_instant_ngp_json_data(
+            cameras, ref_centroid_shift, keep_image_names
+        )
         with open(ofp, "w") as f:
             json.dump(json_data, f, indent=4)
@@ -4,10 +4,14 @@ import os
 
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.visibility_index import VisibilityIndex
 from photogrammetry_importer.file_handlers.utility import (
     check_radial_distortion,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class MeshroomFileHandler:
@@ -36,6 +40,8 @@ class MeshroomFileHandler:
     ):
         cams = []
         image_index_to_camera_index = {}
+        rotation_mats = []
+        centers = []
 
         is_valid_file = (
             "views" in json_data
@@ -209,15 +215,17 @@ class MeshroomFileHandler:
             extrinsic_params = extrinsic["pose"]["transform"]
 
             cam_rotation_list = extrinsic_params["rotation"]
-            camera.set_rotation_with_rotation_mat(
+            rotation_mats.append(
                 np.array(cam_rotation_list, dtype=float).reshape(3, 3).T
             )
-            camera.set_camera_center_after_rotation(
-                np.array(extrinsic_params["center"], dtype=float)
-            )
+            centers.append(np.array(extrinsic_params["center"], dtype=float))
             camera.view_index = view_index
 
             cams.append(camera)
+
+        # Convert the rotations of all cameras at once
+        Camera.set_rotations_with_rotation_mats(cams, rotation_mats)
+        Camera.set_camera_centers_after_rotation(cams, centers)
         return cams, image_index_to_camera_index
 
     @staticmethod
@@ -247,6 +255,35 @@ class MeshroomFileHandler:
             points.append(custom_point)
         return points
 
+    @staticmethod
+    def _compute_visibility_index(json_data, image_index_to_camera_index):
+        # The observations refer to view ids, while the cameras are created
+        # for the poses of the reconstruction.
+        view_id_to_camera_index = {}
+        for view in json_data.get("views", []):
+            pose_id = int(view["poseId"])
+            if pose_id in image_index_to_camera_index:
+                view_id_to_camera_index[int(view["viewId"])] = (
+                    image_index_to_camera_index[pose_id]
+                )
+        camera_index_lists = []
+        point_ids = []
+        for json_point in json_data.get("structure", []):
+            camera_index_lists.append(
+                [
+                    view_id_to_camera_index[int(observation["observationId"])]
+                    for observation in json_point.get("observations", [])
+                    if int(observation["observationId"])
+                    in view_id_to_camera_index
+                ]
+            )
+            point_ids.append(int(json_point["landmarkId"]))
+        return VisibilityIndex.from_track_lists(
+            camera_index_lists,
+            point_ids,
+            num_cameras=len(image_index_to_camera_index),
+        )
+
     @classmethod
     def parse_meshroom_sfm_file(
         cls,
@@ -255,12 +292,14 @@ class MeshroomFileHandler:
         image_fp_type,
         suppress_distortion_warnings,
         op=None,
+        return_visibility_index=False,
     ):
         """Parse a :code:`Meshroom` (:code:`.sfm` or :code:`.json`) file.
 
         Parse different file formats created with the
         :code:`StructureFromMotion` / :code:`ConvertSfMFormat` node in
-        :code:`Meshroom`.
+        :code:`Meshroom`. If :code:`return_visibility_index` is set, a
+        :code:`VisibilityIndex` is returned as additional (last) element.
         """
         log_report("INFO", "parse_meshroom_sfm_file: ...", op)
         log_report("INFO", "sfm_ifp: " + sfm_ifp, op)
@@ -284,6 +323,11 @@ class MeshroomFileHandler:
         else:
             points = []
         log_report("INFO", "parse_meshroom_sfm_file: Done", op)
+        if return_visibility_index:
+            visibility_index = cls._compute_visibility_index(
+                json_data, image_index_to_camera_index
+            )
+            return cams, points, visibility_index
         return cams, points
 
     @staticmethod
@@ -529,6 +573,7 @@ class MeshroomFileHandler:
         return sfm_fp, mesh_fp, image_dp
 
     @classmethod
+    @profile_function("Parse Meshroom File")
     def parse_meshroom_file(
         cls,
         meshroom_ifp,
@@ -542,10 +587,13 @@ class MeshroomFileHandler:
         mesh_node_number,
         prepare_node_number,
         op=None,
+        return_visibility_index=False,
     ):
         """Parse a :code:`Meshroom` file.
 
         Supported file formats are :code:`.mg`, :code:`.sfm` or :code:`.json`.
+        If :code:`return_visibility_index` is set, a :code:`VisibilityIndex`
+        is returned as additional (last) element.
         """
         log_report("INFO", "parse_meshroom_file: ...", op)
         log_report("INFO", "meshroom_ifp: " + meshroom_ifp, op)
@@ -576,14 +624,20 @@ class MeshroomFileHandler:
             assert ext == ".json" or ext == ".sfm"
             mesh_fp = None
 
+        visibility_index = None
         if meshroom_ifp is not None:
-            cams, points = cls.parse_meshroom_sfm_file(
+            result = cls.parse_meshroom_sfm_file(
                 meshroom_ifp,
                 image_dp,
                 image_fp_type,
                 suppress_distortion_warnings,
                 op,
+                return_visibility_index=return_visibility_index,
             )
+            if return_visibility_index:
+                cams, points, visibility_index = result
+            else:
+                cams, points = result
         else:
             log_report(
                 "WARNING",
@@ -595,4 +649,10 @@ class MeshroomFileHandler:
             points = []
 
         log_report("INFO", "parse_meshroom_file: Done", op)
+        if return_visibility_index:
+            if visibility_index is None:
+                visibility_index = VisibilityIndex.from_observations(
+                    [], [], num_cameras=0
+                )
+            return cams, points, mesh_fp, image_dp, visibility_index
         return cams, points, mesh_fp, image_dp
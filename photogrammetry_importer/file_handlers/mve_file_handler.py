@@ -14,6 +14,9 @@ from photogrammetry_importer.file_handlers.utility import (
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class MVEFileHandler:
@@ -90,6 +93,18 @@ class MVEFileHandler:
     @staticmethod
     def parse_meta(meta_ifp, width, height, camera_name, op):
         """Parse a :code:`meta.ini` file in the :code:`MVE` workspace."""
+        camera, rotation_mat, translation_vec = MVEFileHandler._parse_meta(
+            meta_ifp, width, height, camera_name, op
+        )
+        camera.set_rotation_with_rotation_mat(rotation_mat)
+        camera.set_camera_translation_vector_after_rotation(translation_vec)
+        return camera
+
+    @staticmethod
+    def _parse_meta(meta_ifp, width, height, camera_name, op):
+        # Return the camera with intrinsic parameters as well as the rotation
+        # matrix and the translation vector (so that the rotations of all
+        # views can be converted at once)
         view_specific_dir = os.path.dirname(meta_ifp)
         relative_image_fp = os.path.join(view_specific_dir, "undistorted.png")
         image_dp = os.path.dirname(view_specific_dir)
@@ -164,9 +179,7 @@ class MVEFileHandler:
             MVEFileHandler._str_to_arr(translation_str, target_type=float)
         )
 
-        camera.set_rotation_with_rotation_mat(rotation_mat)
-        camera.set_camera_translation_vector_after_rotation(translation_vec)
-        return camera
+        return camera, rotation_mat, translation_vec
 
     @staticmethod
     def parse_views(
@@ -178,14 +191,26 @@ class MVEFileHandler:
     ):
         """Parse the :code:`views` directory in the :code:`MVE` workspace."""
         cameras = []
+        rotation_mats = []
+        translation_vecs = []
         subdirs = get_subdirs(views_idp)
-        for subdir in subdirs:
+        undistorted_img_ifps = [
+            os.path.join(subdir, "undistorted.png") for subdir in subdirs
+        ]
+        image_sizes = ImageFileHandler.read_image_sizes(undistorted_img_ifps)
+        for subdir, undistorted_img_ifp, image_size in zip(
+            subdirs, undistorted_img_ifps, image_sizes
+        ):
             folder_name = os.path.basename(subdir)
             # folder_name = view_0000.mve
             camera_name = folder_name.split("_")[1].split(".")[0]
-            undistorted_img_ifp = os.path.join(subdir, "undistorted.png")
-            success, width, height = ImageFileHandler.read_image_size(
+            (
+                success,
+                width,
+                height,
+            ) = ImageFileHandler.get_image_size_or_default(
                 undistorted_img_ifp,
+                image_size,
                 default_width=default_width,
                 default_height=default_height,
                 op=op,
@@ -193,9 +218,15 @@ class MVEFileHandler:
             assert success
 
             meta_ifp = os.path.join(subdir, "meta.ini")
-            camera = MVEFileHandler.parse_meta(
+            (
+                camera,
+                rotation_mat,
+                translation_vec,
+            ) = MVEFileHandler._parse_meta(
                 meta_ifp, width, height, camera_name, op
             )
+            rotation_mats.append(rotation_mat)
+            translation_vecs.append(translation_vec)
 
             if add_depth_maps_as_point_cloud:
                 for level in range(9):
@@ -216,9 +247,16 @@ class MVEFileHandler:
                     )
 
             cameras.append(camera)
+
+        # Convert the rotations of all views at once
+        Camera.set_rotations_with_rotation_mats(cameras, rotation_mats)
+        Camera.set_camera_translation_vectors_after_rotation(
+            cameras, translation_vecs
+        )
         return cameras
 
     @staticmethod
+    @profile_function("Parse MVE Workspace")
     def parse_mve_workspace(
         workspace_idp,
         default_width,
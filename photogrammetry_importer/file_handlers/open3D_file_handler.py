@@ -9,12 +9,16 @@ from photogrammetry_importer.utility.os_utility import (
 )
 
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class Open3DFileHandler:
     """Class to read and write :code:`Open3D` files."""
 
     @staticmethod
+    @profile_function("Parse Open3D File")
     def parse_open3d_file(open3d_ifp, image_dp, image_fp_type, op):
         """Parse an :code:`Open3D` (:code:`.json` or :code:`.log`) file.
 
@@ -71,6 +75,7 @@ class Open3DFileHandler:
         open3d_ifp, image_dp, image_relative_fp_list, image_fp_type, op
     ):
         cams = []
+        cam_to_world_mats = []
         with open(open3d_ifp, "r") as open3d_file:
             lines = open3d_file.readlines()
             # Chunk size: 1 line meta data, 4 lines for the matrix
@@ -106,12 +111,13 @@ class Open3DFileHandler:
                 image_absolute_fp = os.path.join(image_dp, image_relative_fp)
                 cam._absolute_fp = image_absolute_fp
 
-                # Accuracy of rotation matrices is too low => disable test
-                cam.set_4x4_cam_to_world_mat(
-                    extrinsic_matrix, check_rotation=False
-                )
-
+                cam_to_world_mats.append(extrinsic_matrix)
                 cams.append(cam)
+
+        # Accuracy of rotation matrices is too low => disable test
+        Camera.set_4x4_cam_to_world_mats(
+            cams, cam_to_world_mats, check_rotation=False
+        )
         return cams
 
     @staticmethod
@@ -119,6 +125,7 @@ class Open3DFileHandler:
         open3d_ifp, image_dp, image_relative_fp_list, image_fp_type, op
     ):
         cams = []
+        cam_to_world_mats = []
 
         with open(open3d_ifp, "r") as open3d_file:
             json_data = json.load(open3d_file)
@@ -151,10 +158,7 @@ class Open3DFileHandler:
                 cam.width = intrinsic["width"]
                 cam.height = intrinsic["height"]
 
-                # Accuracy of rotation matrices is too low => disable test
-                cam.set_4x4_cam_to_world_mat(
-                    extrinsic_mat, check_rotation=False
-                )
+                cam_to_world_mats.append(extrinsic_mat)
 
                 intrinsic = intrinsic["intrinsic_matrix"]
                 intrinsic_mat = (
@@ -163,4 +167,9 @@ class Open3DFileHandler:
                 cam.set_calibration_mat(intrinsic_mat)
 
                 cams.append(cam)
+
+        # Accuracy of rotation matrices is too low => disable test
+        Camera.set_4x4_cam_to_world_mats(
+            cams, cam_to_world_mats, check_rotation=False
+        )
         return cams
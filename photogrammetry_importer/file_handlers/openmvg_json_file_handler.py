@@ -4,10 +4,14 @@ import os
 
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.visibility_index import VisibilityIndex
 from photogrammetry_importer.file_handlers.utility import (
     check_radial_distortion,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class OpenMVGJSONFileHandler:
@@ -47,6 +51,8 @@ class OpenMVGJSONFileHandler:
         )
 
         cams = []
+        rotation_mats = []
+        centers = []
         # Iterate over views and create a camera if intrinsic and extrinsic
         # parameters exist
         for id, view in views.items():  # Iterate over views
@@ -136,15 +142,17 @@ class OpenMVGJSONFileHandler:
                 )
                 extrinsic_params = extrinsics[id_pose]
                 cam_rotation_list = extrinsic_params["value"]["rotation"]
-                camera.set_rotation_with_rotation_mat(
-                    np.array(cam_rotation_list, dtype=float)
-                )
-                camera.set_camera_center_after_rotation(
+                rotation_mats.append(np.array(cam_rotation_list, dtype=float))
+                centers.append(
                     np.array(extrinsic_params["value"]["center"], dtype=float)
                 )
                 camera.view_index = id_view
 
                 cams.append(camera)
+
+        # Convert the rotations of all cameras at once
+        Camera.set_rotations_with_rotation_mats(cams, rotation_mats)
+        Camera.set_camera_centers_after_rotation(cams, centers)
         return cams
 
     @staticmethod
@@ -178,14 +186,41 @@ class OpenMVGJSONFileHandler:
         return points
 
     @staticmethod
+    def _compute_visibility_index(json_data, cams):
+        view_index_to_camera_index = {
+            cam.view_index: camera_index
+            for camera_index, cam in enumerate(cams)
+        }
+        camera_index_lists = []
+        point_ids = []
+        for json_point in json_data["structure"]:
+            camera_index_lists.append(
+                [
+                    view_index_to_camera_index[observation["key"]]
+                    for observation in json_point["value"]["observations"]
+                    if observation["key"] in view_index_to_camera_index
+                ]
+            )
+            point_ids.append(int(json_point["key"]))
+        return VisibilityIndex.from_track_lists(
+            camera_index_lists, point_ids, num_cameras=len(cams)
+        )
+
+    @staticmethod
+    @profile_function("Parse OpenMVG File")
     def parse_openmvg_file(
         input_openMVG_file_path,
         image_dp,
         image_fp_type,
         suppress_distortion_warnings,
         op=None,
+        return_visibility_index=False,
     ):
-        """Parse an :code:`OpenMVG` (:code:`.json`) file."""
+        """Parse an :code:`OpenMVG` (:code:`.json`) file.
+
+        If :code:`return_visibility_index` is set, a :code:`VisibilityIndex`
+        is returned as additional (last) element.
+        """
 
         log_report("INFO", "parse_openmvg_file: ...", op)
         log_report(
@@ -208,4 +243,11 @@ class OpenMVGJSONFileHandler:
             json_data, view_index_to_absolute_fp, op
         )
         log_report("INFO", "parse_openmvg_file: Done", op)
+        if return_visibility_index:
+            visibility_index = (
+                OpenMVGJSONFileHandler._compute_visibility_index(
+                    json_data, cams
+                )
+            )
+            return cams, points, visibility_index
         return cams, points
@@ -4,12 +4,18 @@ import os
 import math
 import sys
 
-from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_batch import CameraBatch
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.utility.quaternion_utility import (
+    rodrigues_vecs_to_rotation_matrices,
+)
 from photogrammetry_importer.file_handlers.utility import (
     check_radial_distortion,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class OpenSfMJSONFileHandler:
@@ -103,50 +109,68 @@ class OpenSfMJSONFileHandler:
         json_cameras_intrinsics = json_data["cameras"]
         views = json_data["shots"]
 
-        cams = []
-        for view_name in views:
-            view = views[view_name]
-
-            camera = Camera()
-            camera.image_fp_type = image_fp_type
-            camera.image_dp = image_dp
-            camera._relative_fp = view_name
-            camera._absolute_fp = os.path.join(image_dp, view_name)
-
-            intrinsic_key = view["camera"]
-            (
-                focal_length,
-                cx,
-                cy,
-                width,
-                height,
-                radial_distortion,
-            ) = OpenSfMJSONFileHandler._convert_intrinsics(
-                json_cameras_intrinsics[intrinsic_key],
-                camera._relative_fp,
-                suppress_distortion_warnings,
-                op,
-            )
-            camera.height = height
-            camera.width = width
-            camera_calibration_matrix = np.array(
-                [[focal_length, 0, cx], [0, focal_length, cy], [0, 0, 1]]
-            )
-            camera.set_calibration(
-                camera_calibration_matrix, radial_distortion
-            )
-
-            rodrigues_vec = np.array(view["rotation"], dtype=float)
-            rot_mat = OpenSfMJSONFileHandler._rodrigues_to_matrix(
-                rodrigues_vec
-            )
-            camera.set_rotation_with_rotation_mat(rot_mat)
-            camera.set_camera_translation_vector_after_rotation(
-                np.array(view["translation"], dtype=float)
-            )
+        # Table of shared intrinsics (one entry per OpenSfM camera)
+        intrinsic_key_to_index = {}
+        calibration_mats = []
+        widths = []
+        heights = []
+        radial_distortions = []
+        view_names = list(views)
+        intrinsic_indices = []
+        for view_name in view_names:
+            intrinsic_key = views[view_name]["camera"]
+            intrinsic_index = intrinsic_key_to_index.get(intrinsic_key)
+            if intrinsic_index is None:
+                (
+                    focal_length,
+                    cx,
+                    cy,
+                    width,
+                    height,
+                    radial_distortion,
+                ) = OpenSfMJSONFileHandler._convert_intrinsics(
+                    json_cameras_intrinsics[intrinsic_key],
+                    view_name,
+                    True,
+                    op,
+                )
+                intrinsic_index = len(calibration_mats)
+                intrinsic_key_to_index[intrinsic_key] = intrinsic_index
+                calibration_mats.append(
+                    [[focal_length, 0, cx], [0, focal_length, cy], [0, 0, 1]]
+                )
+                widths.append(width)
+                heights.append(height)
+                radial_distortions.append(radial_distortion)
+            if not suppress_distortion_warnings:
+                check_radial_distortion(
+                    radial_distortions[intrinsic_index], view_name, op
+                )
+            intrinsic_indices.append(intrinsic_index)
 
-            cams.append(camera)
-        return cams
+        rotation_mats = rodrigues_vecs_to_rotation_matrices(
+            [views[view_name]["rotation"] for view_name in view_names]
+        )
+        translation_vecs = [
+            np.array(views[view_name]["translation"], dtype=float)
+            for view_name in view_names
+        ]
+        camera_batch = CameraBatch.from_world_to_cam(
+            rotation_mats,
+            translation_vecs,
+            calibration_mats=np.array(calibration_mats, dtype=float),
+            widths=np.array(widths, dtype=object),
+            heights=np.array(heights, dtype=object),
+            intrinsic_indices=intrinsic_indices,
+            radial_distortions=radial_distortions,
+            relative_fps=view_names,
+            absolute_fps=[
+                os.path.join(image_dp, view_name) for view_name in view_names
+            ],
+            image_dp=image_dp,
+            image_fp_type=image_fp_type,
+        )
+        return camera_batch.to_cameras()
 
     @staticmethod
     def _parse_points(json_data, op):
@@ -164,6 +188,7 @@ class OpenSfMJSONFileHandler:
         return points
 
     @staticmethod
+    @profile_function("Parse OpenSfM File")
     def parse_opensfm_file(
         input_opensfm_fp,
         image_dp,
@@ -5,6 +5,9 @@ import importlib
 from photogrammetry_importer.types.point import Point
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 from photogrammetry_importer.utility.type_utility import is_float, is_int
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class _DataSemantics:
@@ -187,6 +190,7 @@ class PointDataFileHandler:
         return named_list
 
     @staticmethod
+    @profile_function("Parse Point Data File")
     def parse_point_data_file(ifp, op=None):
         """Parse a point data file.
 
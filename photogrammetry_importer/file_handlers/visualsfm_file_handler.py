@@ -4,10 +4,14 @@ import numpy as np
 
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.visibility_index import VisibilityIndex
 from photogrammetry_importer.file_handlers.utility import (
     check_radial_distortion,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class VisualSfMFileHandler:
@@ -44,6 +48,8 @@ class VisualSfMFileHandler:
         """
         # log_report('INFO', '_parse_cameras: ...', op)
         cameras = []
+        quaternions = []
+        center_vecs = []
 
         for i in range(num_cameras):
             line = input_file.readline()
@@ -86,26 +92,8 @@ class VisualSfMFileHandler:
             assert zero_value == 0
 
             current_camera = Camera()
-            # Setting the quaternion also sets the rotation matrix
-            current_camera.set_rotation_with_quaternion(quaternion)
-
-            # Set the camera center after rotation
-            current_camera._center = center_vec
-
-            # set the camera view direction as normal w.r.t world coordinates
-            cam_view_vec_cam_coord = np.array([0, 0, 1]).T
-            cam_rotation_matrix_inv = np.linalg.inv(
-                current_camera.get_rotation_as_rotation_mat()
-            )
-            cam_view_vec_world_coord = cam_rotation_matrix_inv.dot(
-                cam_view_vec_cam_coord
-            )
-            current_camera.normal = cam_view_vec_world_coord
-
-            translation_vec = cls._compute_translation_vector(
-                center_vec, current_camera.get_rotation_as_rotation_mat()
-            )
-            current_camera._translation_vec = translation_vec
+            quaternions.append(quaternion)
+            center_vecs.append(center_vec)
 
             current_camera.set_calibration(
                 camera_calibration_matrix, radial_distortion=radial_distortion
@@ -118,11 +106,24 @@ class VisualSfMFileHandler:
             current_camera._relative_fp = relative_path
             current_camera.id = i
             cameras.append(current_camera)
+
+        # Setting the quaternions also sets the rotation matrices. The
+        # rotations of all cameras are converted at once.
+        Camera.set_rotations_with_quaternions(cameras, quaternions)
+        # Set the camera centers after rotation
+        Camera.set_camera_centers_after_rotation(cameras, center_vecs)
+
+        # Set the camera view directions as normals w.r.t world coordinates,
+        # i.e. R^-1 [0, 0, 1]^T = R^T [0, 0, 1]^T (the third row of R)
+        for current_camera in cameras:
+            current_camera.normal = (
+                current_camera.get_rotation_as_rotation_mat()[2].copy()
+            )
         # log_report('INFO', '_parse_cameras: Done', op)
         return cameras
 
     @staticmethod
-    def _parse_nvm_points(input_file, num_3D_points):
+    def _parse_nvm_points(input_file, num_3D_points, camera_index_lists=None):
         points = []
         for point_index in range(num_3D_points):
             # From the VSFM docs:
@@ -135,6 +136,12 @@ class VisualSfMFileHandler:
                 coord=xyz_vec, color=rgb_vec, id=point_index, scalars=None
             )
             points.append(current_point)
+            if camera_index_lists is not None:
+                # <Measurement> = <Image index> <Feature Index> <xy>
+                num_measurements = int(point_line_elements[6])
+                camera_index_lists.append(
+                    point_line_elements[7 : 7 + 4 * num_measurements : 4]
+                )
 
         return points
 
@@ -162,6 +169,7 @@ class VisualSfMFileHandler:
         return calib_mat
 
     @classmethod
+    @profile_function("Parse VisualSfM File")
     def parse_visualsfm_file(
         cls,
         input_visual_fsm_file_name,
@@ -169,8 +177,13 @@ class VisualSfMFileHandler:
         image_fp_type,
         suppress_distortion_warnings,
         op=None,
+        return_visibility_index=False,
     ):
-        """Parse a :code:`VisualSfM` (:code:`.nvm`) file."""
+        """Parse a :code:`VisualSfM` (:code:`.nvm`) file.
+
+        If :code:`return_visibility_index` is set, a :code:`VisibilityIndex`
+        is returned as additional (last) element.
+        """
         log_report("INFO", "Parse NVM file: " + input_visual_fsm_file_name, op)
         input_file = open(input_visual_fsm_file_name, "r")
         # Documentation of *.NVM data format
@@ -207,6 +220,7 @@ class VisualSfMFileHandler:
         current_line = (input_file.readline()).rstrip()
         assert current_line == ""
         current_line = (input_file.readline()).rstrip()
+        camera_index_lists = [] if return_visibility_index else None
         if current_line.isdigit():
             amount_points = int(current_line)
             log_report(
@@ -215,11 +229,20 @@ class VisualSfMFileHandler:
                 + str(amount_points),
                 op,
             )
-            points = cls._parse_nvm_points(input_file, amount_points)
+            points = cls._parse_nvm_points(
+                input_file, amount_points, camera_index_lists
+            )
         else:
             points = []
 
         log_report("INFO", "Parse NVM file: Done", op)
+        if return_visibility_index:
+            visibility_index = VisibilityIndex.from_track_lists(
+                camera_index_lists,
+                [point.id for point in points],
+                num_cameras=len(cameras),
+            )
+            return cameras, points, visibility_index
         return cameras, points
 
     @staticmethod
@@ -362,14 +385,3 @@ class VisualSfMFileHandler:
         output_file.writelines([item.encode() for item in nvm_content])
 
         log_report("INFO", "Write NVM file: Done", op)
-
-    @staticmethod
-    def _compute_translation_vector(c, R):
-        """
-        x_cam = R (X - C) = RX - RC == RX + t
-        <=> t = -RC
-        """
-        t = np.zeros(3, dtype=float)
-        for j in range(0, 3):
-            t[j] = -float(R[j][0] * c[0] + R[j][1] * c[1] + R[j][2] * c[2])
-        return t
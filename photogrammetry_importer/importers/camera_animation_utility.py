@@ -1,9 +1,7 @@
 import os
-import shutil
 from collections import namedtuple
+import numpy as np
 import bpy
-from mathutils import Quaternion
-from mathutils import Matrix
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 
 from photogrammetry_importer.importers.camera_utility import (
@@ -16,9 +14,20 @@ from photogrammetry_importer.blender_utility.object_utility import add_obj
 
 from photogrammetry_importer.utility.os_utility import (
     get_image_file_paths_in_dir,
+    link_or_copy_files,
 )
 
 from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.utility.camera_path_utility import (
+    compute_camera_path,
+)
+from photogrammetry_importer.utility.quaternion_utility import (
+    make_quaternions_continuous,
+    rotation_matrices_to_quaternions,
+)
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 _CameraIntrinsics = namedtuple(
@@ -35,12 +44,13 @@ class _NonReconstructedCamera(Camera):
 def _enhance_cameras_with_non_reconstructed_cameras(
     cameras, image_dp, image_fp_type, op=None
 ):
-    rec_image_relative_fp = []
+    # Use a set for constant time membership tests
+    rec_image_relative_fp = set()
     for camera in cameras:
         if camera.has_undistorted_absolute_fp():
-            rec_image_relative_fp.append(camera.get_undistorted_relative_fp())
+            rec_image_relative_fp.add(camera.get_undistorted_relative_fp())
         else:
-            rec_image_relative_fp.append(camera.get_relative_fp())
+            rec_image_relative_fp.add(camera.get_relative_fp())
 
     # rec_image_relative_fp = [camera.get_relative_fp() for camera in cameras]
 
@@ -80,65 +90,99 @@ def _enhance_cameras_with_non_reconstructed_cameras(
     return cameras
 
 
-def _remove_quaternion_discontinuities(target_obj):
-    # the interpolation of quaternions may lead to discontinuities
-    # if the quaternions show different signs
-
-    # https://blender.stackexchange.com/questions/58866/keyframe-interpolation-instability
-    action = target_obj.animation_data.action
-
-    # quaternion curves
-    fqw = action.fcurves.find("rotation_quaternion", index=0)
-    fqx = action.fcurves.find("rotation_quaternion", index=1)
-    fqy = action.fcurves.find("rotation_quaternion", index=2)
-    fqz = action.fcurves.find("rotation_quaternion", index=3)
-
-    # invert quaternion so that interpolation takes the shortest path
-    if len(fqw.keyframe_points) > 0:
-        current_quat = Quaternion(
-            (
-                fqw.keyframe_points[0].co[1],
-                fqx.keyframe_points[0].co[1],
-                fqy.keyframe_points[0].co[1],
-                fqz.keyframe_points[0].co[1],
-            )
-        )
-
-        for i in range(len(fqw.keyframe_points) - 1):
-            last_quat = current_quat
-            current_quat = Quaternion(
-                (
-                    fqw.keyframe_points[i + 1].co[1],
-                    fqx.keyframe_points[i + 1].co[1],
-                    fqy.keyframe_points[i + 1].co[1],
-                    fqz.keyframe_points[i + 1].co[1],
-                )
-            )
-
-            if last_quat.dot(current_quat) < 0:
-                current_quat.negate()
-                fqw.keyframe_points[i + 1].co[1] = -fqw.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqx.keyframe_points[i + 1].co[1] = -fqx.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqy.keyframe_points[i + 1].co[1] = -fqy.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqz.keyframe_points[i + 1].co[1] = -fqz.keyframe_points[
-                    i + 1
-                ].co[1]
+# Values of Blender's keyframe interpolation enum (see DNA_curve_types.h),
+# which are required by foreach_set()
+_INTERPOLATION_TYPE_TO_VALUE = {
+    "CONSTANT": 0,
+    "LINEAR": 1,
+    "BEZIER": 2,
+    "BACK": 3,
+    "BOUNCE": 4,
+    "CIRC": 5,
+    "CUBIC": 6,
+    "ELASTIC": 7,
+    "EXPO": 8,
+    "QUAD": 9,
+    "QUART": 10,
+    "QUINT": 11,
+    "SINE": 12,
+}
 
 
 def _set_fcurve_interpolation(some_obj, interpolation_type="LINEAR"):
     # interpolation_string: ['CONSTANT', 'LINEAR', 'BEZIER', 'SINE',
     # 'QUAD', 'CUBIC', 'QUART', 'QUINT', 'EXPO', 'CIRC',
     # 'BACK', 'BOUNCE', 'ELASTIC']
+    interpolation_value = _INTERPOLATION_TYPE_TO_VALUE[interpolation_type]
     fcurves = some_obj.animation_data.action.fcurves
     for fcurve in fcurves:
-        for kf in fcurve.keyframe_points:
-            kf.interpolation = interpolation_type
+        num_keyframes = len(fcurve.keyframe_points)
+        fcurve.keyframe_points.foreach_set(
+            "interpolation",
+            np.full(num_keyframes, interpolation_value, dtype=np.int32),
+        )
+        fcurve.update()
+
+
+def _get_or_create_action(id_data, action_name):
+    if id_data.animation_data is None:
+        id_data.animation_data_create()
+    if id_data.animation_data.action is None:
+        id_data.animation_data.action = bpy.data.actions.new(action_name)
+    return id_data.animation_data.action
+
+
+def _add_fcurve_keyframes(
+    id_data, data_path, frames, values, action_group=None
+):
+    """Add keyframes for all components of a property in bulk.
+
+    The parameter :code:`values` must be an array of shape (N, K), where K is
+    the number of components (e.g. 4 for quaternions) and N the number of
+    frames.
+    """
+    action = _get_or_create_action(id_data, id_data.name + "Action")
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32).reshape(len(frames), -1)
+    co = np.empty(2 * len(frames), dtype=np.float32)
+    co[0::2] = frames
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve is None:
+            if action_group is None:
+                fcurve = action.fcurves.new(data_path, index=index)
+            else:
+                fcurve = action.fcurves.new(
+                    data_path, index=index, action_group=action_group
+                )
+        else:
+            fcurve.keyframe_points.clear()
+        co[1::2] = values[:, index]
+        fcurve.keyframe_points.add(len(frames))
+        fcurve.keyframe_points.foreach_set("co", co)
+        # The handles are recomputed by update()
+        fcurve.keyframe_points.foreach_set("handle_left", co)
+        fcurve.keyframe_points.foreach_set("handle_right", co)
+        fcurve.update()
+
+
+def _get_keyframe_indices(values_sorted, number_interpolation_frames):
+    step_size = number_interpolation_frames + 1
+    return [
+        (index + 1) * step_size
+        for index, value in enumerate(values_sorted)
+        if value is not None
+    ]
+
+
+CameraPathOptions = namedtuple(
+    "CameraPathOptions",
+    "position_interpolation rotation_interpolation smoothing_sigma",
+)
+
+
+def _get_baked_frame_indices(keyframe_indices):
+    return np.arange(keyframe_indices[0], keyframe_indices[-1] + 1)
 
 
 def _add_transformation_animation(
@@ -147,6 +191,7 @@ def _add_transformation_animation(
     number_interpolation_frames,
     interpolation_type=None,
     remove_rotation_discontinuities=True,
+    camera_path_options=None,
     op=None,
 ):
     log_report("INFO", "Adding transformation animation: ...", op)
@@ -157,71 +202,121 @@ def _add_transformation_animation(
     scene.frame_end = step_size * len(transformations_sorted)
     animated_obj = bpy.data.objects[animated_obj_name]
 
-    for index, transformation in enumerate(transformations_sorted):
-        # log_report('INFO', 'index: ' + str(index), op)
-        # log_report('INFO', 'transformation: ' + str(transformation), op)
-
-        current_keyframe_index = (index + 1) * step_size
-
-        if transformation is None:
-            continue
-
-        # A direct assignment of a numpy array leads to incorrect results!
-        animated_obj.matrix_world = Matrix(transformation)
+    keyframe_indices = _get_keyframe_indices(
+        transformations_sorted, number_interpolation_frames
+    )
+    if len(keyframe_indices) == 0:
+        log_report("INFO", "Adding transformation animation: Done", op)
+        return
 
-        animated_obj.keyframe_insert(
-            data_path="location", index=-1, frame=current_keyframe_index
+    transformations = np.array(
+        [
+            np.array(transformation)
+            for transformation in transformations_sorted
+            if transformation is not None
+        ],
+        dtype=np.float64,
+    )
+    locations = transformations[:, 0:3, 3]
+    # Don't use euler rotations, they show too many discontinuties
+    quaternions = rotation_matrices_to_quaternions(
+        transformations[:, 0:3, 0:3]
+    )
+    if remove_rotation_discontinuities:
+        # q and -q represent the same rotation
+        quaternions = make_quaternions_continuous(quaternions)
+
+    if camera_path_options is not None:
+        # Bake the precomputed path into a keyframe for each frame
+        sample_indices = _get_baked_frame_indices(keyframe_indices)
+        locations, quaternions = compute_camera_path(
+            keyframe_indices,
+            locations,
+            quaternions,
+            sample_indices,
+            position_interpolation=camera_path_options.position_interpolation,
+            rotation_interpolation=camera_path_options.rotation_interpolation,
+            smoothing_sigma=camera_path_options.smoothing_sigma,
         )
+        keyframe_indices = sample_indices
+        # The values of all frames are given
+        interpolation_type = "LINEAR"
+
+    animated_obj.rotation_mode = "QUATERNION"
+    _add_fcurve_keyframes(
+        animated_obj,
+        "location",
+        keyframe_indices,
+        locations,
+        action_group="Object Transforms",
+    )
+    _add_fcurve_keyframes(
+        animated_obj,
+        "rotation_quaternion",
+        keyframe_indices,
+        quaternions,
+        action_group="Object Transforms",
+    )
 
-        # Don't use euler rotations, they show too many discontinuties
-        # animated_obj.keyframe_insert(
-        #   data_path="rotation_euler",
-        #   index=-1,
-        #   frame=current_keyframe_index)
-
-        animated_obj.rotation_mode = "QUATERNION"
-        animated_obj.keyframe_insert(
-            data_path="rotation_quaternion",
-            index=-1,
-            frame=current_keyframe_index,
-        )
+    if interpolation_type is not None:
+        _set_fcurve_interpolation(animated_obj, interpolation_type)
 
-        if remove_rotation_discontinuities:
-            # q and -q represent the same rotation
-            _remove_quaternion_discontinuities(animated_obj)
+    log_report("INFO", "Adding transformation animation: Done", op)
 
-        if interpolation_type is not None:
-            _set_fcurve_interpolation(animated_obj, interpolation_type)
 
-    log_report("INFO", "Adding transformation animation: Done", op)
+def _convert_field_of_view_to_lens(camera_data, field_of_views):
+    # Analogous to Blender's conversion when setting "Camera.angle"
+    if camera_data.sensor_fit == "VERTICAL":
+        sensor_size = camera_data.sensor_height
+    else:
+        sensor_size = camera_data.sensor_width
+    return (sensor_size / 2.0) / np.tan(np.asarray(field_of_views) / 2.0)
 
 
 def _add_camera_intrinsics_animation(
-    animated_obj_name, intrinsics_sorted, number_interpolation_frames, op=None
+    animated_obj_name,
+    intrinsics_sorted,
+    number_interpolation_frames,
+    bake_camera_path=False,
+    op=None,
 ):
     log_report("INFO", "Adding camera intrinsic parameter animation: ...", op)
 
-    step_size = number_interpolation_frames + 1
     animated_obj = bpy.data.objects[animated_obj_name]
-
-    for index, intrinsics in enumerate(intrinsics_sorted):
-        current_keyframe_index = (index + 1) * step_size
-
-        if intrinsics is None:
-            continue
-
-        animated_obj.data.angle = intrinsics.field_of_view
-        animated_obj.data.shift_x = intrinsics.shift_x
-        animated_obj.data.shift_y = intrinsics.shift_y
-
-        animated_obj.data.keyframe_insert(
-            data_path="lens", index=-1, frame=current_keyframe_index
+    keyframe_indices = _get_keyframe_indices(
+        intrinsics_sorted, number_interpolation_frames
+    )
+    if len(keyframe_indices) > 0:
+        intrinsics = np.array(
+            [
+                intrinsic
+                for intrinsic in intrinsics_sorted
+                if intrinsic is not None
+            ],
+            dtype=np.float64,
         )
-        animated_obj.data.keyframe_insert(
-            data_path="shift_x", index=-1, frame=current_keyframe_index
+        if bake_camera_path and len(keyframe_indices) > 1:
+            sample_indices = _get_baked_frame_indices(keyframe_indices)
+            intrinsics = np.stack(
+                [
+                    np.interp(sample_indices, keyframe_indices, column)
+                    for column in intrinsics.T
+                ],
+                axis=1,
+            )
+            keyframe_indices = sample_indices
+        camera_data = animated_obj.data
+        lens_values = _convert_field_of_view_to_lens(
+            camera_data, intrinsics[:, 0]
+        )
+        _add_fcurve_keyframes(
+            camera_data, "lens", keyframe_indices, lens_values
         )
-        animated_obj.data.keyframe_insert(
-            data_path="shift_y", index=-1, frame=current_keyframe_index
+        _add_fcurve_keyframes(
+            camera_data, "shift_x", keyframe_indices, intrinsics[:, 1]
+        )
+        _add_fcurve_keyframes(
+            camera_data, "shift_y", keyframe_indices, intrinsics[:, 2]
         )
 
     log_report("INFO", "Adding camera intrinsic parameter animation: Done", op)
@@ -266,12 +361,24 @@ def _reorganize_undistorted_images(cameras_sorted, op):
     if not os.path.isdir(reorganized_undistorted_dp):
         os.mkdir(reorganized_undistorted_dp)
 
+    src_fps = []
+    dst_fps = []
     for cam in cameras_sorted:
         reorganized_fn = _get_reorganized_file_name(cam, common_prefix)
         reorganized_fp = os.path.join(
             reorganized_undistorted_dp, reorganized_fn
         )
-        shutil.copyfile(cam.get_undistorted_absolute_fp(), reorganized_fp)
+        src_fps.append(cam.get_undistorted_absolute_fp())
+        dst_fps.append(reorganized_fp)
+    # Prefer links over copies and skip files of previous imports
+    counts = link_or_copy_files(src_fps, dst_fps)
+    num_linked = counts["HARDLINKED"] + counts["SYMLINKED"]
+    log_report(
+        "INFO",
+        f"Reorganized images: {counts['SKIPPED']} up to date, {num_linked}"
+        f" linked, {counts['COPIED']} copied",
+        op,
+    )
 
     first_cam = cameras_sorted[0]
     first_fn = _get_reorganized_file_name(first_cam, common_prefix)
@@ -326,6 +433,7 @@ def _add_background_image_sequence(
         bg_img.clip = bpy.data.movieclips[movie_clip_name]
 
 
+@profile_function("Add Camera Animation")
 def add_camera_animation(
     cameras,
     parent_collection,
@@ -338,9 +446,15 @@ def add_camera_animation(
     consider_missing_cameras_during_animation=False,
     image_dp=None,
     image_fp_type=None,
+    camera_path_options=None,
     op=None,
 ):
-    """Add an animated camera from a set of reconstructed cameras."""
+    """Add an animated camera from a set of reconstructed cameras.
+
+    If :code:`camera_path_options` (see :code:`CameraPathOptions`) is
+    provided, the camera path is precomputed (interpolated and optionally
+    smoothed) and baked into a keyframe for each frame.
+    """
     log_report("INFO", "Adding Camera Animation: ...", op)
 
     if len(cameras) == 0:
@@ -398,6 +512,7 @@ def add_camera_animation(
         number_interpolation_frames=number_interpolation_frames,
         interpolation_type=interpolation_type,
         remove_rotation_discontinuities=remove_rotation_discontinuities,
+        camera_path_options=camera_path_options,
         op=op,
     )
 
@@ -405,6 +520,7 @@ def add_camera_animation(
         animated_obj_name=cam_obj.name,
         intrinsics_sorted=camera_intrinsics_sorted,
         number_interpolation_frames=number_interpolation_frames,
+        bake_camera_path=camera_path_options is not None,
         op=op,
     )
 
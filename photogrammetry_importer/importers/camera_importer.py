@@ -9,16 +9,12 @@ from bpy.props import (
     FloatVectorProperty,
 )
 
-from photogrammetry_importer.importers.camera_utility import (
-    add_cameras,
-    adjust_render_settings_if_possible,
-)
-from photogrammetry_importer.importers.camera_animation_utility import (
-    add_camera_animation,
-)
 from photogrammetry_importer.types.camera import Camera
 
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class CameraImporter:
@@ -97,6 +93,13 @@ class CameraImporter:
         "scene from a specific camera",
         default=True,
     )
+    share_camera_data: BoolProperty(
+        name="Share Camera Data",
+        description="Cameras with identical intrinsic parameters share a "
+        "single camera data entity, which reduces import time and file size. "
+        "Only used if no background images are added",
+        default=True,
+    )
     add_image_planes: BoolProperty(
         name="Add an Image Plane for each Camera",
         description="Add an Image Plane for each Camera - only for "
@@ -117,6 +120,34 @@ class CameraImporter:
         min=0,
         max=1,
     )
+    image_loading_mode: EnumProperty(
+        name="Image Loading",
+        description="Choose when the images of the background images and "
+        "image planes are loaded",
+        items=(
+            ("IMMEDIATE", "Immediate", "Load all images during the import"),
+            (
+                "DEFERRED",
+                "Deferred",
+                "Load the image of a camera once the camera becomes the "
+                "active camera and the image of an image plane once the image "
+                "plane becomes visible. Image planes are added hidden",
+            ),
+        ),
+    )
+    use_image_proxies: BoolProperty(
+        name="Use Image Proxies",
+        description="Use downscaled copies of the images for the background "
+        "images and image planes. The copies are created in parallel and "
+        "stored in an on-disk cache. Requires Pillow",
+        default=False,
+    )
+    image_proxy_max_resolution: IntProperty(
+        name="Maximum Proxy Resolution",
+        description="Maximum width and height of the image proxies",
+        default=2048,
+        min=16,
+    )
     add_depth_maps_as_point_cloud: BoolProperty(
         name="Add Depth Maps (EXPERIMENTAL)",
         description="Add the depth map (if available) as point cloud "
@@ -145,6 +176,13 @@ class CameraImporter:
         default=10,
         min=1,
     )
+    depth_map_voxel_size: FloatProperty(
+        name="Depth Map Voxel Size",
+        description="Reduce each depth map point cloud to a single point per "
+        "voxel of this size. A value of 0 disables the voxel downsampling",
+        default=0.0,
+        min=0.0,
+    )
     depth_map_id_or_name_str: StringProperty(
         name="Depth Map IDs or Names to Display",
         description="A list of camera indices or names (separated by "
@@ -213,6 +251,46 @@ class CameraImporter:
         items=interpolation_items,
     )
 
+    bake_camera_path: BoolProperty(
+        name="Bake Interpolated Camera Path",
+        description="Precompute the poses of all frames between the "
+        "reconstructed cameras and add a keyframe for each frame. In "
+        "contrast to the fcurve interpolation, this interpolates rotations "
+        "correctly and allows to smooth the reconstructed path",
+        default=False,
+    )
+    path_position_interpolation: EnumProperty(
+        name="Position Interpolation",
+        description="Interpolation of the camera positions",
+        items=(
+            (
+                "CATMULL_ROM",
+                "Catmull-Rom",
+                "Cubic spline through the positions",
+            ),
+            (
+                "B_SPLINE",
+                "B-Spline",
+                "Cubic B-spline approximating (and smoothing) the positions",
+            ),
+            ("LINEAR", "Linear", "Linear interpolation"),
+        ),
+    )
+    path_rotation_interpolation: EnumProperty(
+        name="Rotation Interpolation",
+        description="Interpolation of the camera rotations",
+        items=(
+            ("SLERP", "Slerp", "Spherical linear interpolation"),
+            ("SQUAD", "Squad", "Spherical cubic interpolation"),
+        ),
+    )
+    path_smoothing_sigma: FloatProperty(
+        name="Path Smoothing",
+        description="Standard deviation (in cameras) of the Gaussian kernel "
+        "used to smooth the camera path. A value of 0 disables the smoothing",
+        default=0.0,
+        min=0.0,
+    )
     consider_missing_cameras_during_animation: BoolProperty(
         name="Adjust Frame Numbers of Camera Animation",
         description="Assume there are three consecutive images A,B and "
@@ -298,6 +376,8 @@ class CameraImporter:
         if self.import_cameras or draw_everything:
             import_camera_box.prop(self, "camera_extent")
             import_camera_box.prop(self, "add_background_images")
+            if not self.add_background_images or draw_everything:
+                import_camera_box.prop(self, "share_camera_data")
 
             image_plane_box = import_camera_box.box()
             image_plane_box.prop(self, "add_image_planes")
@@ -305,6 +385,17 @@ class CameraImporter:
                 image_plane_box.prop(self, "add_image_plane_emission")
                 image_plane_box.prop(self, "image_plane_transparency")
 
+            if (
+                self.add_background_images
+                or self.add_image_planes
+                or draw_everything
+            ):
+                image_loading_box = import_camera_box.box()
+                image_loading_box.prop(self, "image_loading_mode")
+                image_loading_box.prop(self, "use_image_proxies")
+                if self.use_image_proxies or draw_everything:
+                    image_loading_box.prop(self, "image_proxy_max_resolution")
+
             if draw_depth_map_import or draw_everything:
                 depth_map_box = import_camera_box.box()
                 depth_map_box.prop(self, "add_depth_maps_as_point_cloud")
@@ -313,6 +404,7 @@ class CameraImporter:
                     if self.use_default_depth_map_color or draw_everything:
                         depth_map_box.prop(self, "depth_map_default_color")
                     depth_map_box.prop(self, "depth_map_display_sparsity")
+                    depth_map_box.prop(self, "depth_map_voxel_size")
                     depth_map_box.prop(self, "depth_map_id_or_name_str")
 
         anim_box = camera_box.box()
@@ -326,6 +418,12 @@ class CameraImporter:
                     anim_box.prop(self, "reorganize_undistorted_images")
             if self.animation_frame_source == "ADJUSTED" or draw_everything:
                 anim_box.prop(self, "number_interpolation_frames")
+                path_box = anim_box.box()
+                path_box.prop(self, "bake_camera_path")
+                if self.bake_camera_path or draw_everything:
+                    path_box.prop(self, "path_position_interpolation")
+                    path_box.prop(self, "path_rotation_interpolation")
+                    path_box.prop(self, "path_smoothing_sigma")
             anim_box.prop(self, "consider_missing_cameras_during_animation")
             anim_box.prop(self, "interpolation_type")
             anim_box.prop(self, "remove_rotation_discontinuities")
@@ -382,8 +480,20 @@ class CameraImporter:
             if not camera.has_principal_point():
                 camera.set_principal_point([default_pp_x, default_pp_y])
 
+    @profile_function("Import Cameras")
     def import_photogrammetry_cameras(self, cameras, parent_collection):
         """Import the cameras using the properties of this class."""
+        # Import the Blender-heavy modules on first use (and not when
+        # registering the operators)
+        from photogrammetry_importer.importers.camera_utility import (
+            add_cameras,
+            adjust_render_settings_if_possible,
+        )
+        from photogrammetry_importer.importers.camera_animation_utility import (
+            CameraPathOptions,
+            add_camera_animation,
+        )
+
         if not self.import_cameras and not self.add_camera_motion_as_animation:
             return {"FINISHED"}
 
@@ -417,11 +527,27 @@ class CameraImporter:
                 use_default_depth_map_color=self.use_default_depth_map_color,
                 depth_map_default_color=self.depth_map_default_color,
                 depth_map_display_sparsity=self.depth_map_display_sparsity,
+                depth_map_voxel_size=self.depth_map_voxel_size,
                 depth_map_id_or_name_str=self.depth_map_id_or_name_str,
+                image_loading_mode=self.image_loading_mode,
+                use_image_proxies=self.use_image_proxies,
+                image_proxy_max_resolution=self.image_proxy_max_resolution,
+                share_camera_data=self.share_camera_data,
                 op=self,
             )
 
         if self.add_camera_motion_as_animation:
+            if (
+                self.animation_frame_source == "ADJUSTED"
+                and self.bake_camera_path
+            ):
+                camera_path_options = CameraPathOptions(
+                    position_interpolation=self.path_position_interpolation,
+                    rotation_interpolation=self.path_rotation_interpolation,
+                    smoothing_sigma=self.path_smoothing_sigma,
+                )
+            else:
+                camera_path_options = None
             add_camera_animation(
                 cameras=cameras,
                 parent_collection=parent_collection,
@@ -434,6 +560,7 @@ class CameraImporter:
                 consider_missing_cameras_during_animation=self.consider_missing_cameras_during_animation,
                 image_dp=self.image_dp,
                 image_fp_type=self.image_fp_type,
+                camera_path_options=camera_path_options,
                 op=self,
             )
         return {"FINISHED"}
@@ -6,15 +6,28 @@ from mathutils import Matrix
 from mathutils import Vector
 
 from photogrammetry_importer.types.camera import Camera
-from photogrammetry_importer.blender_utility.object_utility import (
-    add_collection,
-    add_obj,
-)
+from photogrammetry_importer.blender_utility.object_utility import add_obj
 
 from photogrammetry_importer.opengl.utility import draw_coords
-from photogrammetry_importer.utility.timing_utility import StopWatch
 from photogrammetry_importer.utility.type_utility import is_int
+from photogrammetry_importer.utility.np_utility import invert_y_and_z_axis
+from photogrammetry_importer.utility.voxel_utility import (
+    downsample_with_voxel_grid,
+)
+from photogrammetry_importer.utility.thumbnail_utility import (
+    create_thumbnails,
+)
+from photogrammetry_importer.blender_utility.scene_builder import (
+    SceneBuilder,
+)
+from photogrammetry_importer.blender_utility.image_utility import (
+    defer_image_loading,
+    get_image_texture_node,
+)
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+)
 
 
 def compute_principal_point_shift(camera, relativ_to_largest_extend):
@@ -86,16 +99,59 @@ def _add_camera_data(camera, camera_name):
     return bcamera
 
 
+def _get_camera_data_key(camera):
+    """Return a key describing the Blender relevant intrinsic parameters."""
+    shift_x, shift_y = compute_principal_point_shift(
+        camera, relativ_to_largest_extend=True
+    )
+    # All camera data entities use the default sensor fit (i.e. "AUTO")
+    return (
+        camera.get_panoramic_type(),
+        camera.width,
+        camera.height,
+        float(camera.get_field_of_view()),
+        shift_x,
+        shift_y,
+    )
+
+
+def _get_shared_camera_data(camera, camera_data_cache):
+    """Return a camera data entity shared by cameras with equal intrinsics."""
+    key = _get_camera_data_key(camera)
+    bcamera = camera_data_cache.get(key)
+    if bcamera is None:
+        camera_data_name = "Camera Intrinsics %d" % len(camera_data_cache)
+        bcamera = _add_camera_data(camera, camera_data_name)
+        camera_data_cache[key] = bcamera
+    return bcamera
+
+
 def add_camera_object(
     camera,
     camera_name,
     camera_collection,
     copy_matrix_world=True,
     convert_coordinate_system=True,
+    camera_data_cache=None,
+    scene_builder=None,
 ):
-    """Add a camera as Blender object."""
-    bcamera = _add_camera_data(camera, camera_name)
-    camera_object = add_obj(bcamera, camera_name, camera_collection)
+    """Add a camera as Blender object.
+
+    If a :code:`camera_data_cache` (dict) is provided, cameras with identical
+    intrinsic parameters share the same camera data entity. If a
+    :code:`scene_builder` is provided, the object is linked once the scene
+    builder commits.
+    """
+    if camera_data_cache is None:
+        bcamera = _add_camera_data(camera, camera_name)
+    else:
+        bcamera = _get_shared_camera_data(camera, camera_data_cache)
+    if scene_builder is None:
+        camera_object = add_obj(bcamera, camera_name, camera_collection)
+    else:
+        camera_object = scene_builder.add_obj(
+            bcamera, camera_name, camera_collection
+        )
     if copy_matrix_world:
         camera_object.matrix_world = compute_camera_matrix_world(
             camera, convert_coordinate_system
@@ -128,20 +184,6 @@ def _get_camera_obj_gui_str(camera):
     return image_fp_suffix
 
 
-def invert_y_and_z_axis(input_matrix_or_vector):
-    """Invert the y and z axis of a given matrix or vector.
-
-    Many SfM / MVS libraries use coordinate systems that differ from Blender's
-    coordinate system in the y and the z coordinate. This function inverts the
-    y and the z coordinates in the corresponding matrix / vector entries, which
-    is equivalent to a rotation by 180 degree around the x axis.
-    """
-    output_matrix_or_vector = input_matrix_or_vector.copy()
-    output_matrix_or_vector[1] = -output_matrix_or_vector[1]
-    output_matrix_or_vector[2] = -output_matrix_or_vector[2]
-    return output_matrix_or_vector
-
-
 def _get_world_matrix_from_translation_and_rotation(translation_vec, rotation):
     translation_vec_hom_coord = Vector(translation_vec).to_4d()
     world_matrix = Matrix()
@@ -251,25 +293,54 @@ def get_computer_vision_camera(
     op=None,
 ):
     """Derive a camera object from a Blender camera object."""
+    return get_computer_vision_cameras(
+        [blender_camera],
+        [camera_name],
+        image_dp=image_dp,
+        camera_indices=[camera_index],
+        check_scale=check_scale,
+        op=op,
+    )[0]
+
+
+def get_computer_vision_cameras(
+    blender_cameras,
+    camera_names,
+    image_dp=None,
+    camera_indices=None,
+    check_scale=True,
+    op=None,
+):
+    """Derive camera objects from several Blender camera objects.
 
-    calibration_mat = get_calibration_mat(blender_camera)
-    camera_matrix_computer_vision = (
-        get_computer_vision_camera_transformation_matrix(
-            blender_camera, check_scale, op
+    The rotations of all cameras are converted at once.
+    """
+    if camera_indices is None:
+        camera_indices = range(len(blender_cameras))
+    cameras = []
+    camera_matrices_computer_vision = []
+    for blender_camera, camera_name, camera_index in zip(
+        blender_cameras, camera_names, camera_indices
+    ):
+        calibration_mat = get_calibration_mat(blender_camera)
+        camera_matrices_computer_vision.append(
+            get_computer_vision_camera_transformation_matrix(
+                blender_camera, check_scale, op
+            )
         )
-    )
 
-    camera = Camera()
-    camera.id = camera_index
-    camera.set_relative_fp(camera_name, Camera.IMAGE_FP_TYPE_NAME)
-    camera.image_dp = image_dp
-    camera.width = bpy.context.scene.render.resolution_x
-    camera.height = bpy.context.scene.render.resolution_y
-    camera.set_calibration(calibration_mat, radial_distortion=0)
-    camera.set_4x4_cam_to_world_mat(
-        camera_matrix_computer_vision, check_rotation=check_scale
+        camera = Camera()
+        camera.id = camera_index
+        camera.set_relative_fp(camera_name, Camera.IMAGE_FP_TYPE_NAME)
+        camera.image_dp = image_dp
+        camera.width = bpy.context.scene.render.resolution_x
+        camera.height = bpy.context.scene.render.resolution_y
+        camera.set_calibration(calibration_mat, radial_distortion=0)
+        cameras.append(camera)
+    Camera.set_4x4_cam_to_world_mats(
+        cameras, camera_matrices_computer_vision, check_rotation=check_scale
     )
-    return camera
+    return cameras
 
 
 def load_background_image(blender_image, camera_name):
@@ -284,6 +355,29 @@ def load_background_image(blender_image, camera_name):
     background_image.frame_method = "CROP"
 
 
+def _get_image_fps_of_cameras(
+    cameras, use_image_proxies, image_proxy_max_resolution, op=None
+):
+    image_fps = []
+    for camera in cameras:
+        if camera.has_undistorted_absolute_fp():
+            image_fps.append(camera.get_undistorted_absolute_fp())
+        else:
+            image_fps.append(camera.get_absolute_fp())
+    if use_image_proxies:
+        log_report("INFO", "Creating image proxies: ...", op)
+        with profile_span("Create Image Proxies", len(image_fps)) as span:
+            image_fps = create_thumbnails(
+                image_fps, image_proxy_max_resolution
+            )
+        log_report(
+            "INFO",
+            f"Creating image proxies: Done ({span.wall_time:.3f}s)",
+            op,
+        )
+    return image_fps
+
+
 def add_cameras(
     cameras,
     parent_collection,
@@ -301,22 +395,94 @@ def add_cameras(
     use_default_depth_map_color=False,
     depth_map_default_color=(1.0, 0.0, 0.0),
     depth_map_display_sparsity=10,
+    depth_map_voxel_size=0.0,
     depth_map_id_or_name_str="",
+    image_loading_mode="IMMEDIATE",
+    use_image_proxies=False,
+    image_proxy_max_resolution=2048,
+    share_camera_data=False,
     op=None,
 ):
-    """Add a set of reconstructed cameras to Blender's 3D view port."""
+    """Add a set of reconstructed cameras to Blender's 3D view port.
+
+    If :code:`image_loading_mode` is :code:`DEFERRED`, the images of the
+    background images and image planes are only loaded once the
+    corresponding camera becomes active or the image plane becomes visible.
+    If :code:`use_image_proxies` is set, downscaled copies of the images
+    (stored in an on-disk cache) are used instead of the original images.
+    If :code:`share_camera_data` is set, cameras with identical intrinsic
+    parameters share a single camera data entity. Since background images
+    are stored in the camera data, this requires
+    :code:`add_background_images` to be disabled.
+    """
     log_report("INFO", "Adding Cameras: ...", op)
-    stop_watch = StopWatch()
-    camera_collection = add_collection(
+    with profile_span("Add Cameras", len(cameras)) as span:
+        _add_cameras(
+            cameras,
+            parent_collection,
+            add_background_images,
+            add_image_planes,
+            add_depth_maps_as_point_cloud,
+            convert_camera_coordinate_system,
+            camera_collection_name,
+            image_plane_collection_name,
+            depth_map_collection_name,
+            camera_scale,
+            image_plane_transparency,
+            add_image_plane_emission,
+            depth_map_point_size,
+            use_default_depth_map_color,
+            depth_map_default_color,
+            depth_map_display_sparsity,
+            depth_map_voxel_size,
+            depth_map_id_or_name_str,
+            image_loading_mode,
+            use_image_proxies,
+            image_proxy_max_resolution,
+            share_camera_data,
+            op,
+        )
+    log_report("INFO", f"Duration: {span.wall_time:.3f}s", op)
+    log_report("INFO", "Adding Cameras: Done", op)
+
+
+def _add_cameras(
+    cameras,
+    parent_collection,
+    add_background_images,
+    add_image_planes,
+    add_depth_maps_as_point_cloud,
+    convert_camera_coordinate_system,
+    camera_collection_name,
+    image_plane_collection_name,
+    depth_map_collection_name,
+    camera_scale,
+    image_plane_transparency,
+    add_image_plane_emission,
+    depth_map_point_size,
+    use_default_depth_map_color,
+    depth_map_default_color,
+    depth_map_display_sparsity,
+    depth_map_voxel_size,
+    depth_map_id_or_name_str,
+    image_loading_mode,
+    use_image_proxies,
+    image_proxy_max_resolution,
+    share_camera_data,
+    op,
+):
+    # Link all objects and collections at once (see commit() below)
+    scene_builder = SceneBuilder()
+    camera_collection = scene_builder.add_collection(
         camera_collection_name, parent_collection
     )
 
     if add_image_planes:
         log_report("INFO", "Adding image planes: True", op)
-        image_planes_collection = add_collection(
+        image_planes_collection = scene_builder.add_collection(
             image_plane_collection_name, parent_collection
         )
-        camera_image_plane_pair_collection = add_collection(
+        camera_image_plane_pair_collection = scene_builder.add_collection(
             "Camera Image Plane Pair Collection", parent_collection
         )
     else:
@@ -324,10 +490,10 @@ def add_cameras(
 
     if add_depth_maps_as_point_cloud:
         log_report("INFO", "Adding depth maps as point cloud: True", op)
-        depth_map_collection = add_collection(
+        depth_map_collection = scene_builder.add_collection(
             depth_map_collection_name, parent_collection
         )
-        camera_depth_map_pair_collection = add_collection(
+        camera_depth_map_pair_collection = scene_builder.add_collection(
             "Camera Depth Map Pair Collection", parent_collection
         )
     else:
@@ -359,6 +525,22 @@ def add_cameras(
                         op,
                     )
 
+    if add_image_planes or add_background_images:
+        image_fps = _get_image_fps_of_cameras(
+            cameras, use_image_proxies, image_proxy_max_resolution, op
+        )
+    defer_images = image_loading_mode == "DEFERRED"
+
+    if share_camera_data and add_background_images:
+        log_report(
+            "WARNING",
+            "Camera data can not be shared between cameras with different "
+            + "background images.",
+            op,
+        )
+        share_camera_data = False
+    camera_data_cache = {} if share_camera_data else None
+
     # Adding cameras and image planes:
     for index, camera in enumerate(cameras):
         # camera_name = "Camera %d" % index     # original code
@@ -366,18 +548,20 @@ def add_cameras(
         blender_image_name_stem = _get_camera_obj_gui_str(camera)
         camera_name = blender_image_name_stem + "_cam"
         camera_object = add_camera_object(
-            camera, camera_name, camera_collection
+            camera,
+            camera_name,
+            camera_collection,
+            camera_data_cache=camera_data_cache,
+            scene_builder=scene_builder,
         )
         camera_object.scale *= camera_scale
+        # Allows to look up the camera in a point visibility index
+        camera_object["camera_index"] = index
 
         if not add_image_planes and not add_background_images:
             continue
 
-        if camera.has_undistorted_absolute_fp():
-            image_path = camera.get_undistorted_absolute_fp()
-        else:
-            image_path = camera.get_absolute_fp()
-
+        image_path = image_fps[index]
         if not os.path.isfile(image_path):
             log_report(
                 "WARNING", "Could not find image at " + str(image_path), op
@@ -386,17 +570,24 @@ def add_cameras(
         else:
             log_report("INFO", "Found image at " + str(image_path), op)
 
-        blender_image = bpy.data.images.load(image_path)
+        if defer_images:
+            blender_image = None
+        else:
+            blender_image = bpy.data.images.load(image_path)
 
         if add_background_images:
             load_background_image(blender_image, camera_name)
+            if defer_images:
+                defer_image_loading(camera_object, image_path)
 
         if add_image_planes and not camera.is_panoramic():
             # Group image plane and camera:
-            camera_image_plane_pair_collection_current = add_collection(
-                "Camera Image Plane Pair Collection %s"
-                % blender_image_name_stem,
-                camera_image_plane_pair_collection,
+            camera_image_plane_pair_collection_current = (
+                scene_builder.add_collection(
+                    "Camera Image Plane Pair Collection %s"
+                    % blender_image_name_stem,
+                    camera_image_plane_pair_collection,
+                )
             )
 
             image_plane_name = blender_image_name_stem + "_image_plane"
@@ -409,14 +600,19 @@ def add_cameras(
                 transparency=image_plane_transparency,
                 add_image_plane_emission=add_image_plane_emission,
                 image_planes_collection=image_planes_collection,
+                scene_builder=scene_builder,
                 op=op,
             )
+            if defer_images:
+                # Hidden image planes are loaded once they are shown
+                scene_builder.hide_obj(image_plane_obj)
+                defer_image_loading(image_plane_obj, image_path)
 
-            camera_image_plane_pair_collection_current.objects.link(
-                camera_object
+            scene_builder.link_obj(
+                camera_object, camera_image_plane_pair_collection_current
             )
-            camera_image_plane_pair_collection_current.objects.link(
-                image_plane_obj
+            scene_builder.link_obj(
+                image_plane_obj, camera_image_plane_pair_collection_current
             )
 
         if not add_depth_maps_as_point_cloud:
@@ -430,15 +626,21 @@ def add_cameras(
                 continue
 
         # Group image plane and camera:
-        camera_depth_map_pair_collection_current = add_collection(
-            "Camera Depth Map Pair Collection %s"
-            % os.path.basename(camera.get_depth_map_fp()),
-            camera_depth_map_pair_collection,
+        camera_depth_map_pair_collection_current = (
+            scene_builder.add_collection(
+                "Camera Depth Map Pair Collection %s"
+                % os.path.basename(camera.get_depth_map_fp()),
+                camera_depth_map_pair_collection,
+            )
         )
 
         depth_map_world_coords = camera.convert_depth_map_to_world_coords(
             depth_map_display_sparsity=depth_map_display_sparsity
         )
+        if depth_map_voxel_size > 0:
+            depth_map_world_coords, _, _ = downsample_with_voxel_grid(
+                depth_map_world_coords, voxel_size=depth_map_voxel_size
+            )
         depth_map_world_coords = depth_map_world_coords.tolist()
 
         if use_default_depth_map_color:
@@ -459,13 +661,118 @@ def add_cameras(
             op=op,
         )
 
-        camera_depth_map_pair_collection_current.objects.link(camera_object)
-        camera_depth_map_pair_collection_current.objects.link(
-            depth_map_anchor_handle
+        scene_builder.link_obj(
+            camera_object, camera_depth_map_pair_collection_current
+        )
+        scene_builder.link_obj(
+            depth_map_anchor_handle, camera_depth_map_pair_collection_current
         )
 
-    log_report("INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op)
-    log_report("INFO", "Adding Cameras: Done", op)
+    with profile_span("Link Camera Objects"):
+        scene_builder.commit()
+    if camera_data_cache is not None:
+        log_report(
+            "INFO",
+            f"Number of shared camera data entities: {len(camera_data_cache)}",
+            op,
+        )
+
+
+def _get_image_plane_mesh():
+    """Return the unit quad shared by all image planes."""
+    mesh_name = "image_plane_unit_quad"
+    mesh = bpy.data.meshes.get(mesh_name)
+    if mesh is not None:
+        return mesh
+    mesh = bpy.data.meshes.new(mesh_name)
+    # The quad lies at a distance of 1 in view direction of the camera. The
+    # extent and the principal point shift are defined by the object
+    # transformation of the corresponding image plane.
+    corners = ((-0.5, -0.5), (+0.5, -0.5), (+0.5, +0.5), (-0.5, +0.5))
+    points = [(c[0], c[1], -1.0) for c in corners]
+    mesh.from_pydata(points, [], [[0, 1, 2, 3]])
+    mesh.uv_layers.new()
+    mesh.update()
+    mesh.validate()
+    return mesh
+
+
+def _new_node_group_socket(node_group, name, in_out, socket_type):
+    if hasattr(node_group, "interface"):
+        # Blender 4.0 and newer
+        node_group.interface.new_socket(
+            name=name, in_out=in_out, socket_type=socket_type
+        )
+    elif in_out == "INPUT":
+        node_group.inputs.new(socket_type, name)
+    else:
+        node_group.outputs.new(socket_type, name)
+
+
+def _get_image_plane_node_group(add_image_plane_emission):
+    """Return the shader node group shared by all image plane materials."""
+    if add_image_plane_emission:
+        node_group_name = "image_plane_shader_emission"
+    else:
+        node_group_name = "image_plane_shader"
+    node_group = bpy.data.node_groups.get(node_group_name)
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(node_group_name, "ShaderNodeTree")
+    _new_node_group_socket(node_group, "Color", "INPUT", "NodeSocketColor")
+    _new_node_group_socket(node_group, "Alpha", "INPUT", "NodeSocketFloat")
+    _new_node_group_socket(node_group, "BSDF", "OUTPUT", "NodeSocketShader")
+
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes.new(type="NodeGroupInput")
+    group_output = nodes.new(type="NodeGroupOutput")
+    principled_bsdf = nodes.new(type="ShaderNodeBsdfPrincipled")
+    links.new(
+        group_input.outputs["Color"], principled_bsdf.inputs["Base Color"]
+    )
+    links.new(group_input.outputs["Alpha"], principled_bsdf.inputs["Alpha"])
+    if add_image_plane_emission:
+        emission_input = principled_bsdf.inputs.get("Emission Color")
+        if emission_input is None:
+            # Blender 3.x
+            emission_input = principled_bsdf.inputs["Emission"]
+        links.new(group_input.outputs["Color"], emission_input)
+    links.new(principled_bsdf.outputs["BSDF"], group_output.inputs["BSDF"])
+    return node_group
+
+
+def _get_image_plane_material_template(transparency, add_image_plane_emission):
+    """Return the material copied for each image plane."""
+    material_name = "image_plane_material_template_{:.3f}{}".format(
+        transparency, "_emission" if add_image_plane_emission else ""
+    )
+    material = bpy.data.materials.get(material_name)
+    if material is not None:
+        return material
+
+    material = bpy.data.materials.new(name=material_name)
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+    for node in list(nodes):
+        if node.type != "OUTPUT_MATERIAL":
+            nodes.remove(node)
+    material_output = nodes.get("Material Output")
+    shader_node_tex_image = nodes.new(type="ShaderNodeTexImage")
+    group_node = nodes.new(type="ShaderNodeGroup")
+    group_node.node_tree = _get_image_plane_node_group(
+        add_image_plane_emission
+    )
+    group_node.inputs["Alpha"].default_value = transparency
+    links.new(
+        shader_node_tex_image.outputs["Color"], group_node.inputs["Color"]
+    )
+    links.new(group_node.outputs["BSDF"], material_output.inputs["Surface"])
+    # Keep the template, even if it is not used by any object
+    material.use_fake_user = True
+    return material
 
 
 def add_camera_image_plane(
@@ -476,12 +783,16 @@ def add_camera_image_plane(
     transparency,
     add_image_plane_emission,
     image_planes_collection,
+    scene_builder=None,
     op=None,
 ):
-    """Add an image plane corresponding to a reconstructed camera."""
-    # log_report('INFO', 'add_camera_image_plane: ...', op)
-    # log_report('INFO', 'name: ' + str(name), op)
+    """Add an image plane corresponding to a reconstructed camera.
 
+    All image planes share a single unit quad mesh, which is scaled by the
+    object transformation. The material of each image plane is a copy of a
+    small template material (an image texture node and a shared node group)
+    linked to the object.
+    """
     width = camera.width
     height = camera.height
     focal_length = camera.get_focal_length()
@@ -489,68 +800,33 @@ def add_camera_image_plane(
     assert width is not None and height is not None
 
     bpy.context.scene.render.engine = "CYCLES"
-    mesh = bpy.data.meshes.new(name)
-    mesh.update()
-    mesh.validate()
 
-    plane_distance = 1.0  # Distance from camera position
-    # Right vector in view frustum at plane_distance:
-    right = Vector((1, 0, 0)) * (width / focal_length) * plane_distance
-    # Up vector in view frustum at plane_distance:
-    up = Vector((0, 1, 0)) * (height / focal_length) * plane_distance
-    # Camera view direction:
-    view_dir = -Vector((0, 0, 1)) * plane_distance
-    plane_center = view_dir
+    mesh = _get_image_plane_mesh()
+    if len(mesh.materials) == 0:
+        mesh.materials.append(None)
+    if scene_builder is None:
+        mesh_obj = add_obj(mesh, name, image_planes_collection)
+    else:
+        mesh_obj = scene_builder.add_obj(mesh, name, image_planes_collection)
+
+    image_plane_material = _get_image_plane_material_template(
+        transparency, add_image_plane_emission
+    ).copy()
+    image_plane_material.name = "image_plane_material"
+    image_plane_material.use_fake_user = False
+    get_image_texture_node(image_plane_material).image = blender_image
+    material_slot = mesh_obj.material_slots[0]
+    material_slot.link = "OBJECT"
+    material_slot.material = image_plane_material
 
     shift_x, shift_y = compute_principal_point_shift(
         camera, relativ_to_largest_extend=False
     )
-
-    corners = ((-0.5, -0.5), (+0.5, -0.5), (+0.5, +0.5), (-0.5, +0.5))
-    points = [
-        (plane_center + (c[0] + shift_x) * right + (c[1] + shift_y) * up)[0:3]
-        for c in corners
-    ]
-    mesh.from_pydata(points, [], [[0, 1, 2, 3]])
-    mesh.uv_layers.new()
-
-    # Add mesh to new image plane object:
-    mesh_obj = add_obj(mesh, name, image_planes_collection)
-
-    image_plane_material = bpy.data.materials.new(name="image_plane_material")
-    # Adds "Principled BSDF" and a "Material Output" node
-    image_plane_material.use_nodes = True
-
-    nodes = image_plane_material.node_tree.nodes
-    links = image_plane_material.node_tree.links
-
-    shader_node_tex_image = nodes.new(type="ShaderNodeTexImage")
-    shader_node_principled_bsdf = nodes.get("Principled BSDF")
-    shader_node_principled_bsdf.inputs["Alpha"].default_value = transparency
-
-    links.new(
-        shader_node_tex_image.outputs["Color"],
-        shader_node_principled_bsdf.inputs["Base Color"],
-    )
-
-    if add_image_plane_emission:
-        links.new(
-            shader_node_tex_image.outputs["Color"],
-            shader_node_principled_bsdf.inputs["Emission Color"],
-        )
-
-    shader_node_tex_image.image = blender_image
-
-    # Assign it to object
-    if mesh_obj.data.materials:
-        # assign to 1st material slot
-        mesh_obj.data.materials[0] = image_plane_material
-    else:
-        # no slots
-        mesh_obj.data.materials.append(image_plane_material)
-
-    mesh_obj.matrix_world = matrix_world
-    mesh.update()
-    mesh.validate()
-    # log_report('INFO', 'add_camera_image_plane: Done', op)
+    # Extent of the view frustum at the plane distance (i.e. 1)
+    right_extent = width / focal_length
+    up_extent = height / focal_length
+    plane_matrix = Matrix.Translation(
+        (shift_x * right_extent, shift_y * up_extent, 0.0)
+    ) @ Matrix.Diagonal((right_extent, up_extent, 1.0, 1.0))
+    mesh_obj.matrix_world = matrix_world @ plane_matrix
     return mesh_obj
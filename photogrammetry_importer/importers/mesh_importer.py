@@ -6,6 +6,9 @@ from photogrammetry_importer.importers.mesh_utility import (
     add_color_emission_to_material,
     add_mesh_vertex_color_material,
 )
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 class MeshImporter:
@@ -34,6 +37,7 @@ class MeshImporter:
         if self.import_mesh:
             mesh_box.prop(self, "add_mesh_color_emission")
 
+    @profile_function("Import Mesh")
     def import_photogrammetry_mesh(self, mesh_fp, reconstruction_collection):
         """Import a mesh using the properties of this class."""
         if self.import_mesh and mesh_fp is not None:
@@ -7,12 +7,12 @@ from bpy.props import (
     FloatProperty,
     FloatVectorProperty,
 )
-from photogrammetry_importer.opengl.utility import draw_points
-from photogrammetry_importer.importers.point_utility import (
-    add_points_as_mesh_vertices,
-    add_points_as_object_with_particle_system,
-)
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+    profile_span,
+)
 
 
 class PointImporter:
@@ -28,12 +28,122 @@ class PointImporter:
         default=1,
         min=1,
     )
+    crop_points_to_box: BoolProperty(
+        name="Crop Points to Box",
+        description="Import only the points inside an axis aligned box "
+        "(defined in the coordinate system of the reconstruction)",
+        default=False,
+    )
+    crop_box_min: FloatVectorProperty(
+        name="Box Minimum",
+        description="Minimum x, y and z coordinate of the crop box",
+        size=3,
+        default=(-1.0, -1.0, -1.0),
+    )
+    crop_box_max: FloatVectorProperty(
+        name="Box Maximum",
+        description="Maximum x, y and z coordinate of the crop box",
+        size=3,
+        default=(1.0, 1.0, 1.0),
+    )
+    remove_statistical_outliers: BoolProperty(
+        name="Remove Statistical Outliers",
+        description="Remove points whose mean distance to their nearest "
+        "neighbors is large compared to the other points",
+        default=False,
+    )
+    statistical_outlier_num_neighbors: IntProperty(
+        name="Number of Neighbors",
+        description="Number of nearest neighbors used to compute the mean "
+        "neighbor distance of each point",
+        default=20,
+        min=1,
+    )
+    statistical_outlier_std_ratio: FloatProperty(
+        name="Standard Deviation Ratio",
+        description="Points whose mean neighbor distance exceeds the average "
+        "by more than this multiple of the standard deviation are removed",
+        default=2.0,
+        min=0.0,
+    )
+    remove_radius_outliers: BoolProperty(
+        name="Remove Radius Outliers",
+        description="Remove points with only few neighbors within a radius",
+        default=False,
+    )
+    radius_outlier_radius: FloatProperty(
+        name="Radius",
+        description="Radius used to count the neighbors of each point",
+        default=0.1,
+        min=0.000001,
+    )
+    radius_outlier_min_neighbors: IntProperty(
+        name="Minimum Number of Neighbors",
+        description="Points with fewer neighbors within the radius are "
+        "removed",
+        default=5,
+        min=1,
+    )
+    voxel_downsampling_mode: EnumProperty(
+        name="Voxel Downsampling",
+        description="Reduce the point cloud to a single point per occupied "
+        "voxel of a regular grid",
+        items=(
+            ("NONE", "None", "Do not apply a voxel downsampling"),
+            (
+                "VOXEL_SIZE",
+                "Voxel Size",
+                "Use a voxel grid with the specified voxel size",
+            ),
+            (
+                "TARGET_COUNT",
+                "Target Point Count",
+                "Determine the voxel size so that the downsampled point "
+                "cloud contains approximately the specified number of points",
+            ),
+        ),
+    )
+    voxel_size: FloatProperty(
+        name="Voxel Size",
+        description="Edge length of the voxels used for downsampling",
+        default=0.05,
+        min=0.000001,
+    )
+    voxel_target_point_count: IntProperty(
+        name="Target Point Count",
+        description="Approximate number of points after the downsampling",
+        default=100000,
+        min=1,
+    )
+    voxel_representative: EnumProperty(
+        name="Voxel Representative",
+        description="Point used to represent the points within a voxel",
+        items=(
+            (
+                "CENTROID",
+                "Centroid",
+                "Use the centroid (and the average color) of the points",
+            ),
+            (
+                "FIRST",
+                "First Point",
+                "Use the first point (and the average color) of the points",
+            ),
+        ),
+    )
     center_points: BoolProperty(
         name="Center Data Around Origin",
         description="Center data by subtracting the centroid. Useful for las/"
         "laz files, which contain usually large offsets.",
         default=False,
     )
+    import_point_visibility: BoolProperty(
+        name="Import Point Visibility",
+        description="Store the cameras observing each point (if available) "
+        "in the point cloud handle. This allows to show the points seen by a "
+        "selected camera",
+        default=False,
+    )
     # Option 1: Draw Points with GPU
     draw_points_with_gpu: BoolProperty(
         name="Draw Points in the 3D View with OpenGL.",
@@ -84,11 +194,37 @@ class PointImporter:
         default=True,
     )
 
-    def draw_point_options(self, layout, draw_everything=False):
+    def draw_point_options(
+        self, layout, draw_everything=False, draw_point_visibility=False
+    ):
         """Draw point import options."""
         point_box = layout.box()
         point_box.prop(self, "import_points")
+        if draw_point_visibility or draw_everything:
+            point_box.prop(self, "import_point_visibility")
         point_box.prop(self, "point_cloud_display_sparsity")
+        crop_box = point_box.box()
+        crop_box.prop(self, "crop_points_to_box")
+        if self.crop_points_to_box or draw_everything:
+            crop_box.prop(self, "crop_box_min")
+            crop_box.prop(self, "crop_box_max")
+        outlier_box = point_box.box()
+        outlier_box.prop(self, "remove_statistical_outliers")
+        if self.remove_statistical_outliers or draw_everything:
+            outlier_box.prop(self, "statistical_outlier_num_neighbors")
+            outlier_box.prop(self, "statistical_outlier_std_ratio")
+        outlier_box.prop(self, "remove_radius_outliers")
+        if self.remove_radius_outliers or draw_everything:
+            outlier_box.prop(self, "radius_outlier_radius")
+            outlier_box.prop(self, "radius_outlier_min_neighbors")
+        voxel_box = point_box.box()
+        voxel_box.prop(self, "voxel_downsampling_mode")
+        if self.voxel_downsampling_mode == "VOXEL_SIZE" or draw_everything:
+            voxel_box.prop(self, "voxel_size")
+        if self.voxel_downsampling_mode == "TARGET_COUNT" or draw_everything:
+            voxel_box.prop(self, "voxel_target_point_count")
+        if self.voxel_downsampling_mode != "NONE" or draw_everything:
+            voxel_box.prop(self, "voxel_representative")
         point_box.prop(self, "center_points")
         if self.import_points or draw_everything:
             opengl_box = point_box.box()
@@ -104,9 +240,156 @@ class PointImporter:
                 mesh_box.prop(self, "point_subdivisions")
                 mesh_box.prop(self, "add_color_as_custom_property")
 
-    def import_photogrammetry_points(self, points, reconstruction_collection):
-        """Import a point cloud using the properties of this class."""
+    def crop_points_to_box_if_requested(self, points):
+        """Remove the points outside of the crop box of this class."""
+        from photogrammetry_importer.types.spatial_index import (
+            compute_box_mask,
+        )
+
+        if not self.crop_points_to_box or len(points) == 0:
+            return points
+        coords, _ = Point.split_points_as_arrays(points)
+        mask = compute_box_mask(coords, self.crop_box_min, self.crop_box_max)
+        cropped_points = [
+            point for point, inside in zip(points, mask) if inside
+        ]
+        log_report(
+            "INFO",
+            f"Cropping points to box: {len(points)} -> "
+            f"{len(cropped_points)} points",
+            self,
+        )
+        return cropped_points
+
+    def remove_outliers_if_requested(self, points):
+        """Remove outliers with the outlier options of this class."""
+        if len(points) == 0:
+            return points
+        if self.remove_statistical_outliers:
+            filter_name = "Statistical outlier removal"
+            with profile_span(filter_name, len(points)) as span:
+                points = self._remove_statistical_outliers(points)
+            self._log_filter_result(filter_name, span, len(points))
+        if self.remove_radius_outliers:
+            filter_name = "Radius outlier removal"
+            with profile_span(filter_name, len(points)) as span:
+                points = self._remove_radius_outliers(points)
+            self._log_filter_result(filter_name, span, len(points))
+        return points
+
+    def _remove_statistical_outliers(self, points):
+        from photogrammetry_importer.utility.outlier_utility import (
+            compute_statistical_inlier_mask,
+        )
+
+        coords, _ = Point.split_points_as_arrays(points)
+        mask = compute_statistical_inlier_mask(
+            coords,
+            self.statistical_outlier_num_neighbors,
+            self.statistical_outlier_std_ratio,
+        )
+        return self._filter_points_with_mask(points, mask)
+
+    def _remove_radius_outliers(self, points):
+        from photogrammetry_importer.utility.outlier_utility import (
+            compute_radius_inlier_mask,
+        )
+
+        coords, _ = Point.split_points_as_arrays(points)
+        mask = compute_radius_inlier_mask(
+            coords,
+            self.radius_outlier_radius,
+            self.radius_outlier_min_neighbors,
+        )
+        return self._filter_points_with_mask(points, mask)
+
+    @staticmethod
+    def _filter_points_with_mask(points, mask):
+        return [point for point, inlier in zip(points, mask) if inlier]
+
+    def _log_filter_result(self, filter_name, span, num_filtered_points):
+        log_report(
+            "INFO",
+            f"{filter_name}: removed {span.num_items - num_filtered_points} "
+            f"of {span.num_items} points in {span.wall_time:.3f} seconds",
+            self,
+        )
+
+    def downsample_points_with_voxel_grid(self, points):
+        """Downsample the points with the voxel options of this class."""
+        if self.voxel_downsampling_mode == "NONE" or len(points) == 0:
+            return points
+
+        with profile_span("Voxel downsampling", len(points)) as span:
+            downsampled_points, voxel_size = (
+                self._downsample_points_with_voxel_grid(points)
+            )
+        if voxel_size is None:
+            return points
+        log_report(
+            "INFO",
+            f"Voxel downsampling (voxel size {voxel_size:.6f}): "
+            f"{len(points)} -> {len(downsampled_points)} points",
+            self,
+        )
+        log_report("INFO", f"Duration: {span.wall_time:.3f}s", self)
+        return downsampled_points
+
+    def _downsample_points_with_voxel_grid(self, points):
+        # Return the downsampled points and the voxel size (None, if the
+        # voxel size could not be estimated)
+        from photogrammetry_importer.utility.voxel_utility import (
+            downsample_with_voxel_grid,
+            estimate_voxel_size_for_target_count,
+        )
+
+        coords, colors = Point.split_points_as_arrays(points)
+        if self.voxel_downsampling_mode == "TARGET_COUNT":
+            voxel_size = estimate_voxel_size_for_target_count(
+                coords, self.voxel_target_point_count
+            )
+            if voxel_size is None:
+                return points, None
+        else:
+            voxel_size = self.voxel_size
+
+        coords, colors, first_indices = downsample_with_voxel_grid(
+            coords,
+            colors,
+            voxel_size=voxel_size,
+            representative=self.voxel_representative,
+        )
+        downsampled_points = [
+            Point(
+                coord=coord,
+                color=color,
+                id=points[first_idx].id,
+                scalars=points[first_idx].scalars,
+            )
+            for coord, color, first_idx in zip(coords, colors, first_indices)
+        ]
+        return downsampled_points, voxel_size
+
+    @profile_function("Import Points")
+    def import_photogrammetry_points(
+        self, points, reconstruction_collection, visibility_index=None
+    ):
+        """Import a point cloud using the properties of this class.
+
+        If a :code:`VisibilityIndex` is provided, it is stored (w.r.t. the
+        imported points) in the point cloud handle.
+        """
+        # Import the Blender-heavy modules on first use (and not when
+        # registering the operators)
+        from photogrammetry_importer.opengl.utility import draw_points
+        from photogrammetry_importer.importers.point_utility import (
+            add_points_as_mesh_vertices,
+        )
+
         if self.import_points:
+            points = self.crop_points_to_box_if_requested(points)
+            points = self.remove_outliers_if_requested(points)
+            points = self.downsample_points_with_voxel_grid(points)
             if self.point_cloud_display_sparsity > 1:
                 points = points[:: self.point_cloud_display_sparsity]
 
@@ -138,3 +421,13 @@ class PointImporter:
             if self.center_points and obj_handle is not None:
                 # store the xyz shift as custom property in the object handle
                 obj_handle["centroid_shift"] = centroid_shift
+
+            if visibility_index is not None and obj_handle is not None:
+                # The point ids of the index are replaced with the positions
+                # of the imported (i.e. filtered) points
+                point_visibility_index = visibility_index.remap_point_ids(
+                    [point.id for point in points]
+                )
+                obj_handle["visibility_index"] = (
+                    point_visibility_index.to_dict()
+                )
@@ -1,4 +1,5 @@
 import bpy
+import bmesh
 import numpy as np
 from mathutils import Vector
 
@@ -7,8 +8,10 @@ from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
     add_obj,
 )
-from photogrammetry_importer.utility.timing_utility import StopWatch
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+)
 
 
 def _copy_values_to_image(value_tripplets, image_name):
@@ -109,19 +112,25 @@ def _add_particle_obj(
     #   primitive_cube_add, primitive_uv_sphere_add, etc. is (2,2,2)
     point_scale = point_extent * 0.5
 
-    bpy.ops.object.select_all(action="DESELECT")
+    # Create the mesh with bmesh (instead of bpy.ops.mesh.primitive_*_add),
+    # which avoids selection changes as well as depsgraph and UI updates.
+    # The sizes correspond to the ones of the bpy.ops primitives.
+    bm = bmesh.new()
     if mesh_type == "PLANE":
-        bpy.ops.mesh.primitive_plane_add(size=point_scale)
+        bmesh.ops.create_grid(
+            bm, x_segments=1, y_segments=1, size=point_scale / 2.0
+        )
     elif mesh_type == "CUBE":
-        bpy.ops.mesh.primitive_cube_add(size=point_scale)
-    elif mesh_type == "SPHERE":
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=point_scale)
+        bmesh.ops.create_cube(bm, size=point_scale)
     else:
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=point_scale)
-    particle_obj = bpy.context.object
-    particle_obj.name = particle_obj_name
+        bmesh.ops.create_uvsphere(
+            bm, u_segments=32, v_segments=16, radius=point_scale
+        )
+    particle_mesh = bpy.data.meshes.new(particle_obj_name)
+    bm.to_mesh(particle_mesh)
+    bm.free()
+    particle_obj = bpy.data.objects.new(particle_obj_name, particle_mesh)
     reconstruction_collection.objects.link(particle_obj)
-    bpy.context.collection.objects.unlink(particle_obj)
 
     _add_particle_material(
         colors,
@@ -183,12 +192,17 @@ def _add_particle_material(
 
 
 def _add_particle_system_obj(
-    coords, particle_obj, point_cloud_obj_name, reconstruction_collection
+    points,
+    coords,
+    particle_obj,
+    point_cloud_obj_name,
+    reconstruction_collection,
 ):
     point_cloud_mesh = bpy.data.meshes.new(point_cloud_obj_name)
     point_cloud_mesh.update()
     point_cloud_mesh.validate()
     point_cloud_mesh.from_pydata(coords, [], [])
+    _add_scalars_to_vertices(point_cloud_mesh, points)
     point_cloud_obj = add_obj(
         point_cloud_mesh, point_cloud_obj_name, reconstruction_collection
     )
@@ -224,8 +238,30 @@ def add_points_as_object_with_particle_system(
     :code:`add_points_as_mesh_vertices()` instead.
     """
     log_report("INFO", "Adding Points as Particle System: ...", op)
-    stop_watch = StopWatch()
+    with profile_span("Add Points As Particle System", len(points)) as span:
+        point_cloud_obj_list = _add_points_as_object_with_particle_system(
+            points,
+            reconstruction_collection,
+            mesh_type,
+            point_extent,
+            add_particle_color_emission,
+            particle_overwrite_color,
+            op,
+        )
+    log_report("INFO", f"Duration: {span.wall_time:.3f}s", op)
+    log_report("INFO", "Adding Points as Particle System: Done", op)
+    return point_cloud_obj_list
+
 
+def _add_points_as_object_with_particle_system(
+    points,
+    reconstruction_collection,
+    mesh_type,
+    point_extent,
+    add_particle_color_emission,
+    particle_overwrite_color,
+    op,
+):
     # The particle systems in Blender do not work for large particle numbers
     # (see https://developer.blender.org/T81103). Thus, we represent large
     # point clouds with multiple smaller particle systems.
@@ -257,6 +293,7 @@ def add_points_as_object_with_particle_system(
             particle_system_collection,
         )
         point_cloud_obj = _add_particle_system_obj(
+            points_subset,
             coords,
             particle_obj,
             point_cloud_obj_name,
@@ -265,9 +302,6 @@ def add_points_as_object_with_particle_system(
         point_cloud_obj_list.append(point_cloud_obj)
 
     bpy.context.view_layer.update()
-
-    log_report("INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op)
-    log_report("INFO", "Adding Points as Particle System: Done", op)
     return point_cloud_obj_list
 
 
@@ -300,13 +334,37 @@ def add_points_as_mesh_vertices(
 ):
     """Add a point cloud as mesh."""
     log_report("INFO", "Adding Points as Mesh: ...", op)
-    stop_watch = StopWatch()
+    with profile_span("Add Points As Mesh Vertices", len(points)) as span:
+        point_cloud_obj = _add_points_as_mesh_vertices(
+            points,
+            reconstruction_collection,
+            add_mesh_to_point_geometry_nodes,
+            point_radius,
+            point_subdivisions,
+            add_color_as_custom_property,
+            op,
+        )
+    log_report("INFO", f"Duration: {span.wall_time:.3f}s", op)
+    log_report("INFO", "Adding Points as Mesh: Done", op)
+    return point_cloud_obj
+
+
+def _add_points_as_mesh_vertices(
+    points,
+    reconstruction_collection,
+    add_mesh_to_point_geometry_nodes,
+    point_radius,
+    point_subdivisions,
+    add_color_as_custom_property,
+    op,
+):
     point_cloud_obj_name = "Mesh Point Cloud"
     point_cloud_mesh = bpy.data.meshes.new(point_cloud_obj_name)
     point_cloud_mesh.update()
     point_cloud_mesh.validate()
     coords, colors = Point.split_points(points, normalize_colors=False)
     point_cloud_mesh.from_pydata(coords, [], [])
+    _add_scalars_to_vertices(point_cloud_mesh, points)
     point_cloud_obj = add_obj(
         point_cloud_mesh, point_cloud_obj_name, reconstruction_collection
     )
@@ -405,12 +463,32 @@ def add_points_as_mesh_vertices(
 
     if add_color_as_custom_property:
         point_cloud_obj["colors"] = colors
-
-    log_report("INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op)
-    log_report("INFO", "Adding Points as Mesh: Done", op)
     return point_cloud_obj
 
 
+def _add_scalars_to_vertices(mesh, points):
+    """Add the (numeric) scalars shared by all points as vertex attributes."""
+    if len(points) == 0 or not isinstance(points[0].scalars, dict):
+        return
+    scalar_names = set(points[0].scalars.keys())
+    for point in points:
+        if not isinstance(point.scalars, dict):
+            return
+        scalar_names.intersection_update(point.scalars.keys())
+    for scalar_name in sorted(scalar_names):
+        try:
+            values = np.array(
+                [point.scalars[scalar_name] for point in points],
+                dtype=np.float32,
+            )
+        except (TypeError, ValueError):
+            continue
+        attribute = mesh.attributes.new(
+            name=scalar_name, type="FLOAT", domain="POINT"
+        )
+        attribute.data.foreach_set("value", values)
+
+
 def _add_colors_to_vertices(mesh, colors, attribute_name):
     """Add a color attribute to each vertex of mesh."""
     if len(mesh.vertices) != len(colors):
@@ -1,6 +1,5 @@
 import bpy
 import gpu
-from bpy.app.handlers import persistent
 from mathutils import Matrix
 from gpu.types import GPUOffScreen
 from gpu_extras.batch import batch_for_shader
@@ -9,6 +8,9 @@ from photogrammetry_importer.types.point import Point
 from photogrammetry_importer.opengl.draw_manager import DrawManager
 from photogrammetry_importer.blender_utility.object_utility import add_empty
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+)
 
 
 def _draw_coords_with_color(
@@ -60,6 +62,7 @@ def draw_points(
     return object_anchor_handle
 
 
+@profile_function("Draw Points With OpenGL")
 def draw_coords(
     coords,
     color=(0, 0, 255, 1.0),
@@ -86,39 +89,6 @@ def draw_coords(
     return object_anchor_handle
 
 
-@persistent
-def redraw_points(dummy):
-    """Redraw points of the previous Blender session."""
-
-    # This test is very cheap, so it will not cause
-    # huge overheads for scenes without point clouds
-    if "contains_opengl_point_clouds" in bpy.context.scene:
-        log_report(
-            "INFO",
-            "Checking scene for missing point cloud draw handlers",
-            op=None,
-        )
-        for obj in bpy.data.objects:
-            if (
-                "particle_coords" in obj
-                and "particle_colors" in obj
-                and "point_size" in obj
-            ):
-                coords = obj["particle_coords"]
-                colors = obj["particle_colors"]
-                point_size = obj["point_size"]
-
-                draw_manager = DrawManager.get_singleton()
-                draw_manager.register_points_draw_callback(
-                    obj, coords, colors, point_size
-                )
-
-        for area in bpy.context.screen.areas:
-            if area.type == "VIEW_3D":
-                area.tag_redraw()
-                break
-
-
 def render_opengl_image(image_name, cam, coords, colors, point_size):
     """Render the given coordinates with :code:`OpenGL`."""
 
@@ -3,9 +3,6 @@ import bpy
 from bpy.props import StringProperty, CollectionProperty
 from bpy_extras.io_utils import ExportHelper
 
-from photogrammetry_importer.file_handlers.colmap_file_handler import (
-    ColmapFileHandler,
-)
 from photogrammetry_importer.operators.export_op import ExportOperator
 
 
@@ -30,6 +27,10 @@ class ExportColmapOperator(ExportOperator, ExportHelper):
 
     def execute(self, context):
         """Export selected cameras and points as :code:`Colmap` model."""
+        from photogrammetry_importer.file_handlers.colmap_file_handler import (
+            ColmapFileHandler,
+        )
+
         assert len(self.files) == 1
         odp = os.path.join(self.directory, self.files[0].name)
 
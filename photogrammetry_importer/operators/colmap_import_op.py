@@ -1,17 +1,20 @@
 import os
 import bpy
-from bpy.props import StringProperty
+from bpy.props import (
+    StringProperty,
+    BoolProperty,
+    IntProperty,
+    FloatProperty,
+)
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 from photogrammetry_importer.importers.mesh_importer import MeshImporter
 
-from photogrammetry_importer.file_handlers.colmap_file_handler import (
-    ColmapFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -32,24 +35,65 @@ class ImportColmapOperator(
     bl_options = {"PRESET"}
 
     directory: StringProperty()
+    min_track_length: IntProperty(
+        name="Minimum Track Length",
+        description="Import only points observed in at least this number of "
+        "images",
+        default=0,
+        min=0,
+    )
+    filter_by_reprojection_error: BoolProperty(
+        name="Filter by Reprojection Error",
+        description="Import only points with a small reprojection error",
+        default=False,
+    )
+    max_reprojection_error: FloatProperty(
+        name="Maximum Reprojection Error",
+        description="Maximum reprojection error (in pixels) of the imported "
+        "points",
+        default=2.0,
+        min=0.0,
+    )
     # filter_folder : BoolProperty(default=True, options={'HIDDEN'})
 
+    @profile_execute
     def execute(self, context):
         """Import a :code:`Colmap` model/workspace."""
+        from photogrammetry_importer.file_handlers.colmap_file_handler import (
+            ColmapFileHandler,
+        )
+
         path = self.directory
         # Remove trailing slash
         path = os.path.dirname(path)
         log_report("INFO", "path: " + str(path), self)
 
         self.image_dp = self.get_default_image_path(path, self.image_dp)
-        cameras, points, mesh_ifp = ColmapFileHandler.parse_colmap_folder(
+        if self.filter_by_reprojection_error:
+            max_reprojection_error = self.max_reprojection_error
+        else:
+            max_reprojection_error = None
+        result = ColmapFileHandler.parse_colmap_folder(
             path,
             self.use_workspace_images,
             self.image_dp,
             self.image_fp_type,
             self.suppress_distortion_warnings,
-            self,
+            op=self,
+            min_track_length=self.min_track_length,
+            max_reprojection_error=max_reprojection_error,
+            return_visibility_index=self.import_point_visibility,
         )
+        if self.import_point_visibility:
+            (
+                cameras,
+                points,
+                mesh_ifp,
+                visibility_index,
+            ) = result
+        else:
+            cameras, points, mesh_ifp = result
+            visibility_index = None
 
         log_report("INFO", "Number cameras: " + str(len(cameras)), self)
         log_report("INFO", "Number points: " + str(len(points)), self)
@@ -57,7 +101,9 @@ class ImportColmapOperator(
 
         reconstruction_collection = add_collection("Reconstruction Collection")
         self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
+        self.import_photogrammetry_points(
+            points, reconstruction_collection, visibility_index
+        )
         self.import_photogrammetry_mesh(mesh_ifp, reconstruction_collection)
         self.apply_general_options()
 
@@ -78,6 +124,11 @@ class ImportColmapOperator(
         self.draw_camera_options(
             layout, draw_workspace_image_usage=True, draw_depth_map_import=True
         )
-        self.draw_point_options(layout)
+        self.draw_point_options(layout, draw_point_visibility=True)
+        track_box = layout.box()
+        track_box.prop(self, "min_track_length")
+        track_box.prop(self, "filter_by_reprojection_error")
+        if self.filter_by_reprojection_error:
+            track_box.prop(self, "max_reprojection_error")
         self.draw_mesh_options(layout)
         self.draw_general_options(layout)
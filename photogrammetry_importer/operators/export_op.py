@@ -1,9 +1,6 @@
 import bpy
 import mathutils
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.importers.camera_utility import (
-    get_computer_vision_camera,
-)
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 
 
@@ -12,23 +9,24 @@ class ExportOperator(bpy.types.Operator):
 
     def get_selected_cameras_and_vertices_of_meshes(self, odp):
         """Get selected cameras and vertices."""
+        from photogrammetry_importer.importers.camera_utility import (
+            get_computer_vision_cameras,
+        )
+
         log_report(
             "INFO", "get_selected_cameras_and_vertices_of_meshes: ...", self
         )
-        cameras = []
+        camera_objs = []
+        camera_obj_names = []
         points = []
 
         point_index = 0
-        camera_index = 0
         for obj in bpy.context.selected_objects:
             if obj.type == "CAMERA":
                 obj_name = str(obj.name).replace(" ", "_")
                 log_report("INFO", "obj_name: " + obj_name, self)
-                cam = get_computer_vision_camera(
-                    obj, obj_name, odp, camera_index
-                )
-                cameras.append(cam)
-                camera_index += 1
+                camera_objs.append(obj)
+                camera_obj_names.append(obj_name)
 
             else:
                 obj_points = []
@@ -67,6 +65,10 @@ class ExportOperator(bpy.types.Operator):
                         )
                         point_index += 1
                     points += obj_points
+        # Convert the poses of all selected cameras at once
+        cameras = get_computer_vision_cameras(
+            camera_objs, camera_obj_names, odp, op=self
+        )
         log_report(
             "INFO",
             "get_selected_cameras_and_vertices_of_meshes: Done",
@@ -13,11 +13,27 @@ class GeneralOptions:
         description="Adjust clipping distance of 3D view.",
         default=False,
     )
+    profile_import: BoolProperty(
+        name="Profile Import",
+        description="Record the duration of the different import steps. "
+        "The profile is shown in the 3D view sidebar and can be exported as "
+        "json or Chrome trace file.",
+        default=False,
+    )
+    profile_memory: BoolProperty(
+        name="Profile Memory",
+        description="Additionally record the peak memory of the import "
+        "steps. This slows down the import.",
+        default=False,
+    )
 
     def draw_general_options(self, layout):
         """Draw general options."""
         mesh_box = layout.box()
         mesh_box.prop(self, "adjust_clipping_distance")
+        mesh_box.prop(self, "profile_import")
+        if self.profile_import:
+            mesh_box.prop(self, "profile_memory")
 
     def apply_general_options(self):
         """Apply the options defined by this class."""
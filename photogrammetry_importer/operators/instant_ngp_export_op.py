@@ -3,9 +3,6 @@ import bpy
 from bpy.props import StringProperty, CollectionProperty
 from bpy_extras.io_utils import ExportHelper
 
-from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
-    InstantNGPFileHandler,
-)
 from photogrammetry_importer.operators.export_op import ExportOperator
 
 
@@ -30,6 +27,10 @@ class ExportInstantNGPOperator(ExportOperator, ExportHelper):
 
     def execute(self, context):
         """Export selected cameras as :code:`Instant-NGP` JSON file."""
+        from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
+            InstantNGPFileHandler,
+        )
+
         assert len(self.files) == 1
         ofp = os.path.join(self.directory, self.files[0].name)
 
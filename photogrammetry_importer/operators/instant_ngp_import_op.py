@@ -3,12 +3,10 @@ from bpy.props import StringProperty
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 
-from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
-    InstantNGPFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -34,8 +32,13 @@ class ImportInstantNGPOperator(
     directory: StringProperty()
     filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
 
+    @profile_execute
     def execute(self, context):
         """Import an :code:`Instant-NGP` :code:`JSON` file."""
+        from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
+            InstantNGPFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
 
         log_report("INFO", "path: " + str(path), self)
@@ -7,14 +7,12 @@ from bpy_extras.io_utils import ImportHelper
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 from photogrammetry_importer.importers.mesh_importer import MeshImporter
 
-from photogrammetry_importer.file_handlers.meshroom_file_handler import (
-    MeshroomFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -93,18 +91,18 @@ class ImportMeshroomOperator(
         default=-1,
     )
 
+    @profile_execute
     def execute(self, context):
         """Import a :code:`Meshroom` file/workspace."""
+        from photogrammetry_importer.file_handlers.meshroom_file_handler import (
+            MeshroomFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
         log_report("INFO", "path: " + str(path), self)
 
         self.image_dp = self.get_default_image_path(path, self.image_dp)
-        (
-            cameras,
-            points,
-            mesh_fp,
-            image_dp,
-        ) = MeshroomFileHandler.parse_meshroom_file(
+        result = MeshroomFileHandler.parse_meshroom_file(
             path,
             self.use_workspace_images,
             self.image_dp,
@@ -116,7 +114,19 @@ class ImportMeshroomOperator(
             self.mesh_node_number,
             self.prepare_node_number,
             self,
+            return_visibility_index=self.import_point_visibility,
         )
+        if self.import_point_visibility:
+            (
+                cameras,
+                points,
+                mesh_fp,
+                image_dp,
+                visibility_index,
+            ) = result
+        else:
+            cameras, points, mesh_fp, image_dp = result
+            visibility_index = None
         self.image_dp = image_dp
         log_report("INFO", "image_dp: " + str(self.image_dp), self)
 
@@ -125,7 +135,9 @@ class ImportMeshroomOperator(
 
         reconstruction_collection = add_collection("Reconstruction Collection")
         self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
+        self.import_photogrammetry_points(
+            points, reconstruction_collection, visibility_index
+        )
         self.import_photogrammetry_mesh(mesh_fp, reconstruction_collection)
         self.apply_general_options()
 
@@ -151,6 +163,6 @@ class ImportMeshroomOperator(
             draw_workspace_image_usage=True,
             reorganize_undistorted_images=True,
         )
-        self.draw_point_options(layout)
+        self.draw_point_options(layout, draw_point_visibility=True)
         self.draw_mesh_options(layout)
         self.draw_general_options(layout)
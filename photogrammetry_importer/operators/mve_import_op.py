@@ -4,13 +4,11 @@ from bpy.props import StringProperty
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 
-from photogrammetry_importer.file_handlers.mve_file_handler import (
-    MVEFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -31,8 +29,13 @@ class ImportMVEOperator(
 
     directory: StringProperty()
 
+    @profile_execute
     def execute(self, context):
         """Import an :code:`MVE` workspace."""
+        from photogrammetry_importer.file_handlers.mve_file_handler import (
+            MVEFileHandler,
+        )
+
         path = self.directory
         # Remove trailing slash
         path = os.path.dirname(path)
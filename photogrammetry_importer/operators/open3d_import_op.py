@@ -8,14 +8,12 @@ from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
 from photogrammetry_importer.operators.utility import (
     set_image_size_for_cameras,
+    profile_execute,
 )
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 
-from photogrammetry_importer.file_handlers.open3D_file_handler import (
-    Open3DFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -127,8 +125,13 @@ class ImportOpen3DOperator(
             success = True
         return cameras, success
 
+    @profile_execute
     def execute(self, context):
         """Import an :code:`Open3D` file."""
+        from photogrammetry_importer.file_handlers.open3D_file_handler import (
+            Open3DFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
         log_report("INFO", "path: " + str(path), self)
 
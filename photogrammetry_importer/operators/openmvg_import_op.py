@@ -5,13 +5,11 @@ from bpy_extras.io_utils import ImportHelper
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 
-from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
-    OpenMVGJSONFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -38,28 +36,41 @@ class ImportOpenMVGOperator(
     directory: StringProperty()
     filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
 
+    @profile_execute
     def execute(self, context):
         """Import an :code:`OpenMVG` :code:`JSON` file."""
+        from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
+            OpenMVGJSONFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
         log_report("INFO", "path: " + str(path), self)
 
         self.image_dp = self.get_default_image_path(path, self.image_dp)
         log_report("INFO", "image_dp: " + str(self.image_dp), self)
 
-        cameras, points = OpenMVGJSONFileHandler.parse_openmvg_file(
+        result = OpenMVGJSONFileHandler.parse_openmvg_file(
             path,
             self.image_dp,
             self.image_fp_type,
             self.suppress_distortion_warnings,
             self,
+            return_visibility_index=self.import_point_visibility,
         )
+        if self.import_point_visibility:
+            cameras, points, visibility_index = result
+        else:
+            cameras, points = result
+            visibility_index = None
 
         log_report("INFO", "Number cameras: " + str(len(cameras)), self)
         log_report("INFO", "Number points: " + str(len(points)), self)
 
         reconstruction_collection = add_collection("Reconstruction Collection")
         self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
+        self.import_photogrammetry_points(
+            points, reconstruction_collection, visibility_index
+        )
         self.apply_general_options()
 
         return {"FINISHED"}
@@ -74,5 +85,5 @@ class ImportOpenMVGOperator(
         """Draw the import options corresponding to this operator."""
         layout = self.layout
         self.draw_camera_options(layout)
-        self.draw_point_options(layout)
+        self.draw_point_options(layout, draw_point_visibility=True)
         self.draw_general_options(layout)
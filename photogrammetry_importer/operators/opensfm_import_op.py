@@ -5,13 +5,11 @@ from bpy_extras.io_utils import ImportHelper
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 
-from photogrammetry_importer.file_handlers.opensfm_json_file_handler import (
-    OpenSfMJSONFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -45,8 +43,13 @@ class ImportOpenSfMOperator(
         default=0,
     )
 
+    @profile_execute
     def execute(self, context):
         """Import an :code:`OpenSfM` :code:`JSON` file."""
+        from photogrammetry_importer.file_handlers.opensfm_json_file_handler import (
+            OpenSfMJSONFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
         log_report("INFO", "path: " + str(path), self)
 
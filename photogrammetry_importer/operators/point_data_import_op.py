@@ -5,15 +5,10 @@ from bpy_extras.io_utils import ImportHelper
 
 from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
+from photogrammetry_importer.operators.utility import profile_execute
 
 from photogrammetry_importer.importers.point_importer import PointImporter
 
-from photogrammetry_importer.file_handlers.point_data_file_handler import (
-    PointDataFileHandler,
-)
-from photogrammetry_importer.file_handlers.transformation_file_handler import (
-    TransformationFileHandler,
-)
 from photogrammetry_importer.blender_utility.object_utility import (
     add_collection,
 )
@@ -41,8 +36,16 @@ class ImportPointDataOperator(
         default="*.ply;*.pcd;*.las;*.laz;*.asc;*.pts;*.csv", options={"HIDDEN"}
     )
 
+    @profile_execute
     def execute(self, context):
         """Import a file with point data (e.g. :code:`PLY`)."""
+        from photogrammetry_importer.file_handlers.point_data_file_handler import (
+            PointDataFileHandler,
+        )
+        from photogrammetry_importer.file_handlers.transformation_file_handler import (
+            TransformationFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
         log_report("INFO", "path: " + str(path), self)
 
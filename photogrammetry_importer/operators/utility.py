@@ -1,4 +1,9 @@
+import functools
+
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profiling_session,
+)
 
 
 def set_image_size_for_cameras(
@@ -12,10 +17,11 @@ def set_image_size_for_cameras(
 
     log_report("INFO", "set_image_size_for_cameras: ", op)
     success = True
-    for camera in cameras:
-        image_fp = camera.get_absolute_fp()
-        success, width, height = ImageFileHandler.read_image_size(
-            image_fp, default_width, default_height, op
+    image_fps = [camera.get_absolute_fp() for camera in cameras]
+    image_sizes = ImageFileHandler.read_image_sizes(image_fps)
+    for camera, image_fp, image_size in zip(cameras, image_fps, image_sizes):
+        success, width, height = ImageFileHandler.get_image_size_or_default(
+            image_fp, image_size, default_width, default_height, op
         )
         camera.width = width
         camera.height = height
@@ -23,3 +29,24 @@ def set_image_size_for_cameras(
             break
     log_report("INFO", "set_image_size_for_cameras: Done", op)
     return success
+
+
+def profile_execute(execute):
+    """Decorate :code:`execute()` to profile the import (if enabled)."""
+
+    # Blender checks the number of arguments of "execute()", i.e. the wrapper
+    # must not use "*args" or "**kwargs".
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        if not getattr(self, "profile_import", False):
+            return execute(self, context)
+        with profiling_session(
+            self.bl_label, trace_memory=self.profile_memory
+        ) as profiler:
+            result = execute(self, context)
+        log_report("INFO", "Import profile:", self)
+        for line in profiler.get_summary_lines():
+            log_report("INFO", line, self)
+        return result
+
+    return wrapper
@@ -5,9 +5,6 @@ from bpy_extras.io_utils import ExportHelper
 
 from bpy.props import CollectionProperty
 
-from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
-    VisualSfMFileHandler,
-)
 from photogrammetry_importer.operators.export_op import ExportOperator
 
 
@@ -31,6 +28,10 @@ class ExportVisualSfMOperator(ExportOperator, ExportHelper):
 
     def execute(self, context):
         """Export selected cameras and points as :code:`VisualSfM` file."""
+        from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
+            VisualSfMFileHandler,
+        )
+
         assert len(self.files) == 1
         ofp = os.path.join(self.directory, self.files[0].name)
 
@@ -7,14 +7,12 @@ from photogrammetry_importer.operators.import_op import ImportOperator
 from photogrammetry_importer.operators.general_options import GeneralOptions
 from photogrammetry_importer.operators.utility import (
     set_image_size_for_cameras,
+    profile_execute,
 )
 
 from photogrammetry_importer.importers.camera_importer import CameraImporter
 from photogrammetry_importer.importers.point_importer import PointImporter
 
-from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
-    VisualSfMFileHandler,
-)
 
 from photogrammetry_importer.types.camera import Camera
 
@@ -55,27 +53,40 @@ class ImportVisualSfMOperator(
         )
         return cameras, success
 
+    @profile_execute
     def execute(self, context):
         """Import an :code:`VisualSfM` file."""
+        from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
+            VisualSfMFileHandler,
+        )
+
         path = os.path.join(self.directory, self.filepath)
         log_report("INFO", "path: " + str(path), self)
 
         self.image_dp = self.get_default_image_path(path, self.image_dp)
         log_report("INFO", "image_dp: " + str(self.image_dp), self)
 
-        cameras, points = VisualSfMFileHandler.parse_visualsfm_file(
+        result = VisualSfMFileHandler.parse_visualsfm_file(
             path,
             self.image_dp,
             self.image_fp_type,
             self.suppress_distortion_warnings,
             self,
+            return_visibility_index=self.import_point_visibility,
         )
+        if self.import_point_visibility:
+            cameras, points, visibility_index = result
+        else:
+            cameras, points = result
+            visibility_index = None
         log_report("INFO", "Number cameras: " + str(len(cameras)), self)
         log_report("INFO", "Number points: " + str(len(points)), self)
 
         reconstruction_collection = add_collection("Reconstruction Collection")
         self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
+        self.import_photogrammetry_points(
+            points, reconstruction_collection, visibility_index
+        )
         self.apply_general_options()
 
         return {"FINISHED"}
@@ -92,5 +103,5 @@ class ImportVisualSfMOperator(
         self.draw_camera_options(
             layout, draw_image_size=True, draw_principal_point=True
         )
-        self.draw_point_options(layout)
+        self.draw_point_options(layout, draw_point_visibility=True)
         self.draw_general_options(layout)
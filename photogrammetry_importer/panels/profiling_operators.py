@@ -0,0 +1,46 @@
+import bpy
+from bpy.props import EnumProperty, StringProperty
+from bpy_extras.io_utils import ExportHelper
+from photogrammetry_importer.utility.profiling_utility import (
+    get_last_profiler,
+)
+from photogrammetry_importer.blender_utility.logging_utility import log_report
+
+
+class ExportImportProfileOperator(bpy.types.Operator, ExportHelper):
+    """An Operator to export the profile of the last import."""
+
+    bl_idname = "photogrammetry_importer.export_import_profile"
+    bl_label = "Export Import Profile"
+    bl_description = (
+        "Export the profile of the last import as json or Chrome trace file."
+    )
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    export_format: EnumProperty(
+        name="Format",
+        description="Format of the exported profile. Chrome trace files can "
+        "be inspected with chrome://tracing or https://ui.perfetto.dev",
+        items=(
+            ("JSON", "JSON", "Nested spans with durations"),
+            ("CHROME_TRACE", "Chrome Trace", "Chrome trace event format"),
+        ),
+        default="JSON",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """Return the availability status of the operator."""
+        return get_last_profiler() is not None
+
+    def execute(self, context):
+        """Export the profile of the last import."""
+        profiler = get_last_profiler()
+        if self.export_format == "CHROME_TRACE":
+            profiler.write_chrome_trace(self.filepath)
+        else:
+            profiler.write_json(self.filepath)
+        log_report("INFO", "Wrote import profile to " + self.filepath, self)
+        return {"FINISHED"}
@@ -6,8 +6,6 @@ from photogrammetry_importer.blender_utility.retrieval_utility import (
     get_scene_animation_indices,
     get_object_animation_indices,
 )
-from photogrammetry_importer.opengl.draw_manager import DrawManager
-from photogrammetry_importer.opengl.utility import render_opengl_image
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 from photogrammetry_importer.blender_utility.image_utility import (
     save_image_to_disk,
@@ -29,6 +27,9 @@ class SaveOpenGLRenderImageOperator(bpy.types.Operator):
 
     def execute(self, context):
         """Render the point cloud and save the result as image in Blender."""
+        from photogrammetry_importer.opengl.draw_manager import DrawManager
+        from photogrammetry_importer.opengl.utility import render_opengl_image
+
         log_report("INFO", "Save opengl render as image: ...", self)
         save_point_size = context.scene.opengl_panel_settings.save_point_size
         cam = get_selected_camera()
@@ -59,6 +60,9 @@ class ExportOpenGLRenderImageOperator(bpy.types.Operator, ExportHelper):
 
     def execute(self, context):
         """Render the point cloud and export the result as image."""
+        from photogrammetry_importer.opengl.draw_manager import DrawManager
+        from photogrammetry_importer.opengl.utility import render_opengl_image
+
         log_report("INFO", "Export opengl render as image: ...", self)
         scene = context.scene
         save_point_size = scene.opengl_panel_settings.save_point_size
@@ -100,6 +104,9 @@ class ExportOpenGLRenderAnimationOperator(bpy.types.Operator, ExportHelper):
 
     def execute(self, context):
         """Render the point cloud and export the result as image sequence."""
+        from photogrammetry_importer.opengl.draw_manager import DrawManager
+        from photogrammetry_importer.opengl.utility import render_opengl_image
+
         log_report(
             "INFO", "Export opengl render as image sequencemation: ...", self
         )
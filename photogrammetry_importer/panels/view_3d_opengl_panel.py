@@ -15,8 +15,10 @@ from photogrammetry_importer.panels.render_operators import (
     ExportOpenGLRenderImageOperator,
     ExportOpenGLRenderAnimationOperator,
 )
+from photogrammetry_importer.panels.visibility_operators import (
+    ShowPointsSeenByCameraOperator,
+)
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.opengl.draw_manager import DrawManager
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 from photogrammetry_importer.blender_utility.retrieval_utility import (
     get_selected_empty,
@@ -36,6 +38,8 @@ class OpenGLPanelSettings(bpy.types.PropertyGroup):
         return 1
 
     def set_viz_point_size(self, value):
+        from photogrammetry_importer.opengl.draw_manager import DrawManager
+
         point_cloud_anchor = get_selected_empty()
         if point_cloud_anchor is not None:
             point_cloud_anchor["point_size"] = value
@@ -121,6 +125,7 @@ class OpenGLPanel(bpy.types.Panel):
         bpy.utils.register_class(SaveOpenGLRenderImageOperator)
         bpy.utils.register_class(ExportOpenGLRenderImageOperator)
         bpy.utils.register_class(ExportOpenGLRenderAnimationOperator)
+        bpy.utils.register_class(ShowPointsSeenByCameraOperator)
 
     @classmethod
     def unregister(cls):
@@ -133,6 +138,7 @@ class OpenGLPanel(bpy.types.Panel):
         bpy.utils.unregister_class(SaveOpenGLRenderImageOperator)
         bpy.utils.unregister_class(ExportOpenGLRenderImageOperator)
         bpy.utils.unregister_class(ExportOpenGLRenderAnimationOperator)
+        bpy.utils.unregister_class(ShowPointsSeenByCameraOperator)
 
     def draw(self, context):
         """Draw the panel with corrresponding properties and operators."""
@@ -157,6 +163,13 @@ class OpenGLPanel(bpy.types.Panel):
         )
         row.enabled = anchor_selected
 
+        visibility_box = layout.box()
+        visibility_box.label(
+            text="Select a camera to show the points observed by it."
+        )
+        row = visibility_box.row()
+        row.operator(ShowPointsSeenByCameraOperator.bl_idname)
+
         export_screenshot_box = layout.box()
         export_screenshot_box.label(
             text="Export a single or multiple"
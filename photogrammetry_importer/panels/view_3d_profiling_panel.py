@@ -0,0 +1,46 @@
+import bpy
+from photogrammetry_importer.panels.profiling_operators import (
+    ExportImportProfileOperator,
+)
+from photogrammetry_importer.utility.profiling_utility import (
+    get_last_profiler,
+)
+
+
+class ImportProfilePanel(bpy.types.Panel):
+    """Class that defines the import profile panel in the 3D view."""
+
+    bl_label = "Import Profile Panel"
+    bl_idname = "IMPORT_PROFILE_PT_show_import_profile"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "PhotogrammetryImporter"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    @classmethod
+    def poll(cls, context):
+        """Return the availability status of the panel."""
+        return True
+
+    @classmethod
+    def register(cls):
+        """Register operators corresponding to this panel."""
+        bpy.utils.register_class(ExportImportProfileOperator)
+
+    @classmethod
+    def unregister(cls):
+        """Unregister operators corresponding to this panel."""
+        bpy.utils.unregister_class(ExportImportProfileOperator)
+
+    def draw(self, context):
+        """Draw the panel with the profile of the last import."""
+        layout = self.layout
+        profiler = get_last_profiler()
+        if profiler is None:
+            layout.label(text="Enable 'Profile Import' in the import options")
+            return
+        profile_box = layout.box()
+        for line in profiler.get_summary_lines():
+            profile_box.label(text=line)
+        row = layout.row()
+        row.operator(ExportImportProfileOperator.bl_idname)
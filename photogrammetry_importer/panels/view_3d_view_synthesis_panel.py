@@ -7,6 +7,7 @@ from bpy.props import (
 )
 from photogrammetry_importer.panels.view_synthesis_operators import (
     RunViewSynthesisOperator,
+    StopViewSynthesisWorkerOperator,
 )
 
 
@@ -68,6 +69,27 @@ class ViewSynthesisPanelSettings(bpy.types.PropertyGroup):
         description="",
         default=1,
     )
+    worker_idle_timeout: IntProperty(
+        name="Worker Idle Timeout",
+        description="Stop the view synthesis worker (and release the loaded "
+        "snapshot) after this many seconds without requests",
+        default=600,
+        min=1,
+    )
+    worker_startup_timeout: IntProperty(
+        name="Worker Startup Timeout",
+        description="Stop the view synthesis worker, if loading the snapshot "
+        "takes longer than this many seconds",
+        default=300,
+        min=1,
+    )
+    worker_render_timeout: IntProperty(
+        name="Worker Render Timeout",
+        description="Stop the view synthesis worker, if rendering an image "
+        "takes longer than this many seconds",
+        default=120,
+        min=1,
+    )
     rotation_anchor_obj_name: StringProperty(
         name="Rotation Anchor Object",
         description="The rotation of this object is considered for view "
@@ -99,6 +121,7 @@ class ViewSynthesisPanel(bpy.types.Panel):
             type=ViewSynthesisPanelSettings
         )
         bpy.utils.register_class(RunViewSynthesisOperator)
+        bpy.utils.register_class(StopViewSynthesisWorkerOperator)
 
     @classmethod
     def unregister(cls):
@@ -106,6 +129,13 @@ class ViewSynthesisPanel(bpy.types.Panel):
         bpy.utils.unregister_class(ViewSynthesisPanelSettings)
         del bpy.types.Scene.view_synthesis_panel_settings
         bpy.utils.unregister_class(RunViewSynthesisOperator)
+        bpy.utils.unregister_class(StopViewSynthesisWorkerOperator)
+        # Release the snapshot loaded by the worker
+        from photogrammetry_importer.process_communication.view_synthesis_worker import (
+            stop_view_synthesis_workers,
+        )
+
+        stop_view_synthesis_workers()
 
     def draw(self, context):
         """Draw the panel with corrresponding properties and operators."""
@@ -164,5 +194,22 @@ class ViewSynthesisPanel(bpy.types.Panel):
             settings, "rotation_anchor_obj_name", text="Rotation Anchor Object"
         )
 
+        row = view_synthesis_box.row()
+        row.prop(
+            settings, "worker_idle_timeout", text="Worker Idle Timeout (s)"
+        )
+        row = view_synthesis_box.row()
+        row.prop(
+            settings,
+            "worker_startup_timeout",
+            text="Worker Startup Timeout (s)",
+        )
+        row = view_synthesis_box.row()
+        row.prop(
+            settings, "worker_render_timeout", text="Worker Render Timeout (s)"
+        )
+
         row = view_synthesis_box.row()
         row.operator(RunViewSynthesisOperator.bl_idname)
+        row = view_synthesis_box.row()
+        row.operator(StopViewSynthesisWorkerOperator.bl_idname)
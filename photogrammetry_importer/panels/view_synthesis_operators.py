@@ -1,10 +1,6 @@
-import sys
-import subprocess
-import os
-import numpy as np
 import bpy
+import numpy as np
 from mathutils import Matrix
-from tempfile import NamedTemporaryFile
 
 
 from photogrammetry_importer.utility.np_utility import (
@@ -14,19 +10,42 @@ from photogrammetry_importer.blender_utility.retrieval_utility import (
     get_selected_camera,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
-from photogrammetry_importer.importers.camera_utility import (
-    load_background_image,
-    get_computer_vision_camera,
-)
-from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
-    InstantNGPFileHandler,
-)
-from photogrammetry_importer.process_communication.subprocess_command import (
-    create_subprocess_command,
-)
-from photogrammetry_importer.process_communication.file_communication import (
-    read_np_array_from_file,
-)
+
+
+def _create_view_synthesis_command(settings):
+    from photogrammetry_importer.process_communication.subprocess_command import (
+        create_subprocess_command,
+    )
+
+    if settings.execution_environment == "CONDA":
+        conda_exe_fp = settings.conda_exe_fp
+        conda_env_name = settings.conda_env_name
+        python_exe_fp = None
+    elif settings.execution_environment == "DEFAULT PYTHON":
+        python_exe_fp = settings.python_exe_fp
+        conda_exe_fp = None
+        conda_env_name = None
+
+    parameter_list = ["--load_snapshot", settings.view_synthesis_snapshot_fp]
+    parameter_list += ["--serve"]
+    if settings.additional_system_dps.strip() != "":
+        parameter_list += [
+            "--additional_system_dps",
+            settings.additional_system_dps,
+        ]
+    if settings.additional_output_dp.strip() != "":
+        parameter_list += [
+            "--additional_output_dp",
+            settings.additional_output_dp,
+        ]
+
+    return create_subprocess_command(
+        settings.view_synthesis_executable_fp,
+        parameter_list,
+        python_exe_fp=python_exe_fp,
+        conda_exe_fp=conda_exe_fp,
+        conda_env_name=conda_env_name,
+    )
 
 
 class RunViewSynthesisOperator(bpy.types.Operator):  # ImportHelper
@@ -43,90 +62,34 @@ class RunViewSynthesisOperator(bpy.types.Operator):  # ImportHelper
         return cam is not None
 
     def execute(self, context):
-        """Compute a view synthesis for the current camera."""
+        """Compute a view synthesis for the current camera.
+
+        The view synthesis script runs in a persistent worker process, i.e.
+        the snapshot is only loaded for the first camera.
+        """
+        from photogrammetry_importer.importers.camera_utility import (
+            load_background_image,
+            get_computer_vision_camera,
+        )
+        from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
+            InstantNGPFileHandler,
+        )
+        from photogrammetry_importer.process_communication.view_synthesis_worker import (
+            WorkerError,
+            create_worker_env,
+            get_view_synthesis_worker,
+        )
 
         log_report(
             "INFO", "Compute view synthesis for current camera: ...", self
         )
         scene = context.scene
+        settings = scene.view_synthesis_panel_settings
 
-        if sys.platform == "linux":
-            temp_json_file = NamedTemporaryFile()
-            temp_array_file = NamedTemporaryFile()
-        elif sys.platform == "win32":
-            temp_json_file = NamedTemporaryFile(delete=False)
-            temp_array_file = NamedTemporaryFile(delete=False)
-            # Required for windows (https://docs.python.org/3.9/library/tempfile.html)
-            #  Whether the name can be used to open the file a second time, while the named temporary file is still open,
-            #  varies across platforms (it can be so used on Unix; it cannot on Windows)
-            temp_json_file.close()
-            temp_array_file.close()
-        else:
-            assert False
-
-        if (
-            scene.view_synthesis_panel_settings.execution_environment
-            == "CONDA"
-        ):
-            conda_exe_fp = scene.view_synthesis_panel_settings.conda_exe_fp
-            conda_env_name = scene.view_synthesis_panel_settings.conda_env_name
-            python_exe_fp = None
-        elif (
-            scene.view_synthesis_panel_settings.execution_environment
-            == "DEFAULT PYTHON"
-        ):
-            python_exe_fp = scene.view_synthesis_panel_settings.python_exe_fp
-            conda_exe_fp = None
-            conda_env_name = None
-
-        view_synthesis_exe_or_script_fp = (
-            scene.view_synthesis_panel_settings.view_synthesis_executable_fp
-        )
-        view_synthesis_snapshot_fp = (
-            scene.view_synthesis_panel_settings.view_synthesis_snapshot_fp
-        )
-        additional_system_dps = (
-            scene.view_synthesis_panel_settings.additional_system_dps
-        )
-        additional_output_dp = (
-            scene.view_synthesis_panel_settings.additional_output_dp
-        )
-        samples_per_pixel = (
-            scene.view_synthesis_panel_settings.samples_per_pixel
-        )
-
-        parameter_list = ["--load_snapshot", view_synthesis_snapshot_fp]
-        parameter_list += ["--temp_json_ifp", temp_json_file.name]
-        parameter_list += ["--temp_array_ofp", temp_array_file.name]
-        parameter_list += ["--samples_per_pixel", str(samples_per_pixel)]
-        if additional_system_dps.strip() != "":
-            parameter_list += [
-                "--additional_system_dps",
-                additional_system_dps,
-            ]
-        if additional_output_dp.strip() != "":
-            parameter_list += [
-                "--additional_output_dp",
-                additional_output_dp,
-            ]
-
-        assert os.path.isfile(view_synthesis_exe_or_script_fp)
-        assert os.path.isfile(temp_json_file.name)
-        assert os.path.isfile(temp_array_file.name)
-
-        command = create_subprocess_command(
-            view_synthesis_exe_or_script_fp,
-            parameter_list,
-            python_exe_fp=python_exe_fp,
-            conda_exe_fp=conda_exe_fp,
-            conda_env_name=conda_env_name,
-        )
-        cmd_call = " ".join(command)
-        log_report("INFO", cmd_call, self)
+        command = _create_view_synthesis_command(settings)
+        log_report("INFO", " ".join(command), self)
 
-        anchor_obj = bpy.data.objects[
-            scene.view_synthesis_panel_settings.rotation_anchor_obj_name
-        ]
+        anchor_obj = bpy.data.objects[settings.rotation_anchor_obj_name]
         anchor_matrix_world = invert_transformation_matrix(
             np.array(anchor_obj.matrix_world)
         )
@@ -152,21 +115,29 @@ class RunViewSynthesisOperator(bpy.types.Operator):  # ImportHelper
             camera_obj_relative_to_anchor.name,
             check_scale=False,
         )
-
-        # Call before executing the child process
-        InstantNGPFileHandler.write_instant_ngp_file(
-            temp_json_file.name,
+        camera_json_data = InstantNGPFileHandler.get_instant_ngp_json_data(
             [camera_relative_to_anchor],
             ref_centroid_shift=centroid_shift,
         )
 
-        child_process = subprocess.Popen(command)
-        child_process.communicate()
-
-        # Call after executing the child process
-        img_np_array = read_np_array_from_file(
-            temp_array_file.name, use_pickle=False
+        worker = get_view_synthesis_worker(
+            command,
+            env=create_worker_env(),
+            idle_timeout=settings.worker_idle_timeout,
+            startup_timeout=settings.worker_startup_timeout,
+            render_timeout=settings.worker_render_timeout,
         )
+        if not worker.is_alive():
+            log_report(
+                "INFO", "Starting view synthesis worker (loading snapshot)"
+            )
+        try:
+            img_np_array = worker.render(
+                camera_json_data, settings.samples_per_pixel
+            )
+        except WorkerError as err:
+            log_report("ERROR", f"View synthesis failed: {err}", self)
+            return {"CANCELLED"}
 
         blender_image = bpy.data.images.new(
             "view_synthesis_result",
@@ -177,14 +148,25 @@ class RunViewSynthesisOperator(bpy.types.Operator):  # ImportHelper
         blender_image.pixels = img_np_array_flipped.ravel()
         load_background_image(blender_image, camera_obj.name)
 
-        if sys.platform == "win32":
-            # Required for windows (https://docs.python.org/3.9/library/tempfile.html)
-            temp_json_file.close()
-            temp_array_file.close()
-            os.unlink(temp_json_file.name)
-            os.unlink(temp_array_file.name)
-
         log_report(
             "INFO", "Compute view synthesis for current camera: Done", self
         )
         return {"FINISHED"}
+
+
+class StopViewSynthesisWorkerOperator(bpy.types.Operator):
+    """An Operator to stop the view synthesis worker process."""
+
+    bl_idname = "photogrammetry_importer.stop_view_synthesis_worker"
+    bl_label = "Stop View Synthesis Worker"
+    bl_description = "Stop the worker process to release its (GPU) memory."
+
+    def execute(self, context):
+        """Stop the view synthesis worker."""
+        from photogrammetry_importer.process_communication.view_synthesis_worker import (
+            stop_view_synthesis_workers,
+        )
+
+        stop_view_synthesis_workers()
+        log_report("INFO", "Stopped view synthesis worker", self)
+        return {"FINISHED"}
@@ -0,0 +1,108 @@
+import numpy as np
+import bpy
+
+from photogrammetry_importer.blender_utility.retrieval_utility import (
+    get_selected_camera,
+)
+from photogrammetry_importer.blender_utility.logging_utility import log_report
+
+
+def _get_parent_collection(collection):
+    for parent_collection in bpy.data.collections:
+        if collection.name in parent_collection.children:
+            return parent_collection
+    return None
+
+
+def _get_point_cloud_handle_with_visibility(camera_obj):
+    """Return the point cloud handle of the camera's reconstruction."""
+    handles = [obj for obj in bpy.data.objects if "visibility_index" in obj]
+    # Prefer handles in the same reconstruction collection as the camera
+    for camera_collection in camera_obj.users_collection:
+        reconstruction_collection = _get_parent_collection(camera_collection)
+        if reconstruction_collection is None:
+            continue
+        for handle in handles:
+            if handle.name in reconstruction_collection.objects:
+                return handle
+    if len(handles) > 0:
+        return handles[0]
+    return None
+
+
+def _get_point_cloud_coords(handle):
+    if "particle_coords" in handle:
+        return np.asarray(handle["particle_coords"], dtype=float)
+    if handle.type == "MESH":
+        coords = np.empty(len(handle.data.vertices) * 3, dtype=float)
+        handle.data.vertices.foreach_get("co", coords)
+        return coords.reshape(-1, 3)
+    return None
+
+
+class ShowPointsSeenByCameraOperator(bpy.types.Operator):
+    """An Operator to show the points observed by the selected camera."""
+
+    bl_idname = "photogrammetry_importer.show_points_seen_by_camera"
+    bl_label = "Show Points Seen by Selected Camera"
+    bl_description = (
+        "Add a point cloud with the points observed by the selected camera."
+        " Requires a reconstruction imported with point visibility"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """Return the availability status of the operator."""
+        cam = get_selected_camera()
+        return cam is not None and "camera_index" in cam
+
+    def execute(self, context):
+        """Add the points observed by the selected camera."""
+        from photogrammetry_importer.types.visibility_index import (
+            VisibilityIndex,
+        )
+        from photogrammetry_importer.opengl.utility import draw_coords
+
+        camera_obj = get_selected_camera()
+        handle = _get_point_cloud_handle_with_visibility(camera_obj)
+        if handle is None:
+            log_report(
+                "ERROR", "No point cloud with visibility information", self
+            )
+            return {"CANCELLED"}
+        coords = _get_point_cloud_coords(handle)
+        if coords is None:
+            log_report("ERROR", "Point cloud handle contains no points", self)
+            return {"CANCELLED"}
+
+        visibility_index = VisibilityIndex.from_dict(
+            handle["visibility_index"].to_dict()
+        )
+        camera_index = camera_obj["camera_index"]
+        if camera_index >= visibility_index.get_num_cameras():
+            log_report("ERROR", "Camera not contained in the index", self)
+            return {"CANCELLED"}
+        # The point ids of the stored index are positions in the point cloud
+        point_positions = visibility_index.get_point_ids_of_camera(
+            camera_index
+        )
+        log_report(
+            "INFO",
+            f"Camera {camera_obj.name} observes {len(point_positions)} points",
+            self,
+        )
+        if len(handle.users_collection) > 0:
+            collection = handle.users_collection[0]
+        else:
+            collection = None
+        point_size = handle["point_size"] if "point_size" in handle else 5
+        draw_coords(
+            coords[point_positions].tolist(),
+            color=(1.0, 0.5, 0.0, 1.0),
+            point_size=point_size,
+            add_points_to_point_cloud_handle=True,
+            reconstruction_collection=collection,
+            object_anchor_handle_name=camera_obj.name + "_visible_points",
+            op=self,
+        )
+        return {"FINISHED"}
@@ -8,6 +8,7 @@ from photogrammetry_importer.preferences.dependency import (
     UninstallOptionalDependenciesOperator,
     PipManager,
     OptionalDependencyManager,
+    probe_dependencies,
 )
 from photogrammetry_importer.blender_utility.logging_utility import log_report
 from photogrammetry_importer.utility.ui_utility import add_multi_line_label
@@ -22,6 +23,25 @@ def _get_addon_name():
     return __name__.split(".")[0]
 
 
+def _get_dependency_statuses():
+    pip_manager = PipManager.get_singleton()
+    dependency_manager = OptionalDependencyManager.get_singleton()
+    return [pip_manager.pip_dependency_status] + list(
+        dependency_manager.get_dependencies()
+    )
+
+
+def _redraw_preferences_after_probing():
+    # Timer function (the probing thread must not access Blender's data)
+    if not all(status.is_probed() for status in _get_dependency_statuses()):
+        return 0.25
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "PREFERENCES":
+                area.tag_redraw()
+    return None
+
+
 class AddonPreferences(
     bpy.types.AddonPreferences,
     CameraImporter,
@@ -80,6 +100,7 @@ class AddonPreferences(
         bpy.utils.register_class(UninstallOptionalDependenciesOperator)
         bpy.utils.register_class(ResetImportOptionsOperator)
         bpy.utils.register_class(UpdateImporterExporterOperator)
+        probe_dependencies()
 
     @classmethod
     def unregister(cls):
@@ -91,7 +112,9 @@ class AddonPreferences(
 
     @staticmethod
     def _get_installation_status_str(installation_status):
-        if installation_status:
+        if installation_status is None:
+            status = "Checking ..."
+        elif installation_status:
             status = "Installed"
         else:
             status = "Not installed"
@@ -101,14 +124,17 @@ class AddonPreferences(
     def _get_package_info_str(
         info_str,
         installation_status,
-        setuptools_missing_str="",
+        metadata_missing_str="",
         removed_in_current_sesssion_str="",
     ):
-        if installation_status:
+        if installation_status is None:
+            # The status has not been determined yet
+            info_str = ""
+        elif installation_status:
             if info_str is None:
                 # In this case the info_str could not been determined, since
-                # the setuptools package is missing
-                info_str = setuptools_missing_str
+                # the package metadata is missing
+                info_str = metadata_missing_str
         else:
             if info_str is None:
                 # In this case the module has not been removed in the
@@ -123,19 +149,25 @@ class AddonPreferences(
     def _draw_dependency(
         self,
         dependency,
-        setuptools_missing_str,
+        metadata_missing_str,
         removed_in_current_sesssion_str,
         dependencies_status_box,
     ):
-        dependency_installation_status = dependency.installation_status
+        if dependency.is_probed():
+            dependency_installation_status = dependency.installation_status
+            version_str, location_str = dependency.get_package_info()
+        else:
+            # Do not block the user interface, the probing thread will
+            # trigger a redraw
+            dependency_installation_status = None
+            version_str, location_str = "", ""
         dependency_installation_status_str = self._get_installation_status_str(
             dependency_installation_status
         )
-        version_str, location_str = dependency.get_package_info()
         version_str = self._get_package_info_str(
             version_str,
             dependency_installation_status,
-            setuptools_missing_str,
+            metadata_missing_str,
             removed_in_current_sesssion_str,
         )
         location_str = self._get_package_info_str(
@@ -196,11 +228,21 @@ class AddonPreferences(
 
         row = install_dependency_box.row()
         row.label(text="Pip Installation Status:")
-        setuptools_missing_str = "Install setuptools (and restart Blender) to show version and location"
+        metadata_missing_str = "No package metadata found"
         removed_in_current_sesssion_str = (
             "(Restart Blender to clear imported module)"
         )
 
+        if not all(
+            status.is_probed() for status in _get_dependency_statuses()
+        ):
+            # E.g. the status has been invalidated by (un)installing packages
+            probe_dependencies()
+            if not bpy.app.timers.is_registered(
+                _redraw_preferences_after_probing
+            ):
+                bpy.app.timers.register(_redraw_preferences_after_probing)
+
         pip_manager = PipManager.get_singleton()
         pip_status_box = install_dependency_box.box()
         pip_status_box_split = pip_status_box.split()
@@ -209,15 +251,18 @@ class AddonPreferences(
         pip_status_box_3 = pip_status_box_split.column()
         pip_status_box_4 = pip_status_box_split.column()
 
-        pip_installation_status = (
-            pip_manager.pip_dependency_status.installation_status
-        )
+        pip_dependency_status = pip_manager.pip_dependency_status
+        if pip_dependency_status.is_probed():
+            pip_installation_status = pip_dependency_status.installation_status
+            version_str, location_str = pip_manager.get_package_info()
+        else:
+            pip_installation_status = None
+            version_str, location_str = "", ""
         pip_installation_status_str = self._get_installation_status_str(
             pip_installation_status
         )
-        version_str, location_str = pip_manager.get_package_info()
         version_str = self._get_package_info_str(
-            version_str, pip_installation_status, setuptools_missing_str
+            version_str, pip_installation_status, metadata_missing_str
         )
         location_str = self._get_package_info_str(
             location_str, pip_installation_status
@@ -237,7 +282,7 @@ class AddonPreferences(
         for dependency in dependencies:
             self._draw_dependency(
                 dependency,
-                setuptools_missing_str,
+                metadata_missing_str,
                 removed_in_current_sesssion_str,
                 dependencies_status_box,
             )
@@ -9,6 +9,10 @@ from collections import defaultdict
 import bpy
 from bpy.app.handlers import persistent
 from photogrammetry_importer.blender_utility.logging_utility import log_report
+from photogrammetry_importer.utility.dependency_utility import (
+    DependencyStatus,
+    probe_dependencies_in_background,
+)
 from bpy.props import StringProperty
 
 
@@ -94,53 +98,6 @@ def add_command_line_sys_path_if_necessary(dummy):
         )
 
 
-class DependencyStatus:
-    """Class that describes the installation status of a Python dependency."""
-
-    def __init__(self, gui_name, package_name, import_name):
-        # Name shown in the GUI.
-        self.gui_name = gui_name
-        # Package name such as "pillow" in "pip install pillow".
-        self.package_name = package_name
-        # Import name such as "PIL" in "import PIL".
-        self.import_name = import_name
-
-        self.installation_status = False
-        self._determine_installation_status()
-
-    def _determine_installation_status(self):
-        """Determine wether this dependency is installed or not.
-
-        Once a module is loaded into the current Python session, importlib can
-        not longer be used to determine the installation status. Restart
-        Blender to clear the current Python session.
-        """
-        assert not self.installation_status
-        module_spec = importlib.util.find_spec(self.import_name)
-        self.installation_status = module_spec is not None
-
-    def get_package_info(self):
-        try:
-            # This does NOT immediately work after installation from Blender's
-            # python using a subprocess. A restart is required to import
-            # "pkg_resources" properly.
-            import pkg_resources
-
-            # https://github.com/pypa/setuptools/blob/9f1822ee910df3df930a98ab99f66d18bb70659b/pkg_resources/__init__.py#L2574
-            dist_info_distribution = pkg_resources.get_distribution(
-                self.package_name
-            )
-            version_str = dist_info_distribution.version
-            location_str = os.path.join(
-                dist_info_distribution.location,
-                dist_info_distribution.project_name,
-            )
-        except Exception as e:
-            version_str = None
-            location_str = None
-        return version_str, location_str
-
-
 class PipManager:
     """Class that manages the pip installation."""
 
@@ -189,7 +146,7 @@ class PipManager:
         # Thus, we need to remove the invalid environment variable.
         ensurepip.bootstrap()
         os.environ.pop("PIP_REQ_TRACKER", None)
-        self.pip_dependency_status.installation_status = True
+        self.pip_dependency_status.invalidate()
 
     def get_package_info(self):
         """Return the pip installation status."""
@@ -223,9 +180,10 @@ class OptionalDependency(DependencyStatus):
             op,
         )
         subprocess.run(dependency_install_command, check=False)
+        self.invalidate()
         try:
             importlib.import_module(self.import_name)
-            self.installation_status = True
+            self.probe()
         except ImportError as import_error:
             self.installation_status = False
             log_report(
@@ -263,7 +221,13 @@ class OptionalDependency(DependencyStatus):
         subprocess.run(dependency_uninstall_command, check=False)
         if remove_sys_path:
             remove_command_line_sys_path()
-        self.installation_status = False
+        if self.import_name in sys.modules:
+            # The module stays imported until Blender is restarted. Keep the
+            # previous version to show a corresponding note.
+            self.get_package_info()
+            self.installation_status = False
+        else:
+            self.invalidate()
 
 
 class OptionalDependencyManager:
@@ -340,6 +304,35 @@ class OptionalDependencyManager:
         """Return all (optional) dependencies of this addon."""
         return self.dependencies
 
+    def get_dependency(self, package_name):
+        """Return the (optional) dependency with the given package name."""
+        for dependency in self.dependencies:
+            if dependency.package_name == package_name:
+                return dependency
+        raise ValueError(f"Unknown dependency: {package_name}")
+
+
+_probe_thread = None
+
+
+def probe_dependencies():
+    """Determine the status of pip and all (optional) dependencies.
+
+    The status is determined in a background thread, so that drawing the
+    preferences or the menus does not block the user interface. Does not
+    start another thread while a previous one is still running.
+    """
+    global _probe_thread
+    if _probe_thread is not None and _probe_thread.is_alive():
+        return _probe_thread
+    pip_manager = PipManager.get_singleton()
+    dependency_manager = OptionalDependencyManager.get_singleton()
+    _probe_thread = probe_dependencies_in_background(
+        [pip_manager.pip_dependency_status]
+        + list(dependency_manager.get_dependencies())
+    )
+    return _probe_thread
+
 
 class InstallOptionalDependenciesOperator(bpy.types.Operator):
     """Operator to install all (optional) dependencies of this addon."""
@@ -1,13 +1,150 @@
+"""Framed binary protocol to exchange json data and numpy arrays via pipes.
+
+Each frame consists of
+
+- the magic bytes :code:`FRAME_MAGIC`,
+- the length of the header (unsigned 32 bit integer, little endian),
+- the json header (e.g. with the :code:`dtype` and the :code:`shape` of an
+  array) and
+- :code:`header["num_bytes"]` bytes of payload (e.g. the raw array data).
+
+Arrays are written without an intermediate copy and read directly into a
+(preallocated) numpy array.
+"""
+
+import struct
+import numpy as np
+
 from photogrammetry_importer.process_communication.serialization import (
-    serialize_string,
     serialize_json_dict,
     deserialize_json_dict,
     serialize_numpy_array,
     deserialize_numpy_array,
 )
 
-BINARY_START_IDENTIFIER_STR = "_serialized_numpy_array_start_"
-BINARY_END_IDENTIFIER_STR = "_serialized_numpy_array_end_"
+FRAME_MAGIC = b"PIFR"
+_HEADER_LENGTH_STRUCT = struct.Struct("<I")
+_PREFIX_LENGTH = len(FRAME_MAGIC) + _HEADER_LENGTH_STRUCT.size
+_PICKLE_ENCODING = "pickle"
+
+
+def _as_contiguous_array(np_array):
+    # In contrast to np.ascontiguousarray(), this keeps the shape of 0-d
+    # arrays
+    np_array = np.require(np_array, requirements="C")
+    if np_array.dtype.hasobject:
+        raise ValueError("Arrays with Python objects can not be framed")
+    return np_array
+
+
+def _as_byte_view(np_array):
+    # Viewing the data as bytes also supports dtypes without buffer support
+    # (e.g. datetime64 and timedelta64)
+    return memoryview(np_array.reshape(-1).view(np.uint8))
+
+
+def _read_exactly(input_stream, num_bytes):
+    data = input_stream.read(num_bytes)
+    if len(data) != num_bytes:
+        raise EOFError("Stream closed while reading a frame")
+    return data
+
+
+def _read_into(input_stream, byte_view):
+    """Fill the buffer with data of the stream (reading in chunks)."""
+    num_bytes_read = 0
+    while num_bytes_read < len(byte_view):
+        num_bytes = input_stream.readinto(byte_view[num_bytes_read:])
+        if not num_bytes:
+            raise EOFError("Stream closed while reading a frame")
+        num_bytes_read += num_bytes
+
+
+def write_frame(output_stream, header, payload=b""):
+    """Write a frame with the json header and the payload (bytes-like)."""
+    payload = memoryview(payload).cast("B")
+    header = dict(header, num_bytes=len(payload))
+    serialized_header = serialize_json_dict(header)
+    output_stream.write(
+        FRAME_MAGIC
+        + _HEADER_LENGTH_STRUCT.pack(len(serialized_header))
+        + serialized_header
+    )
+    output_stream.write(payload)
+    output_stream.flush()
+
+
+def read_frame_header(input_stream):
+    """Read the header of the next frame.
+
+    Raises :code:`EOFError` if the stream has been closed before the frame
+    started and :code:`ValueError` if the stream does not contain a frame.
+    """
+    prefix = input_stream.read(_PREFIX_LENGTH)
+    if not prefix:
+        raise EOFError("Stream closed")
+    if len(prefix) != _PREFIX_LENGTH:
+        raise EOFError("Stream closed while reading a frame")
+    if prefix[: len(FRAME_MAGIC)] != FRAME_MAGIC:
+        raise ValueError(f"Invalid frame start: {prefix!r}")
+    (header_length,) = _HEADER_LENGTH_STRUCT.unpack(prefix[len(FRAME_MAGIC) :])
+    return deserialize_json_dict(_read_exactly(input_stream, header_length))
+
+
+def read_frame_payload(input_stream, header):
+    """Read the payload corresponding to the header (as bytes)."""
+    return _read_exactly(input_stream, header["num_bytes"])
+
+
+def read_frame(input_stream):
+    """Read the next frame and return the header and the payload."""
+    header = read_frame_header(input_stream)
+    return header, read_frame_payload(input_stream, header)
+
+
+def is_np_array_header(header):
+    """Return wether the frame of the header contains a numpy array."""
+    return "dtype" in header and "shape" in header
+
+
+def write_np_array_frame(output_stream, np_array, header=None):
+    """Write the array (and additional json values) as frame."""
+    np_array = _as_contiguous_array(np_array)
+    if header is None:
+        header = {}
+    header = dict(header, dtype=np_array.dtype.str, shape=list(np_array.shape))
+    write_frame(output_stream, header, _as_byte_view(np_array))
+
+
+def read_np_array_payload(input_stream, header, out=None):
+    """Read the array of the frame into :code:`out` (or a new array)."""
+    dtype = np.dtype(header["dtype"])
+    shape = tuple(header["shape"])
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape or out.dtype != dtype:
+        raise ValueError(
+            f"Frame contains an array of shape {shape} ({dtype}), but the"
+            f" buffer has shape {out.shape} ({out.dtype})"
+        )
+    elif not out.flags.c_contiguous:
+        raise ValueError("The buffer must be C contiguous")
+    if out.nbytes != header["num_bytes"]:
+        raise ValueError("The frame size does not match the array size")
+    _read_into(input_stream, _as_byte_view(out))
+    return out
+
+
+def read_np_array_frame(input_stream, out=None):
+    """Read a frame written with :code:`write_np_array_frame()`.
+
+    Returns the array and the header. Provide :code:`out` to read the array
+    into a preallocated buffer with matching shape and dtype.
+    """
+    header = read_frame_header(input_stream)
+    if not is_np_array_header(header):
+        raise ValueError(f"Frame does not contain an array: {header}")
+    return read_np_array_payload(input_stream, header, out), header
 
 
 def write_json_as_binary_string(json_dict):
@@ -23,43 +160,49 @@ def read_json_from_binary_string(json_dict_serialized):
 
 
 def write_np_array_as_binary_string(np_array, use_pickle):
-    """Write numpy array as binary string with start and end identifier."""
-    serialized_np_array = serialize_numpy_array(
-        np_array, use_pickle=use_pickle
+    """Write numpy array as binary string (i.e. as a single frame)."""
+    if use_pickle:
+        header = {"encoding": _PICKLE_ENCODING}
+        payload = serialize_numpy_array(np_array, use_pickle=True)
+    else:
+        np_array = _as_contiguous_array(np_array)
+        header = {"dtype": np_array.dtype.str, "shape": list(np_array.shape)}
+        payload = _as_byte_view(np_array)
+    payload = memoryview(payload).cast("B")
+    header["num_bytes"] = len(payload)
+    serialized_header = serialize_json_dict(header)
+    return b"".join(
+        [
+            FRAME_MAGIC,
+            _HEADER_LENGTH_STRUCT.pack(len(serialized_header)),
+            serialized_header,
+            payload,
+        ]
     )
-    serialized_string = serialize_string(BINARY_START_IDENTIFIER_STR) + b"\n"
-    serialized_string += serialized_np_array + b"\n"
-    serialized_string += serialize_string(BINARY_END_IDENTIFIER_STR) + b"\n"
-    return serialized_string
 
 
 def read_np_array_from_binary_string(process_output, use_pickle):
-    """Read numpy array from binary string using start and end identifier."""
-    lines = process_output.splitlines(keepends=True)
-    binary_start_index, binary_end_index = _find_serialize_meta_information(
-        lines
-    )
-    # IMPORTANT: The binary encoding of the numpy array potentially contains
-    # new line characters (i.e. "\n"). Thus, while parsing the byte
-    # representation multiple lines must be considered.
-    serialized = b"".join(lines[binary_start_index + 1 : binary_end_index])
-    np_array = deserialize_numpy_array(serialized, use_pickle=use_pickle)
-    return np_array
-
+    """Read numpy array from the first frame in the binary string.
 
-def _find_serialize_meta_information(lines):
-    binary_start_index = None
-    binary_start_identifier = serialize_string(BINARY_START_IDENTIFIER_STR)
-    for index, line in enumerate(lines):
-        if line.startswith(binary_start_identifier):
-            binary_start_index = index
-            break
-    assert binary_start_index is not None
-    binary_end_index = None
-    binary_end_identifier = serialize_string(BINARY_END_IDENTIFIER_STR)
-    for relative_index, line in enumerate(lines[binary_start_index:]):
-        index = binary_start_index + relative_index
-        if line.startswith(binary_end_identifier):
-            binary_end_index = index
-            break
-    return binary_start_index, binary_end_index
+    The process output may contain arbitrary output before the frame.
+    """
+    frame_start = process_output.find(FRAME_MAGIC)
+    if frame_start < 0:
+        raise ValueError("Process output does not contain a frame")
+    view = memoryview(process_output)
+    header_start = frame_start + _PREFIX_LENGTH
+    (header_length,) = _HEADER_LENGTH_STRUCT.unpack(
+        view[frame_start + len(FRAME_MAGIC) : header_start]
+    )
+    payload_start = header_start + header_length
+    header = deserialize_json_dict(bytes(view[header_start:payload_start]))
+    payload = view[payload_start : payload_start + header["num_bytes"]]
+    if len(payload) != header["num_bytes"]:
+        raise EOFError("Process output contains an incomplete frame")
+    if use_pickle:
+        assert header.get("encoding") == _PICKLE_ENCODING
+        return deserialize_numpy_array(bytes(payload), use_pickle=True)
+    # Returns a read-only view of the process output (without copying)
+    return np.frombuffer(payload, dtype=np.dtype(header["dtype"])).reshape(
+        header["shape"]
+    )
@@ -0,0 +1,381 @@
+"""Long-lived view synthesis worker process.
+
+The worker (e.g. :code:`example_view_synthesis_scripts/instant_ngp.py
+--serve`) loads the model once and then answers render requests of the
+parent process. Parent and worker exchange messages over the stdin / stdout
+pipes of the worker. Each message is a frame (see
+:code:`pipe_communication`), i.e. rendered images are transferred as raw
+array data.
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import threading
+import subprocess
+
+from photogrammetry_importer.process_communication.pipe_communication import (
+    write_frame,
+    read_frame_header,
+    read_frame_payload,
+    is_np_array_header,
+    write_np_array_frame,
+    read_np_array_payload,
+)
+
+MESSAGE_TYPE_READY = "ready"
+MESSAGE_TYPE_PING = "ping"
+MESSAGE_TYPE_PONG = "pong"
+MESSAGE_TYPE_RENDER = "render"
+MESSAGE_TYPE_IMAGE = "image"
+MESSAGE_TYPE_ERROR = "error"
+MESSAGE_TYPE_SHUTDOWN = "shutdown"
+
+
+class WorkerError(RuntimeError):
+    """Error raised if the worker could not handle a request."""
+
+
+class WorkerCrashedError(WorkerError):
+    """Error raised if the worker terminated unexpectedly."""
+
+
+def write_message(output_stream, header, payload=b""):
+    """Write a json header and the corresponding payload as frame."""
+    write_frame(output_stream, header, payload)
+
+
+def read_message(input_stream):
+    """Read a message written with :code:`write_message()`.
+
+    The payload of array frames is returned as numpy array. Raises
+    :code:`EOFError` if the stream has been closed.
+    """
+    header = read_frame_header(input_stream)
+    if is_np_array_header(header):
+        return header, read_np_array_payload(input_stream, header)
+    return header, read_frame_payload(input_stream, header)
+
+
+def create_worker_env():
+    """Return an environment in which the worker can import this addon."""
+    addon_parent_dp = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    env = dict(os.environ)
+    python_paths = [addon_parent_dp]
+    python_paths += env.get("PYTHONPATH", "").split(os.pathsep)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, python_paths))
+    return env
+
+
+class WorkerChannel:
+    """Worker side of the protocol.
+
+    Create the channel (with :code:`from_stdio()`) before loading the model,
+    so that any output of the model does not corrupt the protocol.
+    """
+
+    def __init__(self, input_stream, output_stream):
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+
+    @classmethod
+    def from_stdio(cls):
+        """Use stdin / stdout and redirect any other output to stderr."""
+        sys.stdout.flush()
+        output_stream = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+        # Also redirects the output of native libraries
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        return cls(sys.stdin.buffer, output_stream)
+
+    def serve(self, render_function, worker_info=None):
+        """Answer requests until the parent requests a shutdown.
+
+        :code:`render_function(camera_json_data, samples_per_pixel)` must
+        return the rendered image as numpy array. Exceptions of the render
+        function are reported to the parent.
+        """
+        if worker_info is None:
+            worker_info = {}
+        ready_header = dict(worker_info, type=MESSAGE_TYPE_READY)
+        write_message(self.output_stream, ready_header)
+        while True:
+            try:
+                header, _ = read_message(self.input_stream)
+            except EOFError:
+                # The parent process terminated
+                return
+            message_type = header["type"]
+            if message_type == MESSAGE_TYPE_SHUTDOWN:
+                return
+            if message_type == MESSAGE_TYPE_PING:
+                write_message(self.output_stream, {"type": MESSAGE_TYPE_PONG})
+            elif message_type == MESSAGE_TYPE_RENDER:
+                try:
+                    image = render_function(
+                        header["camera"], header["samples_per_pixel"]
+                    )
+                except Exception as error:
+                    write_message(
+                        self.output_stream,
+                        {"type": MESSAGE_TYPE_ERROR, "message": repr(error)},
+                    )
+                    continue
+                write_np_array_frame(
+                    self.output_stream, image, {"type": MESSAGE_TYPE_IMAGE}
+                )
+            else:
+                write_message(
+                    self.output_stream,
+                    {
+                        "type": MESSAGE_TYPE_ERROR,
+                        "message": f"Unknown message type: {message_type}",
+                    },
+                )
+
+
+class ViewSynthesisWorker:
+    """Parent side of the protocol, i.e. a handle of the worker process.
+
+    The worker is started on first use, stopped after :code:`idle_timeout`
+    seconds without requests and restarted if it crashed.
+    """
+
+    def __init__(
+        self,
+        command,
+        env=None,
+        idle_timeout=600.0,
+        startup_timeout=None,
+        render_timeout=None,
+        health_check_timeout=10.0,
+    ):
+        self.command = list(command)
+        self.env = env
+        self.idle_timeout = idle_timeout
+        self.startup_timeout = startup_timeout
+        self.render_timeout = render_timeout
+        self.health_check_timeout = health_check_timeout
+        self.worker_info = None
+        self.num_starts = 0
+        self._last_use_time = None
+
+        self._lock = threading.RLock()
+        self._process = None
+        self._messages = None
+        self._idle_timer = None
+
+    def _read_messages(self, process, messages):
+        # Executed in a separate thread to support timeouts
+        try:
+            while True:
+                messages.put(read_message(process.stdout))
+        except (EOFError, OSError):
+            messages.put(None)
+        except (KeyError, TypeError, ValueError) as error:
+            # The worker wrote something else than a frame (e.g. a print
+            # statement before creating the channel)
+            messages.put(
+                WorkerError(f"Invalid message of the worker: {error}")
+            )
+
+    def _receive(self, timeout):
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            self._terminate()
+            raise WorkerError(f"No response within {timeout} seconds")
+        if message is None:
+            return_code = self._process.wait()
+            self._terminate()
+            raise WorkerCrashedError(
+                f"Worker terminated (return code {return_code})"
+            )
+        if isinstance(message, WorkerError):
+            self._terminate()
+            raise message
+        return message
+
+    def _send(self, header):
+        try:
+            write_message(self._process.stdin, header)
+        except (OSError, ValueError) as error:
+            self._terminate()
+            raise WorkerCrashedError(f"Worker not reachable: {error}")
+
+    def is_alive(self):
+        """Return wether the worker process is running."""
+        with self._lock:
+            return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Start the worker and wait until it is ready (if necessary)."""
+        with self._lock:
+            if self.is_alive():
+                return
+            self._terminate()
+            try:
+                self._process = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    env=self.env,
+                )
+            except (OSError, ValueError) as error:
+                raise WorkerError(
+                    f"Could not start the worker {self.command}: {error}"
+                )
+            self.num_starts += 1
+            self._messages = queue.Queue()
+            threading.Thread(
+                target=self._read_messages,
+                args=(self._process, self._messages),
+                daemon=True,
+            ).start()
+            header, _ = self._receive(self.startup_timeout)
+            if header.get("type") != MESSAGE_TYPE_READY:
+                self._terminate()
+                raise WorkerError(f"Unexpected message: {header}")
+            self.worker_info = header
+            self._reset_idle_timer()
+
+    def check_health(self):
+        """Return wether the worker answers a ping in time."""
+        with self._lock:
+            if not self.is_alive():
+                return False
+            try:
+                self._send({"type": MESSAGE_TYPE_PING})
+                header, _ = self._receive(self.health_check_timeout)
+            except WorkerError:
+                return False
+            return header["type"] == MESSAGE_TYPE_PONG
+
+    def render(self, camera_json_data, samples_per_pixel):
+        """Render the image of the camera (restarts a crashed worker once).
+
+        A running worker is only reused if it passes the health check.
+        """
+        with self._lock:
+            if self.is_alive() and not self.check_health():
+                # E.g. the worker hangs
+                self._terminate()
+            self.start()
+            try:
+                return self._render(camera_json_data, samples_per_pixel)
+            except WorkerCrashedError:
+                pass
+            self.start()
+            return self._render(camera_json_data, samples_per_pixel)
+
+    def _render(self, camera_json_data, samples_per_pixel):
+        try:
+            self._send(
+                {
+                    "type": MESSAGE_TYPE_RENDER,
+                    "camera": camera_json_data,
+                    "samples_per_pixel": samples_per_pixel,
+                }
+            )
+            header, image = self._receive(self.render_timeout)
+        finally:
+            self._reset_idle_timer()
+        if header["type"] == MESSAGE_TYPE_ERROR:
+            raise WorkerError(f"Worker failed to render: {header['message']}")
+        return image
+
+    def stop(self, timeout=5.0):
+        """Ask the worker to shut down (and kill it, if it does not)."""
+        with self._lock:
+            self._cancel_idle_timer()
+            if self.is_alive():
+                try:
+                    write_message(
+                        self._process.stdin, {"type": MESSAGE_TYPE_SHUTDOWN}
+                    )
+                    self._process.wait(timeout)
+                except (OSError, ValueError, subprocess.TimeoutExpired):
+                    pass
+            self._terminate()
+
+    def _terminate(self):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        for stream in [self._process.stdin, self._process.stdout]:
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self._process = None
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _reset_idle_timer(self):
+        self._cancel_idle_timer()
+        self._last_use_time = time.monotonic()
+        if self.idle_timeout is not None:
+            # Releases the (GPU) memory of the worker
+            self._idle_timer = threading.Timer(
+                self.idle_timeout, self._stop_if_idle
+            )
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _stop_if_idle(self):
+        with self._lock:
+            # The worker may have been used while waiting for the lock
+            idle_time = time.monotonic() - self._last_use_time
+            if idle_time >= self.idle_timeout:
+                self.stop()
+
+
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def get_view_synthesis_worker(
+    command,
+    env=None,
+    idle_timeout=600.0,
+    startup_timeout=None,
+    render_timeout=None,
+):
+    """Return the worker running the command (and stop any other worker).
+
+    Only a single worker is kept, since each worker keeps its model in (GPU)
+    memory.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is not None and (
+            _worker.command != list(command) or _worker.env != env
+        ):
+            _worker.stop()
+            _worker = None
+        if _worker is None:
+            _worker = ViewSynthesisWorker(command, env=env)
+        _worker.idle_timeout = idle_timeout
+        _worker.startup_timeout = startup_timeout
+        _worker.render_timeout = render_timeout
+        return _worker
+
+
+def stop_view_synthesis_workers():
+    """Stop the worker returned by :code:`get_view_synthesis_worker()`."""
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.stop()
+            _worker = None
+
+
+atexit.register(stop_view_synthesis_workers)
@@ -1,4 +1,3 @@
-import importlib
 import bpy
 
 from photogrammetry_importer.operators.colmap_import_op import (
@@ -36,6 +35,10 @@ from photogrammetry_importer.operators.colmap_export_op import (
 from photogrammetry_importer.operators.instant_ngp_export_op import (
     ExportInstantNGPOperator,
 )
+from photogrammetry_importer.preferences.dependency import (
+    OptionalDependencyManager,
+    probe_dependencies,
+)
 
 # Definining the following import and export functions within the
 # "Registration" class causes different errors when hovering over entries in
@@ -83,8 +86,15 @@ def _openmvg_import_operator_function(topbar_file_import, context):
 
 
 def _point_data_import_operator_function(topbar_file_import, context):
-    module_spec = importlib.util.find_spec("pyntcloud")
-    if module_spec is not None:
+    # Use the cached status instead of searching sys.path whenever the menu
+    # is drawn (the cache is invalidated when (un)installing pyntcloud)
+    dependency_manager = OptionalDependencyManager.get_singleton()
+    pyntcloud_dependency = dependency_manager.get_dependency("pyntcloud")
+    if not pyntcloud_dependency.is_probed():
+        # Do not block the user interface while the status is determined
+        probe_dependencies()
+        suffix = "[Checking Pyntcloud ...]"
+    elif pyntcloud_dependency.installation_status:
         suffix = "(.ply/.pcd/.las/.asc/.pts/.csv)"
     else:
         suffix = "[Pyntcloud is NOT installed]"
@@ -1,7 +1,14 @@
 import math
 import os
 import numpy as np
-from photogrammetry_importer.utility.np_utility import is_rotation_mat
+from photogrammetry_importer.utility.np_utility import (
+    is_rotation_mat,
+    are_rotation_mats,
+)
+from photogrammetry_importer.utility.quaternion_utility import (
+    quaternions_to_rotation_matrices,
+    rotation_matrices_to_quaternions,
+)
 
 
 class Camera:
@@ -323,6 +330,95 @@ class Camera:
             cam_to_world_mat[0:3, 3], check_rotation=check_rotation
         )
 
+    @staticmethod
+    def set_rotations_with_quaternions(cameras, quaternions):
+        """Set the rotations of several cameras using (N, 4) quaternions."""
+        quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+        assert len(quaternions) == len(cameras)
+        rotation_mats = quaternions_to_rotation_matrices(quaternions)
+        for camera, quaternion, rotation_mat in zip(
+            cameras, quaternions, rotation_mats
+        ):
+            camera._quaternion = quaternion
+            camera._rotation_mat = rotation_mat
+
+    @staticmethod
+    def set_rotations_with_rotation_mats(
+        cameras, rotation_mats, check_rotation=True
+    ):
+        """Set the rotations of several cameras using rotation matrices."""
+        rotation_mats = np.asarray(rotation_mats, dtype=float).reshape(
+            -1, 3, 3
+        )
+        assert len(rotation_mats) == len(cameras)
+        if check_rotation:
+            assert are_rotation_mats(rotation_mats)
+        quaternions = rotation_matrices_to_quaternions(rotation_mats)
+        for camera, rotation_mat, quaternion in zip(
+            cameras, rotation_mats, quaternions
+        ):
+            camera._rotation_mat = rotation_mat
+            camera._quaternion = quaternion
+
+    @staticmethod
+    def set_camera_centers_after_rotation(cameras, centers):
+        """Set the centers of several cameras after setting the rotations."""
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        assert len(centers) == len(cameras)
+        rotation_mats = np.array(
+            [camera._rotation_mat for camera in cameras], dtype=float
+        ).reshape(-1, 3, 3)
+        # t = -R C
+        translation_vecs = -np.einsum("nij,nj->ni", rotation_mats, centers)
+        for camera, center, translation_vec in zip(
+            cameras, centers, translation_vecs
+        ):
+            camera._center = center
+            camera._translation_vec = translation_vec
+
+    @staticmethod
+    def set_camera_translation_vectors_after_rotation(
+        cameras, translation_vecs
+    ):
+        """Set the translations of several cameras after the rotations."""
+        translation_vecs = np.asarray(translation_vecs, dtype=float).reshape(
+            -1, 3
+        )
+        assert len(translation_vecs) == len(cameras)
+        rotation_mats = np.array(
+            [camera._rotation_mat for camera in cameras], dtype=float
+        ).reshape(-1, 3, 3)
+        # C = -R^T t
+        centers = -np.einsum("nji,nj->ni", rotation_mats, translation_vecs)
+        for camera, center, translation_vec in zip(
+            cameras, centers, translation_vecs
+        ):
+            camera._center = center
+            camera._translation_vec = translation_vec
+
+    @staticmethod
+    def set_4x4_cam_to_world_mats(
+        cameras, cam_to_world_mats, check_rotation=True
+    ):
+        """Set the extrinsic parameters of several cameras at once.
+
+        Like :code:`set_4x4_cam_to_world_mat()`, this accepts also the upper
+        3x4 part of the matrices.
+        """
+        if len(cameras) == 0:
+            return
+        cam_to_world_mats = np.asarray(cam_to_world_mats, dtype=float).reshape(
+            len(cameras), -1, 4
+        )
+        Camera.set_rotations_with_rotation_mats(
+            cameras,
+            cam_to_world_mats[:, 0:3, 0:3].transpose(0, 2, 1),
+            check_rotation=check_rotation,
+        )
+        Camera.set_camera_centers_after_rotation(
+            cameras, cam_to_world_mats[:, 0:3, 3]
+        )
+
     @staticmethod
     def quaternion_to_rotation_matrix(q):
         """Convert a quaternion to a rotation matrix."""
@@ -0,0 +1,297 @@
+import numpy as np
+
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.utility.np_utility import invert_y_and_z_axis
+from photogrammetry_importer.utility.quaternion_utility import (
+    rotation_matrices_to_quaternions,
+)
+
+
+class CameraBatch:
+    """This class represents many reconstructed cameras as arrays.
+
+    In contrast to a list of :code:`Camera` objects, the extrinsic parameters
+    are stored as (N, 3, 3) rotation matrices (world to camera) and (N, 3)
+    camera centers. The intrinsic parameters are stored in a table of K
+    (shared) intrinsics, which are referenced by the N cameras. This allows
+    to compute the pose related quantities of all cameras at once.
+    """
+
+    def __init__(
+        self,
+        rotation_mats,
+        centers,
+        calibration_mats,
+        widths,
+        heights,
+        intrinsic_indices=None,
+        radial_distortions=None,
+        relative_fps=None,
+        absolute_fps=None,
+        image_dp=None,
+        image_fp_type=None,
+        ids=None,
+        quaternions=None,
+    ):
+        self.rotation_mats = np.asarray(rotation_mats, dtype=float).reshape(
+            -1, 3, 3
+        )
+        num_cameras = len(self.rotation_mats)
+        self.centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        assert len(self.centers) == num_cameras
+
+        # Table of shared intrinsics
+        self.calibration_mats = np.asarray(
+            calibration_mats, dtype=float
+        ).reshape(-1, 3, 3)
+        num_intrinsics = len(self.calibration_mats)
+        self.widths = np.asarray(widths).reshape(num_intrinsics)
+        self.heights = np.asarray(heights).reshape(num_intrinsics)
+        # The distortion parameters of the different formats differ (e.g. a
+        # single value or a list of coefficients)
+        if radial_distortions is None:
+            radial_distortions = [0] * num_intrinsics
+        self.radial_distortions = list(radial_distortions)
+        assert len(self.radial_distortions) == num_intrinsics
+        if intrinsic_indices is None:
+            assert num_intrinsics in [1, num_cameras]
+            if num_intrinsics == 1:
+                intrinsic_indices = np.zeros(num_cameras, dtype=np.int64)
+            else:
+                intrinsic_indices = np.arange(num_cameras, dtype=np.int64)
+        self.intrinsic_indices = np.asarray(intrinsic_indices, dtype=np.int64)
+        assert len(self.intrinsic_indices) == num_cameras
+
+        self.relative_fps = relative_fps
+        self.absolute_fps = absolute_fps
+        self.image_dp = image_dp
+        self.image_fp_type = image_fp_type
+        if ids is None:
+            ids = np.arange(num_cameras)
+        self.ids = np.asarray(ids)
+        self._quaternions = quaternions
+
+    def __len__(self):
+        return len(self.rotation_mats)
+
+    @classmethod
+    def from_world_to_cam(
+        cls, rotation_mats, translation_vecs, calibration_mats, **kwargs
+    ):
+        """Create a batch from rotations and translations (t = -R C)."""
+        rotation_mats = np.asarray(rotation_mats, dtype=float).reshape(
+            -1, 3, 3
+        )
+        translation_vecs = np.asarray(translation_vecs, dtype=float).reshape(
+            -1, 3
+        )
+        # C = -R^T t
+        centers = -np.einsum("nji,nj->ni", rotation_mats, translation_vecs)
+        return cls(rotation_mats, centers, calibration_mats, **kwargs)
+
+    @classmethod
+    def from_cameras(cls, cameras):
+        """Create a batch from a list of :code:`Camera` objects.
+
+        Cameras with identical intrinsic parameters (calibration matrix,
+        image size and radial distortion) share a single table entry.
+        """
+        intrinsic_key_to_index = {}
+        calibration_mats = []
+        widths = []
+        heights = []
+        radial_distortions = []
+        intrinsic_indices = []
+        for camera in cameras:
+            calibration_mat = np.asarray(camera._calibration_mat, dtype=float)
+            radial_distortion = getattr(camera, "_radial_distortion", 0)
+            key = (
+                calibration_mat.tobytes(),
+                camera.width,
+                camera.height,
+                np.asarray(radial_distortion, dtype=float).tobytes(),
+            )
+            index = intrinsic_key_to_index.get(key)
+            if index is None:
+                index = len(calibration_mats)
+                intrinsic_key_to_index[key] = index
+                calibration_mats.append(calibration_mat)
+                widths.append(camera.width)
+                heights.append(camera.height)
+                radial_distortions.append(radial_distortion)
+            intrinsic_indices.append(index)
+
+        image_dp = cameras[0].image_dp if len(cameras) > 0 else None
+        image_fp_type = cameras[0].image_fp_type if len(cameras) > 0 else None
+        return cls(
+            rotation_mats=[
+                camera.get_rotation_as_rotation_mat() for camera in cameras
+            ],
+            centers=[camera.get_camera_center() for camera in cameras],
+            calibration_mats=np.array(calibration_mats).reshape(-1, 3, 3),
+            widths=np.array(widths, dtype=object),
+            heights=np.array(heights, dtype=object),
+            intrinsic_indices=intrinsic_indices,
+            radial_distortions=radial_distortions,
+            relative_fps=[camera._relative_fp for camera in cameras],
+            absolute_fps=[camera._absolute_fp for camera in cameras],
+            image_dp=image_dp,
+            image_fp_type=image_fp_type,
+            ids=np.array([camera.id for camera in cameras], dtype=object),
+            quaternions=np.array(
+                [camera.get_rotation_as_quaternion() for camera in cameras],
+                dtype=float,
+            ).reshape(-1, 4),
+        )
+
+    def get_quaternions(self):
+        """Return the rotations as (N, 4) quaternions in (w, x, y, z)."""
+        if self._quaternions is None:
+            self._quaternions = rotation_matrices_to_quaternions(
+                self.rotation_mats
+            )
+        return self._quaternions
+
+    def get_translation_vecs(self):
+        """Return the (N, 3) translation vectors (t = -R C)."""
+        return -np.einsum("nij,nj->ni", self.rotation_mats, self.centers)
+
+    def get_calibration_mats(self):
+        """Return the (N, 3, 3) calibration matrices of all cameras."""
+        return self.calibration_mats[self.intrinsic_indices]
+
+    def get_focal_lengths(self):
+        """Return the (N,) focal lengths of all cameras."""
+        return self.calibration_mats[self.intrinsic_indices, 0, 0]
+
+    def get_field_of_views(self):
+        """Return the (N,) field of views (w.r.t. the larger extent)."""
+        max_extents = np.maximum(
+            self.widths.astype(float), self.heights.astype(float)
+        )
+        field_of_views = 2.0 * np.arctan(
+            max_extents / (2.0 * self.calibration_mats[:, 0, 0])
+        )
+        return field_of_views[self.intrinsic_indices]
+
+    def get_4x4_cam_to_world_mats(self):
+        """Return the (N, 4, 4) camera to world transformation matrices."""
+        # M = [R^T    c]
+        #     [0      1]
+        cam_to_world_mats = np.zeros((len(self), 4, 4), dtype=float)
+        cam_to_world_mats[:, 0:3, 0:3] = self.rotation_mats.transpose(0, 2, 1)
+        cam_to_world_mats[:, 0:3, 3] = self.centers
+        cam_to_world_mats[:, 3, 3] = 1.0
+        return cam_to_world_mats
+
+    def compute_matrix_worlds(self, convert_coordinate_system=True):
+        """Return Blender's :code:`matrix_world` of all cameras.
+
+        The result is a (N, 4, 4) numpy array. Analogous to
+        :code:`compute_camera_matrix_world`, the computer vision camera
+        frames are (optionally) rotated by 180 degrees around the x axis to
+        obtain Blender's camera frames (looking along the negative z axis).
+        """
+        rotation_mats = self.rotation_mats
+        if convert_coordinate_system:
+            rotation_mats = invert_y_and_z_axis(rotation_mats, axis=1)
+        matrix_worlds = np.zeros((len(self), 4, 4), dtype=float)
+        matrix_worlds[:, 0:3, 0:3] = rotation_mats.transpose(0, 2, 1)
+        # Inverting the axes does not change the camera center
+        matrix_worlds[:, 0:3, 3] = self.centers
+        matrix_worlds[:, 3, 3] = 1.0
+        return matrix_worlds
+
+    def compute_frustum_corners(self, distance=1.0):
+        """Return the world coordinates of the image corners.
+
+        The result is a (N, 4, 3) array containing the corners (top left, top
+        right, bottom right and bottom left) of the image planes at the given
+        distance (along the viewing direction) from the camera centers.
+        """
+        widths = self.widths.astype(float)
+        heights = self.heights.astype(float)
+        num_intrinsics = len(self.calibration_mats)
+        # Homogeneous pixel coordinates of the corners of each intrinsic
+        pixel_coords = np.ones((num_intrinsics, 4, 3), dtype=float)
+        pixel_coords[:, :, 0] = (
+            np.array([0.0, 1.0, 1.0, 0.0]) * widths[:, np.newaxis]
+        )
+        pixel_coords[:, :, 1] = (
+            np.array([0.0, 0.0, 1.0, 1.0]) * heights[:, np.newaxis]
+        )
+        inverse_calibration_mats = np.linalg.inv(self.calibration_mats)
+        cam_coords = np.einsum(
+            "kij,kcj->kci", inverse_calibration_mats, pixel_coords
+        )
+        cam_coords *= distance / cam_coords[:, :, 2:3]
+        cam_coords = cam_coords[self.intrinsic_indices]
+        # X_world = R^T X_cam + C
+        world_coords = np.einsum(
+            "nji,ncj->nci", self.rotation_mats, cam_coords
+        )
+        return world_coords + self.centers[:, np.newaxis, :]
+
+    def select(self, indices_or_mask):
+        """Return a batch with a subset of the cameras."""
+        indices = np.arange(len(self))[indices_or_mask]
+
+        def _select_list(values):
+            if values is None:
+                return None
+            return [values[index] for index in indices]
+
+        quaternions = None
+        if self._quaternions is not None:
+            quaternions = self._quaternions[indices]
+        return CameraBatch(
+            self.rotation_mats[indices],
+            self.centers[indices],
+            self.calibration_mats,
+            self.widths,
+            self.heights,
+            intrinsic_indices=self.intrinsic_indices[indices],
+            radial_distortions=self.radial_distortions,
+            relative_fps=_select_list(self.relative_fps),
+            absolute_fps=_select_list(self.absolute_fps),
+            image_dp=self.image_dp,
+            image_fp_type=self.image_fp_type,
+            ids=self.ids[indices],
+            quaternions=quaternions,
+        )
+
+    def to_cameras(self):
+        """Return a list of :code:`Camera` objects.
+
+        The camera attributes are views of the batch arrays, i.e. no
+        per-camera computations are performed.
+        """
+        quaternions = self.get_quaternions()
+        translation_vecs = self.get_translation_vecs()
+        cameras = []
+        for index in range(len(self)):
+            intrinsic_index = self.intrinsic_indices[index]
+            camera = Camera()
+            camera.id = self.ids[index]
+            camera._rotation_mat = self.rotation_mats[index]
+            camera._quaternion = quaternions[index]
+            camera._center = self.centers[index]
+            camera._translation_vec = translation_vecs[index]
+            # Each camera receives its own copy, since the principal point
+            # may be modified later (see set_principal_point())
+            camera._calibration_mat = self.calibration_mats[
+                intrinsic_index
+            ].copy()
+            camera._radial_distortion = self.radial_distortions[
+                intrinsic_index
+            ]
+            camera.width = self.widths[intrinsic_index]
+            camera.height = self.heights[intrinsic_index]
+            camera.image_dp = self.image_dp
+            camera.image_fp_type = self.image_fp_type
+            if self.relative_fps is not None:
+                camera._relative_fp = self.relative_fps[index]
+            if self.absolute_fps is not None:
+                camera._absolute_fp = self.absolute_fps[index]
+            cameras.append(camera)
+        return cameras
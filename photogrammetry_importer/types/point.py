@@ -31,6 +31,17 @@ class Point(namedtuple("Point", ["coord", "color", "id", "scalars"])):
             colors.append(color_with_alpha)
         return coords, colors
 
+    @staticmethod
+    def split_points_as_arrays(points):
+        """Split points into coordinate and color arrays of shape (N,3)."""
+        num_points = len(points)
+        coords = np.empty((num_points, 3), dtype=float)
+        colors = np.empty((num_points, 3), dtype=float)
+        for idx, point in enumerate(points):
+            coords[idx] = point.coord
+            colors[idx] = point.color[:3]
+        return coords, colors
+
     @staticmethod
     def create_points(coords, colors, unnormalize_colors=False):
         if unnormalize_colors:
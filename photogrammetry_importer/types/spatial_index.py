@@ -0,0 +1,489 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from photogrammetry_importer.types.point import Point
+
+
+def compute_box_mask(coords, box_min, box_max):
+    """Return a boolean mask of the coordinates inside an axis aligned box."""
+    coords = np.asarray(coords, dtype=float)
+    box_min = np.asarray(box_min, dtype=float)
+    box_max = np.asarray(box_max, dtype=float)
+    return np.all((coords >= box_min) & (coords <= box_max), axis=1)
+
+
+class SpatialIndex:
+    """Uniform grid (spatial hash) over a set of three-dimensional points.
+
+    The points are sorted by the (linear) key of the grid cell containing
+    them, i.e. the points of each occupied cell are stored contiguously. This
+    allows to answer box, sphere, radius count and k-nearest neighbor queries
+    by visiting only the cells close to the query.
+    """
+
+    # Enumerate the cells of a query explicitly only if their number is
+    # small compared to the number of occupied cells.
+    _max_enumerated_cells_factor = 4
+
+    def __init__(
+        self, coords, cell_size=None, points_per_cell=8, num_threads=None
+    ):
+        """Build the index for the coordinates of shape (N,3)."""
+        coords = np.ascontiguousarray(coords, dtype=float).reshape(-1, 3)
+        self.coords = coords
+        if len(coords) == 0:
+            self.origin = np.zeros(3, dtype=float)
+            extent = np.zeros(3, dtype=float)
+        else:
+            self.origin = coords.min(axis=0)
+            extent = coords.max(axis=0) - self.origin
+        if cell_size is None:
+            cell_size = self._estimate_cell_size(
+                extent, len(coords), points_per_cell
+            )
+        assert cell_size > 0
+        self.cell_size = float(cell_size)
+        self.grid_dims = np.floor(extent / self.cell_size).astype(np.int64) + 1
+
+        cell_keys = self._compute_cell_keys_in_parallel(coords, num_threads)
+        self.order = np.argsort(cell_keys, kind="stable")
+        sorted_keys = cell_keys[self.order]
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(
+            sorted_keys, return_index=True, return_counts=True
+        )
+
+    @classmethod
+    def from_points(cls, points, **kwargs):
+        """Build the index for a list of :code:`Point` objects."""
+        coords, _ = Point.split_points_as_arrays(points)
+        return cls(coords, **kwargs)
+
+    @staticmethod
+    def _estimate_cell_size(extent, num_points, points_per_cell):
+        if num_points == 0:
+            return 1.0
+        max_extent = float(extent.max())
+        if max_extent <= 0:
+            return 1.0
+        # Ignore degenerated (flat) dimensions when estimating the volume
+        extent = np.maximum(extent, max_extent * 1e-3)
+        num_cells = max(num_points / float(points_per_cell), 1.0)
+        return float(np.cbrt(np.prod(extent) / num_cells))
+
+    def __len__(self):
+        return len(self.coords)
+
+    def _compute_cell_indices(self, coords):
+        cell_indices = np.floor((coords - self.origin) / self.cell_size)
+        return cell_indices.astype(np.int64)
+
+    def _compute_cell_keys(self, cell_indices):
+        dims = self.grid_dims
+        return cell_indices[:, 0] + dims[0] * (
+            cell_indices[:, 1] + dims[1] * cell_indices[:, 2]
+        )
+
+    def _compute_cell_keys_in_parallel(self, coords, num_threads):
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        chunk_size = max(int(np.ceil(len(coords) / num_threads)), 100000)
+        chunks = [
+            coords[start : start + chunk_size]
+            for start in range(0, len(coords), chunk_size)
+        ]
+        if len(chunks) <= 1:
+            return self._compute_cell_keys(self._compute_cell_indices(coords))
+
+        def compute_chunk_keys(chunk):
+            return self._compute_cell_keys(self._compute_cell_indices(chunk))
+
+        # NumPy releases the GIL for the (memory bound) array operations
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            chunk_keys = list(executor.map(compute_chunk_keys, chunks))
+        return np.concatenate(chunk_keys)
+
+    def _get_point_indices_of_cells(self, cell_positions):
+        # cell_positions refers to entries of self.cell_keys
+        counts = self.cell_counts[cell_positions]
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.cumsum(counts) - counts
+        sorted_indices = np.repeat(
+            self.cell_starts[cell_positions] - offsets, counts
+        ) + np.arange(total)
+        return self.order[sorted_indices]
+
+    def _get_candidate_indices(self, box_min, box_max):
+        if len(self.coords) == 0:
+            return np.zeros(0, dtype=np.int64)
+        lower = self._compute_cell_indices(np.asarray(box_min, dtype=float))
+        upper = self._compute_cell_indices(np.asarray(box_max, dtype=float))
+        lower = np.maximum(lower, 0)
+        upper = np.minimum(upper, self.grid_dims - 1)
+        if np.any(upper < lower):
+            return np.zeros(0, dtype=np.int64)
+
+        num_query_cells = np.prod((upper - lower + 1).astype(float))
+        max_enumerated = self._max_enumerated_cells_factor * len(
+            self.cell_keys
+        )
+        if num_query_cells <= max_enumerated:
+            ranges = [
+                np.arange(lower[dim], upper[dim] + 1) for dim in range(3)
+            ]
+            grid = np.stack(np.meshgrid(*ranges, indexing="ij"), axis=-1)
+            query_keys = self._compute_cell_keys(grid.reshape(-1, 3))
+            positions = np.searchsorted(self.cell_keys, query_keys)
+            positions = np.minimum(positions, len(self.cell_keys) - 1)
+            positions = positions[self.cell_keys[positions] == query_keys]
+        else:
+            occupied_indices = self._decode_cell_keys(self.cell_keys)
+            cell_mask = np.all(
+                (occupied_indices >= lower) & (occupied_indices <= upper),
+                axis=1,
+            )
+            positions = np.nonzero(cell_mask)[0]
+        return self._get_point_indices_of_cells(positions)
+
+    def _decode_cell_keys(self, cell_keys):
+        dims = self.grid_dims
+        x_indices = cell_keys % dims[0]
+        y_indices = (cell_keys // dims[0]) % dims[1]
+        z_indices = cell_keys // (dims[0] * dims[1])
+        return np.stack([x_indices, y_indices, z_indices], axis=1)
+
+    def query_box(self, box_min, box_max):
+        """Return the (sorted) indices of the points inside the box."""
+        candidates = self._get_candidate_indices(box_min, box_max)
+        mask = compute_box_mask(self.coords[candidates], box_min, box_max)
+        return np.sort(candidates[mask])
+
+    def query_sphere(self, center, radius):
+        """Return the (sorted) indices of the points inside the sphere."""
+        center = np.asarray(center, dtype=float)
+        candidates = self._get_candidate_indices(
+            center - radius, center + radius
+        )
+        squared_dists = np.sum((self.coords[candidates] - center) ** 2, axis=1)
+        return np.sort(candidates[squared_dists <= radius * radius])
+
+    def count_in_radius(self, centers, radius):
+        """Return the number of points within the radius of each center."""
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        counts = np.empty(len(centers), dtype=np.int64)
+        for idx, center in enumerate(centers):
+            counts[idx] = len(self.query_sphere(center, radius))
+        return counts
+
+    def query_knn(self, center, k):
+        """Return the indices and distances of the k nearest neighbors.
+
+        The neighbors are sorted by increasing distance. The search visits
+        rings of cells around the query until the k-th candidate is closer
+        than the covered distance, i.e. the result is exact.
+        """
+        center = np.asarray(center, dtype=float)
+        k = min(k, len(self.coords))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=float)
+
+        center_cell = self._compute_cell_indices(center)
+        # Distance between the query and the farthest grid cell
+        max_ring = int(
+            np.max(np.maximum(center_cell, self.grid_dims - 1 - center_cell))
+        )
+        max_ring = max(max_ring, 0)
+        ring = 1
+        while True:
+            lower = (center_cell - ring) * self.cell_size + self.origin
+            upper = (center_cell + ring + 1) * self.cell_size + self.origin
+            candidates = self._get_candidate_indices(
+                lower, upper - 1e-12 * self.cell_size
+            )
+            if len(candidates) >= k or ring >= max_ring:
+                dists = np.linalg.norm(
+                    self.coords[candidates] - center, axis=1
+                )
+                if len(candidates) > k:
+                    part = np.argpartition(dists, k - 1)[:k]
+                else:
+                    part = np.arange(len(candidates))
+                part = part[np.argsort(dists[part], kind="stable")]
+                # All points within this distance are contained in the rings
+                covered_dist = ring * self.cell_size
+                if ring >= max_ring or dists[part[-1]] <= covered_dist:
+                    return candidates[part], dists[part]
+            ring = ring + 1 if ring < 2 else ring * 2
+
+    @staticmethod
+    def _gather_ranges(starts, counts):
+        # Return the concatenation of the ranges [start, start + count) and
+        # the index of the range of each element.
+        total = int(counts.sum())
+        range_ids = np.repeat(np.arange(len(counts)), counts)
+        offsets = np.cumsum(counts) - counts
+        values = np.arange(total) + (starts - offsets)[range_ids]
+        return values, range_ids
+
+    def _compute_neighbor_cell_positions(self, ring):
+        # Return for each occupied cell the positions (w.r.t. cell_keys) of
+        # the cells within the given ring (-1 for empty cells).
+        cell_indices = self._decode_cell_keys(self.cell_keys)
+        offset_range = np.arange(-ring, ring + 1)
+        offsets = np.stack(
+            np.meshgrid(offset_range, offset_range, offset_range), axis=-1
+        ).reshape(-1, 3)
+        neighbor_positions = np.full(
+            (len(self.cell_keys), len(offsets)), -1, dtype=np.int64
+        )
+        for offset_idx, offset in enumerate(offsets):
+            neighbor_indices = cell_indices + offset
+            valid = np.all(
+                (neighbor_indices >= 0) & (neighbor_indices < self.grid_dims),
+                axis=1,
+            )
+            neighbor_keys = self._compute_cell_keys(neighbor_indices[valid])
+            positions = np.searchsorted(self.cell_keys, neighbor_keys)
+            positions = np.minimum(positions, len(self.cell_keys) - 1)
+            found = self.cell_keys[positions] == neighbor_keys
+            column = np.full(len(self.cell_keys), -1, dtype=np.int64)
+            column[np.nonzero(valid)[0][found]] = positions[found]
+            neighbor_positions[:, offset_idx] = column
+        return neighbor_positions
+
+    def _compute_cell_chunks(self, num_candidates, max_chunk_entries):
+        # Group cells with a similar number of points and candidates, so
+        # that the padding of the distance tensors stays small. Each chunk is
+        # a tuple (cells, slot_start, slot_stop) and covers the points with
+        # positions in [slot_start, slot_stop) of each cell.
+        sorted_cells = np.lexsort((num_candidates, self.cell_counts))
+        chunks = []
+        chunk_start = 0
+        while chunk_start < len(sorted_cells):
+            cell = sorted_cells[chunk_start]
+            cell_count = int(self.cell_counts[cell])
+            if cell_count * num_candidates[cell] > max_chunk_entries:
+                # Split the points of dense cells into several batches. A
+                # batch contains at least one point (i.e. all candidates).
+                batch_size = max(
+                    max_chunk_entries // max(int(num_candidates[cell]), 1), 1
+                )
+                for slot_start in range(0, cell_count, batch_size):
+                    slot_stop = min(slot_start + batch_size, cell_count)
+                    chunks.append(
+                        (
+                            sorted_cells[chunk_start : chunk_start + 1],
+                            slot_start,
+                            slot_stop,
+                        )
+                    )
+                chunk_start += 1
+                continue
+            max_points = 0
+            max_candidates = 0
+            chunk_end = chunk_start
+            while chunk_end < len(sorted_cells):
+                max_points_new = max(
+                    max_points, self.cell_counts[sorted_cells[chunk_end]]
+                )
+                max_candidates_new = max(
+                    max_candidates, num_candidates[sorted_cells[chunk_end]]
+                )
+                padded_entries = (
+                    (chunk_end - chunk_start + 1)
+                    * max_points_new
+                    * max_candidates_new
+                )
+                if (
+                    chunk_end > chunk_start
+                    and padded_entries > max_chunk_entries
+                ):
+                    break
+                max_points = max_points_new
+                max_candidates = max_candidates_new
+                chunk_end += 1
+            chunks.append((sorted_cells[chunk_start:chunk_end], 0, max_points))
+            chunk_start = chunk_end
+        return chunks
+
+    def _iter_neighborhood_distances(
+        self, ring, num_threads, max_chunk_entries=2**21
+    ):
+        """Yield the squared distances of points to their neighborhoods.
+
+        For each chunk of cells, this yields a tuple (point_indices,
+        squared_dists). The (padded) array point_indices has the shape (C,P)
+        and contains the points of C cells (-1 for padded entries). The array
+        squared_dists has the shape (C,P,N) and contains the squared
+        distances to the candidates in the surrounding cells (inf for padded
+        entries). The points of dense cells are split into several chunks,
+        so that a chunk contains at most max_chunk_entries distances (or the
+        distances of a single point). The chunks are computed in parallel.
+        """
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        neighbor_positions = self._compute_neighbor_cell_positions(ring)
+        neighbor_counts = np.where(
+            neighbor_positions >= 0,
+            self.cell_counts[np.maximum(neighbor_positions, 0)],
+            0,
+        )
+        num_candidates = neighbor_counts.sum(axis=1)
+        chunks = self._compute_cell_chunks(num_candidates, max_chunk_entries)
+
+        def compute_chunk(chunk):
+            cells, slot_start, slot_stop = chunk
+            num_cells = len(cells)
+            point_starts = self.cell_starts[cells] + slot_start
+            point_counts = np.clip(
+                self.cell_counts[cells] - slot_start, 0, slot_stop - slot_start
+            )
+            max_points = int(point_counts.max())
+            max_candidates = int(num_candidates[cells].max())
+
+            point_positions, point_cells = self._gather_ranges(
+                point_starts, point_counts
+            )
+            point_slots = point_positions - point_starts[point_cells]
+            point_indices = np.full((num_cells, max_points), -1, np.int64)
+            point_indices[point_cells, point_slots] = self.order[
+                point_positions
+            ]
+
+            chunk_neighbor_counts = neighbor_counts[cells].reshape(-1)
+            chunk_neighbor_starts = self.cell_starts[
+                np.maximum(neighbor_positions[cells], 0)
+            ].reshape(-1)
+            candidate_positions, range_ids = self._gather_ranges(
+                chunk_neighbor_starts, chunk_neighbor_counts
+            )
+            candidate_cells = range_ids // neighbor_positions.shape[1]
+            candidate_offsets = np.cumsum(num_candidates[cells]) - (
+                num_candidates[cells]
+            )
+            candidate_slots = (
+                np.arange(len(candidate_positions))
+                - candidate_offsets[candidate_cells]
+            )
+            candidate_indices = np.full(
+                (num_cells, max_candidates), -1, np.int64
+            )
+            candidate_indices[candidate_cells, candidate_slots] = self.order[
+                candidate_positions
+            ]
+
+            # Padded candidates obtain infinite coordinates (and distances)
+            cell_origins = (
+                self._decode_cell_keys(self.cell_keys[cells]) * self.cell_size
+                + self.origin
+            )
+            candidate_coords = self.coords[candidate_indices]
+            candidate_coords[candidate_indices < 0] = np.inf
+            point_coords = self.coords[point_indices]
+            squared_dists = np.zeros(
+                (num_cells, max_points, max_candidates), dtype=float
+            )
+            for dim in range(3):
+                # Use coordinates relative to each cell to reduce rounding
+                origins = cell_origins[:, dim, np.newaxis]
+                diffs = (point_coords[:, :, dim] - origins)[:, :, np.newaxis]
+                diffs = (
+                    diffs
+                    - (candidate_coords[:, :, dim] - origins)[:, np.newaxis, :]
+                )
+                squared_dists += diffs * diffs
+            return point_indices, squared_dists
+
+        if num_threads == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield compute_chunk(chunk)
+        else:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                yield from executor.map(compute_chunk, chunks)
+
+    def compute_mean_knn_distances(self, k, num_threads=None):
+        """Return the mean distance of each point to its k nearest neighbors.
+
+        The point itself is not considered as neighbor. The distances are
+        computed in vectorized batches of cells using the candidates of the
+        neighboring cells. Points without k candidates closer than the cell
+        size (i.e. isolated points) fall back to :code:`query_knn()`.
+        """
+        mean_dists = np.zeros(len(self.coords), dtype=float)
+        k = min(k, len(self.coords) - 1)
+        if k <= 0:
+            return mean_dists
+
+        fallback_indices = []
+        for point_indices, squared_dists in self._iter_neighborhood_distances(
+            1, num_threads
+        ):
+            valid = point_indices >= 0
+            if squared_dists.shape[2] <= k:
+                fallback_indices.append(point_indices[valid])
+                continue
+            # The smallest distance is the point itself (i.e. zero)
+            knn_dists = np.sqrt(
+                np.partition(squared_dists, k, axis=2)[:, :, : k + 1]
+            )
+            mean_dists[point_indices[valid]] = knn_dists.sum(axis=2)[valid] / k
+            # Neighbors are only guaranteed to be found within the distance
+            # of the cell ring around the current cell.
+            is_exact = knn_dists.max(axis=2) <= self.cell_size
+            fallback_indices.append(point_indices[valid & ~is_exact])
+
+        for idx in np.concatenate(fallback_indices):
+            _, dists = self.query_knn(self.coords[idx], k + 1)
+            mean_dists[idx] = dists.sum() / k
+        return mean_dists
+
+    def count_neighbors_in_radius(self, radius, num_threads=None):
+        """Return the number of neighbors of each point within the radius.
+
+        The point itself is not counted.
+        """
+        counts = np.zeros(len(self.coords), dtype=np.int64)
+        if len(self.coords) == 0:
+            return counts
+        ring = max(int(np.ceil(radius / self.cell_size)), 1)
+        squared_radius = radius * radius
+        for point_indices, squared_dists in self._iter_neighborhood_distances(
+            ring, num_threads
+        ):
+            valid = point_indices >= 0
+            chunk_counts = np.count_nonzero(
+                squared_dists <= squared_radius, axis=2
+            )
+            counts[point_indices[valid]] = chunk_counts[valid] - 1
+        return counts
+
+    def save(self, ofp):
+        """Write the index to a (compressed) :code:`.npz` file."""
+        np.savez_compressed(
+            ofp,
+            coords=self.coords,
+            origin=self.origin,
+            cell_size=self.cell_size,
+            grid_dims=self.grid_dims,
+            order=self.order,
+            cell_keys=self.cell_keys,
+            cell_starts=self.cell_starts,
+            cell_counts=self.cell_counts,
+        )
+
+    @classmethod
+    def load(cls, ifp):
+        """Read an index written with :code:`save()`."""
+        index = cls.__new__(cls)
+        with np.load(ifp) as data:
+            index.coords = data["coords"]
+            index.origin = data["origin"]
+            index.cell_size = float(data["cell_size"])
+            index.grid_dims = data["grid_dims"]
+            index.order = data["order"]
+            index.cell_keys = data["cell_keys"]
+            index.cell_starts = data["cell_starts"]
+            index.cell_counts = data["cell_counts"]
+        return index
@@ -0,0 +1,192 @@
+import numpy as np
+
+
+class VisibilityIndex:
+    """Compressed (CSR) camera-to-point and point-to-camera visibility index.
+
+    Cameras are identified by their index in the list of cameras returned by
+    the corresponding file handler, points by their point id.
+    """
+
+    def __init__(
+        self,
+        point_ids,
+        camera_offsets,
+        camera_point_positions,
+        point_offsets,
+        point_camera_indices,
+    ):
+        self.point_ids = np.asarray(point_ids, dtype=np.int64)
+        self.camera_offsets = np.asarray(camera_offsets, dtype=np.int64)
+        self.camera_point_positions = np.asarray(
+            camera_point_positions, dtype=np.int64
+        )
+        self.point_offsets = np.asarray(point_offsets, dtype=np.int64)
+        self.point_camera_indices = np.asarray(
+            point_camera_indices, dtype=np.int64
+        )
+
+    @classmethod
+    def from_observations(cls, camera_indices, point_ids, num_cameras=None):
+        """Build the index from (camera index, point id) observation pairs.
+
+        Duplicated observations (e.g. several features of the same image
+        belonging to the same track) are stored only once.
+        """
+        camera_indices = np.asarray(camera_indices, dtype=np.int64).ravel()
+        point_ids = np.asarray(point_ids, dtype=np.int64).ravel()
+        assert len(camera_indices) == len(point_ids)
+        if num_cameras is None:
+            num_cameras = (
+                int(camera_indices.max()) + 1 if len(camera_indices) else 0
+            )
+
+        unique_point_ids, point_positions = np.unique(
+            point_ids, return_inverse=True
+        )
+        point_positions = point_positions.ravel()
+        num_points = len(unique_point_ids)
+
+        # Remove duplicated observations
+        pair_keys = np.unique(camera_indices * num_points + point_positions)
+        camera_indices = pair_keys // max(num_points, 1)
+        point_positions = pair_keys - camera_indices * num_points
+
+        # The pair keys are sorted by camera and (then) by point
+        camera_offsets = np.zeros(num_cameras + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(camera_indices, minlength=num_cameras),
+            out=camera_offsets[1:],
+        )
+        point_order = np.argsort(point_positions, kind="stable")
+        point_offsets = np.zeros(num_points + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(point_positions, minlength=num_points),
+            out=point_offsets[1:],
+        )
+        return cls(
+            unique_point_ids,
+            camera_offsets,
+            point_positions,
+            point_offsets,
+            camera_indices[point_order],
+        )
+
+    @classmethod
+    def from_track_lists(cls, camera_index_lists, point_ids, num_cameras):
+        """Build the index from a list of observing cameras for each point."""
+        track_lengths = np.fromiter(
+            (
+                len(camera_index_list)
+                for camera_index_list in camera_index_lists
+            ),
+            dtype=np.int64,
+            count=len(camera_index_lists),
+        )
+        if track_lengths.sum() == 0:
+            camera_indices = np.zeros(0, dtype=np.int64)
+        else:
+            camera_indices = np.concatenate(
+                [
+                    np.asarray(camera_index_list, dtype=np.int64)
+                    for camera_index_list in camera_index_lists
+                ]
+            )
+        return cls.from_observations(
+            camera_indices,
+            np.repeat(np.asarray(point_ids, dtype=np.int64), track_lengths),
+            num_cameras,
+        )
+
+    def get_num_cameras(self):
+        """Return the number of cameras."""
+        return len(self.camera_offsets) - 1
+
+    def get_num_observations(self):
+        """Return the number of (unique) observations."""
+        return len(self.camera_point_positions)
+
+    def get_point_ids_of_camera(self, camera_index):
+        """Return the ids of the points observed by a camera."""
+        start, end = self.camera_offsets[camera_index : camera_index + 2]
+        return self.point_ids[self.camera_point_positions[start:end]]
+
+    def get_point_ids_of_cameras(self, camera_indices):
+        """Return the (sorted) ids of the points observed by any camera."""
+        camera_indices = np.asarray(camera_indices, dtype=np.int64)
+        starts = self.camera_offsets[camera_indices]
+        counts = self.camera_offsets[camera_indices + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        positions = np.repeat(starts - offsets, counts) + np.arange(
+            counts.sum()
+        )
+        return self.point_ids[
+            np.unique(self.camera_point_positions[positions])
+        ]
+
+    def get_camera_indices_of_point(self, point_id):
+        """Return the indices of the cameras observing a point."""
+        position = np.searchsorted(self.point_ids, point_id)
+        if (
+            position == len(self.point_ids)
+            or self.point_ids[position] != point_id
+        ):
+            return np.zeros(0, dtype=np.int64)
+        start, end = self.point_offsets[position : position + 2]
+        return self.point_camera_indices[start:end]
+
+    def get_track_lengths(self):
+        """Return the number of observing cameras of each point."""
+        return np.diff(self.point_offsets)
+
+    def remap_point_ids(self, point_ids):
+        """Return an index referring to positions in a list of point ids.
+
+        This allows to look up the observed points in a (filtered or
+        reordered) point list, e.g. the points added to a point cloud handle.
+        Points not contained in the list are dropped.
+        """
+        point_ids = np.asarray(point_ids, dtype=np.int64)
+        if len(self.point_ids) == 0:
+            return VisibilityIndex.from_observations(
+                [], [], self.get_num_cameras()
+            )
+        positions = np.searchsorted(self.point_ids, point_ids)
+        positions = np.minimum(positions, len(self.point_ids) - 1)
+        valid = self.point_ids[positions] == point_ids
+        new_ids = np.flatnonzero(valid)
+        positions = positions[valid]
+
+        # Expand the observations of the (remaining) points
+        starts = self.point_offsets[positions]
+        counts = self.point_offsets[positions + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        observation_indices = np.repeat(starts - offsets, counts) + np.arange(
+            counts.sum()
+        )
+        return VisibilityIndex.from_observations(
+            self.point_camera_indices[observation_indices],
+            np.repeat(new_ids, counts),
+            self.get_num_cameras(),
+        )
+
+    def to_dict(self):
+        """Return the index as dict of lists (e.g. for custom properties)."""
+        return {
+            "point_ids": self.point_ids.tolist(),
+            "camera_offsets": self.camera_offsets.tolist(),
+            "camera_point_positions": self.camera_point_positions.tolist(),
+            "point_offsets": self.point_offsets.tolist(),
+            "point_camera_indices": self.point_camera_indices.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create an index from the output of :code:`to_dict()`."""
+        return cls(
+            data["point_ids"],
+            data["camera_offsets"],
+            data["camera_point_positions"],
+            data["point_offsets"],
+            data["point_camera_indices"],
+        )
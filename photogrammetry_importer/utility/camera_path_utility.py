@@ -0,0 +1,272 @@
+import numpy as np
+
+from photogrammetry_importer.utility.quaternion_utility import (
+    make_quaternions_continuous,
+)
+
+
+def _normalize(quaternions):
+    return quaternions / np.linalg.norm(quaternions, axis=-1, keepdims=True)
+
+
+def quaternion_multiply(q1, q2):
+    """Return the Hamilton products of (N, 4) quaternions in (w, x, y, z)."""
+    w1, x1, y1, z1 = np.moveaxis(q1, -1, 0)
+    w2, x2, y2, z2 = np.moveaxis(q2, -1, 0)
+    return np.stack(
+        [
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        ],
+        axis=-1,
+    )
+
+
+def _quaternion_conjugate(quaternions):
+    return quaternions * np.array([1.0, -1.0, -1.0, -1.0])
+
+
+def _quaternion_log(quaternions):
+    """Return the logarithms (pure quaternions) of unit quaternions."""
+    vector_part = quaternions[..., 1:]
+    vector_norm = np.linalg.norm(vector_part, axis=-1, keepdims=True)
+    angle = np.arctan2(vector_norm, quaternions[..., :1])
+    factor = np.divide(
+        angle, vector_norm, out=np.ones_like(angle), where=vector_norm > 1e-12
+    )
+    log = np.zeros_like(quaternions)
+    log[..., 1:] = factor * vector_part
+    return log
+
+
+def _quaternion_exp(pure_quaternions):
+    """Return the exponentials of pure quaternions."""
+    vector_part = pure_quaternions[..., 1:]
+    angle = np.linalg.norm(vector_part, axis=-1, keepdims=True)
+    factor = np.divide(
+        np.sin(angle), angle, out=np.ones_like(angle), where=angle > 1e-12
+    )
+    exp = np.empty_like(pure_quaternions)
+    exp[..., :1] = np.cos(angle)
+    exp[..., 1:] = factor * vector_part
+    return exp
+
+
+def slerp(q0, q1, t):
+    """Spherically interpolate between (N, 4) unit quaternions.
+
+    The interpolation follows the shortest path, i.e. q1 is negated if
+    necessary. The parameter :code:`t` contains N values in [0, 1].
+    """
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[..., np.newaxis]
+    dot_products = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot_products < 0, -q1, q1)
+    dot_products = np.clip(np.abs(dot_products), 0.0, 1.0)
+    angle = np.arccos(dot_products)
+    sin_angle = np.sin(angle)
+    # Fall back to linear interpolation for (almost) identical quaternions
+    is_small = sin_angle < 1e-6
+    safe_sin_angle = np.where(is_small, 1.0, sin_angle)
+    w0 = np.where(
+        is_small, 1.0 - t, np.sin((1.0 - t) * angle) / safe_sin_angle
+    )
+    w1 = np.where(is_small, t, np.sin(t * angle) / safe_sin_angle)
+    return _normalize(w0 * q0 + w1 * q1)
+
+
+def _compute_squad_control_points(quaternions):
+    # s_i = q_i * exp(-(log(q_i^-1 q_i+1) + log(q_i^-1 q_i-1)) / 4)
+    padded = np.concatenate([quaternions[:1], quaternions, quaternions[-1:]])
+    inverse = _quaternion_conjugate(quaternions)
+    log_next = _quaternion_log(quaternion_multiply(inverse, padded[2:]))
+    log_prev = _quaternion_log(quaternion_multiply(inverse, padded[:-2]))
+    return _normalize(
+        quaternion_multiply(
+            quaternions, _quaternion_exp(-(log_next + log_prev) / 4.0)
+        )
+    )
+
+
+def _get_segments(key_times, sample_times):
+    """Return the segment index and the local parameter of each sample."""
+    key_times = np.asarray(key_times, dtype=np.float64)
+    sample_times = np.clip(
+        np.asarray(sample_times, dtype=np.float64), key_times[0], key_times[-1]
+    )
+    segment_indices = np.searchsorted(key_times, sample_times, side="right")
+    segment_indices = np.clip(segment_indices - 1, 0, len(key_times) - 2)
+    segment_lengths = (
+        key_times[segment_indices + 1] - key_times[segment_indices]
+    )
+    t = (sample_times - key_times[segment_indices]) / segment_lengths
+    return segment_indices, t
+
+
+def interpolate_rotations(
+    key_times, quaternions, sample_times, interpolation="SLERP"
+):
+    """Interpolate (N, 4) key quaternions at the given sample times.
+
+    Supported interpolation types are :code:`SLERP` and :code:`SQUAD`
+    (spherical cubic interpolation with continuous angular velocity).
+    """
+    quaternions = make_quaternions_continuous(_normalize(quaternions))
+    if len(quaternions) == 1:
+        return np.repeat(quaternions, len(sample_times), axis=0)
+    segment_indices, t = _get_segments(key_times, sample_times)
+    q0 = quaternions[segment_indices]
+    q1 = quaternions[segment_indices + 1]
+    if interpolation == "SLERP":
+        result = slerp(q0, q1, t)
+    elif interpolation == "SQUAD":
+        control_points = _compute_squad_control_points(quaternions)
+        s0 = control_points[segment_indices]
+        s1 = control_points[segment_indices + 1]
+        result = slerp(slerp(q0, q1, t), slerp(s0, s1, t), 2 * t * (1 - t))
+    else:
+        raise ValueError(f"Unknown rotation interpolation: {interpolation}")
+    return make_quaternions_continuous(result)
+
+
+def _compute_catmull_rom_tangents(key_times, positions):
+    # Finite difference tangents (w.r.t. time) of a non-uniform Catmull-Rom
+    # spline. The end points use one-sided differences.
+    tangents = np.empty_like(positions)
+    tangents[1:-1] = (positions[2:] - positions[:-2]) / (
+        key_times[2:] - key_times[:-2]
+    )[:, np.newaxis]
+    tangents[0] = (positions[1] - positions[0]) / (key_times[1] - key_times[0])
+    tangents[-1] = (positions[-1] - positions[-2]) / (
+        key_times[-1] - key_times[-2]
+    )
+    return tangents
+
+
+def _evaluate_uniform_cubic_b_spline(positions, segment_indices, t):
+    # The end points are repeated so that the curve starts and ends close to
+    # the first and last position.
+    padded = np.concatenate([positions[:1], positions, positions[-1:]])
+    p0 = padded[segment_indices]
+    p1 = padded[segment_indices + 1]
+    p2 = padded[segment_indices + 2]
+    p3 = padded[segment_indices + 3]
+    t = t[:, np.newaxis]
+    t2 = t * t
+    t3 = t2 * t
+    b0 = (1 - t) ** 3 / 6.0
+    b1 = (3 * t3 - 6 * t2 + 4) / 6.0
+    b2 = (-3 * t3 + 3 * t2 + 3 * t + 1) / 6.0
+    b3 = t3 / 6.0
+    return b0 * p0 + b1 * p1 + b2 * p2 + b3 * p3
+
+
+def interpolate_positions(
+    key_times, positions, sample_times, interpolation="CATMULL_ROM"
+):
+    """Interpolate (N, 3) key positions at the given sample times.
+
+    Supported interpolation types are :code:`LINEAR`, :code:`CATMULL_ROM`
+    (interpolating cubic spline) and :code:`B_SPLINE` (approximating uniform
+    cubic B-spline, which additionally smooths the path).
+    """
+    key_times = np.asarray(key_times, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) == 1:
+        return np.repeat(positions, len(sample_times), axis=0)
+    segment_indices, t = _get_segments(key_times, sample_times)
+    p0 = positions[segment_indices]
+    p1 = positions[segment_indices + 1]
+    if interpolation == "LINEAR":
+        return p0 + t[:, np.newaxis] * (p1 - p0)
+    elif interpolation == "CATMULL_ROM":
+        segment_lengths = (
+            key_times[segment_indices + 1] - key_times[segment_indices]
+        )[:, np.newaxis]
+        tangents = _compute_catmull_rom_tangents(key_times, positions)
+        m0 = tangents[segment_indices] * segment_lengths
+        m1 = tangents[segment_indices + 1] * segment_lengths
+        t = t[:, np.newaxis]
+        t2 = t * t
+        t3 = t2 * t
+        h00 = 2 * t3 - 3 * t2 + 1
+        h10 = t3 - 2 * t2 + t
+        h01 = -2 * t3 + 3 * t2
+        h11 = t3 - t2
+        return h00 * p0 + h10 * m0 + h01 * p1 + h11 * m1
+    elif interpolation == "B_SPLINE":
+        return _evaluate_uniform_cubic_b_spline(positions, segment_indices, t)
+    else:
+        raise ValueError(f"Unknown position interpolation: {interpolation}")
+
+
+def _get_gaussian_kernel(sigma):
+    radius = max(1, int(np.ceil(3 * sigma)))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    return kernel / np.sum(kernel)
+
+
+def _smooth_rows(values, sigma):
+    # Gaussian smoothing along the first axis. The borders are extended by
+    # reflection to avoid shrinking the path.
+    kernel = _get_gaussian_kernel(sigma)
+    radius = len(kernel) // 2
+    mode = "reflect" if len(values) > radius else "edge"
+    padded = np.pad(values, ((radius, radius), (0, 0)), mode=mode)
+    smoothed = np.empty_like(values)
+    for column in range(values.shape[1]):
+        smoothed[:, column] = np.convolve(
+            padded[:, column], kernel, mode="valid"
+        )
+    return smoothed
+
+
+def smooth_camera_path(positions, quaternions, sigma):
+    """Smooth camera positions and rotations with a Gaussian kernel.
+
+    The parameter :code:`sigma` is the standard deviation (in key poses) of
+    the kernel. This removes high-frequency jitter of reconstructed camera
+    poses. The rotations are smoothed by averaging sign-consistent
+    quaternions, which is a good approximation for small differences
+    between neighboring rotations.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    quaternions = make_quaternions_continuous(quaternions)
+    if sigma <= 0 or len(positions) < 3:
+        return positions.copy(), quaternions
+    smoothed_positions = _smooth_rows(positions, sigma)
+    smoothed_quaternions = _normalize(_smooth_rows(quaternions, sigma))
+    return smoothed_positions, smoothed_quaternions
+
+
+def compute_camera_path(
+    key_times,
+    positions,
+    quaternions,
+    sample_times,
+    position_interpolation="CATMULL_ROM",
+    rotation_interpolation="SLERP",
+    smoothing_sigma=0.0,
+):
+    """Compute a dense camera path from sorted key poses.
+
+    Return the positions (M, 3) and the (w, x, y, z) quaternions (M, 4) at the
+    M sample times. Samples outside of the key time range are clamped to the
+    first or last key pose.
+    """
+    key_times = np.asarray(key_times, dtype=np.float64)
+    assert np.all(np.diff(key_times) > 0), "Key times must be increasing"
+    positions, quaternions = smooth_camera_path(
+        positions, quaternions, smoothing_sigma
+    )
+    sample_positions = interpolate_positions(
+        key_times, positions, sample_times, position_interpolation
+    )
+    sample_quaternions = interpolate_rotations(
+        key_times, quaternions, sample_times, rotation_interpolation
+    )
+    return sample_positions, sample_quaternions
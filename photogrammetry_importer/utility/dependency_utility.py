@@ -0,0 +1,127 @@
+import os
+import threading
+import importlib
+import importlib.util
+import importlib.metadata
+
+
+def get_package_info(package_name):
+    """Return the version and the location of an installed package.
+
+    Returns :code:`(None, None)`, if the package is not installed or if its
+    metadata can not be read.
+    """
+    try:
+        distribution = importlib.metadata.distribution(package_name)
+        location_str = os.path.join(
+            str(distribution.locate_file("")), distribution.metadata["Name"]
+        )
+        return distribution.version, location_str
+    except Exception:
+        # E.g. a missing package or a dist-info folder with broken metadata
+        return None, None
+
+
+class DependencyStatus:
+    """Class that describes the installation status of a Python dependency.
+
+    The status is determined once (see :code:`probe()`) and cached until
+    :code:`invalidate()` is called.
+    """
+
+    def __init__(self, gui_name, package_name, import_name):
+        # Name shown in the GUI.
+        self.gui_name = gui_name
+        # Package name such as "pillow" in "pip install pillow".
+        self.package_name = package_name
+        # Import name such as "PIL" in "import PIL".
+        self.import_name = import_name
+
+        self._lock = threading.Lock()
+        self._probed = threading.Event()
+        # Incremented by invalidate(), allows to drop results of probes that
+        # started before (e.g. before installing the package)
+        self._generation = 0
+        self._installation_status = False
+        self._package_info = (None, None)
+
+    def probe(self):
+        """Determine wether this dependency is installed or not.
+
+        Once a module is loaded into the current Python session, importlib can
+        not longer be used to determine the installation status. Restart
+        Blender to clear the current Python session.
+        """
+        with self._lock:
+            generation = self._generation
+        installation_status = False
+        package_info = (None, None)
+        try:
+            module_spec = importlib.util.find_spec(self.import_name)
+            installation_status = module_spec is not None
+            package_info = get_package_info(self.package_name)
+        except Exception:
+            # Treat the dependency as not installed
+            pass
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._installation_status = installation_status
+                    self._package_info = package_info
+                    self._probed.set()
+
+    def is_probed(self):
+        """Return wether the status has been determined (without blocking)."""
+        return self._probed.is_set()
+
+    def invalidate(self):
+        """Discard the cached status (e.g. after installing the package)."""
+        importlib.invalidate_caches()
+        with self._lock:
+            self._generation += 1
+            self._probed.clear()
+
+    @property
+    def installation_status(self):
+        """Return wether this dependency is installed."""
+        if not self.is_probed():
+            self.probe()
+        return self._installation_status
+
+    @installation_status.setter
+    def installation_status(self, installation_status):
+        # Keeps the (cached) package information
+        with self._lock:
+            # Running probes must not overwrite this status
+            self._generation += 1
+            self._installation_status = installation_status
+            self._probed.set()
+
+    def get_package_info(self):
+        """Return the version and location of this dependency."""
+        if not self.is_probed():
+            self.probe()
+        return self._package_info
+
+
+def probe_dependencies_in_background(dependencies):
+    """Determine the status of the dependencies in a separate thread."""
+
+    def probe_dependencies():
+        # Repeat for dependencies invalidated while probing
+        while True:
+            unprobed_dependencies = [
+                dependency
+                for dependency in dependencies
+                if not dependency.is_probed()
+            ]
+            if not unprobed_dependencies:
+                break
+            for dependency in unprobed_dependencies:
+                dependency.probe()
+
+    thread = threading.Thread(
+        target=probe_dependencies, name="DependencyProbe", daemon=True
+    )
+    thread.start()
+    return thread
@@ -1,34 +1,29 @@
-import os
 import sys
-import pkgutil
 import importlib
 
 
+def get_loaded_addon_modules(package_name):
+    """Return the submodules of this addon that have been imported so far."""
+    prefix = package_name + "."
+    return [
+        module
+        for name, module in sorted(sys.modules.items())
+        if name.startswith(prefix) and module is not None
+    ]
+
+
 def setup_addon_modules(path, package_name, reload):
-    """Imports and reloads all modules in this addon.
+    """Reload the already imported modules of this addon.
+
+    The remaining submodules are imported on first use (e.g. the file handlers
+    when executing the corresponding operator), which keeps the registration
+    of the addon fast.
 
     Individual modules can define a :code:`__reload_order_index__` property
     which will be used to reload the modules in a specific order. The default
     is 0.
     """
 
-    def get_submodule_names(path=path[0], root=""):
-        module_names = []
-        for importer, module_name, is_package in pkgutil.iter_modules([path]):
-            if is_package:
-                sub_path = os.path.join(path, module_name)
-                sub_root = root + module_name + "."
-                module_names.extend(get_submodule_names(sub_path, sub_root))
-            else:
-                module_names.append(root + module_name)
-        return module_names
-
-    def import_submodules(names):
-        modules = []
-        for name in names:
-            modules.append(importlib.import_module("." + name, package_name))
-        return modules
-
     def reload_modules(modules):
         modules.sort(
             key=lambda module: getattr(module, "__reload_order_index__", 0)
@@ -36,8 +31,7 @@ def setup_addon_modules(path, package_name, reload):
         for module in modules:
             importlib.reload(module)
 
-    names = get_submodule_names()
-    modules = import_submodules(names)
+    modules = get_loaded_addon_modules(package_name)
     if reload:
         reload_modules(modules)
     return modules
@@ -9,6 +9,13 @@ def is_rotation_mat(some_mat):
     return res
 
 
+def are_rotation_mats(some_mats):
+    """Test if all (N, 3, 3) matrices are rotation matrices."""
+    # Batched version of is_rotation_mat()
+    dets = np.linalg.det(np.asarray(some_mats, dtype=float).reshape(-1, 3, 3))
+    return bool(np.all(np.isclose(np.abs(dets), 1)))
+
+
 def invert_transformation_matrix(mat):
     """Invert transformation matrix without numerical errors."""
     assert is_rotation_mat(mat)
@@ -17,3 +24,27 @@ def invert_transformation_matrix(mat):
     mat_copy[0:3, 3] = -np.dot(mat[0:3, 0:3].T, mat_copy[0:3, 3])
     mat_copy[0:3, 0:3] = mat[0:3, 0:3].T
     return mat_copy
+
+
+def invert_y_and_z_axis(input_matrix_or_vector, axis=0):
+    """Invert the y and the z axis of a given matrix or vector.
+
+    Many SfM / MVS libraries use coordinate systems that differ from Blender's
+    coordinate system in the y and the z coordinate. This function inverts the
+    y and the z coordinates in the corresponding matrix / vector entries, which
+    is equivalent to a rotation by 180 degree around the x axis.
+
+    Use :code:`axis` to invert the entries of stacked matrices or vectors
+    (e.g. :code:`axis=1` for (N, 3, 3) rotation matrices or :code:`axis=-1`
+    for (N, 3) vectors).
+    """
+    if axis == 0:
+        output_matrix_or_vector = input_matrix_or_vector.copy()
+        output_matrix_or_vector[1] = -output_matrix_or_vector[1]
+        output_matrix_or_vector[2] = -output_matrix_or_vector[2]
+    else:
+        output_matrix_or_vector = np.array(input_matrix_or_vector, copy=True)
+        index = [slice(None)] * output_matrix_or_vector.ndim
+        index[axis] = slice(1, 3)
+        output_matrix_or_vector[tuple(index)] *= -1
+    return output_matrix_or_vector
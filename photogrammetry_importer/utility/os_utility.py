@@ -1,15 +1,93 @@
 import os
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+
+_DIGITS_REGEX = re.compile(r"(\d+)")
 
 
 def _natural_key(some_string):
     """Return a key that allows for natural sorting."""
     return [
-        int(s) if s.isdigit() else s for s in re.split(r"(\d+)", some_string)
+        int(s) if s.isdigit() else s for s in _DIGITS_REGEX.split(some_string)
     ]
 
 
-def get_file_paths_in_dir(
+def _sort_paths(paths, natural_sorting):
+    if natural_sorting:
+        # The keys are computed only once per path
+        return sorted(paths, key=_natural_key)
+    return sorted(paths)
+
+
+# (directory, recursive) -> (file paths, directory mtimes)
+_file_listing_cache = {}
+
+
+def _walk_files(idp, recursive, dir_mtimes=None):
+    """Yield the paths and names of the files in a directory.
+
+    The directories are enumerated with :code:`os.scandir`, which provides
+    the file types without additional :code:`stat` calls. Analogous to
+    :code:`os.walk`, symbolic links to directories are not followed. If
+    :code:`dir_mtimes` is provided, the modification times of the walked
+    directories are stored in it.
+    """
+    dp_stack = [idp]
+    while len(dp_stack) > 0:
+        dp = dp_stack.pop()
+        try:
+            if dir_mtimes is not None:
+                dir_mtimes[dp] = os.stat(dp).st_mtime_ns
+            with os.scandir(dp) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        yield entry.path, entry.name
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        dp_stack.append(entry.path)
+        except OSError:
+            if dp == idp:
+                raise
+
+
+def _is_file_listing_valid(dir_mtimes):
+    for dp, mtime_ns in dir_mtimes.items():
+        try:
+            if os.stat(dp).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _iter_cached_files(idp, recursive):
+    # Several importer stages enumerate the same (potentially huge)
+    # directory. Reuse the listing as long as no directory was modified.
+    key = (os.path.abspath(idp), recursive)
+    cached = _file_listing_cache.get(key)
+    if cached is None or not _is_file_listing_valid(cached[1]):
+        dir_mtimes = {}
+        ifp_s = list(_walk_files(idp, recursive, dir_mtimes))
+        cached = (ifp_s, dir_mtimes)
+        _file_listing_cache[key] = cached
+    return iter(cached[0])
+
+
+def clear_file_listing_cache():
+    """Remove all cached directory listings."""
+    _file_listing_cache.clear()
+
+
+def _as_list(str_or_list):
+    if str_or_list is None:
+        return []
+    if isinstance(str_or_list, str):
+        return [str_or_list]
+    return list(str_or_list)
+
+
+def iter_file_paths_in_dir(
     idp,
     ext=None,
     target_str_or_list=None,
@@ -17,69 +95,86 @@ def get_file_paths_in_dir(
     base_name_only=False,
     relative_path_only=False,
     without_ext=False,
-    sort_result=True,
-    natural_sorting=False,
     recursive=False,
+    use_cache=False,
 ):
-    """Return the paths of the files in the given directory.
+    """Yield the (unsorted) paths of the files in the given directory.
 
-    The parameter :code:`ext` can be a list of extensions or a single extension
-    (e.g. [:code:`.jpg`, :code:`.png`] or :code:`.jpg`).
+    All filters are applied in a single pass over the directory entries. See
+    :code:`get_file_paths_in_dir` for a description of the parameters.
     """
+    assert not (base_name_only and relative_path_only)
+    extensions = None
+    if ext is not None:
+        extensions = frozenset(_as_list(ext))
+    target_strs = _as_list(target_str_or_list)
+    ignore_strs = _as_list(ignore_str_or_list)
+    idp_prefix = os.path.join(idp, "")
 
-    if recursive:
-        ifp_s = []
-        for root, dirs, files in os.walk(idp):
-            ifp_s += [os.path.join(root, ele) for ele in files]
+    if use_cache:
+        entries = _iter_cached_files(idp, recursive)
     else:
-        ifp_s = [
-            os.path.join(idp, ele)
-            for ele in os.listdir(idp)
-            if os.path.isfile(os.path.join(idp, ele))
-        ]
+        entries = _walk_files(idp, recursive)
 
-    if ext is not None:
-        if isinstance(ext, list):
-            ifp_s = [
-                ifp for ifp in ifp_s if os.path.splitext(ifp)[1].lower() in ext
-            ]
+    for ifp, name in entries:
+        if (
+            extensions is not None
+            and os.path.splitext(name)[1].lower() not in extensions
+        ):
+            continue
+        if not all(target_str in name for target_str in target_strs):
+            continue
+        if any(ignore_str in name for ignore_str in ignore_strs):
+            continue
+        if base_name_only:
+            result = name
+        elif relative_path_only:
+            if ifp.startswith(idp_prefix):
+                result = ifp[len(idp_prefix) :]
+            else:
+                result = os.path.relpath(ifp, idp)
         else:
-            ifp_s = [
-                ifp for ifp in ifp_s if os.path.splitext(ifp)[1].lower() == ext
-            ]
-
-    if target_str_or_list is not None:
-        if type(target_str_or_list) == str:
-            target_str_or_list = [target_str_or_list]
-        for target_str in target_str_or_list:
-            ifp_s = [
-                ifp for ifp in ifp_s if target_str in os.path.basename(ifp)
-            ]
-
-    if ignore_str_or_list is not None:
-        if type(ignore_str_or_list) == str:
-            ignore_str_or_list = [ignore_str_or_list]
-        for ignore_str in ignore_str_or_list:
-            ifp_s = [
-                ifp for ifp in ifp_s if ignore_str not in os.path.basename(ifp)
-            ]
-
-    assert not (base_name_only and relative_path_only)
-    if base_name_only:
-        ifp_s = [os.path.basename(ifp) for ifp in ifp_s]
+            result = ifp
+        if without_ext:
+            result = os.path.splitext(result)[0]
+        yield result
 
-    if relative_path_only:
-        ifp_s = [os.path.relpath(ifp, idp) for ifp in ifp_s]
 
-    if without_ext:
-        ifp_s = [os.path.splitext(ifp)[0] for ifp in ifp_s]
+def get_file_paths_in_dir(
+    idp,
+    ext=None,
+    target_str_or_list=None,
+    ignore_str_or_list=None,
+    base_name_only=False,
+    relative_path_only=False,
+    without_ext=False,
+    sort_result=True,
+    natural_sorting=False,
+    recursive=False,
+    use_cache=False,
+):
+    """Return the paths of the files in the given directory.
 
+    The parameter :code:`ext` can be a list of extensions or a single extension
+    (e.g. [:code:`.jpg`, :code:`.png`] or :code:`.jpg`). If :code:`use_cache`
+    is set, the directory listing is reused until one of the enumerated
+    directories is modified.
+    """
+    ifp_s = list(
+        iter_file_paths_in_dir(
+            idp,
+            ext=ext,
+            target_str_or_list=target_str_or_list,
+            ignore_str_or_list=ignore_str_or_list,
+            base_name_only=base_name_only,
+            relative_path_only=relative_path_only,
+            without_ext=without_ext,
+            recursive=recursive,
+            use_cache=use_cache,
+        )
+    )
     if sort_result:
-        if natural_sorting:
-            ifp_s = sorted(ifp_s, key=_natural_key)
-        else:
-            ifp_s = sorted(ifp_s)
-
+        ifp_s = _sort_paths(ifp_s, natural_sorting)
     return ifp_s
 
 
@@ -91,6 +186,7 @@ def get_image_file_paths_in_dir(
     sort_result=True,
     recursive=True,
     target_str_or_list=None,
+    use_cache=True,
 ):
     """Return the paths of the images in the given directory."""
     return get_file_paths_in_dir(
@@ -122,6 +218,7 @@ def get_image_file_paths_in_dir(
         without_ext=without_ext,
         sort_result=sort_result,
         recursive=recursive,
+        use_cache=use_cache,
     )
 
 
@@ -133,29 +230,91 @@ def get_subdirs(
     recursive=False,
 ):
     """Return the paths of the subdirectories in the given directory."""
-    if recursive:
-        sub_dps = []
-        if base_name_only:
-            for root, dirs, files in os.walk(idp):
-                sub_dps += [name for name in dirs]
-        else:
-            for root, dirs, files in os.walk(idp):
-                sub_dps += [os.path.join(root, sub_dn) for sub_dn in dirs]
-    else:
-        sub_dns = [
-            name
-            for name in os.listdir(idp)
-            if os.path.isdir(os.path.join(idp, name))
-        ]
-        if base_name_only:
-            sub_dps = sub_dns
-        else:
-            sub_dps = [os.path.join(idp, sub_dn) for sub_dn in sub_dns]
+    sub_dps = []
+    dp_stack = [idp]
+    while len(dp_stack) > 0:
+        with os.scandir(dp_stack.pop()) as entries:
+            for entry in entries:
+                # Analogous to os.walk, list (but don't follow) symlinks
+                if not entry.is_dir():
+                    continue
+                if base_name_only:
+                    sub_dps.append(entry.name)
+                else:
+                    sub_dps.append(entry.path)
+                if recursive and not entry.is_symlink():
+                    dp_stack.append(entry.path)
 
     if sort_result:
-        if natural_sorting:
-            sub_dps = sorted(sub_dps, key=_natural_key)
-        else:
-            sub_dps = sorted(sub_dps)
+        sub_dps = _sort_paths(sub_dps, natural_sorting)
 
     return sub_dps
+
+
+def _is_up_to_date(src_fp, dst_fp):
+    """Return True, if the target file corresponds to the source file."""
+    try:
+        if os.path.samefile(src_fp, dst_fp):
+            # Hardlink or symlink to the source file
+            return True
+        src_stat = os.stat(src_fp)
+        dst_stat = os.stat(dst_fp)
+    except OSError:
+        return False
+    # Copies preserve the modification time (see shutil.copy2)
+    return (
+        src_stat.st_size == dst_stat.st_size
+        and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    )
+
+
+def _link_or_copy_file(src_fp, dst_fp, allow_links):
+    if os.path.lexists(dst_fp):
+        if _is_up_to_date(src_fp, dst_fp):
+            return "SKIPPED"
+        os.remove(dst_fp)
+    if allow_links:
+        try:
+            os.link(src_fp, dst_fp)
+            return "HARDLINKED"
+        except OSError:
+            # E.g. different file systems or file systems without hardlinks
+            pass
+        try:
+            os.symlink(os.path.abspath(src_fp), dst_fp)
+            return "SYMLINKED"
+        except (OSError, NotImplementedError):
+            # E.g. missing privileges on Windows
+            pass
+    shutil.copy2(src_fp, dst_fp)
+    return "COPIED"
+
+
+def link_or_copy_files(src_fps, dst_fps, allow_links=True, num_threads=None):
+    """Make the source files available at the target paths.
+
+    Targets that already correspond to their source (links to the source
+    or copies with the same size and modification time) are skipped. If
+    :code:`allow_links` is set, hardlinks and (as fallback) symbolic links
+    are preferred over copies. Copies are performed in parallel. Return a
+    dictionary with the number of skipped, linked and copied files.
+    """
+    src_fps = list(src_fps)
+    dst_fps = list(dst_fps)
+    assert len(src_fps) == len(dst_fps)
+    if num_threads is None:
+        num_threads = min(32, (os.cpu_count() or 1) + 4)
+    num_threads = max(1, min(num_threads, len(src_fps)))
+
+    def process(fp_pair):
+        return _link_or_copy_file(fp_pair[0], fp_pair[1], allow_links)
+
+    if num_threads == 1:
+        results = [process(fp_pair) for fp_pair in zip(src_fps, dst_fps)]
+    else:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            results = list(executor.map(process, zip(src_fps, dst_fps)))
+    counts = {"SKIPPED": 0, "HARDLINKED": 0, "SYMLINKED": 0, "COPIED": 0}
+    for result in results:
+        counts[result] += 1
+    return counts
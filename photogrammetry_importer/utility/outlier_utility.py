@@ -0,0 +1,41 @@
+import numpy as np
+
+from photogrammetry_importer.types.spatial_index import SpatialIndex
+
+
+def compute_statistical_inlier_mask(
+    coords,
+    num_neighbors=20,
+    std_ratio=2.0,
+    spatial_index=None,
+    num_threads=None,
+):
+    """Return a mask of the points that are not statistical outliers.
+
+    A point is considered an outlier, if the mean distance to its k nearest
+    neighbors exceeds the mean of these distances (over all points) by more
+    than :code:`std_ratio` standard deviations.
+    """
+    if spatial_index is None:
+        spatial_index = SpatialIndex(coords, num_threads=num_threads)
+    mean_dists = spatial_index.compute_mean_knn_distances(
+        num_neighbors, num_threads=num_threads
+    )
+    if len(mean_dists) == 0:
+        return np.zeros(0, dtype=bool)
+    threshold = mean_dists.mean() + std_ratio * mean_dists.std()
+    return mean_dists <= threshold
+
+
+def compute_radius_inlier_mask(
+    coords, radius, min_neighbors, spatial_index=None, num_threads=None
+):
+    """Return a mask of the points with enough neighbors within the radius."""
+    if spatial_index is None:
+        spatial_index = SpatialIndex(
+            coords, cell_size=radius, num_threads=num_threads
+        )
+    counts = spatial_index.count_neighbors_in_radius(
+        radius, num_threads=num_threads
+    )
+    return counts >= min_neighbors
@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+
+class ProfileSpan:
+    """This class represents a named (and possibly nested) timing span."""
+
+    def __init__(self, name, parent=None, num_items=None):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.num_items = num_items
+        self.start_time = None
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        # Peak memory (in bytes) allocated during the span (requires
+        # tracemalloc)
+        self.peak_memory = None
+        self._start_cpu_time = None
+        self._start_memory = None
+        self._child_peak = 0
+
+    def set_num_items(self, num_items):
+        """Set the number of items (e.g. cameras or points) of the span."""
+        self.num_items = num_items
+
+    def get_items_per_second(self):
+        """Return the throughput of the span (or None)."""
+        if self.num_items is None or self.wall_time <= 0:
+            return None
+        return self.num_items / self.wall_time
+
+    def to_dict(self):
+        """Return a dictionary representation of the span (and children)."""
+        return {
+            "name": self.name,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "num_items": self.num_items,
+            "peak_memory": self.peak_memory,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class Profiler:
+    """Class to record a tree of timing spans.
+
+    Use :code:`span()` as context manager to measure the wall time, the CPU
+    time and (if :code:`trace_memory` is set) the peak memory of a block.
+    Spans opened within other spans (of the same thread) become children.
+    """
+
+    def __init__(self, name="Profile", trace_memory=False):
+        self.root = ProfileSpan(name)
+        self.trace_memory = trace_memory
+        self._started_tracemalloc = False
+        self._stack = [self.root]
+        self._lock = threading.Lock()
+        self._thread_id = threading.get_ident()
+
+    def start(self):
+        """Start the profiler (i.e. the root span)."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._enter_span(self.root)
+        return self
+
+    def stop(self):
+        """Stop the profiler (i.e. the root span)."""
+        self._exit_span(self.root)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return self
+
+    def _enter_span(self, span):
+        span.start_time = time.perf_counter()
+        span._start_cpu_time = time.process_time()
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            span._start_memory = current
+            if span.parent is not None:
+                # Preserve the peak of the parent before resetting it
+                span.parent._child_peak = max(span.parent._child_peak, peak)
+            tracemalloc.reset_peak()
+
+    def _exit_span(self, span):
+        span.wall_time = time.perf_counter() - span.start_time
+        span.cpu_time = time.process_time() - span._start_cpu_time
+        if span._start_memory is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], span._child_peak)
+            span.peak_memory = max(0, peak - span._start_memory)
+            if span.parent is not None:
+                span.parent._child_peak = max(span.parent._child_peak, peak)
+
+    @contextmanager
+    def span(self, name, num_items=None):
+        """Measure the enclosed block as (nested) span."""
+        if threading.get_ident() != self._thread_id:
+            # Spans of worker threads are not part of the tree
+            yield ProfileSpan(name, num_items=num_items)
+            return
+        with self._lock:
+            parent = self._stack[-1]
+            span = ProfileSpan(name, parent=parent, num_items=num_items)
+            parent.children.append(span)
+            self._stack.append(span)
+        self._enter_span(span)
+        try:
+            yield span
+        finally:
+            self._exit_span(span)
+            with self._lock:
+                self._stack.pop()
+
+    def iter_spans(self):
+        """Iterate over all spans (depth first) and their depth."""
+        stack = [(self.root, 0)]
+        while stack:
+            span, depth = stack.pop()
+            yield span, depth
+            for child in reversed(span.children):
+                stack.append((child, depth + 1))
+
+    def to_dict(self):
+        """Return a dictionary representation of all spans."""
+        return self.root.to_dict()
+
+    def to_chrome_trace(self):
+        """Return the spans in the Chrome trace event format.
+
+        The result can be viewed with :code:`chrome://tracing` or
+        :code:`https://ui.perfetto.dev`.
+        """
+        events = []
+        origin = self.root.start_time or 0.0
+        for span, _ in self.iter_spans():
+            if span.start_time is None:
+                continue
+            args = {"cpu_time": span.cpu_time}
+            if span.num_items is not None:
+                args["num_items"] = span.num_items
+            if span.peak_memory is not None:
+                args["peak_memory"] = span.peak_memory
+            events.append(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": (span.start_time - origin) * 1e6,
+                    "dur": span.wall_time * 1e6,
+                    "pid": os.getpid(),
+                    "tid": self._thread_id,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, ofp):
+        """Write the spans as (nested) :code:`.json` file."""
+        with open(ofp, "w") as json_file:
+            json.dump(self.to_dict(), json_file, indent=4)
+
+    def write_chrome_trace(self, ofp):
+        """Write the spans as Chrome trace (:code:`.json`) file."""
+        with open(ofp, "w") as json_file:
+            json.dump(self.to_chrome_trace(), json_file)
+
+    def get_summary_lines(self):
+        """Return a human readable summary (one line per span)."""
+        lines = []
+        for span, depth in self.iter_spans():
+            line = "{}{}: {:.3f}s (cpu {:.3f}s)".format(
+                "  " * depth, span.name, span.wall_time, span.cpu_time
+            )
+            if span.num_items is not None:
+                line += f", {span.num_items} items"
+                items_per_second = span.get_items_per_second()
+                if items_per_second is not None:
+                    line += f" ({items_per_second:.0f}/s)"
+            if span.peak_memory is not None:
+                line += ", peak {:.1f} MB".format(span.peak_memory / 2**20)
+            lines.append(line)
+        return lines
+
+
+_active_profiler = None
+_last_profiler = None
+
+
+def get_active_profiler():
+    """Return the currently active profiler (or None)."""
+    return _active_profiler
+
+
+def get_last_profiler():
+    """Return the profiler of the last finished profiling session."""
+    return _last_profiler
+
+
+@contextmanager
+def profiling_session(name, trace_memory=False):
+    """Activate a profiler for the enclosed block.
+
+    The spans created with :code:`profile_span()` and
+    :code:`profile_function()` are recorded by the active profiler. After the
+    session, the profiler is available via :code:`get_last_profiler()`.
+    """
+    global _active_profiler, _last_profiler
+    previous_profiler = _active_profiler
+    profiler = Profiler(name, trace_memory=trace_memory).start()
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active_profiler = previous_profiler
+        _last_profiler = profiler
+
+
+@contextmanager
+def profile_span(name, num_items=None):
+    """Record the enclosed block as span of the active profiler.
+
+    Without active profiler, only the wall time and the CPU time of the
+    returned span are measured.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        span = ProfileSpan(name, num_items=num_items)
+        start_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_time = time.perf_counter() - start_time
+            span.cpu_time = time.process_time() - start_cpu_time
+    else:
+        with profiler.span(name, num_items=num_items) as span:
+            yield span
+
+
+def profile_function(name=None):
+    """Return a decorator recording each call of a function as span."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
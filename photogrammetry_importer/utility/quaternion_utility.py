@@ -0,0 +1,137 @@
+import numpy as np
+
+
+def rotation_matrices_to_quaternions(rotation_mats):
+    """Convert rotation matrices to unit quaternions.
+
+    Return a numpy array of shape (N, 4) containing the quaternions in
+    (w, x, y, z) order (i.e. the order used by Blender). The (N, 3, 3) input
+    matrices are orthonormalized by normalizing their columns, which mirrors
+    the scale removal of Blender's matrix decomposition.
+    """
+    rotation_mats = np.asarray(rotation_mats, dtype=np.float64).reshape(
+        -1, 3, 3
+    )
+    rotation_mats = rotation_mats / np.linalg.norm(
+        rotation_mats, axis=1, keepdims=True
+    )
+    m00 = rotation_mats[:, 0, 0]
+    m11 = rotation_mats[:, 1, 1]
+    m22 = rotation_mats[:, 2, 2]
+    trace = m00 + m11 + m22
+
+    # Use the numerically most stable of the four possible formulas
+    diagonal = np.stack([trace, m00, m11, m22], axis=1)
+    case = np.argmax(diagonal, axis=1)
+
+    quaternions = np.empty((len(rotation_mats), 4), dtype=np.float64)
+    m = rotation_mats
+
+    idx = case == 0
+    s = 2.0 * np.sqrt(1.0 + trace[idx])
+    quaternions[idx, 0] = 0.25 * s
+    quaternions[idx, 1] = (m[idx, 2, 1] - m[idx, 1, 2]) / s
+    quaternions[idx, 2] = (m[idx, 0, 2] - m[idx, 2, 0]) / s
+    quaternions[idx, 3] = (m[idx, 1, 0] - m[idx, 0, 1]) / s
+
+    idx = case == 1
+    s = 2.0 * np.sqrt(1.0 + m00[idx] - m11[idx] - m22[idx])
+    quaternions[idx, 0] = (m[idx, 2, 1] - m[idx, 1, 2]) / s
+    quaternions[idx, 1] = 0.25 * s
+    quaternions[idx, 2] = (m[idx, 0, 1] + m[idx, 1, 0]) / s
+    quaternions[idx, 3] = (m[idx, 0, 2] + m[idx, 2, 0]) / s
+
+    idx = case == 2
+    s = 2.0 * np.sqrt(1.0 + m11[idx] - m00[idx] - m22[idx])
+    quaternions[idx, 0] = (m[idx, 0, 2] - m[idx, 2, 0]) / s
+    quaternions[idx, 1] = (m[idx, 0, 1] + m[idx, 1, 0]) / s
+    quaternions[idx, 2] = 0.25 * s
+    quaternions[idx, 3] = (m[idx, 1, 2] + m[idx, 2, 1]) / s
+
+    idx = case == 3
+    s = 2.0 * np.sqrt(1.0 + m22[idx] - m00[idx] - m11[idx])
+    quaternions[idx, 0] = (m[idx, 1, 0] - m[idx, 0, 1]) / s
+    quaternions[idx, 1] = (m[idx, 0, 2] + m[idx, 2, 0]) / s
+    quaternions[idx, 2] = (m[idx, 1, 2] + m[idx, 2, 1]) / s
+    quaternions[idx, 3] = 0.25 * s
+
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    return quaternions
+
+
+def quaternions_to_rotation_matrices(quaternions):
+    """Convert (w, x, y, z) quaternions to rotation matrices.
+
+    Return a numpy array of shape (N, 3, 3). Analogous to
+    :code:`Camera.quaternion_to_rotation_matrix`, the quaternions are
+    normalized and zero quaternions result in identity matrices.
+    """
+    quaternions = np.asarray(quaternions, dtype=np.float64).reshape(-1, 4)
+    norms = np.linalg.norm(quaternions, axis=1, keepdims=True)
+    is_zero = norms[:, 0] == 0
+    quaternions = quaternions / np.where(norms > 0, norms, 1.0)
+    quaternions[is_zero] = [1.0, 0.0, 0.0, 0.0]
+    w, x, y, z = quaternions.T
+    rotation_mats = np.empty((len(quaternions), 3, 3), dtype=np.float64)
+    rotation_mats[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    rotation_mats[:, 0, 1] = 2 * (x * y - z * w)
+    rotation_mats[:, 0, 2] = 2 * (x * z + y * w)
+    rotation_mats[:, 1, 0] = 2 * (x * y + z * w)
+    rotation_mats[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    rotation_mats[:, 1, 2] = 2 * (y * z - x * w)
+    rotation_mats[:, 2, 0] = 2 * (x * z - y * w)
+    rotation_mats[:, 2, 1] = 2 * (y * z + x * w)
+    rotation_mats[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return rotation_mats
+
+
+def rodrigues_vecs_to_rotation_matrices(rodrigues_vecs):
+    """Convert (N, 3) Rodrigues (axis-angle) vectors to rotation matrices.
+
+    The length of each vector defines the rotation angle. Analogous to
+    OpenCV's :code:`Rodrigues()`, vectors with an angle below the machine
+    epsilon result in identity matrices.
+    """
+    rodrigues_vecs = np.asarray(rodrigues_vecs, dtype=np.float64).reshape(
+        -1, 3
+    )
+    thetas = np.linalg.norm(rodrigues_vecs, axis=1)
+    is_small = thetas < np.finfo(np.float64).eps
+    axes = rodrigues_vecs / np.where(is_small, 1.0, thetas)[:, np.newaxis]
+    axes[is_small] = 0.0
+    thetas = np.where(is_small, 0.0, thetas)
+
+    x, y, z = axes.T
+    zeros = np.zeros_like(x)
+    cross_product_mats = np.stack(
+        [zeros, -z, y, z, zeros, -x, -y, x, zeros], axis=1
+    ).reshape(-1, 3, 3)
+    outer_product_mats = np.einsum("ni,nj->nij", axes, axes)
+
+    # R = cos(theta) I + (1 - cos(theta)) r r^T + sin(theta) [r]_x
+    cos_thetas = np.cos(thetas)[:, np.newaxis, np.newaxis]
+    sin_thetas = np.sin(thetas)[:, np.newaxis, np.newaxis]
+    return (
+        cos_thetas * np.eye(3)
+        + (1 - cos_thetas) * outer_product_mats
+        + sin_thetas * cross_product_mats
+    )
+
+
+def make_quaternions_continuous(quaternions):
+    """Flip the signs of quaternions to remove discontinuities.
+
+    The quaternions q and -q represent the same rotation. However, the
+    interpolation between consecutive quaternions with different signs does
+    not follow the shortest path. Return a copy of the (N, 4) quaternions,
+    where each quaternion shows a non-negative dot product with its
+    predecessor.
+    """
+    quaternions = np.array(quaternions, dtype=np.float64)
+    if len(quaternions) < 2:
+        return quaternions
+    dot_products = np.einsum("ij,ij->i", quaternions[:-1], quaternions[1:])
+    # A flip of a quaternion propagates to all subsequent quaternions
+    signs = np.ones(len(quaternions), dtype=np.float64)
+    signs[1:] = np.cumprod(np.where(dot_products < 0, -1.0, 1.0))
+    return quaternions * signs[:, np.newaxis]
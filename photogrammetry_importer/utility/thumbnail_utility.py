@@ -0,0 +1,130 @@
+import os
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from photogrammetry_importer.file_handlers.image_file_handler import (
+    ImageFileHandler,
+)
+
+
+def get_default_thumbnail_cache_dp():
+    """Return the default directory of the on-disk thumbnail cache."""
+    cache_dp = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_dp, "photogrammetry_importer", "thumbnails")
+
+
+def get_thumbnail_fp(image_ifp, max_resolution, cache_dp):
+    """Return the cache path of the thumbnail of an image.
+
+    The path depends on the image path, the file size, the modification time
+    and the maximum resolution. Thus, modified images receive a new
+    thumbnail.
+    """
+    stat_result = os.stat(image_ifp)
+    key = "|".join(
+        [
+            os.path.abspath(image_ifp),
+            str(stat_result.st_size),
+            str(stat_result.st_mtime_ns),
+            str(max_resolution),
+        ]
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    ext = os.path.splitext(image_ifp)[1].lower()
+    if ext not in [".jpg", ".jpeg"]:
+        # Preserve a potential alpha channel
+        ext = ".png"
+    return os.path.join(cache_dp, digest[:2], digest + ext)
+
+
+def _create_thumbnail(task):
+    """Create a single thumbnail (executed in a worker process)."""
+    image_ifp, thumbnail_ofp, max_resolution = task
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    if thumbnail_ofp.endswith(".jpg") or thumbnail_ofp.endswith(".jpeg"):
+        file_format = "JPEG"
+    else:
+        file_format = "PNG"
+    tmp_ofp = thumbnail_ofp + ".%d.tmp" % os.getpid()
+    try:
+        with Image.open(image_ifp) as image:
+            # Let the JPEG decoder perform most of the downscaling
+            image.draft("RGB", (max_resolution, max_resolution))
+            image.thumbnail((max_resolution, max_resolution))
+            if file_format == "JPEG" and image.mode != "RGB":
+                image = image.convert("RGB")
+            os.makedirs(os.path.dirname(thumbnail_ofp), exist_ok=True)
+            image.save(tmp_ofp, format=file_format)
+        os.replace(tmp_ofp, thumbnail_ofp)
+    except (OSError, ValueError):
+        if os.path.isfile(tmp_ofp):
+            os.remove(tmp_ofp)
+        return None
+    return thumbnail_ofp
+
+
+def create_thumbnails(
+    image_ifps, max_resolution, cache_dp=None, num_processes=None
+):
+    """Return paths of downscaled proxies of the given images.
+
+    Images, whose width and height do not exceed :code:`max_resolution`, are
+    used directly. Missing thumbnails are created in parallel worker
+    processes and stored in an on-disk cache. If a thumbnail can not be
+    created (e.g. if :code:`Pillow` is not installed), the path of the
+    original image is returned instead.
+    """
+    if cache_dp is None:
+        cache_dp = get_default_thumbnail_cache_dp()
+    result_fps = list(image_ifps)
+    image_sizes = ImageFileHandler.read_image_sizes(result_fps)
+
+    tasks = []
+    task_indices = []
+    for index, (image_ifp, image_size) in enumerate(
+        zip(result_fps, image_sizes)
+    ):
+        if image_size is not None and max(image_size) <= max_resolution:
+            continue
+        if not os.path.isfile(image_ifp):
+            continue
+        thumbnail_fp = get_thumbnail_fp(image_ifp, max_resolution, cache_dp)
+        if os.path.isfile(thumbnail_fp):
+            result_fps[index] = thumbnail_fp
+        else:
+            tasks.append((image_ifp, thumbnail_fp, max_resolution))
+            task_indices.append(index)
+
+    if len(tasks) == 0 or ImageFileHandler._import_pillow() is None:
+        return result_fps
+
+    if num_processes is None:
+        num_processes = os.cpu_count() or 1
+    num_processes = max(1, min(num_processes, len(tasks)))
+    thumbnail_fps = None
+    if num_processes > 1:
+        try:
+            # Use "spawn" to avoid forking the (multi-threaded) host process
+            with ProcessPoolExecutor(
+                max_workers=num_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                thumbnail_fps = list(
+                    executor.map(_create_thumbnail, tasks, chunksize=4)
+                )
+        except (OSError, BrokenProcessPool):
+            thumbnail_fps = None
+    if thumbnail_fps is None:
+        thumbnail_fps = [_create_thumbnail(task) for task in tasks]
+
+    for index, thumbnail_fp in zip(task_indices, thumbnail_fps):
+        if thumbnail_fp is not None:
+            result_fps[index] = thumbnail_fp
+    return result_fps
@@ -0,0 +1,152 @@
+import numpy as np
+
+VOXEL_REPRESENTATIVE_CENTROID = "CENTROID"
+VOXEL_REPRESENTATIVE_FIRST = "FIRST"
+
+
+def compute_voxel_indices(coords, voxel_size, origin=None):
+    """Return the integer (three-dimensional) voxel indices of coordinates.
+
+    The voxel grid is aligned with the coordinate axes and starts at
+    :code:`origin` (by default the minimum of the coordinates).
+    """
+    coords = np.asarray(coords, dtype=float)
+    assert voxel_size > 0
+    if origin is None:
+        origin = coords.min(axis=0)
+    return np.floor((coords - origin) / voxel_size).astype(np.int64)
+
+
+def compute_linear_voxel_keys(voxel_indices):
+    """Convert (N,3) voxel indices to a single int64 key per voxel.
+
+    Voxels with equal indices obtain equal keys, i.e. the keys can be used
+    for hash / sort based reductions.
+    """
+    voxel_indices = np.asarray(voxel_indices, dtype=np.int64)
+    voxel_indices = voxel_indices - voxel_indices.min(axis=0)
+    extent = voxel_indices.max(axis=0) + 1
+    # The product of the extents must fit into a signed 64 bit integer
+    if np.prod(extent.astype(float)) < 2**62:
+        return voxel_indices[:, 0] + extent[0] * (
+            voxel_indices[:, 1] + extent[1] * voxel_indices[:, 2]
+        )
+    # Fallback for extremely fine grids: enumerate the occupied voxels
+    _, keys = np.unique(voxel_indices, axis=0, return_inverse=True)
+    return keys.reshape(-1).astype(np.int64)
+
+
+def compute_voxel_assignment(coords, voxel_size):
+    """Assign each coordinate to a voxel of a regular grid.
+
+    Returns a tuple :code:`(voxel_ids, first_indices, counts)`. The entry
+    :code:`voxel_ids[i]` is the (consecutive) voxel id of coordinate
+    :code:`i`, :code:`first_indices[j]` the index of the first coordinate
+    (in input order) contained in voxel :code:`j` and :code:`counts[j]` the
+    number of coordinates in voxel :code:`j`.
+    """
+    keys = compute_linear_voxel_keys(compute_voxel_indices(coords, voxel_size))
+    # Using return_index=True causes numpy to use a stable sort, i.e.
+    # first_indices contains the first occurrence of each voxel.
+    _, first_indices, voxel_ids, counts = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True
+    )
+    return voxel_ids.reshape(-1), first_indices, counts
+
+
+def count_occupied_voxels(coords, voxel_size):
+    """Return the number of voxels that contain at least one coordinate."""
+    keys = compute_linear_voxel_keys(compute_voxel_indices(coords, voxel_size))
+    return len(np.unique(keys))
+
+
+def _compute_voxel_means(values, voxel_ids, counts):
+    values = np.asarray(values, dtype=float)
+    num_voxels = len(counts)
+    means = np.empty((num_voxels, values.shape[1]), dtype=float)
+    for dim in range(values.shape[1]):
+        means[:, dim] = np.bincount(
+            voxel_ids, weights=values[:, dim], minlength=num_voxels
+        )
+    means /= counts[:, np.newaxis]
+    return means
+
+
+def downsample_with_voxel_grid(
+    coords,
+    colors=None,
+    voxel_size=0.05,
+    representative=VOXEL_REPRESENTATIVE_CENTROID,
+):
+    """Reduce coordinates (and colors) to one entry per occupied voxel.
+
+    The parameter :code:`representative` defines the coordinate of each
+    voxel, i.e. the centroid of the contained coordinates
+    (:code:`VOXEL_REPRESENTATIVE_CENTROID`) or the first contained coordinate
+    (:code:`VOXEL_REPRESENTATIVE_FIRST`). Colors are always averaged.
+
+    Returns a tuple :code:`(coords, colors, first_indices)`, where
+    :code:`first_indices` refers to the first input element of each voxel
+    (useful to transfer ids or other per-point attributes). If no colors are
+    provided, the returned colors are :code:`None`.
+    """
+    coords = np.asarray(coords, dtype=float)
+    if len(coords) == 0:
+        return coords, colors, np.zeros(0, dtype=np.int64)
+
+    voxel_ids, first_indices, counts = compute_voxel_assignment(
+        coords, voxel_size
+    )
+    if representative == VOXEL_REPRESENTATIVE_CENTROID:
+        voxel_coords = _compute_voxel_means(coords, voxel_ids, counts)
+    elif representative == VOXEL_REPRESENTATIVE_FIRST:
+        voxel_coords = coords[first_indices]
+    else:
+        assert False, f"Invalid voxel representative: {representative}"
+
+    if colors is None:
+        voxel_colors = None
+    else:
+        voxel_colors = _compute_voxel_means(colors, voxel_ids, counts)
+    return voxel_coords, voxel_colors, first_indices
+
+
+def estimate_voxel_size_for_target_count(
+    coords, target_count, relative_tolerance=0.05, max_iterations=24
+):
+    """Estimate a voxel size that results in approximately target_count voxels.
+
+    The number of occupied voxels decreases (approximately) monotonically
+    with the voxel size. Thus, the voxel size is determined with a bisection
+    in logarithmic space.
+    """
+    coords = np.asarray(coords, dtype=float)
+    assert target_count > 0
+    if len(coords) <= target_count:
+        return None
+
+    bbox_extent = coords.max(axis=0) - coords.min(axis=0)
+    max_extent = float(bbox_extent.max())
+    if max_extent <= 0:
+        return None
+
+    # A voxel with the size of the largest extent contains all points
+    lower_log_size = np.log(max_extent / len(coords) ** (1.0 / 1.5) / 1024.0)
+    upper_log_size = np.log(max_extent * 1.01)
+
+    best_size = float(np.exp(upper_log_size))
+    best_count = 1
+    for _ in range(max_iterations):
+        log_size = 0.5 * (lower_log_size + upper_log_size)
+        size = float(np.exp(log_size))
+        count = count_occupied_voxels(coords, size)
+        if count <= target_count and count > best_count:
+            best_size = size
+            best_count = count
+        if abs(count - target_count) <= relative_tolerance * target_count:
+            break
+        if count > target_count:
+            lower_log_size = log_size
+        else:
+            upper_log_size = log_size
+    return best_size
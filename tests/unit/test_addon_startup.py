@@ -0,0 +1,47 @@
+"""Tests for the modules imported when enabling the addon."""
+
+import pytest
+
+from benchmarks.addon_startup import (
+    find_blender_executable,
+    get_deferred_startup_modules,
+    get_startup_modules,
+    measure_addon_startup,
+)
+
+
+def test_startup_modules():
+    startup_modules = get_startup_modules()
+    # Sanity check of the import analysis
+    assert "photogrammetry_importer.registration.registration" in (
+        startup_modules
+    )
+    assert "photogrammetry_importer.operators.colmap_import_op" in (
+        startup_modules
+    )
+    assert get_deferred_startup_modules(startup_modules) == []
+
+
+def test_deferred_startup_modules():
+    module_names = [
+        "photogrammetry_importer.file_handlers.colmap_file_handler",
+        "photogrammetry_importer.importers.camera_importer",
+        "photogrammetry_importer.opengl.handler_utility",
+        "photogrammetry_importer.opengl.utility",
+        "PIL.Image",
+    ]
+    assert get_deferred_startup_modules(module_names) == [
+        "photogrammetry_importer.file_handlers.colmap_file_handler",
+        "photogrammetry_importer.opengl.utility",
+        "PIL.Image",
+    ]
+
+
+@pytest.mark.skipif(
+    find_blender_executable() is None, reason="Blender is not available"
+)
+def test_blender_startup():
+    result = measure_addon_startup(find_blender_executable(), num_runs=3)
+    assert result["enabled"]
+    assert result["deferred_modules_loaded"] == []
+    assert result["time"] > 0
@@ -0,0 +1,174 @@
+"""Tests for the Blender-independent batch conversion."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from benchmarks import format_writers
+from benchmarks.synthetic_reconstruction import (
+    generate_synthetic_reconstruction,
+)
+from photogrammetry_importer.conversion.__main__ import main
+from photogrammetry_importer.conversion.batch_conversion import (
+    INPUT_FORMAT_COLMAP,
+    INPUT_FORMAT_INSTANT_NGP,
+    INPUT_FORMAT_NVM,
+    INPUT_FORMAT_OPEN3D,
+    INPUT_FORMAT_OPENMVG,
+    INPUT_FORMAT_OPENSFM,
+    OUTPUT_FORMAT_COLMAP,
+    OUTPUT_FORMAT_INSTANT_NGP,
+    OUTPUT_FORMAT_NVM,
+    ConversionOptions,
+    convert_reconstructions,
+    create_conversion_tasks,
+    detect_input_format,
+    read_reconstruction,
+)
+
+
+@pytest.fixture
+def reconstruction():
+    return generate_synthetic_reconstruction(num_cameras=5, num_points=40)
+
+
+def _get_sorted_centers(cameras):
+    cameras = sorted(cameras, key=lambda camera: camera.get_relative_fp())
+    return np.array([camera.get_camera_center() for camera in cameras])
+
+
+class TestDetectInputFormat:
+    def test_known_formats(self, reconstruction, temp_dir):
+        writers_and_formats = [
+            (format_writers.write_colmap_workspace, INPUT_FORMAT_COLMAP),
+            (format_writers.write_nvm_file, INPUT_FORMAT_NVM),
+            (format_writers.write_openmvg_file, INPUT_FORMAT_OPENMVG),
+            (format_writers.write_opensfm_file, INPUT_FORMAT_OPENSFM),
+            (format_writers.write_open3d_json_file, INPUT_FORMAT_OPEN3D),
+            (format_writers.write_instant_ngp_file, INPUT_FORMAT_INSTANT_NGP),
+        ]
+        for index, (writer, input_format) in enumerate(writers_and_formats):
+            input_path = writer(reconstruction, str(temp_dir / str(index)))
+            assert detect_input_format(input_path) == input_format
+
+    def test_json_content(self, temp_dir):
+        ifp = temp_dir / "poses.json"
+        ifp.write_text(json.dumps({"parameters": []}))
+        assert detect_input_format(str(ifp)) == INPUT_FORMAT_OPEN3D
+
+    def test_unknown_format(self, temp_dir):
+        assert detect_input_format(str(temp_dir)) is None
+        ifp = temp_dir / "notes.txt"
+        ifp.write_text("")
+        assert detect_input_format(str(ifp)) is None
+
+
+class TestBatchConversion:
+    def test_round_trip(self, reconstruction, temp_dir):
+        input_path = format_writers.write_colmap_workspace(
+            reconstruction, str(temp_dir / "workspace")
+        )
+        input_cameras, _ = read_reconstruction(input_path)
+        options = ConversionOptions(default_width=1920, default_height=1080)
+        input_path_of_format = input_path
+        for output_format in [OUTPUT_FORMAT_NVM, OUTPUT_FORMAT_COLMAP]:
+            tasks = create_conversion_tasks(
+                [input_path_of_format],
+                str(temp_dir / output_format),
+                output_format,
+                options=options,
+            )
+            (summary,) = convert_reconstructions(tasks, num_workers=0)
+            assert summary["error"] is None
+            assert summary["num_cameras"] == 5
+            assert summary["num_points"] == 40
+            input_path_of_format = summary["output_path"]
+
+        cameras, points = read_reconstruction(
+            input_path_of_format,
+            options=ConversionOptions(image_dp=str(temp_dir / "images")),
+        )
+        assert len(points) == 40
+        np.testing.assert_allclose(
+            _get_sorted_centers(cameras),
+            _get_sorted_centers(input_cameras),
+            atol=1e-4,
+        )
+
+    def test_process_pool(self, reconstruction, temp_dir):
+        input_paths = [
+            format_writers.write_openmvg_file(
+                reconstruction, str(temp_dir / "a")
+            ),
+            format_writers.write_openmvg_file(
+                reconstruction, str(temp_dir / "b")
+            ),
+            str(temp_dir / "missing.nvm"),
+        ]
+        tasks = create_conversion_tasks(
+            input_paths, str(temp_dir / "output"), OUTPUT_FORMAT_INSTANT_NGP
+        )
+        output_paths = [task.output_path for task in tasks]
+        assert len(set(output_paths)) == 3
+
+        summaries = list(convert_reconstructions(tasks, num_workers=2))
+        errors = {
+            summary["input_path"]: summary["error"] for summary in summaries
+        }
+        assert errors[input_paths[0]] is None
+        assert errors[input_paths[1]] is None
+        assert errors[input_paths[2]] is not None
+
+    def test_does_not_import_blender_modules(self):
+        # Fail on any attempt to import a Blender module (the addon package
+        # itself tries to import bpy)
+        code = "\n".join(
+            [
+                "import sys",
+                "import photogrammetry_importer",
+                "class Finder:",
+                "    def find_spec(self, name, path, target=None):",
+                "        assert name.split('.')[0] not in BLENDER_MODULES",
+                "BLENDER_MODULES = ['bpy', 'bmesh', 'gpu', 'mathutils']",
+                "sys.meta_path.insert(0, Finder())",
+                "import photogrammetry_importer.conversion.__main__",
+            ]
+        )
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[2],
+            check=True,
+        )
+
+    def test_main(self, reconstruction, temp_dir):
+        input_path = format_writers.write_nvm_file(
+            reconstruction, str(temp_dir)
+        )
+        summary_ofp = temp_dir / "summary.json"
+        exit_code = main(
+            [
+                input_path,
+                "--output-format",
+                "colmap",
+                "--output-dp",
+                str(temp_dir / "output"),
+                "--default-width",
+                "1920",
+                "--default-height",
+                "1080",
+                "--num-workers",
+                "0",
+                "--summary",
+                str(summary_ofp),
+            ]
+        )
+        assert exit_code == 0
+        (summary,) = json.loads(summary_ofp.read_text())
+        assert summary["num_cameras"] == 5
+        assert (
+            temp_dir / "output" / "reconstruction" / "cameras.txt"
+        ).exists()
@@ -0,0 +1,128 @@
+"""Tests for the synthetic reconstructions and the benchmark suite."""
+
+import numpy as np
+import pytest
+
+from benchmarks import format_writers
+from benchmarks.suite import (
+    compare_with_baselines,
+    get_benchmark_cases,
+    run_benchmark_case,
+)
+from benchmarks.synthetic_reconstruction import (
+    generate_synthetic_reconstruction,
+)
+from photogrammetry_importer.file_handlers.colmap_file_handler import (
+    ColmapFileHandler,
+)
+from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
+    VisualSfMFileHandler,
+)
+from photogrammetry_importer.types.camera import Camera
+
+
+@pytest.fixture
+def reconstruction():
+    return generate_synthetic_reconstruction(
+        num_cameras=6,
+        num_points=50,
+        mean_track_length=3,
+        num_intrinsics=2,
+        depth_map_size=(8, 6),
+    )
+
+
+def _get_case(name):
+    return next(case for case in get_benchmark_cases() if case.name == name)
+
+
+class TestSyntheticReconstruction:
+    def test_tracks(self, reconstruction):
+        track_lengths = reconstruction.get_track_lengths()
+        assert len(track_lengths) == 50
+        assert np.all(track_lengths >= 2)
+        assert track_lengths.sum() == reconstruction.get_num_observations()
+
+    def test_observations_project_into_images(self, reconstruction):
+        _, camera_indices, feature_indices, pixel_coords = (
+            reconstruction.get_observations()
+        )
+        assert np.all(pixel_coords[:, 0] > 0)
+        assert np.all(pixel_coords[:, 0] < reconstruction.width)
+        assert np.all(pixel_coords[:, 1] > 0)
+        assert np.all(pixel_coords[:, 1] < reconstruction.height)
+        for camera_index in range(reconstruction.get_num_cameras()):
+            camera_features = feature_indices[camera_indices == camera_index]
+            assert sorted(camera_features) == list(range(len(camera_features)))
+
+
+class TestFormatRoundTrips:
+    @pytest.mark.parametrize("ext", [".bin", ".txt"])
+    def test_colmap(self, reconstruction, temp_dir, ext):
+        idp = format_writers.write_colmap_workspace(
+            reconstruction, str(temp_dir), ext=ext
+        )
+        cameras, points, _ = ColmapFileHandler.parse_colmap_folder(
+            idp,
+            use_workspace_images=False,
+            image_dp=str(temp_dir / "images"),
+            image_fp_type=Camera.IMAGE_FP_TYPE_NAME,
+            suppress_distortion_warnings=True,
+        )
+        assert len(points) == reconstruction.get_num_points()
+        cameras = sorted(cameras, key=lambda camera: camera._relative_fp)
+        centers = np.array([camera.get_camera_center() for camera in cameras])
+        np.testing.assert_allclose(centers, reconstruction.centers, atol=1e-6)
+        depth_map = cameras[0].get_depth_map()
+        np.testing.assert_allclose(
+            depth_map, reconstruction.compute_depth_map(0)
+        )
+
+    def test_nvm(self, reconstruction, temp_dir):
+        ifp = format_writers.write_nvm_file(reconstruction, str(temp_dir))
+        cameras, points = VisualSfMFileHandler.parse_visualsfm_file(
+            ifp, str(temp_dir / "images"), Camera.IMAGE_FP_TYPE_NAME, True
+        )
+        assert len(points) == reconstruction.get_num_points()
+        centers = np.array([camera.get_camera_center() for camera in cameras])
+        np.testing.assert_allclose(centers, reconstruction.centers, atol=1e-4)
+
+    @pytest.mark.parametrize(
+        "case_name",
+        [
+            "parse_meshroom_sfm",
+            "parse_opensfm",
+            "parse_openmvg",
+            "parse_open3d_json",
+            "parse_open3d_log",
+            "parse_instant_ngp",
+        ],
+    )
+    def test_camera_counts(self, reconstruction, temp_dir, case_name):
+        case = _get_case(case_name)
+        result = case.run(case.write_input(reconstruction, str(temp_dir)))
+        cameras = result[0] if isinstance(result, tuple) else result
+        assert len(cameras) == reconstruction.get_num_cameras()
+
+
+class TestSuite:
+    def test_run_benchmark_case(self, reconstruction, temp_dir):
+        result = run_benchmark_case(
+            _get_case("parse_nvm"), reconstruction, str(temp_dir), 1
+        )
+        assert result["num_items"] == reconstruction.get_num_points()
+        assert result["wall_time"] > 0
+        assert result["megabytes_per_second"] > 0
+        assert result["peak_memory"] > 0
+
+    def test_compare_with_baselines(self):
+        baselines = {
+            "results": {"a": {"wall_time": 1.0}, "b": {"wall_time": 1.0}}
+        }
+        results = [
+            {"name": "a", "wall_time": 1.1},
+            {"name": "b", "wall_time": 2.0},
+            {"name": "c", "wall_time": 5.0},
+        ]
+        regressions = compare_with_baselines(results, baselines, 1.25)
+        assert [regression[0] for regression in regressions] == ["b"]
@@ -0,0 +1,230 @@
+import json
+
+import numpy as np
+
+from photogrammetry_importer.file_handlers.instant_ngp_file_handler import (
+    InstantNGPFileHandler,
+)
+from photogrammetry_importer.file_handlers.open3D_file_handler import (
+    Open3DFileHandler,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_batch import CameraBatch
+from photogrammetry_importer.utility.np_utility import invert_y_and_z_axis
+from photogrammetry_importer.utility.quaternion_utility import (
+    quaternions_to_rotation_matrices,
+)
+
+
+def _create_cameras(num_cameras, seed=0):
+    rng = np.random.default_rng(seed)
+    quaternions = rng.normal(size=(num_cameras, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    translation_vecs = rng.normal(size=(num_cameras, 3))
+    cameras = []
+    for index in range(num_cameras):
+        camera = Camera()
+        camera.id = index
+        camera.set_rotation_with_quaternion(quaternions[index])
+        camera.set_camera_translation_vector_after_rotation(
+            translation_vecs[index]
+        )
+        # Two different intrinsics
+        focal_length = 1000 + 100 * (index % 2)
+        camera.set_calibration(
+            np.array(
+                [[focal_length, 0, 320], [0, focal_length, 240], [0, 0, 1]]
+            ),
+            radial_distortion=0,
+        )
+        camera.width = 640
+        camera.height = 480
+        camera._relative_fp = f"image_{index}.jpg"
+        cameras.append(camera)
+    return cameras
+
+
+def test_from_world_to_cam_matches_camera():
+    cameras = _create_cameras(10)
+    quaternions = np.array(
+        [cam.get_rotation_as_quaternion() for cam in cameras]
+    )
+    batch = CameraBatch.from_world_to_cam(
+        quaternions_to_rotation_matrices(quaternions),
+        [cam.get_translation_vec() for cam in cameras],
+        calibration_mats=[cam.get_calibration_mat() for cam in cameras],
+        widths=[cam.width for cam in cameras],
+        heights=[cam.height for cam in cameras],
+    )
+    for camera, batch_camera in zip(cameras, batch.to_cameras()):
+        np.testing.assert_allclose(
+            batch_camera.get_rotation_as_rotation_mat(),
+            camera.get_rotation_as_rotation_mat(),
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(
+            batch_camera.get_camera_center(),
+            camera.get_camera_center(),
+            atol=1e-12,
+        )
+
+
+def test_from_cameras_shares_intrinsics():
+    cameras = _create_cameras(10)
+    batch = CameraBatch.from_cameras(cameras)
+    assert len(batch) == 10
+    assert len(batch.calibration_mats) == 2
+    np.testing.assert_allclose(
+        batch.get_focal_lengths(),
+        [cam.get_calibration_mat()[0][0] for cam in cameras],
+    )
+    for camera, batch_camera in zip(cameras, batch.to_cameras()):
+        assert batch_camera.id == camera.id
+        assert batch_camera._relative_fp == camera._relative_fp
+        np.testing.assert_allclose(
+            batch_camera.get_translation_vec(), camera.get_translation_vec()
+        )
+        np.testing.assert_allclose(
+            batch_camera.get_calibration_mat(), camera.get_calibration_mat()
+        )
+    # Modifying the principal point of a camera must not affect the batch
+    batch_camera = batch.to_cameras()[0]
+    batch_camera.set_principal_point([0, 0])
+    assert batch.calibration_mats[0][0][2] == 320
+
+
+def test_compute_matrix_worlds():
+    cameras = _create_cameras(5)
+    batch = CameraBatch.from_cameras(cameras)
+    matrix_worlds = batch.compute_matrix_worlds()
+    for camera, matrix_world in zip(cameras, matrix_worlds):
+        rotation_mat = invert_y_and_z_axis(
+            camera.get_rotation_as_rotation_mat()
+        )
+        np.testing.assert_allclose(
+            matrix_world[0:3, 0:3], rotation_mat.T, atol=1e-12
+        )
+        np.testing.assert_allclose(
+            matrix_world[0:3, 3], camera.get_camera_center(), atol=1e-12
+        )
+
+
+def test_compute_frustum_corners():
+    cameras = _create_cameras(3)
+    batch = CameraBatch.from_cameras(cameras)
+    corners = batch.compute_frustum_corners(distance=2.0)
+    assert corners.shape == (3, 4, 3)
+    for camera, camera_corners in zip(cameras, corners):
+        rotation_mat = camera.get_rotation_as_rotation_mat()
+        cam_coords = (
+            camera_corners - camera.get_camera_center()
+        ) @ rotation_mat.T
+        # All corners lie on the plane z = 2 in camera coordinates
+        np.testing.assert_allclose(cam_coords[:, 2], 2.0)
+        pixel_coords = cam_coords @ camera.get_calibration_mat().T
+        pixel_coords = pixel_coords[:, 0:2] / pixel_coords[:, 2:3]
+        np.testing.assert_allclose(
+            pixel_coords, [[0, 0], [640, 0], [640, 480], [0, 480]], atol=1e-9
+        )
+
+
+def test_parse_instant_ngp_json_file(temp_dir):
+    width, height, focal_length = 640, 480, 500.0
+    transform_mats = []
+    rng = np.random.default_rng(1)
+    rotation_mats = quaternions_to_rotation_matrices(rng.normal(size=(4, 4)))
+    for index, rotation_mat in enumerate(rotation_mats):
+        transform_mat = np.eye(4)
+        transform_mat[0:3, 0:3] = rotation_mat
+        transform_mat[0:3, 3] = [index, 0, 1]
+        transform_mats.append(transform_mat)
+    json_data = {
+        "w": width,
+        "h": height,
+        "fl_x": focal_length,
+        "fl_y": focal_length,
+        "cx": width / 2,
+        "cy": height / 2,
+        "camera_angle_x": np.arctan(width / (focal_length * 2)) * 2,
+        "camera_angle_y": np.arctan(height / (focal_length * 2)) * 2,
+        "frames": [
+            {
+                "file_path": f"image_{index}.jpg",
+                "transform_matrix": transform_mat.tolist(),
+            }
+            for index, transform_mat in enumerate(transform_mats)
+        ],
+    }
+    json_ifp = str(temp_dir / "transforms.json")
+    with open(json_ifp, "w") as json_file:
+        json.dump(json_data, json_file)
+
+    cameras = InstantNGPFileHandler.parse_instant_ngp_json_file(
+        json_ifp, str(temp_dir), Camera.IMAGE_FP_TYPE_NAME
+    )
+    assert len(cameras) == 4
+    for index, (camera, transform_mat) in enumerate(
+        zip(cameras, transform_mats)
+    ):
+        assert camera._relative_fp == f"image_{index}.jpg"
+        assert camera.width == width
+        np.testing.assert_allclose(camera.get_camera_center(), [index, 0, 1])
+        np.testing.assert_allclose(
+            camera.get_rotation_as_rotation_mat(),
+            invert_y_and_z_axis(transform_mat[0:3, 0:3].T),
+        )
+
+
+def _write_open3d_log_file(log_ofp, cam_to_world_mats):
+    with open(log_ofp, "w") as log_file:
+        for index, cam_to_world_mat in enumerate(cam_to_world_mats):
+            log_file.write(f"{index} {index} {index + 1}\n")
+            for row in cam_to_world_mat:
+                log_file.write(
+                    " ".join(repr(float(value)) for value in row) + "\n"
+                )
+
+
+def test_parse_open3d_log_file(temp_dir):
+    cameras = _create_cameras(20)
+    cam_to_world_mats = [cam.get_4x4_cam_to_world_mat() for cam in cameras]
+    log_ifp = str(temp_dir / "trajectory.log")
+    _write_open3d_log_file(log_ifp, cam_to_world_mats)
+
+    parsed_cameras = Open3DFileHandler.parse_open3d_file(
+        log_ifp, str(temp_dir), Camera.IMAGE_FP_TYPE_NAME, None
+    )
+    assert len(parsed_cameras) == 20
+    for parsed_camera, cam_to_world_mat in zip(
+        parsed_cameras, cam_to_world_mats
+    ):
+        np.testing.assert_allclose(
+            parsed_camera.get_4x4_cam_to_world_mat(),
+            cam_to_world_mat,
+            atol=1e-12,
+        )
+
+
+def test_parse_empty_open3d_log_file(temp_dir):
+    log_ifp = str(temp_dir / "trajectory.log")
+    _write_open3d_log_file(log_ifp, [])
+    assert (
+        Open3DFileHandler.parse_open3d_file(
+            log_ifp, str(temp_dir), Camera.IMAGE_FP_TYPE_NAME, None
+        )
+        == []
+    )
+
+
+def test_set_4x4_cam_to_world_mats_accepts_3x4_matrices():
+    cameras = _create_cameras(3)
+    cam_to_world_mats = [cam.get_4x4_cam_to_world_mat() for cam in cameras]
+    new_cameras = [Camera() for _ in cameras]
+    Camera.set_4x4_cam_to_world_mats(
+        new_cameras, [mat[0:3] for mat in cam_to_world_mats]
+    )
+    for new_camera, cam_to_world_mat in zip(new_cameras, cam_to_world_mats):
+        np.testing.assert_allclose(
+            new_camera.get_4x4_cam_to_world_mat(), cam_to_world_mat
+        )
+    Camera.set_4x4_cam_to_world_mats([], np.empty((0, 4, 4)))
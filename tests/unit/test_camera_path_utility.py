@@ -0,0 +1,81 @@
+import numpy as np
+
+from photogrammetry_importer.utility.camera_path_utility import (
+    compute_camera_path,
+    interpolate_positions,
+    interpolate_rotations,
+    slerp,
+)
+
+
+def _axis_angle_quaternions(angles, axis=(0.0, 0.0, 1.0)):
+    axis = np.asarray(axis) / np.linalg.norm(axis)
+    quaternions = np.empty((len(angles), 4))
+    quaternions[:, 0] = np.cos(np.asarray(angles) / 2)
+    quaternions[:, 1:] = np.sin(np.asarray(angles) / 2)[:, np.newaxis] * axis
+    return quaternions
+
+
+def test_slerp_has_constant_angular_velocity():
+    q0, q1 = _axis_angle_quaternions([0.0, np.pi / 2])
+    t = np.linspace(0.0, 1.0, 5)
+    result = slerp(np.tile(q0, (5, 1)), np.tile(q1, (5, 1)), t)
+    expected = _axis_angle_quaternions(t * np.pi / 2)
+    assert np.allclose(result, expected)
+    # The shortest path is used, even if the signs differ
+    result = slerp(np.tile(q0, (5, 1)), np.tile(-q1, (5, 1)), t)
+    assert np.allclose(result, expected)
+
+
+def test_interpolation_passes_through_key_poses():
+    key_times = np.array([0.0, 3.0, 5.0, 9.0])
+    positions = np.array(
+        [[0.0, 0.0, 0.0], [1.0, 2.0, 0.0], [2.0, 1.0, 1.0], [4.0, 0.0, 0.0]]
+    )
+    quaternions = _axis_angle_quaternions([0.0, 0.4, 1.0, 1.2])
+    for interpolation in ["LINEAR", "CATMULL_ROM"]:
+        result = interpolate_positions(
+            key_times, positions, key_times, interpolation
+        )
+        assert np.allclose(result, positions)
+    for interpolation in ["SLERP", "SQUAD"]:
+        result = interpolate_rotations(
+            key_times, quaternions, key_times, interpolation
+        )
+        assert np.allclose(result, quaternions)
+        # Rotations around a single axis are interpolated monotonically
+        dense = interpolate_rotations(
+            key_times, quaternions, np.arange(10), interpolation
+        )
+        angles = 2 * np.arctan2(dense[:, 3], dense[:, 0])
+        assert np.all(np.diff(angles) > 0)
+
+
+def test_compute_camera_path_with_smoothing():
+    num_keys = 200
+    key_times = np.arange(num_keys) * 4.0
+    rng = np.random.default_rng(0)
+    smooth_positions = np.stack(
+        [np.sin(key_times / 500), np.cos(key_times / 500), key_times / 1000],
+        axis=1,
+    )
+    noisy_positions = smooth_positions + rng.normal(
+        scale=0.01, size=smooth_positions.shape
+    )
+    quaternions = _axis_angle_quaternions(key_times / 100)
+    sample_times = np.arange(key_times[0], key_times[-1] + 1)
+    positions, sample_quaternions = compute_camera_path(
+        key_times,
+        noisy_positions,
+        quaternions,
+        sample_times,
+        position_interpolation="CATMULL_ROM",
+        rotation_interpolation="SQUAD",
+        smoothing_sigma=2.0,
+    )
+    assert positions.shape == (len(sample_times), 3)
+    assert sample_quaternions.shape == (len(sample_times), 4)
+    assert np.allclose(np.linalg.norm(sample_quaternions, axis=1), 1.0)
+    noisy_error = np.abs(noisy_positions - smooth_positions).mean()
+    smoothed_error = np.abs(positions[::4] - smooth_positions)[5:-5].mean()
+    assert smoothed_error < 0.5 * noisy_error
@@ -0,0 +1,71 @@
+import numpy as np
+
+from photogrammetry_importer.ext.read_write_model import (
+    Point3D as ColmapPoint3D,
+)
+from photogrammetry_importer.file_handlers.colmap_file_handler import (
+    ColmapFileHandler,
+)
+
+
+def _create_colmap_points():
+    id_to_col_points3D = {}
+    for idx, (error, track_length) in enumerate(
+        [(0.5, 2), (3.0, 5), (1.0, 4), (0.1, 1)]
+    ):
+        id_to_col_points3D[idx] = ColmapPoint3D(
+            id=idx,
+            xyz=np.array([idx, 0.0, 0.0]),
+            rgb=np.array([255, 0, 0]),
+            error=error,
+            image_ids=np.arange(track_length),
+            point2D_idxs=np.arange(track_length),
+        )
+    return id_to_col_points3D
+
+
+def test_convert_points_keeps_track_scalars():
+    points = ColmapFileHandler._convert_points(_create_colmap_points())
+    assert [point.id for point in points] == [0, 1, 2, 3]
+    assert points[1].scalars == {
+        "track_length": 5,
+        "reprojection_error": 3.0,
+    }
+
+
+def test_convert_points_filters_by_track_length_and_error():
+    points = ColmapFileHandler._convert_points(
+        _create_colmap_points(),
+        min_track_length=2,
+        max_reprojection_error=1.0,
+    )
+    assert [point.id for point in points] == [0, 2]
+
+
+def test_parse_colmap_model_folder_with_filter(sample_colmap_model_dir):
+    _, points = ColmapFileHandler.parse_colmap_model_folder(
+        str(sample_colmap_model_dir), "", "NAME"
+    )
+    assert len(points) == 1
+    assert points[0].scalars["track_length"] == 1
+    _, points = ColmapFileHandler.parse_colmap_model_folder(
+        str(sample_colmap_model_dir), "", "NAME", min_track_length=2
+    )
+    assert len(points) == 0
+
+
+def test_parse_colmap_model_folder_with_visibility_index(
+    sample_colmap_model_dir,
+):
+    (sample_colmap_model_dir / "images.txt").write_text(
+        "1 0.7071 0 0.7071 0 1 2 3 1 image_001.jpg\n"
+        "10.0 20.0 1 30.0 40.0 -1\n"
+    )
+    _, _, index = ColmapFileHandler.parse_colmap_model_folder(
+        str(sample_colmap_model_dir),
+        "",
+        "NAME",
+        return_visibility_index=True,
+    )
+    assert index.get_num_cameras() == 1
+    assert list(index.get_point_ids_of_camera(0)) == [1]
@@ -0,0 +1,98 @@
+import threading
+from unittest import mock
+
+from photogrammetry_importer.utility import dependency_utility
+from photogrammetry_importer.utility.dependency_utility import (
+    DependencyStatus,
+    get_package_info,
+    probe_dependencies_in_background,
+)
+
+
+def test_get_package_info():
+    version_str, location_str = get_package_info("pytest")
+    assert version_str is not None
+    assert location_str.endswith("pytest")
+    assert get_package_info("not-an-installed-package") == (None, None)
+
+
+def test_status_is_cached_until_invalidated():
+    status = DependencyStatus("Pytest", "pytest", "pytest")
+    assert not status.is_probed()
+    with mock.patch.object(
+        dependency_utility,
+        "get_package_info",
+        wraps=dependency_utility.get_package_info,
+    ) as get_package_info_mock:
+        assert status.installation_status
+        assert status.get_package_info()[0] is not None
+        assert status.installation_status
+        assert get_package_info_mock.call_count == 1
+
+        status.invalidate()
+        assert not status.is_probed()
+        assert status.installation_status
+        assert get_package_info_mock.call_count == 2
+
+
+def test_removed_status_keeps_package_info():
+    status = DependencyStatus("Pytest", "pytest", "pytest")
+    version_str, _ = status.get_package_info()
+    status.installation_status = False
+    assert not status.installation_status
+    assert status.get_package_info()[0] == version_str
+
+
+def test_probe_in_background():
+    statuses = [
+        DependencyStatus("Pytest", "pytest", "pytest"),
+        DependencyStatus("Missing", "not-a-package", "not_a_package"),
+    ]
+    probe_dependencies_in_background(statuses).join()
+    assert all(status.is_probed() for status in statuses)
+    assert statuses[0].installation_status
+    assert not statuses[1].installation_status
+    assert statuses[1].get_package_info() == (None, None)
+
+
+def test_get_package_info_with_broken_metadata():
+    distribution = mock.Mock()
+    distribution.metadata = {"Name": None}
+    with mock.patch(
+        "importlib.metadata.distribution", return_value=distribution
+    ):
+        assert get_package_info("broken") == (None, None)
+
+
+def test_failing_probe_sets_not_installed():
+    status = DependencyStatus("Pytest", "pytest", "pytest")
+    with mock.patch(
+        "importlib.util.find_spec", side_effect=ValueError("broken")
+    ):
+        probe_dependencies_in_background([status]).join()
+    assert status.is_probed()
+    assert not status.installation_status
+    assert status.get_package_info() == (None, None)
+
+
+def test_invalidate_drops_result_of_running_probe():
+    status = DependencyStatus("Pytest", "pytest", "pytest")
+    probe_started = threading.Event()
+    continue_probe = threading.Event()
+    find_spec_results = [None, object()]
+
+    def find_spec(name):
+        # The first (stale) probe reports a missing package
+        if len(find_spec_results) == 2:
+            probe_started.set()
+            continue_probe.wait(10)
+        return find_spec_results.pop(0)
+
+    with mock.patch("importlib.util.find_spec", side_effect=find_spec):
+        thread = probe_dependencies_in_background([status])
+        assert probe_started.wait(10)
+        status.invalidate()
+        continue_probe.set()
+        thread.join()
+    assert status.is_probed()
+    assert status.installation_status
@@ -0,0 +1,129 @@
+import os
+import struct
+
+import pytest
+
+from photogrammetry_importer.file_handlers.image_file_handler import (
+    ImageFileHandler,
+)
+
+
+@pytest.fixture
+def image_size_cache_fp(temp_dir, monkeypatch):
+    cache_fp = str(temp_dir / "cache" / "image_size_cache.json")
+    monkeypatch.setattr(ImageFileHandler, "image_size_cache_fp", cache_fp)
+    monkeypatch.setattr(ImageFileHandler, "_image_size_cache", None)
+    return cache_fp
+
+
+def _write_png(ofp, width, height):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    with open(ofp, "wb") as png_file:
+        png_file.write(b"\x89PNG\r\n\x1a\n")
+        png_file.write(struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr)
+        png_file.write(b"\x00" * 12)
+
+
+def _write_jpeg(ofp, width, height):
+    app0 = b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    sof0 = struct.pack(">BHHB", 8, height, width, 3) + b"\x00" * 9
+    with open(ofp, "wb") as jpeg_file:
+        jpeg_file.write(b"\xff\xd8")
+        jpeg_file.write(b"\xff\xe0" + struct.pack(">H", len(app0) + 2) + app0)
+        jpeg_file.write(b"\xff\xc0" + struct.pack(">H", len(sof0) + 2) + sof0)
+        jpeg_file.write(b"\xff\xd9")
+
+
+def _write_tiff(ofp, width, height):
+    entries = [(256, 4, 1, width), (257, 3, 1, height)]
+    with open(ofp, "wb") as tiff_file:
+        tiff_file.write(b"II*\x00" + struct.pack("<I", 8))
+        tiff_file.write(struct.pack("<H", len(entries)))
+        for tag, field_type, count, value in entries:
+            if field_type == 3:
+                value_bytes = struct.pack("<HH", value, 0)
+            else:
+                value_bytes = struct.pack("<I", value)
+            tiff_file.write(
+                struct.pack("<HHI", tag, field_type, count) + value_bytes
+            )
+        tiff_file.write(struct.pack("<I", 0))
+
+
+def _write_exr(ofp, width, height):
+    def attribute(name, attribute_type, value):
+        return (
+            name
+            + b"\x00"
+            + attribute_type
+            + b"\x00"
+            + struct.pack("<i", len(value))
+            + value
+        )
+
+    with open(ofp, "wb") as exr_file:
+        exr_file.write(b"\x76\x2f\x31\x01" + struct.pack("<I", 2))
+        exr_file.write(attribute(b"compression", b"compression", b"\x00"))
+        exr_file.write(
+            attribute(
+                b"dataWindow",
+                b"box2i",
+                struct.pack("<iiii", 0, 0, width - 1, height - 1),
+            )
+        )
+        exr_file.write(b"\x00")
+
+
+def test_read_image_size_from_header(temp_dir):
+    for ext, write_func in [
+        ("png", _write_png),
+        ("jpg", _write_jpeg),
+        ("tif", _write_tiff),
+        ("exr", _write_exr),
+    ]:
+        ifp = str(temp_dir / f"image.{ext}")
+        write_func(ifp, 640, 480)
+        assert ImageFileHandler.read_image_size_from_header(ifp) == (640, 480)
+
+
+def test_read_image_sizes_in_parallel(temp_dir, image_size_cache_fp):
+    ifps = []
+    for idx in range(20):
+        ifp = str(temp_dir / f"image_{idx}.png")
+        _write_png(ifp, 100 + idx, 50)
+        ifps.append(ifp)
+    missing_ifp = str(temp_dir / "missing.png")
+    sizes = ImageFileHandler.read_image_sizes(
+        ifps + [missing_ifp], num_threads=4
+    )
+    assert sizes[:-1] == [(100 + idx, 50) for idx in range(20)]
+    assert sizes[-1] is None
+    assert os.path.isfile(image_size_cache_fp)
+
+
+def test_image_size_cache_uses_size_and_mtime(temp_dir, image_size_cache_fp):
+    ifp = str(temp_dir / "image.png")
+    _write_png(ifp, 640, 480)
+    stat_result = os.stat(ifp)
+    assert ImageFileHandler.read_image_sizes([ifp]) == [(640, 480)]
+
+    # Same file size and modification time: the cached value is returned
+    _write_png(ifp, 320, 240)
+    os.utime(ifp, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    ImageFileHandler._image_size_cache = None
+    assert ImageFileHandler.read_image_sizes([ifp]) == [(640, 480)]
+
+    # A modified file is probed again
+    os.utime(ifp, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10))
+    assert ImageFileHandler.read_image_sizes([ifp]) == [(320, 240)]
+
+
+def test_read_image_size_with_default_values(temp_dir, image_size_cache_fp):
+    missing_ifp = str(temp_dir / "missing.png")
+    assert ImageFileHandler.read_image_size(missing_ifp, 10, 20) == (
+        True,
+        10,
+        20,
+    )
+    success, _, _ = ImageFileHandler.read_image_size(missing_ifp, 0, 0)
+    assert not success
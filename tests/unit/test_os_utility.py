@@ -0,0 +1,112 @@
+import os
+
+from photogrammetry_importer.utility.os_utility import (
+    clear_file_listing_cache,
+    get_file_paths_in_dir,
+    get_image_file_paths_in_dir,
+    get_subdirs,
+    iter_file_paths_in_dir,
+    link_or_copy_files,
+)
+
+
+def _create_files(idp, rel_fps):
+    for rel_fp in rel_fps:
+        fp = idp / rel_fp
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fp.write_text("")
+
+
+def test_get_file_paths_in_dir_recursive_with_ext(temp_dir):
+    _create_files(temp_dir, ["a.jpg", "b.txt", "sub/c.JPG", "sub/d/e.png"])
+    assert get_file_paths_in_dir(
+        str(temp_dir), ext=".jpg", relative_path_only=True, recursive=True
+    ) == ["a.jpg", "sub/c.JPG"]
+    assert get_file_paths_in_dir(str(temp_dir), base_name_only=True) == [
+        "a.jpg",
+        "b.txt",
+    ]
+
+
+def test_image_file_listing_cache_is_invalidated(temp_dir):
+    clear_file_listing_cache()
+    _create_files(temp_dir, ["1.jpg", "sub/2.png", "notes.txt"])
+    first = get_image_file_paths_in_dir(str(temp_dir), base_name_only=True)
+    assert first == ["1.jpg", "2.png"]
+    assert (
+        get_image_file_paths_in_dir(str(temp_dir), base_name_only=True)
+        == first
+    )
+    # Adding a file modifies the corresponding (sub) directory
+    _create_files(temp_dir, ["sub/3.exr"])
+    assert get_image_file_paths_in_dir(str(temp_dir), base_name_only=True) == [
+        "1.jpg",
+        "2.png",
+        "3.exr",
+    ]
+
+
+def test_link_or_copy_files_is_incremental(temp_dir):
+    src_fps = []
+    dst_fps = []
+    (temp_dir / "dst").mkdir()
+    for idx in range(10):
+        src_fp = temp_dir / f"{idx}.exr"
+        src_fp.write_text(str(idx))
+        src_fps.append(str(src_fp))
+        dst_fps.append(str(temp_dir / "dst" / f"frame_{idx}.exr"))
+
+    counts = link_or_copy_files(src_fps, dst_fps, allow_links=False)
+    assert counts["COPIED"] == 10
+    assert (temp_dir / "dst" / "frame_3.exr").read_text() == "3"
+    counts = link_or_copy_files(src_fps, dst_fps, allow_links=False)
+    assert counts["SKIPPED"] == 10
+
+    # Modified sources are copied again
+    (temp_dir / "5.exr").write_text("modified")
+    counts = link_or_copy_files(src_fps, dst_fps, allow_links=False)
+    assert counts["COPIED"] == 1 and counts["SKIPPED"] == 9
+    assert (temp_dir / "dst" / "frame_5.exr").read_text() == "modified"
+
+
+def test_link_or_copy_files_prefers_links(temp_dir):
+    src_fp = temp_dir / "image.exr"
+    src_fp.write_text("data")
+    dst_fp = str(temp_dir / "linked.exr")
+    counts = link_or_copy_files([str(src_fp)], [dst_fp])
+    assert counts["HARDLINKED"] + counts["SYMLINKED"] == 1
+    assert os.path.samefile(str(src_fp), dst_fp)
+    counts = link_or_copy_files([str(src_fp)], [dst_fp])
+    assert counts["SKIPPED"] == 1
+
+
+def test_iter_file_paths_in_dir_applies_all_filters(temp_dir):
+    _create_files(
+        temp_dir,
+        ["img_10.jpg", "img_9.jpg", "img_2_mask.jpg", "sub/img_1.jpg"],
+    )
+    paths = iter_file_paths_in_dir(
+        str(temp_dir),
+        ext=[".jpg"],
+        target_str_or_list="img",
+        ignore_str_or_list=["mask"],
+        relative_path_only=True,
+        without_ext=True,
+        recursive=True,
+    )
+    assert sorted(paths) == ["img_10", "img_9", "sub/img_1"]
+    assert get_file_paths_in_dir(
+        str(temp_dir), ext=".jpg", base_name_only=True, natural_sorting=True
+    ) == ["img_2_mask.jpg", "img_9.jpg", "img_10.jpg"]
+
+
+def test_get_subdirs(temp_dir):
+    _create_files(temp_dir, ["view_10/a", "view_2/b", "view_2/nested/c"])
+    assert get_subdirs(
+        str(temp_dir), base_name_only=True, natural_sorting=True
+    ) == ["view_2", "view_10"]
+    assert get_subdirs(str(temp_dir), recursive=True) == [
+        str(temp_dir / "view_10"),
+        str(temp_dir / "view_2"),
+        str(temp_dir / "view_2" / "nested"),
+    ]
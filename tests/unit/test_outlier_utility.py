@@ -0,0 +1,47 @@
+import numpy as np
+
+from photogrammetry_importer.types.spatial_index import SpatialIndex
+from photogrammetry_importer.utility.outlier_utility import (
+    compute_radius_inlier_mask,
+    compute_statistical_inlier_mask,
+)
+
+
+def _create_cloud_with_outliers():
+    rng = np.random.default_rng(0)
+    inliers = rng.normal(0.0, 1.0, size=(5000, 3))
+    outliers = rng.uniform(20.0, 40.0, size=(20, 3))
+    return np.concatenate([inliers, outliers]), len(inliers)
+
+
+def test_mean_knn_distances_match_brute_force():
+    rng = np.random.default_rng(1)
+    coords = rng.uniform(0.0, 1.0, size=(800, 3))
+    coords[:5] += 10.0
+    k = 6
+    index = SpatialIndex(coords)
+    for num_threads in [1, 4]:
+        mean_dists = index.compute_mean_knn_distances(k, num_threads)
+        dists = np.linalg.norm(coords[:, None] - coords[None], axis=2)
+        expected = np.sort(dists, axis=1)[:, 1 : k + 1].mean(axis=1)
+        assert np.allclose(mean_dists, expected)
+
+
+def test_radius_counts_match_brute_force():
+    rng = np.random.default_rng(2)
+    coords = rng.uniform(0.0, 1.0, size=(800, 3))
+    index = SpatialIndex(coords, cell_size=0.1)
+    counts = index.count_neighbors_in_radius(0.15, num_threads=4)
+    dists = np.linalg.norm(coords[:, None] - coords[None], axis=2)
+    assert np.array_equal(counts, np.sum(dists <= 0.15, axis=1) - 1)
+
+
+def test_outlier_masks_remove_outliers():
+    coords, num_inliers = _create_cloud_with_outliers()
+    statistical_mask = compute_statistical_inlier_mask(coords, 10, 2.0)
+    assert not np.any(statistical_mask[num_inliers:])
+    assert np.mean(statistical_mask[:num_inliers]) > 0.9
+
+    radius_mask = compute_radius_inlier_mask(coords, 0.5, 3)
+    assert not np.any(radius_mask[num_inliers:])
+    assert np.mean(radius_mask[:num_inliers]) > 0.9
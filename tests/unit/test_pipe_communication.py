@@ -0,0 +1,122 @@
+"""Tests for the framed pipe protocol."""
+
+import io
+
+import numpy as np
+import pytest
+
+from benchmarks.pipe_communication import measure_pipe_throughput
+from photogrammetry_importer.process_communication.pipe_communication import (
+    read_frame,
+    read_np_array_frame,
+    read_np_array_from_binary_string,
+    write_frame,
+    write_np_array_as_binary_string,
+    write_np_array_frame,
+)
+
+
+class _ChunkedStream(io.RawIOBase):
+    """Stream returning at most a few bytes per read (like a pipe)."""
+
+    def __init__(self, data, chunk_size=7):
+        self._stream = io.BytesIO(data)
+        self._chunk_size = chunk_size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(min(len(buffer), self._chunk_size))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def test_np_array_frame_round_trip():
+    stream = io.BytesIO()
+    image = np.arange(24 * 32 * 4, dtype=np.float32).reshape(24, 32, 4)
+    write_np_array_frame(stream, image, {"type": "image"})
+    # Non-contiguous arrays are written in C order
+    write_np_array_frame(stream, image[:, ::2, 0].astype(">f8"))
+    write_frame(stream, {"type": "pong"})
+
+    stream = io.BufferedReader(_ChunkedStream(stream.getvalue()))
+    out = np.empty_like(image)
+    result, header = read_np_array_frame(stream, out)
+    assert result is out
+    assert header["type"] == "image"
+    np.testing.assert_array_equal(out, image)
+    result, _ = read_np_array_frame(stream)
+    assert result.dtype == np.dtype(">f8")
+    np.testing.assert_array_equal(result, image[:, ::2, 0])
+    assert read_frame(stream) == ({"type": "pong", "num_bytes": 0}, b"")
+    with pytest.raises(EOFError):
+        read_frame(stream)
+
+
+def test_read_np_array_frame_errors():
+    stream = io.BytesIO()
+    write_np_array_frame(stream, np.zeros((4, 4), dtype=np.float32))
+    data = stream.getvalue()
+    with pytest.raises(ValueError):
+        read_np_array_frame(
+            io.BytesIO(data), out=np.empty((4, 4), dtype=np.float64)
+        )
+    with pytest.raises(EOFError):
+        read_np_array_frame(io.BytesIO(data[:-1]))
+    with pytest.raises(ValueError):
+        read_np_array_frame(io.BytesIO(b"\n" + data))
+
+
+@pytest.mark.parametrize("use_pickle", [False, True])
+def test_binary_string_round_trip(use_pickle):
+    np_array = np.linspace(0, 1, 10 * 10 * 3).reshape(10, 10, 3)
+    binary_string = write_np_array_as_binary_string(np_array, use_pickle)
+    # The frame may be preceded by arbitrary output of the process
+    process_output = b"Loading model\n" + binary_string
+    np.testing.assert_array_equal(
+        read_np_array_from_binary_string(process_output, use_pickle),
+        np_array,
+    )
+
+
+def test_pipe_throughput_benchmark():
+    result = measure_pipe_throughput(
+        "framed", width=64, height=32, num_images=3
+    )
+    assert result["image_shape"] == [32, 64, 4]
+    assert result["megabytes_per_second"] > 0
+
+
+@pytest.mark.parametrize(
+    "np_array",
+    [
+        np.array(3.5, dtype=np.float32),
+        np.float64(2.0),
+        np.array(
+            ["2024-01-01T12:00", "2024-06-30T00:30"], dtype="datetime64[m]"
+        ),
+        np.array([[1, -2], [3, 4]], dtype="timedelta64[ms]").T,
+    ],
+)
+def test_frames_keep_shape_and_dtype(np_array):
+    stream = io.BytesIO()
+    write_np_array_frame(stream, np_array)
+    stream.seek(0)
+    result, _ = read_np_array_frame(stream)
+    binary_string = write_np_array_as_binary_string(np_array, False)
+    for result in [
+        result,
+        read_np_array_from_binary_string(binary_string, False),
+    ]:
+        assert result.shape == np.shape(np_array)
+        assert result.dtype == np_array.dtype
+        np.testing.assert_array_equal(result, np_array)
+
+
+def test_object_arrays_are_rejected():
+    np_array = np.array([{"a": 1}, None], dtype=object)
+    with pytest.raises(ValueError):
+        write_np_array_frame(io.BytesIO(), np_array)
+    with pytest.raises(ValueError):
+        write_np_array_as_binary_string(np_array, False)
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+
+from photogrammetry_importer.utility.profiling_utility import (
+    Profiler,
+    get_active_profiler,
+    get_last_profiler,
+    profile_function,
+    profile_span,
+    profiling_session,
+)
+
+
+@profile_function("Decorated")
+def _decorated_function(value):
+    return value * 2
+
+
+def test_nested_spans():
+    with profiling_session("Import") as profiler:
+        assert get_active_profiler() is profiler
+        with profile_span("Parse", num_items=10):
+            with profile_span("Read"):
+                pass
+        assert _decorated_function(3) == 6
+    assert get_active_profiler() is None
+    assert get_last_profiler() is profiler
+
+    root = profiler.root
+    assert [child.name for child in root.children] == ["Parse", "Decorated"]
+    parse_span = root.children[0]
+    assert parse_span.num_items == 10
+    assert [child.name for child in parse_span.children] == ["Read"]
+    assert root.wall_time >= parse_span.wall_time >= 0
+    assert [(span.name, depth) for span, depth in profiler.iter_spans()] == [
+        ("Import", 0),
+        ("Parse", 1),
+        ("Read", 2),
+        ("Decorated", 1),
+    ]
+    assert len(profiler.get_summary_lines()) == 4
+
+
+def test_export(temp_dir):
+    with profiling_session("Import") as profiler:
+        with profile_span("Parse", num_items=5):
+            pass
+
+    events = profiler.to_chrome_trace()["traceEvents"]
+    assert [event["name"] for event in events] == ["Import", "Parse"]
+    for event in events:
+        assert event["ph"] == "X"
+        assert event["dur"] >= 0
+    assert events[1]["args"]["num_items"] == 5
+
+    json_ofp = temp_dir / "profile.json"
+    profiler.write_json(str(json_ofp))
+    with open(json_ofp) as json_file:
+        profile_dict = json.load(json_file)
+    assert profile_dict["name"] == "Import"
+    assert profile_dict["children"][0]["name"] == "Parse"
+
+
+def test_peak_memory():
+    profiler = Profiler("Memory", trace_memory=True).start()
+    with profiler.span("Allocate") as span:
+        array = np.ones(2**20, dtype=np.float64)
+        del array
+    profiler.stop()
+    # 8 MB array
+    assert span.peak_memory >= 2**23
+    assert profiler.root.peak_memory >= span.peak_memory
+
+
+def test_span_without_profiler():
+    assert get_active_profiler() is None
+    with profile_span("Standalone", num_items=3) as span:
+        pass
+    assert span.wall_time >= 0
+    assert span.num_items == 3
@@ -0,0 +1,190 @@
+import numpy as np
+
+from photogrammetry_importer.ext.read_write_model import (
+    qvec2rotmat,
+    rotmat2qvec,
+)
+from photogrammetry_importer.file_handlers.opensfm_json_file_handler import (
+    OpenSfMJSONFileHandler,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.utility.quaternion_utility import (
+    make_quaternions_continuous,
+    quaternions_to_rotation_matrices,
+    rodrigues_vecs_to_rotation_matrices,
+    rotation_matrices_to_quaternions,
+)
+
+
+def _create_random_quaternions(num_quaternions, seed=0):
+    rng = np.random.default_rng(seed)
+    quaternions = rng.normal(size=(num_quaternions, 4))
+    return quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+
+
+def test_rotation_matrix_quaternion_round_trip():
+    quaternions = _create_random_quaternions(1000)
+    rotation_mats = quaternions_to_rotation_matrices(quaternions)
+    assert np.allclose(
+        rotation_mats @ rotation_mats.transpose(0, 2, 1), np.eye(3)
+    )
+    converted = rotation_matrices_to_quaternions(rotation_mats)
+    # q and -q represent the same rotation
+    signs = np.sign(np.sum(converted * quaternions, axis=1))
+    assert np.allclose(converted * signs[:, np.newaxis], quaternions)
+
+
+def test_rotation_matrices_to_quaternions_removes_scale():
+    angle = np.pi / 3
+    rotation_mat = np.array(
+        [
+            [np.cos(angle), -np.sin(angle), 0.0],
+            [np.sin(angle), np.cos(angle), 0.0],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+    quaternions = rotation_matrices_to_quaternions(
+        [np.eye(3), rotation_mat * 2.5]
+    )
+    assert np.allclose(quaternions[0], [1.0, 0.0, 0.0, 0.0])
+    assert np.allclose(
+        quaternions[1], [np.cos(angle / 2), 0.0, 0.0, np.sin(angle / 2)]
+    )
+
+
+def _make_continuous_reference(quaternions):
+    quaternions = np.array(quaternions)
+    for index in range(1, len(quaternions)):
+        if np.dot(quaternions[index - 1], quaternions[index]) < 0:
+            quaternions[index] = -quaternions[index]
+    return quaternions
+
+
+def test_make_quaternions_continuous_on_long_trajectory():
+    num_frames = 100000
+    # A smooth trajectory rotating several times around a tilted axis
+    angles = np.linspace(0.0, 40.0 * np.pi, num_frames)
+    axis = np.array([1.0, 2.0, 3.0]) / np.linalg.norm([1.0, 2.0, 3.0])
+    quaternions = np.empty((num_frames, 4))
+    quaternions[:, 0] = np.cos(angles / 2)
+    quaternions[:, 1:] = np.sin(angles / 2)[:, np.newaxis] * axis
+    rng = np.random.default_rng(0)
+    signs = rng.choice([-1.0, 1.0], size=num_frames)
+    flipped = quaternions * signs[:, np.newaxis]
+
+    continuous = make_quaternions_continuous(flipped)
+    dot_products = np.sum(continuous[:-1] * continuous[1:], axis=1)
+    assert np.all(dot_products >= 0)
+    # Only the signs are changed
+    assert np.allclose(np.abs(continuous), np.abs(flipped))
+    assert np.allclose(continuous[0], flipped[0])
+    assert np.allclose(continuous, _make_continuous_reference(flipped))
+
+
+def _assert_equal_up_to_sign(quaternions_1, quaternions_2, atol=1e-8):
+    signs = np.where(np.sum(quaternions_1 * quaternions_2, axis=1) < 0, -1, 1)
+    np.testing.assert_allclose(
+        quaternions_1 * signs[:, np.newaxis], quaternions_2, atol=atol
+    )
+
+
+def _create_rotations_close_to_180_degrees(num_rotations, seed=0):
+    # These rotations use the non-trace branches of the conversion
+    rng = np.random.default_rng(seed)
+    axes = rng.normal(size=(num_rotations, 3))
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+    angles = np.pi - rng.uniform(0, 1e-6, size=num_rotations)
+    return rodrigues_vecs_to_rotation_matrices(axes * angles[:, np.newaxis])
+
+
+def test_quaternions_to_rotation_matrices_matches_scalar_versions():
+    quaternions = _create_random_quaternions(200) * 3.0
+    quaternions[0] = 0
+    rotation_mats = quaternions_to_rotation_matrices(quaternions)
+    for quaternion, rotation_mat in zip(quaternions, rotation_mats):
+        np.testing.assert_allclose(
+            rotation_mat,
+            Camera.quaternion_to_rotation_matrix(quaternion),
+            atol=1e-12,
+        )
+    for quaternion, rotation_mat in zip(quaternions[1:], rotation_mats[1:]):
+        np.testing.assert_allclose(
+            rotation_mat,
+            qvec2rotmat(quaternion / np.linalg.norm(quaternion)),
+            atol=1e-12,
+        )
+
+
+def test_rotation_matrices_to_quaternions_matches_scalar_versions():
+    rotation_mats = np.concatenate(
+        [
+            quaternions_to_rotation_matrices(_create_random_quaternions(200)),
+            _create_rotations_close_to_180_degrees(50),
+        ]
+    )
+    quaternions = rotation_matrices_to_quaternions(rotation_mats)
+    _assert_equal_up_to_sign(
+        quaternions,
+        np.array([rotmat2qvec(mat) for mat in rotation_mats]),
+    )
+    # Close to 180 degrees the scalar version returns w values close to 0
+    # (with an arbitrary sign)
+    _assert_equal_up_to_sign(
+        quaternions,
+        np.array(
+            [
+                Camera.rotation_matrix_to_quaternion(mat)
+                for mat in rotation_mats
+            ]
+        ),
+        atol=1e-4,
+    )
+
+
+def test_rodrigues_vecs_to_rotation_matrices_matches_scalar_version():
+    rng = np.random.default_rng(0)
+    rodrigues_vecs = rng.normal(size=(200, 3))
+    rodrigues_vecs[0] = 0
+    rodrigues_vecs[1] = [1e-17, 0, 0]
+    rotation_mats = rodrigues_vecs_to_rotation_matrices(rodrigues_vecs)
+    for rodrigues_vec, rotation_mat in zip(rodrigues_vecs, rotation_mats):
+        np.testing.assert_allclose(
+            rotation_mat,
+            OpenSfMJSONFileHandler._rodrigues_to_matrix(rodrigues_vec),
+            atol=1e-12,
+        )
+
+
+def test_set_extrinsics_of_several_cameras():
+    quaternions = _create_random_quaternions(20)
+    centers = np.random.default_rng(1).normal(size=(20, 3))
+    cameras = [Camera() for _ in range(20)]
+    Camera.set_rotations_with_quaternions(cameras, quaternions)
+    Camera.set_camera_centers_after_rotation(cameras, centers)
+    for camera, quaternion, center in zip(cameras, quaternions, centers):
+        reference_camera = Camera()
+        reference_camera.set_rotation_with_quaternion(quaternion)
+        reference_camera.set_camera_center_after_rotation(center)
+        np.testing.assert_allclose(
+            camera.get_rotation_as_rotation_mat(),
+            reference_camera.get_rotation_as_rotation_mat(),
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(
+            camera.get_translation_vec(),
+            reference_camera.get_translation_vec(),
+            atol=1e-12,
+        )
+
+    rotation_mats = [cam.get_rotation_as_rotation_mat() for cam in cameras]
+    Camera.set_rotations_with_rotation_mats(cameras, rotation_mats)
+    Camera.set_camera_translation_vectors_after_rotation(
+        cameras, [cam.get_translation_vec() for cam in cameras]
+    )
+    _assert_equal_up_to_sign(
+        np.array([cam.get_rotation_as_quaternion() for cam in cameras]),
+        quaternions,
+    )
+    np.testing.assert_allclose(
+        [cam.get_camera_center() for cam in cameras], centers, atol=1e-12
+    )
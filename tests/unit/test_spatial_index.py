@@ -0,0 +1,91 @@
+import numpy as np
+
+from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.spatial_index import SpatialIndex
+
+
+def _create_coords(num_points=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-5.0, 5.0, size=(num_points, 3))
+
+
+def test_query_box_and_sphere_match_brute_force():
+    coords = _create_coords()
+    index = SpatialIndex(coords)
+
+    box_min = np.array([-1.0, -2.0, 0.0])
+    box_max = np.array([2.0, 1.0, 3.0])
+    expected = np.nonzero(
+        np.all((coords >= box_min) & (coords <= box_max), axis=1)
+    )[0]
+    assert np.array_equal(index.query_box(box_min, box_max), expected)
+
+    # A box covering (almost) the whole grid uses the occupied cell scan
+    expected = np.nonzero(np.all(coords >= -4.9, axis=1))[0]
+    assert np.array_equal(index.query_box([-4.9] * 3, [100.0] * 3), expected)
+
+    center = np.array([0.5, -0.5, 1.0])
+    dists = np.linalg.norm(coords - center, axis=1)
+    assert np.array_equal(
+        index.query_sphere(center, 1.5), np.nonzero(dists <= 1.5)[0]
+    )
+    assert index.count_in_radius([center], 1.5)[0] == np.sum(dists <= 1.5)
+
+
+def test_query_knn_matches_brute_force():
+    coords = _create_coords()
+    index = SpatialIndex(coords)
+    for center in [[0.0, 0.0, 0.0], [4.9, -4.9, 4.9], [20.0, 0.0, 0.0]]:
+        dists = np.linalg.norm(coords - np.array(center), axis=1)
+        indices, knn_dists = index.query_knn(center, 10)
+        assert np.allclose(knn_dists, np.sort(dists)[:10])
+        assert np.allclose(dists[indices], knn_dists)
+
+
+def test_parallel_build_equals_sequential_build():
+    coords = _create_coords(num_points=250000, seed=1)
+    sequential = SpatialIndex(coords, num_threads=1)
+    parallel = SpatialIndex(coords, num_threads=4)
+    assert np.array_equal(sequential.order, parallel.order)
+    assert np.array_equal(sequential.cell_keys, parallel.cell_keys)
+
+
+def test_save_and_load(temp_dir):
+    coords = _create_coords(num_points=500)
+    points = Point.create_points(coords, np.zeros_like(coords))
+    index = SpatialIndex.from_points(points, cell_size=0.5)
+    ofp = str(temp_dir / "spatial_index.npz")
+    index.save(ofp)
+    loaded = SpatialIndex.load(ofp)
+    assert loaded.cell_size == 0.5
+    assert np.array_equal(
+        loaded.query_sphere([0, 0, 0], 2.0), index.query_sphere([0, 0, 0], 2.0)
+    )
+
+
+def test_dense_cells_are_split_into_bounded_chunks():
+    rng = np.random.default_rng(2)
+    # A dense cluster (i.e. one dense cell) and a few sparse points
+    coords = np.concatenate(
+        [
+            rng.uniform(0.0, 0.1, size=(2000, 3)),
+            rng.uniform(-5.0, 5.0, size=(200, 3)),
+        ]
+    )
+    index = SpatialIndex(coords, cell_size=1.0)
+    max_chunk_entries = 50000
+    counts = np.zeros(len(coords), dtype=np.int64)
+    for point_indices, squared_dists in index._iter_neighborhood_distances(
+        1, 1, max_chunk_entries=max_chunk_entries
+    ):
+        assert squared_dists.size <= max_chunk_entries
+        valid = point_indices >= 0
+        chunk_counts = np.count_nonzero(squared_dists <= 0.25, axis=2)
+        counts[point_indices[valid]] += chunk_counts[valid]
+
+    dists = np.linalg.norm(coords[:, np.newaxis] - coords, axis=2)
+    assert np.array_equal(counts, np.count_nonzero(dists <= 0.5, axis=1))
+    assert np.array_equal(
+        index.count_neighbors_in_radius(0.5),
+        np.count_nonzero(dists <= 0.5, axis=1) - 1,
+    )
@@ -0,0 +1,60 @@
+import os
+import struct
+
+import pytest
+
+from photogrammetry_importer.file_handlers.image_file_handler import (
+    ImageFileHandler,
+)
+from photogrammetry_importer.utility.thumbnail_utility import (
+    create_thumbnails,
+    get_thumbnail_fp,
+)
+
+
+@pytest.fixture(autouse=True)
+def image_size_cache_fp(temp_dir, monkeypatch):
+    cache_fp = str(temp_dir / "cache" / "image_size_cache.json")
+    monkeypatch.setattr(ImageFileHandler, "image_size_cache_fp", cache_fp)
+    monkeypatch.setattr(ImageFileHandler, "_image_size_cache", None)
+    return cache_fp
+
+
+def _write_png(ofp, width, height):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    with open(ofp, "wb") as png_file:
+        png_file.write(b"\x89PNG\r\n\x1a\n")
+        png_file.write(struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr)
+
+
+def test_thumbnail_fp_depends_on_resolution_and_mtime(temp_dir):
+    image_ifp = str(temp_dir / "image.tif")
+    _write_png(image_ifp, 100, 100)
+    cache_dp = str(temp_dir / "thumbnails")
+    thumbnail_fp = get_thumbnail_fp(image_ifp, 512, cache_dp)
+    assert thumbnail_fp.startswith(cache_dp)
+    assert thumbnail_fp.endswith(".png")
+    assert thumbnail_fp == get_thumbnail_fp(image_ifp, 512, cache_dp)
+    assert thumbnail_fp != get_thumbnail_fp(image_ifp, 256, cache_dp)
+    stat_result = os.stat(image_ifp)
+    os.utime(image_ifp, ns=(stat_result.st_atime_ns, 10**18))
+    assert thumbnail_fp != get_thumbnail_fp(image_ifp, 512, cache_dp)
+
+
+def test_create_thumbnails_keeps_small_and_cached_images(temp_dir):
+    cache_dp = str(temp_dir / "thumbnails")
+    small_ifp = str(temp_dir / "small.png")
+    large_ifp = str(temp_dir / "large.png")
+    missing_ifp = str(temp_dir / "missing.png")
+    _write_png(small_ifp, 64, 32)
+    _write_png(large_ifp, 4000, 3000)
+
+    # An existing thumbnail is reused without creating it again
+    thumbnail_fp = get_thumbnail_fp(large_ifp, 128, cache_dp)
+    os.makedirs(os.path.dirname(thumbnail_fp))
+    _write_png(thumbnail_fp, 128, 96)
+
+    result_fps = create_thumbnails(
+        [small_ifp, large_ifp, missing_ifp], 128, cache_dp=cache_dp
+    )
+    assert result_fps == [small_ifp, thumbnail_fp, missing_ifp]
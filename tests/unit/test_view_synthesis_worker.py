@@ -0,0 +1,182 @@
+"""Tests for the view synthesis worker protocol (with a stand-in worker)."""
+
+import io
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from photogrammetry_importer.process_communication.pipe_communication import (
+    FRAME_MAGIC,
+)
+from photogrammetry_importer.process_communication.view_synthesis_worker import (
+    ViewSynthesisWorker,
+    WorkerError,
+    create_worker_env,
+    read_message,
+    write_message,
+)
+from photogrammetry_importer.process_communication.subprocess_command import (
+    create_subprocess_command,
+)
+
+STAND_IN_WORKER_FP = str(
+    Path(__file__).parents[2]
+    / "example_view_synthesis_scripts"
+    / "stand_in_worker.py"
+)
+
+
+def _create_camera_json_data(width=32, height=24):
+    return {
+        "camera_angle_x": 1.0,
+        "w": width,
+        "h": height,
+        "frames": [{"transform_matrix": np.identity(4).tolist()}],
+    }
+
+
+def _create_worker(*parameters, **kwargs):
+    command = create_subprocess_command(
+        STAND_IN_WORKER_FP,
+        ["--load_snapshot", "snapshot.msgpack"] + list(parameters),
+        python_exe_fp=sys.executable,
+    )
+    return ViewSynthesisWorker(command, env=create_worker_env(), **kwargs)
+
+
+@pytest.fixture
+def worker():
+    worker = _create_worker()
+    yield worker
+    worker.stop()
+
+
+def test_message_round_trip():
+    stream = io.BytesIO()
+    payload = bytes(range(256)) * 4
+    write_message(stream, {"type": "image"}, payload)
+    write_message(stream, {"type": "pong"})
+    stream.seek(0)
+    assert read_message(stream) == (
+        {"type": "image", "num_bytes": len(payload)},
+        payload,
+    )
+    assert read_message(stream) == ({"type": "pong", "num_bytes": 0}, b"")
+    with pytest.raises(EOFError):
+        read_message(stream)
+
+
+def test_render_with_persistent_worker(worker):
+    for width, height in [(32, 24), (16, 8), (32, 24)]:
+        image = worker.render(_create_camera_json_data(width, height), 1)
+        assert image.shape == (height, width, 4)
+        assert image.dtype == np.float32
+    assert worker.num_starts == 1
+    assert worker.worker_info["snapshot"] == "snapshot.msgpack"
+    assert worker.check_health()
+
+
+def test_render_error_keeps_worker(worker):
+    with pytest.raises(WorkerError):
+        worker.render({"w": 1}, 1)
+    assert worker.check_health()
+    worker.render(_create_camera_json_data(), 1)
+    assert worker.num_starts == 1
+
+
+def test_restart_after_crash():
+    worker = _create_worker("--crash_after", "2")
+    try:
+        worker.render(_create_camera_json_data(), 1)
+        # The worker terminates when receiving the second request
+        image = worker.render(_create_camera_json_data(), 1)
+        assert image.shape == (24, 32, 4)
+        assert worker.num_starts == 2
+    finally:
+        worker.stop()
+
+
+def test_idle_timeout():
+    worker = _create_worker(idle_timeout=0.2)
+    try:
+        worker.render(_create_camera_json_data(), 1)
+        assert worker.is_alive()
+        deadline = time.monotonic() + 10
+        while worker.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not worker.is_alive()
+        worker.render(_create_camera_json_data(), 1)
+        assert worker.num_starts == 2
+    finally:
+        worker.stop()
+
+
+def test_startup_timeout():
+    worker = _create_worker("--startup_delay", "10", startup_timeout=0.2)
+    with pytest.raises(WorkerError):
+        worker.start()
+    assert not worker.is_alive()
+
+
+def test_render_timeout():
+    worker = _create_worker("--hang_after", "2", render_timeout=0.5)
+    try:
+        worker.render(_create_camera_json_data(), 1)
+        with pytest.raises(WorkerError):
+            worker.render(_create_camera_json_data(), 1)
+        assert not worker.is_alive()
+        worker.render(_create_camera_json_data(), 1)
+        assert worker.num_starts == 2
+    finally:
+        worker.stop()
+
+
+@pytest.mark.skipif(
+    not hasattr(signal, "SIGSTOP"), reason="Requires POSIX signals"
+)
+def test_restart_of_unresponsive_worker():
+    worker = _create_worker(health_check_timeout=0.5)
+    try:
+        worker.render(_create_camera_json_data(), 1)
+        # The process is still alive, but does not answer any requests
+        os.kill(worker._process.pid, signal.SIGSTOP)
+        assert worker.is_alive()
+        image = worker.render(_create_camera_json_data(), 1)
+        assert image.shape == (24, 32, 4)
+        assert worker.num_starts == 2
+    finally:
+        worker.stop()
+
+
+def test_start_with_invalid_executable(temp_dir):
+    worker = ViewSynthesisWorker([str(temp_dir / "not_a_python_exe")])
+    with pytest.raises(WorkerError):
+        worker.start()
+    assert not worker.is_alive()
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        b"Loading snapshot ...\n",
+        FRAME_MAGIC + b"\x08\x00\x00\x00not json",
+    ],
+)
+def test_start_with_invalid_first_message(output):
+    script = (
+        "import sys, time;"
+        f"sys.stdout.buffer.write({output!r});"
+        "sys.stdout.flush();"
+        "time.sleep(30)"
+    )
+    worker = ViewSynthesisWorker(
+        [sys.executable, "-c", script], startup_timeout=10
+    )
+    with pytest.raises(WorkerError):
+        worker.start()
+    assert not worker.is_alive()
@@ -0,0 +1,136 @@
+import os
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from benchmarks import format_writers
+from benchmarks.synthetic_reconstruction import (
+    generate_synthetic_reconstruction,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.visibility_index import VisibilityIndex
+from photogrammetry_importer.file_handlers.colmap_file_handler import (
+    ColmapFileHandler,
+)
+from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
+    OpenMVGJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.visualsfm_file_handler import (
+    VisualSfMFileHandler,
+)
+
+
+def _create_index():
+    camera_indices = [0, 0, 1, 2, 2, 2, 2]
+    point_ids = [10, 5, 5, 7, 10, 10, 42]
+    return VisibilityIndex.from_observations(camera_indices, point_ids, 4)
+
+
+def test_camera_and_point_lookups():
+    index = _create_index()
+    assert index.get_num_cameras() == 4
+    # The duplicated observation (2, 10) is stored only once
+    assert index.get_num_observations() == 6
+    assert list(index.get_point_ids_of_camera(0)) == [5, 10]
+    assert list(index.get_point_ids_of_camera(2)) == [7, 10, 42]
+    assert list(index.get_point_ids_of_camera(3)) == []
+    assert list(index.get_point_ids_of_cameras([0, 1])) == [5, 10]
+    assert list(index.get_camera_indices_of_point(10)) == [0, 2]
+    assert list(index.get_camera_indices_of_point(11)) == []
+    assert list(index.get_track_lengths()) == [2, 1, 2, 1]
+
+
+def test_remap_point_ids_and_dict_round_trip():
+    index = _create_index()
+    remapped = index.remap_point_ids([42, 10, 99])
+    assert list(remapped.get_point_ids_of_camera(0)) == [1]
+    assert list(remapped.get_point_ids_of_camera(2)) == [0, 1]
+    restored = VisibilityIndex.from_dict(remapped.to_dict())
+    assert np.array_equal(restored.camera_offsets, remapped.camera_offsets)
+    assert list(restored.get_camera_indices_of_point(1)) == [0, 2]
+
+
+def test_parse_visualsfm_file_with_visibility_index(temp_dir):
+    nvm_ifp = temp_dir / "model.nvm"
+    nvm_ifp.write_text(
+        "NVM_V3\n"
+        "\n"
+        "2\n"
+        "a.jpg 100 1 0 0 0 0 0 0 0 0\n"
+        "b.jpg 100 1 0 0 0 1 0 0 0 0\n"
+        "\n"
+        "2\n"
+        "0 0 1 255 0 0 2 0 3 1.0 2.0 1 4 3.0 4.0\n"
+        "1 1 1 0 255 0 1 1 7 5.0 6.0\n"
+    )
+    cameras, points, index = VisualSfMFileHandler.parse_visualsfm_file(
+        str(nvm_ifp), "", "NAME", True, return_visibility_index=True
+    )
+    assert len(cameras) == 2 and len(points) == 2
+    assert list(index.get_point_ids_of_camera(0)) == [0]
+    assert list(index.get_point_ids_of_camera(1)) == [0, 1]
+
+
+def _parse_colmap_workspace(idp, **kwargs):
+    return ColmapFileHandler.parse_colmap_folder(
+        idp,
+        False,
+        os.path.join(idp, "images"),
+        Camera.IMAGE_FP_TYPE_NAME,
+        True,
+        **kwargs
+    )
+
+
+def _parse_file(parse_function):
+    def parse(ifp, **kwargs):
+        image_dp = os.path.join(os.path.dirname(ifp), "images")
+        return parse_function(
+            ifp, image_dp, Camera.IMAGE_FP_TYPE_NAME, True, **kwargs
+        )
+
+    return parse
+
+
+@pytest.mark.parametrize(
+    "write_function,parse_function",
+    [
+        (format_writers.write_colmap_workspace, _parse_colmap_workspace),
+        (
+            format_writers.write_nvm_file,
+            _parse_file(VisualSfMFileHandler.parse_visualsfm_file),
+        ),
+        (
+            format_writers.write_openmvg_file,
+            _parse_file(OpenMVGJSONFileHandler.parse_openmvg_file),
+        ),
+    ],
+)
+def test_default_parse_does_not_build_index(
+    write_function, parse_function, temp_dir
+):
+    reconstruction = generate_synthetic_reconstruction(
+        num_cameras=4, num_points=20, depth_map_size=(8, 6)
+    )
+    ifp = write_function(reconstruction, str(temp_dir))
+    with mock.patch.object(
+        VisibilityIndex,
+        "from_observations",
+        wraps=VisibilityIndex.from_observations,
+    ) as from_observations_mock, mock.patch.object(
+        VisibilityIndex,
+        "from_track_lists",
+        wraps=VisibilityIndex.from_track_lists,
+    ) as from_track_lists_mock:
+        result = parse_function(ifp)
+        assert not any(
+            isinstance(element, VisibilityIndex) for element in result
+        )
+        assert from_observations_mock.call_count == 0
+        assert from_track_lists_mock.call_count == 0
+
+        result = parse_function(ifp, return_visibility_index=True)
+        assert isinstance(result[-1], VisibilityIndex)
+        # from_track_lists() uses from_observations()
+        assert from_observations_mock.call_count == 1
@@ -0,0 +1,71 @@
+import numpy as np
+
+from photogrammetry_importer.utility.voxel_utility import (
+    compute_linear_voxel_keys,
+    count_occupied_voxels,
+    downsample_with_voxel_grid,
+    estimate_voxel_size_for_target_count,
+)
+
+
+def _compute_reference_voxels(coords, voxel_size):
+    origin = coords.min(axis=0)
+    voxel_to_indices = {}
+    for idx, coord in enumerate(coords):
+        key = tuple(np.floor((coord - origin) / voxel_size).astype(int))
+        voxel_to_indices.setdefault(key, []).append(idx)
+    return voxel_to_indices
+
+
+def test_linear_voxel_keys_are_unique_per_voxel():
+    indices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 0, 0]])
+    keys = compute_linear_voxel_keys(indices)
+    assert len(np.unique(keys)) == 4
+    assert keys[1] == keys[4]
+
+
+def test_downsample_matches_reference_implementation():
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(-1.0, 1.0, size=(2000, 3))
+    colors = rng.uniform(0.0, 255.0, size=(2000, 3))
+    voxel_size = 0.25
+
+    down_coords, down_colors, first_indices = downsample_with_voxel_grid(
+        coords, colors, voxel_size=voxel_size
+    )
+    reference = _compute_reference_voxels(coords, voxel_size)
+    assert len(down_coords) == len(reference)
+    assert count_occupied_voxels(coords, voxel_size) == len(reference)
+
+    for down_coord, down_color, first_idx in zip(
+        down_coords, down_colors, first_indices
+    ):
+        origin = coords.min(axis=0)
+        key = tuple(
+            np.floor((coords[first_idx] - origin) / voxel_size).astype(int)
+        )
+        voxel_indices = reference[key]
+        assert voxel_indices[0] == first_idx
+        assert np.allclose(down_coord, coords[voxel_indices].mean(axis=0))
+        assert np.allclose(down_color, colors[voxel_indices].mean(axis=0))
+
+
+def test_downsample_with_first_representative():
+    coords = np.array([[0.0, 0.0, 0.0], [0.05, 0.05, 0.05], [1.0, 1.0, 1.0]])
+    down_coords, down_colors, first_indices = downsample_with_voxel_grid(
+        coords, voxel_size=0.5, representative="FIRST"
+    )
+    assert down_colors is None
+    assert list(first_indices) == [0, 2]
+    assert np.allclose(down_coords, coords[[0, 2]])
+
+
+def test_estimate_voxel_size_for_target_count():
+    rng = np.random.default_rng(1)
+    coords = rng.uniform(0.0, 10.0, size=(20000, 3))
+    target_count = 1000
+    voxel_size = estimate_voxel_size_for_target_count(coords, target_count)
+    count = count_occupied_voxels(coords, voxel_size)
+    assert count <= target_count
+    assert count >= 0.5 * target_count
+    assert estimate_voxel_size_for_target_count(coords, 30000) is None